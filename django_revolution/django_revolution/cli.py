@@ -23,13 +23,30 @@ from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from django_revolution.config import get_settings
+from django_revolution.metrics import stage_totals, write_summary_json
+from django_revolution.tracing import get_tracer
 from django_revolution.openapi.generator import OpenAPIGenerator
+from django_revolution.openapi.watcher import ZoneWatcher
 from django_revolution.utils import Logger, auto_install_dependencies, check_dependency
 
 
 console = Console()
 
 
+def parse_max_workers(value: str):
+    """Parse a --max-workers value: a positive number or 'auto'."""
+    value = str(value).strip().lower()
+    if value == "auto":
+        return "auto"
+    try:
+        workers = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number or 'auto', got '{value}'")
+    if workers < 1:
+        raise argparse.ArgumentTypeError("max workers must be at least 1")
+    return workers
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -40,6 +57,7 @@ Examples:
   django-revolution                    # Interactive mode
   django-revolution --generate         # Generate all clients
   django-revolution --zones public private --typescript  # Generate specific zones
+  django-revolution --watch            # Regenerate zones when their sources change
   django-revolution --status           # Show status
   django-revolution --list-zones       # List zones
   django-revolution --validate-zones   # Validate zones
@@ -81,6 +99,12 @@ Examples:
         action="store_true",
         help="Clean output directories before generation",
     )
+    parser.add_argument(
+        "--watch",
+        "-w",
+        action="store_true",
+        help="Keep running and regenerate zones whose app sources change",
+    )
     parser.add_argument(
         "--no-multithreading",
         action="store_true",
@@ -88,9 +112,58 @@ Examples:
     )
     parser.add_argument(
         "--max-workers",
-        type=int,
-        default=20,
-        help="Maximum number of worker threads (default: 20)",
+        type=parse_max_workers,
+        help=(
+            "Maximum number of worker threads, or 'auto' to size them from "
+            "CPU count and available memory (default: from settings)"
+        ),
+    )
+    parser.add_argument(
+        "--schema-engine",
+        choices=["inprocess", "pool", "subprocess"],
+        help="Schema generation engine (default: inprocess)",
+    )
+    parser.add_argument(
+        "--schema-format",
+        choices=["yaml", "json"],
+        help="Zone schema file format (default: yaml)",
+    )
+    parser.add_argument(
+        "--archive-backend",
+        choices=["files", "store"],
+        help="Archive history backend; store deduplicates files across runs (default: files)",
+    )
+    parser.add_argument(
+        "--archive-format",
+        choices=["zip", "store", "tar.gz", "tar.zst"],
+        help="Client archive format; store skips compression (default: zip)",
+    )
+    parser.add_argument(
+        "--schema-cache",
+        action="store_true",
+        help="Reuse schemas of zones whose inputs did not change",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only regenerate clients of zones whose schema changed",
+    )
+    parser.add_argument(
+        "--pipeline-mode",
+        choices=["staged", "streaming"],
+        help="Run stages for all zones at once or stream each zone (default: staged)",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        metavar="PATH",
+        help="Write the generation summary with stage timings to a JSON file "
+        "(numbered per run with --watch)",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="Record the run as a Chrome trace (open in Perfetto or chrome://tracing; "
+        "numbered per run with --watch)",
     )
 
     # Information options
@@ -146,6 +219,20 @@ Examples:
             config.enable_multithreading = False
         if args.max_workers:
             config.max_workers = args.max_workers
+        if args.schema_engine:
+            config.schema_engine = args.schema_engine
+        if args.schema_format:
+            config.schema_format = args.schema_format
+        if args.archive_backend:
+            config.archive_backend = args.archive_backend
+        if args.archive_format:
+            config.archive_format = args.archive_format
+        if args.schema_cache:
+            config.schema_cache = True
+        if args.incremental:
+            config.incremental = True
+        if args.pipeline_mode:
+            config.pipeline_mode = args.pipeline_mode
 
         # Initialize generator
         generator = OpenAPIGenerator(config)
@@ -166,6 +253,8 @@ Examples:
             return handle_validate_zones_detailed(generator)
         elif args.test_schemas:
             return handle_test_schemas(generator)
+        elif args.watch:
+            return handle_watch(generator, args)
         elif args.generate or args.zones or args.typescript or args.python:
             return handle_generate(generator, args)
         elif args.interactive:
@@ -287,8 +376,8 @@ def handle_generate_interactive(generator):
             default=str(generator.config.max_workers),
         ).ask()
         try:
-            max_workers = int(max_workers)
-        except ValueError:
+            max_workers = parse_max_workers(max_workers)
+        except argparse.ArgumentTypeError:
             max_workers = generator.config.max_workers
 
     # Verbose mode
@@ -371,13 +460,75 @@ def handle_generate(generator, args):
     archive = not args.no_archive
 
     console.print("🚀 Starting generation...")
-    summary = generator.generate_all(zones=zones, archive=archive)
+    tracer = get_tracer()
+    if args.trace:
+        tracer.start()
+    try:
+        summary = generator.generate_all(zones=zones, archive=archive)
+    finally:
+        if args.trace:
+            tracer.stop()
+            trace_path = tracer.write(Path(args.trace))
 
     # Display results
     show_generation_results(summary)
+
+    if args.metrics_json:
+        path = write_summary_json(summary, Path(args.metrics_json))
+        console.print(f"📈 Metrics written to {path}")
+    if args.trace:
+        console.print(f"🔍 Trace written to {trace_path}")
     return 0
 
 
+def handle_watch(generator, args):
+    """Regenerate zones whose sources change until interrupted."""
+    generator.config.generators.typescript.enabled = not args.no_typescript and (
+        args.typescript or not args.python
+    )
+    generator.config.generators.python.enabled = not args.no_python and (
+        args.python or not args.typescript
+    )
+
+    # Each run gets its own trace and metrics file: trace.json -> trace.1.json
+    tracer = get_tracer()
+    runs = 0
+
+    def start_run():
+        nonlocal runs
+        runs += 1
+        if args.trace:
+            tracer.start()
+
+    def finish_run(summary):
+        if args.trace:
+            tracer.stop()
+            trace_path = tracer.write(numbered_path(Path(args.trace), runs))
+        show_generation_results(summary)
+        if args.metrics_json:
+            path = write_summary_json(
+                summary, numbered_path(Path(args.metrics_json), runs)
+            )
+            console.print(f"📈 Metrics written to {path}")
+        if args.trace:
+            console.print(f"🔍 Trace written to {trace_path}")
+
+    watcher = ZoneWatcher(
+        generator, zones=args.zones, on_summary=finish_run, on_start=start_run
+    )
+    console.print("👀 Watching zone sources, press Ctrl+C to stop...")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        console.print("👋 Stopped watching")
+    return 0
+
+
+def numbered_path(path: Path, number: int) -> Path:
+    """Insert a run number before the suffix of an output file."""
+    return path.with_name(f"{path.stem}.{number}{path.suffix}")
+
+
 def show_generation_results(summary):
     """Display generation results in a nice table."""
     table = Table(title="📊 Generation Results")
@@ -386,7 +537,27 @@ def show_generation_results(summary):
 
     table.add_row("Zones Processed", str(summary.total_zones))
     table.add_row("Duration", f"{summary.duration_seconds:.1f}s")
+    table.add_row(
+        "CPU Time",
+        f"{summary.cpu_seconds:.1f}s in process, "
+        f"{summary.child_cpu_seconds:.1f}s in child processes",
+    )
     table.add_row("Total Files", str(summary.total_files_generated))
+    table.add_row(
+        "Output Files",
+        f"{summary.files_written} written, {summary.files_unchanged} unchanged, "
+        f"{summary.files_deleted} deleted",
+    )
+
+    if summary.schema_cache_hits or summary.schema_cache_misses:
+        table.add_row(
+            "Schema Cache",
+            f"{len(summary.schema_cache_hits)} hits, "
+            f"{len(summary.schema_cache_misses)} misses",
+        )
+
+    if summary.unchanged_zones:
+        table.add_row("Unchanged Zones", ", ".join(summary.unchanged_zones))
 
     # TypeScript results
     if summary.typescript_results:
@@ -406,11 +577,53 @@ def show_generation_results(summary):
 
     console.print(table)
 
+    # Schema worker pool utilization
+    if summary.schema_workers:
+        console.print("\n[bold]Schema Workers:[/bold]")
+        for worker in summary.schema_workers:
+            console.print(
+                f"  ⚙️  worker {worker.worker_id} (pid {worker.pid}): "
+                f"{worker.jobs} zones, {worker.busy_seconds:.1f}s busy, "
+                f"{worker.utilization:.0%} utilization"
+            )
+
+    # Stage timings, summed over zones
+    if summary.stage_timings:
+        stages = Table(title="⏱️  Stage Timings")
+        stages.add_column("Stage", style="cyan", no_wrap=True)
+        stages.add_column("Wall", justify="right")
+        stages.add_column("CPU", justify="right")
+        stages.add_column("Child CPU", justify="right")
+        stages.add_column("Peak RSS", justify="right")
+        stages.add_column("Files", justify="right")
+        for total in stage_totals(summary.stage_timings):
+            stages.add_row(
+                total.stage,
+                f"{total.duration_seconds:.1f}s",
+                f"{total.cpu_seconds:.1f}s",
+                f"{total.child_cpu_seconds:.1f}s",
+                f"{total.peak_rss_bytes // (1024 * 1024)} MB",
+                str(total.files),
+            )
+        console.print(stages)
+
+    # Streaming pipeline critical path
+    if summary.critical_path:
+        console.print("\n[bold]Critical Path:[/bold]")
+        for task in summary.critical_path:
+            console.print(
+                f"  ⏱️  {task.name}: started at {task.start_seconds:.1f}s, "
+                f"took {task.duration_seconds:.1f}s"
+            )
+
     # Show detailed results
     if summary.typescript_results:
         console.print("\n[bold]TypeScript Results:[/bold]")
         for zone_name, result in summary.typescript_results.items():
             status = "✅" if result.success else "❌"
+            if result.skipped:
+                console.print(f"  ⏭️  {zone_name}: unchanged")
+                continue
             console.print(f"  {status} {zone_name}: {result.files_generated} files")
             if not result.success and result.error_message:
                 console.print(f"    Error: {result.error_message}")
@@ -419,6 +632,9 @@ def show_generation_results(summary):
         console.print("\n[bold]Python Results:[/bold]")
         for zone_name, result in summary.python_results.items():
             status = "✅" if result.success else "❌"
+            if result.skipped:
+                console.print(f"  ⏭️  {zone_name}: unchanged")
+                continue
             console.print(f"  {status} {zone_name}: {result.files_generated} files")
             if not result.success and result.error_message:
                 console.print(f"    Error: {result.error_message}")
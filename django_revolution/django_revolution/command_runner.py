@@ -0,0 +1,414 @@
+"""
+Command Runner for Django Revolution
+
+Runs external commands as argv lists on one asyncio event loop, streaming
+their output to the logger, with per-job timeouts, bounded concurrency and
+cancellation of sibling jobs after the first failure.
+"""
+
+import asyncio
+import codecs
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from pydantic import BaseModel, Field
+
+from .metrics import record_commands
+from .resources import (
+    ResourceTuner,
+    get_resource_tuner,
+    process_cpu_seconds,
+    process_rss_bytes,
+)
+from .tracing import get_tracer
+from .utils import Logger
+
+DEFAULT_MAX_CONCURRENCY = max(4, os.cpu_count() or 1)
+
+# Seconds between usage samples of a running job and between headroom checks
+USAGE_SAMPLE_INTERVAL = 0.2
+THROTTLE_INTERVAL = 0.25
+
+# Bytes read from a pipe at a time; lines may be longer than this
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class CommandJob(BaseModel):
+    """A command to run."""
+
+    argv: List[str] = Field(..., description="Program and arguments")
+    cwd: Optional[Path] = Field(None, description="Working directory")
+    timeout: float = Field(120, description="Timeout in seconds")
+    name: str = Field("", description="Label used in log output")
+    quiet: bool = Field(False, description="Log failures at debug level only")
+    stage: str = Field("", description="Stage used for memory accounting")
+
+
+class CommandResult(BaseModel):
+    """Outcome of a command."""
+
+    argv: List[str] = Field(..., description="Program and arguments")
+    returncode: Optional[int] = Field(None, description="Exit code, None if not run")
+    stdout: str = Field("", description="Captured standard output")
+    stderr: str = Field("", description="Captured standard error")
+    duration_seconds: float = Field(0.0, description="Wall time")
+    timed_out: bool = Field(False, description="Killed after the timeout")
+    cancelled: bool = Field(False, description="Cancelled after a sibling failed")
+    error: str = Field("", description="Error starting or running the command")
+    peak_rss_bytes: int = Field(0, description="Peak RSS of the process tree")
+    cpu_seconds: float = Field(
+        0.0, description="CPU time of the process tree (last sample)"
+    )
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0
+
+    @property
+    def output(self) -> str:
+        """Combined message in the style of run_command()."""
+        if self.error:
+            return self.error
+        return self.stdout or self.stderr
+
+
+class CommandRunner:
+    """
+    Subprocess engine on a private event loop.
+
+    The loop runs in a daemon thread, so synchronous callers on any thread
+    share one concurrency limit and no thread blocks per running process.
+    The peak RSS of every job is reported to the resource tuner, and new
+    jobs wait while the tuner reports too little free memory. Jobs run
+    through run() and run_many() count towards the metrics stage open on
+    the calling thread.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        logger: Optional[Logger] = None,
+        tuner: Optional[ResourceTuner] = None,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            max_concurrency: Maximum number of commands running at once
+            logger: Optional logger instance
+            tuner: Resource tuner (defaults to the process-wide one)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.logger = logger or Logger("command_runner")
+        self.tuner = tuner or get_resource_tuner()
+        self.running = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def serve():
+                    asyncio.set_event_loop(loop)
+                    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(
+                    target=serve, name="command-runner", daemon=True
+                ).start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    async def _stream(self, stream, chunks: List[str], label: str):
+        """
+        Collect a stream, logging each line as it completes.
+
+        Reads fixed-size chunks rather than lines, so output lines longer
+        than the StreamReader limit do not fail the command.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        partial = ""
+        while True:
+            data = await stream.read(STREAM_CHUNK_SIZE)
+            text = decoder.decode(data, final=not data)
+            chunks.append(text)
+            *complete, partial = (partial + text).split("\n")
+            for line in complete:
+                self.logger.debug(f"[{label}] {line.rstrip()}")
+            if not data:
+                break
+        if partial:
+            self.logger.debug(f"[{label}] {partial.rstrip()}")
+
+    @staticmethod
+    def _stage_of(job: CommandJob) -> str:
+        """Key under which a job's memory use is accounted."""
+        return job.stage or f"command:{Path(job.argv[0]).name}"
+
+    async def _wait_for_headroom(self, job: CommandJob):
+        """Delay a launch while memory is low and other jobs can free some."""
+        stage = self._stage_of(job)
+        throttled = False
+        while self.running > 0 and not self.tuner.has_headroom(stage):
+            if not throttled:
+                self.logger.info(
+                    f"Low memory, waiting for {self.running} running commands "
+                    f"before starting {job.name or stage}"
+                )
+                throttled = True
+            await asyncio.sleep(THROTTLE_INTERVAL)
+
+    async def _sample_usage(self, pid: int, result: CommandResult):
+        """Track peak RSS and CPU time of a job's process tree until cancelled."""
+        while True:
+            rss = process_rss_bytes(pid)
+            result.peak_rss_bytes = max(result.peak_rss_bytes, rss)
+            result.cpu_seconds = max(result.cpu_seconds, process_cpu_seconds(pid))
+            await asyncio.sleep(USAGE_SAMPLE_INTERVAL)
+
+    async def run_async(self, job: CommandJob) -> CommandResult:
+        """
+        Run one command on the runner's loop.
+
+        Args:
+            job: Command to run
+
+        Returns:
+            CommandResult; failures are reported, not raised
+        """
+        label = job.name or Path(job.argv[0]).name
+        result = CommandResult(argv=job.argv)
+        stdout: List[str] = []
+        stderr: List[str] = []
+
+        async with self._semaphore:
+            await self._wait_for_headroom(job)
+            self.logger.debug(f"Running command: {' '.join(job.argv)}")
+            if job.cwd:
+                self.logger.debug(f"Working directory: {job.cwd}")
+
+            # Counted from here so concurrent launches see each other
+            self.running += 1
+            start_time = time.monotonic()
+            trace_start = time.perf_counter()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *job.argv,
+                    cwd=job.cwd,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except (OSError, ValueError) as e:
+                self.running -= 1
+                result.error = str(e)
+                log = self.logger.debug if job.quiet else self.logger.error
+                log(f"Command execution failed: {e}")
+                return result
+            except asyncio.CancelledError:
+                self.running -= 1
+                raise
+
+            sampler = asyncio.ensure_future(self._sample_usage(process.pid, result))
+
+            async def communicate():
+                await asyncio.gather(
+                    self._stream(process.stdout, stdout, label),
+                    self._stream(process.stderr, stderr, label),
+                )
+                return await process.wait()
+
+            try:
+                result.returncode = await asyncio.wait_for(
+                    communicate(), timeout=job.timeout
+                )
+            except asyncio.TimeoutError:
+                await self._kill(process)
+                result.timed_out = True
+                result.error = f"Command timed out after {job.timeout} seconds"
+                log = self.logger.debug if job.quiet else self.logger.error
+                log(result.error)
+            except asyncio.CancelledError:
+                await self._kill(process)
+                raise
+            except Exception as e:
+                await self._kill(process)
+                result.error = f"Command failed while running: {e}"
+                log = self.logger.debug if job.quiet else self.logger.error
+                log(result.error)
+            finally:
+                self.running -= 1
+                sampler.cancel()
+                result.stdout = "".join(stdout)
+                result.stderr = "".join(stderr)
+                result.duration_seconds = time.monotonic() - start_time
+                self.tuner.record(self._stage_of(job), result.peak_rss_bytes)
+                # Each child process gets its own track
+                get_tracer().add_span(
+                    label,
+                    "process",
+                    trace_start,
+                    time.perf_counter(),
+                    {
+                        "argv": job.argv,
+                        "returncode": result.returncode,
+                        "cpu_seconds": result.cpu_seconds,
+                        "peak_rss_bytes": result.peak_rss_bytes,
+                    },
+                    track=process.pid,
+                    track_name=f"{label} (pid {process.pid})",
+                )
+
+        if result.success:
+            self.logger.debug(f"Command succeeded: {result.output}")
+        elif not result.timed_out and not result.error:
+            log = self.logger.debug if job.quiet else self.logger.warning
+            log(f"Command failed (code {result.returncode}): {result.output}")
+        return result
+
+    @staticmethod
+    async def _kill(process):
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+    async def run_many_async(
+        self, jobs: Sequence[CommandJob], fail_fast: bool = True
+    ) -> List[CommandResult]:
+        """
+        Run commands concurrently within the concurrency limit.
+
+        Args:
+            jobs: Commands to run
+            fail_fast: Cancel the remaining commands after the first failure
+
+        Returns:
+            Results in the order of jobs
+        """
+        tasks: Dict[asyncio.Task, int] = {
+            asyncio.ensure_future(self.run_async(job)): index
+            for index, job in enumerate(jobs)
+        }
+        results: List[Optional[CommandResult]] = [None] * len(jobs)
+        pending = set(tasks)
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            failed = False
+            for task in done:
+                if task.cancelled():
+                    continue
+                result = task.result()
+                results[tasks[task]] = result
+                failed = failed or not result.success
+
+            if failed and fail_fast and pending:
+                self.logger.warning(
+                    f"Cancelling {len(pending)} commands after a failure"
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                # Jobs that finished before the cancellation took effect
+                for task in pending:
+                    if not task.cancelled() and task.exception() is None:
+                        results[tasks[task]] = task.result()
+                pending = set()
+
+        return [
+            result
+            if result is not None
+            else CommandResult(argv=job.argv, cancelled=True, error="Cancelled")
+            for job, result in zip(jobs, results)
+        ]
+
+    def run(
+        self,
+        argv: Sequence[str],
+        cwd: Optional[Path] = None,
+        timeout: float = 120,
+        name: str = "",
+        quiet: bool = False,
+        stage: str = "",
+    ) -> CommandResult:
+        """
+        Run one command and wait for it.
+
+        Args:
+            argv: Program and arguments
+            cwd: Working directory
+            timeout: Timeout in seconds
+            name: Label used in log output
+            quiet: Log failures at debug level only (for probes)
+            stage: Stage used for memory accounting
+
+        Returns:
+            CommandResult
+        """
+        job = CommandJob(
+            argv=list(argv),
+            cwd=cwd,
+            timeout=timeout,
+            name=name,
+            quiet=quiet,
+            stage=stage,
+        )
+        loop = self._ensure_loop()
+        result = asyncio.run_coroutine_threadsafe(self.run_async(job), loop).result()
+        record_commands([result])
+        return result
+
+    def run_many(
+        self, jobs: Sequence[CommandJob], fail_fast: bool = True
+    ) -> List[CommandResult]:
+        """
+        Run commands concurrently and wait for all of them.
+
+        Args:
+            jobs: Commands to run
+            fail_fast: Cancel the remaining commands after the first failure
+
+        Returns:
+            Results in the order of jobs
+        """
+        if not jobs:
+            return []
+        loop = self._ensure_loop()
+        results = asyncio.run_coroutine_threadsafe(
+            self.run_many_async(jobs, fail_fast), loop
+        ).result()
+        record_commands(results)
+        return results
+
+
+_default_runner: Optional[CommandRunner] = None
+_default_runner_lock = threading.Lock()
+
+
+def get_command_runner() -> CommandRunner:
+    """
+    Get the process-wide command runner.
+
+    Returns:
+        Shared CommandRunner instance
+    """
+    global _default_runner
+    with _default_runner_lock:
+        if _default_runner is None:
+            _default_runner = CommandRunner()
+        return _default_runner
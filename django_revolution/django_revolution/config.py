@@ -5,7 +5,7 @@ Comprehensive configuration management using Pydantic for validation.
 """
 
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -37,6 +37,13 @@ class ZoneModel(BaseModel):
     cors_enabled: bool = Field(False, description="Enable CORS for this zone")
     middleware: Optional[List[str]] = Field(None, description="Custom middleware")
     path_prefix: Optional[str] = Field(None, description="Path prefix for URLs")
+    shard_by: Optional[str] = Field(
+        None,
+        description=(
+            "Split schema and client generation of the zone by 'app' or 'tag' "
+            "into shards that run in parallel"
+        ),
+    )
 
     @field_validator("apps")
     @classmethod
@@ -52,6 +59,13 @@ class ZoneModel(BaseModel):
             raise ValueError("Zone name cannot be empty")
         return v.strip().lower()
 
+    @field_validator("shard_by")
+    @classmethod
+    def validate_shard_by(cls, v):
+        if v is not None and v not in ("app", "tag"):
+            raise ValueError(f"shard_by must be 'app' or 'tag', got '{v}'")
+        return v
+
     def __post_init_post_parse__(self):
         # Set defaults based on name
         if not self.title:
@@ -118,6 +132,10 @@ class TypeScriptGeneratorSettings(BaseModel):
         None, description="Path to custom templates"
     )
     auto_format: bool = Field(True, description="Automatically format generated files with Prettier")
+    use_node_worker: bool = Field(
+        True,
+        description="Run @hey-api/openapi-ts in persistent Node processes, one per concurrent zone",
+    )
 
     @field_validator("output_directory")
     @classmethod
@@ -150,6 +168,10 @@ class PythonGeneratorSettings(BaseModel):
         None, description="Path to custom templates"
     )
     auto_format: bool = Field(True, description="Automatically format generated files with Black")
+    in_process: bool = Field(
+        True,
+        description="Call the openapi-python-client library instead of its CLI",
+    )
 
     @field_validator("output_directory")
     @classmethod
@@ -171,6 +193,49 @@ class GeneratorsSettings(BaseModel):
     python: PythonGeneratorSettings = Field(default_factory=PythonGeneratorSettings)
 
 
+class ArchiveRetentionSettings(BaseModel):
+    """Archive retention policy; unset rules do not remove anything."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    keep_last: Optional[int] = Field(
+        None, description="Keep the newest N archives of each zone"
+    )
+    keep_daily: Optional[int] = Field(
+        None, description="Keep the newest archive of each of the last N days per zone"
+    )
+    keep_weekly: Optional[int] = Field(
+        None, description="Keep the newest archive of each of the last N weeks per zone"
+    )
+    max_age_days: Optional[int] = Field(
+        None, description="Remove archives older than N days"
+    )
+    max_total_mb: Optional[float] = Field(
+        None, description="Remove the oldest archives while all archives exceed N MB"
+    )
+
+    @field_validator("keep_last", "keep_daily", "keep_weekly", "max_age_days")
+    @classmethod
+    def validate_counts(cls, v):
+        """Validate retention counts."""
+        if v is not None and v < 0:
+            raise ValueError(f"retention counts must not be negative, got {v}")
+        return v
+
+    @field_validator("max_total_mb")
+    @classmethod
+    def validate_max_total_mb(cls, v):
+        """Validate retention size cap."""
+        if v is not None and v <= 0:
+            raise ValueError(f"max_total_mb must be positive, got {v}")
+        return v
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any retention rule is set."""
+        return any(value is not None for value in self.model_dump().values())
+
+
 
 
 
@@ -184,6 +249,69 @@ class GenerationResult(BaseModel):
     output_path: Path = Field(..., description="Output path")
     files_generated: int = Field(0, description="Number of files generated")
     error_message: str = Field("", description="Error message if failed")
+    skipped: bool = Field(
+        False, description="Client kept as is because its schema did not change"
+    )
+
+
+class WorkerStats(BaseModel):
+    """Utilization of a schema worker process."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    worker_id: int = Field(..., description="Worker index within the pool")
+    pid: int = Field(0, description="Worker process id")
+    jobs: int = Field(0, description="Number of zone jobs handled")
+    busy_seconds: float = Field(0.0, description="Time spent generating schemas")
+    lifetime_seconds: float = Field(0.0, description="Time the worker was alive")
+    utilization: float = Field(0.0, description="Busy time / lifetime (0.0-1.0)")
+
+
+class PipelineTaskStats(BaseModel):
+    """Timing of a single pipeline task."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    name: str = Field(..., description="Task name")
+    stage: str = Field("", description="Pipeline stage (schema, typescript, ...)")
+    zone_name: str = Field("", description="Zone the task belongs to")
+    start_seconds: float = Field(0.0, description="Start offset from pipeline start")
+    duration_seconds: float = Field(0.0, description="Task duration in seconds")
+
+
+class StageQueueStats(BaseModel):
+    """Queue metrics of one stage of the job scheduler."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    stage: str = Field(..., description="Stage name (schema, typescript, ...)")
+    limit: int = Field(0, description="Concurrency limit of the stage")
+    jobs: int = Field(0, description="Jobs run")
+    failed: int = Field(0, description="Jobs that raised an exception")
+    max_queued: int = Field(0, description="Largest number of jobs waiting at once")
+    max_running: int = Field(0, description="Largest number of jobs running at once")
+    wait_seconds: float = Field(0.0, description="Total time jobs spent queued")
+    max_wait_seconds: float = Field(0.0, description="Longest time a job spent queued")
+    run_seconds: float = Field(0.0, description="Total time jobs spent running")
+
+
+class StageTiming(BaseModel):
+    """Timing and resource use of one stage of one zone."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    stage: str = Field(..., description="Stage name (urlconf, schema, typescript, ...)")
+    zone_name: str = Field("", description="Zone, empty for stages covering all zones")
+    duration_seconds: float = Field(0.0, description="Wall time")
+    cpu_seconds: float = Field(
+        0.0, description="CPU time of in-process work on the stage's thread"
+    )
+    child_cpu_seconds: float = Field(
+        0.0, description="CPU time of child processes (sampled while they ran)"
+    )
+    peak_rss_bytes: int = Field(0, description="Largest child process tree RSS")
+    commands: int = Field(0, description="External commands run")
+    files: int = Field(0, description="Files produced")
 
 
 class GenerationSummary(BaseModel):
@@ -202,6 +330,45 @@ class GenerationSummary(BaseModel):
     duration_seconds: float = Field(0.0, description="Total duration in seconds")
     typescript_results: Dict[str, GenerationResult] = Field(default_factory=dict)
     python_results: Dict[str, GenerationResult] = Field(default_factory=dict)
+    schema_workers: List[WorkerStats] = Field(
+        default_factory=list, description="Schema worker pool utilization"
+    )
+    schema_cache_hits: List[str] = Field(
+        default_factory=list, description="Zones whose cached schema was reused"
+    )
+    schema_cache_misses: List[str] = Field(
+        default_factory=list, description="Zones whose schema was regenerated"
+    )
+    unchanged_zones: List[str] = Field(
+        default_factory=list,
+        description="Zones whose clients were kept because their schema did not change",
+    )
+    sharded_zones: Dict[str, List[str]] = Field(
+        default_factory=dict,
+        description="Shards the clients of each sharded zone were built from",
+    )
+    shared_models: List[str] = Field(
+        default_factory=list,
+        description="Models emitted once into the common client package",
+    )
+    critical_path: List[PipelineTaskStats] = Field(
+        default_factory=list,
+        description="Chain of pipeline tasks that determined the total duration",
+    )
+    files_written: int = Field(0, description="Output files written because they changed")
+    files_unchanged: int = Field(0, description="Output files left untouched")
+    files_deleted: int = Field(0, description="Stale output files deleted")
+    stage_queues: List[StageQueueStats] = Field(
+        default_factory=list, description="Job scheduler queue metrics per stage"
+    )
+    stage_timings: List[StageTiming] = Field(
+        default_factory=list, description="Per-zone timings of every stage"
+    )
+    cpu_seconds: float = Field(0.0, description="CPU time of the generating process")
+    child_cpu_seconds: float = Field(
+        0.0, description="CPU time of all child processes of the run"
+    )
+    peak_rss_bytes: int = Field(0, description="Peak RSS of the generating process")
 
 
 class DjangoRevolutionSettings(BaseSettings):
@@ -223,12 +390,76 @@ class DjangoRevolutionSettings(BaseSettings):
     version: str = Field("1.0.43", description="Package version for generated clients")
 
     # Multithreading settings
-    max_workers: int = Field(
-        20, description="Maximum number of worker threads for schema generation"
+    max_workers: Union[int, str] = Field(
+        20,
+        description=(
+            "Maximum number of worker threads, or 'auto' to size each stage "
+            "from CPU count and available memory"
+        ),
+    )
+    memory_headroom_mb: int = Field(
+        512, description="Free memory to keep before launching more jobs"
     )
     enable_multithreading: bool = Field(
         True, description="Enable multithreaded schema generation"
     )
+    stage_limits: Dict[str, int] = Field(
+        default_factory=lambda: {"typescript": 4},
+        description="Maximum concurrent jobs per stage within max_workers",
+    )
+
+    # Schema generation settings
+    schema_engine: str = Field(
+        "inprocess",
+        description="Schema generation engine (inprocess, pool, subprocess)",
+    )
+    schema_format: str = Field(
+        "yaml",
+        description="Zone schema file format (yaml, json); JSON is faster to parse downstream",
+    )
+    schema_cache: bool = Field(
+        False, description="Reuse schemas of zones whose inputs did not change"
+    )
+    parsed_schema_cache: bool = Field(
+        True, description="Cache parsed YAML schemas on disk for diffing and sharding"
+    )
+    incremental: bool = Field(
+        False, description="Only regenerate clients of zones whose schema changed"
+    )
+    pipeline_mode: str = Field(
+        "staged",
+        description="Generation flow (staged, streaming per-zone pipeline)",
+    )
+    shared_models: bool = Field(
+        False,
+        description="Emit models shared by several zones once into a common client package",
+    )
+    watch_debounce_ms: int = Field(
+        300, description="Quiet time after a source change before watch mode regenerates"
+    )
+
+    # Archive settings
+    archive_backend: str = Field(
+        "files",
+        description=(
+            "Archive history backend (files: one archive per run, store: "
+            "deduplicated blobs with per-version manifests)"
+        ),
+    )
+    archive_format: str = Field(
+        "zip",
+        description="Client archive format (zip, store, tar.gz, tar.zst); store skips compression",
+    )
+    archive_compression_level: Optional[int] = Field(
+        None, description="Archive compression level (default: format default)"
+    )
+    archive_threads: Optional[int] = Field(
+        None, description="Archive compression threads (default: CPU count)"
+    )
+    archive_retention: ArchiveRetentionSettings = Field(
+        default_factory=ArchiveRetentionSettings,
+        description="Retention policy applied after every archive write",
+    )
 
     # Output configuration
     output: OutputSettings = Field(default_factory=OutputSettings)
@@ -252,6 +483,101 @@ class DjangoRevolutionSettings(BaseSettings):
 
         return cls(**kwargs)
 
+    @field_validator("schema_engine")
+    @classmethod
+    def validate_schema_engine(cls, v):
+        """Validate schema engine name."""
+        allowed = ("inprocess", "pool", "subprocess")
+        if v not in allowed:
+            raise ValueError(f"schema_engine must be one of {allowed}, got '{v}'")
+        return v
+
+    @field_validator("schema_format")
+    @classmethod
+    def validate_schema_format(cls, v):
+        """Validate schema file format."""
+        allowed = ("yaml", "json")
+        if v not in allowed:
+            raise ValueError(f"schema_format must be one of {allowed}, got '{v}'")
+        return v
+
+    @field_validator("watch_debounce_ms")
+    @classmethod
+    def validate_watch_debounce_ms(cls, v):
+        """Validate watch debounce delay."""
+        if v < 0:
+            raise ValueError("watch_debounce_ms must not be negative")
+        return v
+
+    @field_validator("archive_backend")
+    @classmethod
+    def validate_archive_backend(cls, v):
+        """Validate archive backend."""
+        allowed = ("files", "store")
+        if v not in allowed:
+            raise ValueError(f"archive_backend must be one of {allowed}, got '{v}'")
+        return v
+
+    @field_validator("archive_format")
+    @classmethod
+    def validate_archive_format(cls, v):
+        """Validate archive format."""
+        allowed = ("zip", "store", "tar.gz", "tar.zst")
+        if v not in allowed:
+            raise ValueError(f"archive_format must be one of {allowed}, got '{v}'")
+        return v
+
+    @field_validator("archive_compression_level")
+    @classmethod
+    def validate_archive_compression_level(cls, v):
+        """Validate archive compression level."""
+        if v is not None and not 0 <= v <= 22:
+            raise ValueError(f"archive_compression_level must be between 0 and 22, got {v}")
+        return v
+
+    @field_validator("archive_threads")
+    @classmethod
+    def validate_archive_threads(cls, v):
+        """Validate archive thread count."""
+        if v is not None and v < 1:
+            raise ValueError(f"archive_threads must be at least 1, got {v}")
+        return v
+
+    @field_validator("max_workers")
+    @classmethod
+    def validate_max_workers(cls, v):
+        """Validate worker count or 'auto'."""
+        if isinstance(v, str):
+            if v.strip().lower() == "auto":
+                return "auto"
+            try:
+                v = int(v)
+            except ValueError:
+                raise ValueError(f"max_workers must be a number or 'auto', got '{v}'")
+        if v < 1:
+            raise ValueError(f"max_workers must be at least 1, got {v}")
+        return v
+
+    @field_validator("stage_limits")
+    @classmethod
+    def validate_stage_limits(cls, v):
+        """Validate per-stage job limits."""
+        for stage, limit in v.items():
+            if limit < 1:
+                raise ValueError(
+                    f"stage_limits[{stage!r}] must be at least 1, got {limit}"
+                )
+        return v
+
+    @field_validator("pipeline_mode")
+    @classmethod
+    def validate_pipeline_mode(cls, v):
+        """Validate pipeline mode name."""
+        allowed = ("staged", "streaming")
+        if v not in allowed:
+            raise ValueError(f"pipeline_mode must be one of {allowed}, got '{v}'")
+        return v
+
     @field_validator("zones")
     @classmethod
     def validate_zones(cls, v):
@@ -307,7 +633,22 @@ class DjangoRevolutionSettings(BaseSettings):
             "auto_install_deps": self.auto_install_deps,
             "version": self.version,
             "max_workers": self.max_workers,
+            "memory_headroom_mb": self.memory_headroom_mb,
             "enable_multithreading": self.enable_multithreading,
+            "stage_limits": self.stage_limits,
+            "schema_engine": self.schema_engine,
+            "schema_format": self.schema_format,
+            "schema_cache": self.schema_cache,
+            "parsed_schema_cache": self.parsed_schema_cache,
+            "incremental": self.incremental,
+            "pipeline_mode": self.pipeline_mode,
+            "shared_models": self.shared_models,
+            "watch_debounce_ms": self.watch_debounce_ms,
+            "archive_backend": self.archive_backend,
+            "archive_format": self.archive_format,
+            "archive_compression_level": self.archive_compression_level,
+            "archive_threads": self.archive_threads,
+            "archive_retention": self.archive_retention.model_dump(),
             "output": self.output.model_dump(),
             "generators": self.generators.model_dump(),
             "zones": self.zones,
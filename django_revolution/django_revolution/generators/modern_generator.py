@@ -5,14 +5,25 @@ Clean, simple, and powerful generator with excellent enum support.
 """
 
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import traceback
 import datetime
 import sys
-import subprocess
+import threading
 
 from ..config import GenerationResult
-from ..utils import Logger, run_command, ensure_directories
+from ..command_runner import get_command_runner
+from ..metrics import get_stage_recorder
+from ..utils import Logger, ensure_directories
+from ..openapi.output_writer import OutputWriter
+from .code_fixer import CodeFixReport, fix_generated_code
+from ..openapi.schema_io import load_schema
+from ..openapi.sharding import build_sharded_client
+from ..openapi.shared_models import COMMON_PACKAGE, dedupe_python_client
+
+# openapi-python-client is not documented as thread-safe; in-process
+# generations run one at a time (they are CPU bound anyway).
+_in_process_lock = threading.Lock()
 
 
 class ModernPythonGenerator:
@@ -28,61 +39,80 @@ class ModernPythonGenerator:
     - Clean, idiomatic code
     """
     
-    def __init__(self, config=None, logger: Optional[Logger] = None):
+    def __init__(
+        self,
+        config=None,
+        logger: Optional[Logger] = None,
+        writer: Optional[OutputWriter] = None,
+        scheduler=None,
+    ):
         """Initialize the generator."""
         self.config = config
         self.logger = logger or Logger("modern_python_generator")
+        self.writer = writer or OutputWriter(self.logger)
+        self.scheduler = scheduler
+
+        # Client of the shared models package for the current run
+        self.common_dir: Optional[Path] = None
         
         if config:
             self.output_dir = Path(config.generators.python.output_directory)
         else:
             self.output_dir = Path.cwd() / "openapi" / "clients" / "python"
-    
+
+        self._command: Optional[List[str]] = None
+        self._command_probed = False
+        self._in_process_available: Optional[bool] = None
+
+    def _use_in_process(self) -> bool:
+        """Check if the openapi-python-client library can be called directly."""
+        if self.config and not self.config.generators.python.in_process:
+            return False
+
+        if self._in_process_available is None:
+            try:
+                from openapi_python_client import Project  # noqa: F401
+                from openapi_python_client.config import Config, ConfigFile  # noqa: F401
+                from openapi_python_client.parser import GeneratorData  # noqa: F401
+
+                self._in_process_available = True
+            except ImportError as e:
+                self.logger.debug(f"openapi-python-client not importable: {e}")
+                self._in_process_available = False
+
+        return self._in_process_available
+
     def is_available(self) -> bool:
         """Check if openapi-python-client is available."""
-        try:
-            # Try direct command
-            result = subprocess.run(
-                ["openapi-python-client", "--version"], 
-                capture_output=True, 
-                text=True, 
-                timeout=10
-            )
-            if result.returncode == 0:
-                self.logger.info("openapi-python-client available via direct command")
-                return True
-            
-            # Try with pipx
-            result = subprocess.run(
-                ["pipx", "run", "openapi-python-client", "--version"], 
-                capture_output=True, 
-                text=True, 
-                timeout=15
-            )
-            if result.returncode == 0:
-                self.logger.info("openapi-python-client available via pipx")
-                return True
-            
-            # Try as Python module
-            result = subprocess.run(
-                ["python", "-m", "openapi_python_client", "--version"], 
-                capture_output=True, 
-                text=True, 
-                timeout=10
-            )
-            if result.returncode == 0:
-                self.logger.info("openapi-python-client available as Python module")
-                return True
-            
+        if self._use_in_process():
+            return True
+
+        cmd = self._find_command()
+        if cmd is None:
             self.logger.warning("openapi-python-client not found")
             return False
-            
-        except Exception as e:
-            self.logger.error(f"Error checking openapi-python-client availability: {e}")
-            return False
+
+        self.logger.info(f"openapi-python-client available via {' '.join(cmd)}")
+        return True
     
-    def generate_client(self, zone_name: str, schema_path: Path) -> GenerationResult:
-        """Generate Python client using openapi-python-client."""
+    def generate_client(
+        self,
+        zone_name: str,
+        schema_path: Path,
+        schema: Optional[Dict[str, Any]] = None,
+        shards: Optional[Dict[str, Path]] = None,
+    ) -> GenerationResult:
+        """
+        Generate Python client using openapi-python-client.
+
+        Args:
+            zone_name: Name of the zone
+            schema_path: Path to OpenAPI schema file
+            schema: Already parsed schema (in-process mode only); loaded
+                from schema_path if omitted
+            shards: Optional sub-schemas of the zone; each one is generated
+                separately and the results are merged into one package
+        """
         self.logger.info(f"🚀 Generating modern Python client for zone: {zone_name}")
         
         # Validate schema file
@@ -97,53 +127,58 @@ class ModernPythonGenerator:
                 error_message=error_msg,
             )
         
-        # Setup output directory
+        # Generate and post-process in a staging directory; only changed
+        # files are synced into the output directory
         zone_output_dir = self.output_dir / zone_name
-        ensure_directories(zone_output_dir)
+        staging_dir = self.writer.prepare_staging(zone_output_dir)
         
+        recorder = get_stage_recorder()
         try:
-            # Get the appropriate command
-            cmd = self._get_command()
-            
-            # Build command for openapi-python-client with optimal settings
-            full_cmd = cmd + [
-                "generate",
-                "--path", str(schema_path),
-                "--output-path", str(zone_output_dir),
-                "--overwrite",  # Always overwrite for clean generation
-            ]
-            
-            # Create config file for better enum generation
-            config_file = self._create_config_file(zone_name, zone_output_dir)
-            if config_file:
-                full_cmd.extend(["--config", str(config_file)])
-            
-            self.logger.info(f"Running: {' '.join(full_cmd)}")
-            
-            # Execute the command
-            result = subprocess.run(
-                full_cmd,
-                capture_output=True,
-                text=True,
-                timeout=120,
-                cwd=Path.cwd()
-            )
-            
-            if result.returncode == 0:
+            with recorder.stage("python", zone_name) as timing:
+                if shards:
+                    full_cmd = [f"openapi-python-client ({len(shards)} shards)"]
+                    success, output = build_sharded_client(
+                        zone_name,
+                        shards,
+                        lambda shard, path, output_dir: self._generate_raw(
+                            zone_name, path, output_dir
+                        )[1:],
+                        staging_dir,
+                        self.scheduler,
+                        "python",
+                        self.logger,
+                    )
+                else:
+                    full_cmd, success, output = self._generate_raw(
+                        zone_name, schema_path, staging_dir, schema
+                    )
+
+            if success:
                 # Check if files were generated
-                generated_files = list(zone_output_dir.rglob("*.py"))
+                generated_files = list(staging_dir.rglob("*.py"))
                 
                 if generated_files:
                     files_count = len(generated_files)
+                    timing.files = files_count
                     
-                    # Fix known bugs in generated code
-                    self._fix_generated_code_bugs(zone_output_dir)
-                    
-                    # Enhance the generated client
-                    self._enhance_client(zone_name, zone_output_dir)
+                    with recorder.stage("python_fixup", zone_name) as fixup:
+                        # Fix known bugs in generated code
+                        report = self._fix_generated_code_bugs(staging_dir)
+                        
+                        # Enhance the generated client
+                        self._enhance_client(zone_name, staging_dir)
+                    if report:
+                        fixup.files = report.files_fixed
                     
                     # Format generated Python files
-                    self._format_python_files(zone_output_dir)
+                    with recorder.stage("python_format", zone_name) as formatting:
+                        formatting.files = files_count
+                        self._format_python_files(staging_dir)
+
+                    if self.common_dir and zone_name != COMMON_PACKAGE:
+                        self._import_shared_models(zone_name, staging_dir)
+                    
+                    self.writer.sync_tree(staging_dir, zone_output_dir)
                     
                     self.logger.success(
                         f"✅ Modern Python client generated for {zone_name}: {files_count} files"
@@ -157,6 +192,7 @@ class ModernPythonGenerator:
                         error_message="",
                     )
                 else:
+                    self.writer.discard_staging(zone_output_dir)
                     error_msg = f"No Python files generated in: {zone_output_dir}"
                     self.logger.error(error_msg)
                     return GenerationResult(
@@ -167,9 +203,11 @@ class ModernPythonGenerator:
                         error_message=error_msg,
                     )
             else:
-                error_msg = f"openapi-python-client failed: {result.stderr}"
+                self.writer.discard_staging(zone_output_dir)
+                ensure_directories(zone_output_dir)
+                error_msg = f"openapi-python-client failed: {output}"
                 self.logger.error(error_msg)
-                self._save_error_log(zone_name, zone_output_dir, full_cmd, error_msg, result.stderr)
+                self._save_error_log(zone_name, zone_output_dir, full_cmd, error_msg, output)
                 
                 return GenerationResult(
                     success=False,
@@ -180,6 +218,8 @@ class ModernPythonGenerator:
                 )
         
         except Exception as e:
+            self.writer.discard_staging(zone_output_dir)
+            ensure_directories(zone_output_dir)
             error_msg = f"Exception during generation: {str(e)}"
             self.logger.error(error_msg)
             
@@ -197,7 +237,109 @@ class ModernPythonGenerator:
                 error_message=error_msg,
             )
     
-    def generate_all(self, schemas: Dict[str, Path]) -> Dict[str, GenerationResult]:
+    def _generate_raw(
+        self,
+        zone_name: str,
+        schema_path: Path,
+        output_dir: Path,
+        schema: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[list, bool, str]:
+        """Run openapi-python-client in-process or as CLI, without post-processing."""
+        if self._use_in_process():
+            full_cmd = ["openapi_python_client (in-process)", str(schema_path)]
+            success, output = self._generate_in_process(
+                zone_name, schema_path, output_dir, schema
+            )
+            return full_cmd, success, output
+
+        return self._generate_with_cli(zone_name, schema_path, output_dir)
+
+    def _generate_with_cli(
+        self, zone_name: str, schema_path: Path, zone_output_dir: Path
+    ) -> Tuple[list, bool, str]:
+        """Run the openapi-python-client CLI for one zone."""
+        # Get the appropriate command
+        cmd = self._get_command()
+
+        # Build command for openapi-python-client with optimal settings
+        full_cmd = cmd + [
+            "generate",
+            "--path", str(schema_path),
+            "--output-path", str(zone_output_dir),
+            "--overwrite",  # Always overwrite for clean generation
+        ]
+
+        # Create config file for better enum generation
+        config_file = self._create_config_file(zone_name, zone_output_dir)
+        if config_file:
+            full_cmd.extend(["--config", str(config_file)])
+
+        self.logger.info(f"Running: {' '.join(full_cmd)}")
+
+        # Execute the command; its output is streamed to the debug log
+        result = get_command_runner().run(
+            full_cmd,
+            cwd=Path.cwd(),
+            timeout=120,
+            name=f"openapi-python-client:{zone_name}",
+            stage="python",
+        )
+
+        return full_cmd, result.success, result.stderr or result.error
+
+    def _generate_in_process(
+        self,
+        zone_name: str,
+        schema_path: Path,
+        zone_output_dir: Path,
+        schema: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[bool, str]:
+        """
+        Generate a client by calling openapi-python-client directly.
+
+        Mirrors `openapi-python-client generate --overwrite`, but takes the
+        parsed schema and skips the interpreter start.
+
+        Returns:
+            Tuple of (success, error output)
+        """
+        from openapi_python_client import Project
+        from openapi_python_client.config import Config, ConfigFile, MetaType
+        from openapi_python_client.parser import GeneratorData
+        from openapi_python_client.parser.errors import ErrorLevel, GeneratorError
+
+        if schema is None:
+            schema = load_schema(schema_path)
+
+        config_file = ConfigFile.model_validate(self._client_config(zone_name))
+        config = Config.from_sources(
+            config_file=config_file,
+            meta_type=MetaType.POETRY,
+            document_source=schema_path,
+            file_encoding="utf-8",
+            overwrite=True,
+            output_path=zone_output_dir,
+        )
+
+        with _in_process_lock:
+            openapi = GeneratorData.from_dict(schema, config=config)
+            if isinstance(openapi, GeneratorError):
+                return False, f"{openapi.header}: {openapi.detail or ''}"
+
+            errors = Project(openapi=openapi, config=config).build()
+
+        messages = [f"{error.header}: {error.detail or ''}" for error in errors]
+        for message in messages:
+            self.logger.debug(f"openapi-python-client ({zone_name}): {message}")
+
+        failed = any(error.level == ErrorLevel.ERROR for error in errors)
+        return not failed, "\n".join(messages)
+    
+    def generate_all(
+        self,
+        schemas: Dict[str, Path],
+        shards: Optional[Dict[str, Dict[str, Path]]] = None,
+    ) -> Dict[str, GenerationResult]:
         """Generate Python clients for all provided schemas."""
         if not schemas:
             self.logger.warning("No schemas provided for Python generation")
@@ -207,7 +349,9 @@ class ModernPythonGenerator:
         
         results = {}
         for zone_name, schema_path in schemas.items():
-            result = self.generate_client(zone_name, schema_path)
+            result = self.generate_client(
+                zone_name, schema_path, shards=(shards or {}).get(zone_name)
+            )
             results[zone_name] = result
         
         successful = sum(1 for r in results.values() if r.success)
@@ -219,28 +363,49 @@ class ModernPythonGenerator:
     
     def _get_command(self) -> list:
         """Get the appropriate command to run openapi-python-client."""
+        # Fallback to direct command
+        return self._find_command() or ["openapi-python-client"]
+
+    def _find_command(self) -> Optional[List[str]]:
+        """Probe the ways to run the openapi-python-client CLI (once)."""
+        if self._command_probed:
+            return self._command
+
         # Try different ways to run the command
         commands_to_try = [
             ["openapi-python-client"],
             ["pipx", "run", "openapi-python-client"],
-            ["python", "-m", "openapi_python_client"],
+            [sys.executable, "-m", "openapi_python_client"],
         ]
         
+        runner = get_command_runner()
         for cmd in commands_to_try:
-            try:
-                result = subprocess.run(
-                    cmd + ["--version"], 
-                    capture_output=True, 
-                    timeout=10
-                )
-                if result.returncode == 0:
-                    return cmd
-            except Exception:
-                continue
-        
-        # Fallback to direct command
-        return ["openapi-python-client"]
+            if runner.run(cmd + ["--version"], timeout=15, quiet=True).success:
+                self._command = cmd
+                break
+
+        self._command_probed = True
+        return self._command
     
+    def _import_shared_models(self, zone_name: str, output_dir: Path):
+        """Replace model modules the common package defines by imports from it."""
+        try:
+            shared = dedupe_python_client(
+                output_dir,
+                self.package_name(zone_name),
+                self.common_dir,
+                self.package_name(COMMON_PACKAGE),
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not import shared models for {zone_name}: {e}")
+            return
+
+        if shared:
+            self.logger.info(
+                f"{zone_name}: {len(shared)} models imported from "
+                f"{self.package_name(COMMON_PACKAGE)}"
+            )
+
     def _enhance_client(self, zone_name: str, output_dir: Path):
         """Enhance the generated client with additional features."""
         try:
@@ -278,42 +443,51 @@ __generator__ = "openapi-python-client"
     
     def _format_python_files(self, directory: Path) -> bool:
         """Format Python files using ruff (included with openapi-python-client)."""
-        try:
-            # Try to format with ruff (comes with openapi-python-client)
-            result = subprocess.run(
-                ["ruff", "format", str(directory)],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            
-            if result.returncode == 0:
-                self.logger.info("🎨 Python files formatted with ruff")
-                return True
-            else:
-                # Try with black as fallback
-                result = subprocess.run(
-                    ["black", "--line-length", "88", str(directory)],
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-                
-                if result.returncode == 0:
-                    self.logger.info("🎨 Python files formatted with black")
-                    return True
-                else:
-                    self.logger.debug("No formatter available, skipping formatting")
-                    return True
-                
-        except Exception as e:
-            self.logger.debug(f"Could not format Python files: {e}")
-            return True  # Don't fail generation due to formatting issues
+        runner = get_command_runner()
+
+        # Try to format with ruff (comes with openapi-python-client)
+        result = runner.run(["ruff", "format", str(directory)], timeout=60, quiet=True)
+        if result.success:
+            self.logger.info("🎨 Python files formatted with ruff")
+            return True
+
+        # Try with black as fallback
+        result = runner.run(
+            ["black", "--line-length", "88", str(directory)], timeout=60, quiet=True
+        )
+        if result.success:
+            self.logger.info("🎨 Python files formatted with black")
+            return True
+
+        self.logger.debug("No formatter available, skipping formatting")
+        return True  # Don't fail generation due to formatting issues
     
     def _create_config_file(self, zone_name: str, output_dir: Path) -> Optional[Path]:
         """Create configuration file for openapi-python-client."""
         try:
-            config_content = {
+            config_content = self._client_config(zone_name)
+            
+            config_file = output_dir / "openapi_config.yaml"
+            
+            import yaml
+            with open(config_file, "w", encoding="utf-8") as f:
+                yaml.dump(config_content, f, default_flow_style=False)
+            
+            self.logger.debug(f"Created config file: {config_file}")
+            return config_file
+            
+        except Exception as e:
+            self.logger.warning(f"Could not create config file: {e}")
+            return None
+
+    @staticmethod
+    def package_name(zone_name: str) -> str:
+        """Python package name of a zone client."""
+        return f"django_revolution_{zone_name}"
+
+    def _client_config(self, zone_name: str) -> Dict[str, Any]:
+        """Settings passed to openapi-python-client for a zone."""
+        return {
                 # Critical settings for proper enum generation
                 "use_string_enums": False,  # Generate proper Enum classes, not strings
                 "literal_enums": True,      # Use literal values for enum keys (fixes duplicate key issues)
@@ -321,8 +495,8 @@ __generator__ = "openapi-python-client"
                 "use_pydantic_v2": True,    # Modern Pydantic
                 
                 # Additional settings for stability
-                "project_name_override": f"django_revolution_{zone_name}",
-                "package_name_override": f"django_revolution_{zone_name}",
+                "project_name_override": self.package_name(zone_name),
+                "package_name_override": self.package_name(zone_name),
                 "client_class_name": f"{zone_name.title()}Client",
                 
                 # DISABLE post_hooks to prevent ruff from failing generation
@@ -333,19 +507,6 @@ __generator__ = "openapi-python-client"
                 "http_timeout": 30,
                 "follow_redirects": True,
             }
-            
-            config_file = output_dir / "openapi_config.yaml"
-            
-            import yaml
-            with open(config_file, "w", encoding="utf-8") as f:
-                yaml.dump(config_content, f, default_flow_style=False)
-            
-            self.logger.debug(f"Created config file: {config_file}")
-            return config_file
-            
-        except Exception as e:
-            self.logger.warning(f"Could not create config file: {e}")
-            return None
 
     def _save_error_log(self, zone_name: str, output_dir: Path, cmd: list, error_msg: str, output: str):
         """Save detailed error log to file."""
@@ -367,152 +528,54 @@ __generator__ = "openapi-python-client"
         except Exception as log_exc:
             self.logger.error(f"Failed to write detailed error log: {log_exc}")
     
-    def _fix_generated_code_bugs(self, output_dir: Path):
+    def _fix_workers(self) -> Optional[int]:
+        """
+        Processes the code fixer may use for one zone.
+
+        Concurrent Python jobs split the scheduler's global budget, so all
+        fixer pools together stay within it.
+        """
+        if self.scheduler is None:
+            return None
+        return max(
+            1, self.scheduler.max_workers // self.scheduler.stage_limit("python")
+        )
+
+    def _fix_generated_code_bugs(self, output_dir: Path) -> Optional[CodeFixReport]:
         """
         Fix known bugs in openapi-python-client generated code.
         
-        Common issues:
-        1. Missing closing parentheses in files.append() calls
-        2. Malformed if/else blocks
-        3. Syntax errors in multipart form handling
-        4. Incomplete method definitions
+        Multipart form handling sometimes leaves `files.append(...)` calls
+        without their closing parentheses. Only files containing multipart
+        code are tokenized; see code_fixer.
         """
         try:
-            python_files = list(output_dir.rglob("*.py"))
-            fixed_files = 0
-            
-            for py_file in python_files:
-                try:
-                    with open(py_file, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    
-                    original_content = content
-                    
-                    # Import regex once
-                    import re
-                    
-                    # Fix 1: Missing closing parentheses in files.append() calls
-                    # More aggressive pattern matching for various cases
-                    
-                    # Pattern 1: Fix missing closing parentheses in files.append() calls
-                    # files.append(("field", (None, value, "text/plain"))  -> files.append(("field", (None, value, "text/plain")))
-                    content = re.sub(
-                        r'files\.append\(\(([^)]+), \(None, ([^)]+), "text/plain"\)\)(?!\))',
-                        r'files.append((\1, (None, \2, "text/plain")))',
-                        content
-                    )
-                    
-                    # Pattern 2: Fix lines ending with "text/plain") instead of "text/plain"))
-                    content = re.sub(
-                        r'files\.append\(\(([^)]+), \(None, ([^)]+), "text/plain"\)$',
-                        r'files.append((\1, (None, \2, "text/plain")))',
-                        content,
-                        flags=re.MULTILINE
-                    )
-                    
-                    # Pattern 2: More complex multiline cases
-                    # Fix lines that end with "text/plain") but should end with "text/plain"))
-                    lines = content.split('\n')
-                    fixed_lines = []
-                    
-                    for i, line in enumerate(lines):
-                        original_line = line
-                        
-                        # Case 1: files.append line missing closing parenthesis before else/if/for
-                        if ('files.append((' in line and 
-                            '"text/plain")' in line and 
-                            not line.strip().endswith('))')):
-                            
-                            # Check if next line is a control structure
-                            if (i + 1 < len(lines) and 
-                                lines[i + 1].strip().startswith(('else:', 'if ', 'for ', 'while ', 'return ', 'def '))):
-                                line = line.rstrip() + ')'
-                        
-                        # Case 2: Handle specific broken patterns
-                        # Fix: files.append(("field", (None, str(value).encode(), "text/plain"))
-                        if ('files.append((' in line and 
-                            '.encode(), "text/plain")' in line and 
-                            not line.strip().endswith('))')):
-                            line = line.rstrip() + ')'
-                        
-                        # Case 3: Fix incomplete if statements that break syntax
-                        if line.strip().endswith(':') and 'if not isinstance(' in line:
-                            # Look ahead to see if next line has files.append without proper closing
-                            if (i + 1 < len(lines) and 
-                                'files.append(' in lines[i + 1] and 
-                                '"text/plain")' in lines[i + 1] and
-                                not lines[i + 1].strip().endswith('))')):
-                                # This will be fixed by the files.append fix above
-                                pass
-                        
-                        fixed_lines.append(line)
-                    
-                    content = '\n'.join(fixed_lines)
-                    
-                    # Fix 2: Repair broken method structures
-                    # Fix incomplete __contains__ methods
-                    content = re.sub(
-                        r'(\s+def __contains__\(self, key: str\) -> bool:\s+return key in self\.additional_properties)\s*$',
-                        r'\1\n',
-                        content,
-                        flags=re.MULTILINE
-                    )
-                    
-                    # Fix 3: Handle malformed class endings
-                    # Ensure classes end properly
-                    content = re.sub(
-                        r'(\s+return key in self\.additional_properties)\s*$',
-                        r'\1\n',
-                        content,
-                        flags=re.MULTILINE
-                    )
-                    
-                    # Fix 4: Handle broken multipart form generation
-                    # Fix cases where the multipart method is incomplete
-                    content = re.sub(
-                        r'(def to_multipart\(self\) -> types\.RequestFiles:\s+files: types\.RequestFiles = \[\]\s*\n\s*)(.*?)(\s+return files)',
-                        lambda m: m.group(1) + self._fix_multipart_body(m.group(2)) + m.group(3),
-                        content,
-                        flags=re.DOTALL
-                    )
-                    
-                    # Only write if content changed
-                    if content != original_content:
-                        with open(py_file, "w", encoding="utf-8") as f:
-                            f.write(content)
-                        fixed_files += 1
-                        self.logger.debug(f"Fixed syntax bugs in: {py_file.name}")
-                
-                except Exception as e:
-                    self.logger.debug(f"Could not fix bugs in {py_file}: {e}")
-                    continue
-            
-            if fixed_files > 0:
-                self.logger.info(f"🔧 Fixed syntax bugs in {fixed_files} generated files")
-            else:
-                self.logger.debug("No syntax bugs found to fix")
-                
+            report = fix_generated_code(output_dir, self._fix_workers())
         except Exception as e:
             self.logger.warning(f"Could not fix generated code bugs: {e}")
-    
-    def _fix_multipart_body(self, body_content: str) -> str:
-        """Fix broken multipart method bodies."""
-        try:
-            lines = body_content.split('\n')
-            fixed_lines = []
-            
-            for line in lines:
-                # Ensure all files.append lines end with proper closing
-                if ('files.append((' in line and 
-                    '"text/plain")' in line and 
-                    not line.strip().endswith('))')):
-                    line = line.rstrip() + ')'
-                
-                fixed_lines.append(line)
-            
-            return '\n'.join(fixed_lines)
-        except Exception:
-            return body_content
+            return None
+
+        for error in report.errors:
+            self.logger.debug(f"Could not fix bugs in {error}")
+
+        for path in report.fixed_paths:
+            self.logger.debug(f"Fixed syntax bugs in: {Path(path).name}")
+
+        timing = (
+            f"{report.files_candidate}/{report.files_scanned} files with multipart "
+            f"code, {report.duration_seconds:.2f}s"
+        )
+        if report.workers:
+            timing += f", {report.workers} processes"
+
+        if report.files_fixed > 0:
+            self.logger.info(
+                f"🔧 Fixed syntax bugs in {report.files_fixed} generated files ({timing})"
+            )
+        else:
+            self.logger.debug(f"No syntax bugs found to fix ({timing})")
+
+        return report
 
     def get_status(self) -> Dict[str, Any]:
         """Get generator status."""
@@ -55,6 +55,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Clean output directories before generation",
         )
+        parser.add_argument(
+            "--watch",
+            "-w",
+            action="store_true",
+            help="Keep running and regenerate zones whose app sources change",
+        )
         parser.add_argument(
             "--no-multithreading",
             action="store_true",
@@ -62,9 +68,57 @@ class Command(BaseCommand):
         )
         parser.add_argument(
             "--max-workers",
-            type=int,
-            default=20,
-            help="Maximum number of worker threads (default: 20)",
+            help=(
+                "Maximum number of worker threads, or 'auto' to size them from "
+                "CPU count and available memory (default: from settings)"
+            ),
+        )
+        parser.add_argument(
+            "--schema-engine",
+            choices=["inprocess", "pool", "subprocess"],
+            help="Schema generation engine (default: inprocess)",
+        )
+        parser.add_argument(
+            "--schema-format",
+            choices=["yaml", "json"],
+            help="Zone schema file format (default: yaml)",
+        )
+        parser.add_argument(
+            "--archive-backend",
+            choices=["files", "store"],
+            help="Archive history backend; store deduplicates files across runs (default: files)",
+        )
+        parser.add_argument(
+            "--archive-format",
+            choices=["zip", "store", "tar.gz", "tar.zst"],
+            help="Client archive format; store skips compression (default: zip)",
+        )
+        parser.add_argument(
+            "--schema-cache",
+            action="store_true",
+            help="Reuse schemas of zones whose inputs did not change",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only regenerate clients of zones whose schema changed",
+        )
+        parser.add_argument(
+            "--pipeline-mode",
+            choices=["staged", "streaming"],
+            help="Run stages for all zones at once or stream each zone (default: staged)",
+        )
+        parser.add_argument(
+            "--metrics-json",
+            metavar="PATH",
+            help="Write the generation summary with stage timings to a JSON file "
+            "(numbered per run with --watch)",
+        )
+        parser.add_argument(
+            "--trace",
+            metavar="PATH",
+            help="Record the run as a Chrome trace (open in Perfetto or chrome://tracing; "
+            "numbered per run with --watch)",
         )
 
         # Information options
@@ -131,10 +185,30 @@ class Command(BaseCommand):
                 cli_args.append("--no-monorepo")
             if options.get("clean"):
                 cli_args.append("--clean")
+            if options.get("watch"):
+                cli_args.append("--watch")
             if options.get("no_multithreading"):
                 cli_args.append("--no-multithreading")
             if options.get("max_workers"):
                 cli_args.extend(["--max-workers", str(options["max_workers"])])
+            if options.get("schema_engine"):
+                cli_args.extend(["--schema-engine", options["schema_engine"]])
+            if options.get("schema_format"):
+                cli_args.extend(["--schema-format", options["schema_format"]])
+            if options.get("archive_backend"):
+                cli_args.extend(["--archive-backend", options["archive_backend"]])
+            if options.get("archive_format"):
+                cli_args.extend(["--archive-format", options["archive_format"]])
+            if options.get("schema_cache"):
+                cli_args.append("--schema-cache")
+            if options.get("incremental"):
+                cli_args.append("--incremental")
+            if options.get("pipeline_mode"):
+                cli_args.extend(["--pipeline-mode", options["pipeline_mode"]])
+            if options.get("metrics_json"):
+                cli_args.extend(["--metrics-json", options["metrics_json"]])
+            if options.get("trace"):
+                cli_args.extend(["--trace", options["trace"]])
             if options.get("status"):
                 cli_args.append("--status")
             if options.get("list_zones"):
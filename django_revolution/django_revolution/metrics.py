@@ -0,0 +1,238 @@
+"""
+Stage Metrics for Django Revolution
+
+Records wall time, CPU time, child-process usage and file counts of each
+generation stage per zone, and exports run summaries as JSON.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from .config import GenerationSummary, StageTiming
+from .tracing import get_tracer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Stages in pipeline order, used to sort reports
+STAGE_ORDER = (
+    "urlconf",
+    "schema",
+    "typescript",
+    "typescript_format",
+    "python",
+    "python_fixup",
+    "python_format",
+    "archive",
+)
+
+# Stage measured by the current thread (or task), if any
+_current_stage: ContextVar[Optional[StageTiming]] = ContextVar(
+    "revolution_stage", default=None
+)
+
+
+def record_commands(results: Sequence) -> None:
+    """
+    Add finished commands to the stage the calling thread is measuring.
+
+    Args:
+        results: CommandResult objects
+    """
+    timing = _current_stage.get()
+    if timing is None:
+        return
+    for result in results:
+        timing.commands += 1
+        timing.child_cpu_seconds += result.cpu_seconds
+        timing.peak_rss_bytes = max(timing.peak_rss_bytes, result.peak_rss_bytes)
+
+
+class StageRecorder:
+    """Collects stage timings from all threads of a generation run."""
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self._timings: List[StageTiming] = []
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Forget the timings of the previous run."""
+        with self._lock:
+            self._timings = []
+
+    @contextmanager
+    def stage(self, stage: str, zone_name: str = "") -> Iterator[StageTiming]:
+        """
+        Measure a stage.
+
+        Commands run through the command runner on this thread while the
+        stage is open are added to it. Callers may set ``files`` on the
+        yielded timing, also after the block.
+
+        Args:
+            stage: Stage name (see STAGE_ORDER)
+            zone_name: Zone the work belongs to, empty for all zones
+
+        Yields:
+            StageTiming that is filled in when the block exits
+        """
+        timing = StageTiming(stage=stage, zone_name=zone_name)
+        token = _current_stage.set(timing)
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            yield timing
+        finally:
+            _current_stage.reset(token)
+            finished = time.perf_counter()
+            timing.duration_seconds = finished - started
+            timing.cpu_seconds = time.thread_time() - cpu_started
+            with self._lock:
+                self._timings.append(timing)
+            tracer = get_tracer()
+            if tracer.enabled:
+                tracer.add_span(
+                    f"{stage} {zone_name}".strip(),
+                    "stage",
+                    started,
+                    finished,
+                    timing.model_dump(exclude={"duration_seconds"}),
+                )
+
+    def record(self, timing: StageTiming):
+        """
+        Add a timing measured elsewhere, e.g. in a worker process.
+
+        Args:
+            timing: Completed StageTiming
+        """
+        with self._lock:
+            self._timings.append(timing)
+
+    def get_timings(self) -> List[StageTiming]:
+        """
+        Get all timings of the run.
+
+        Returns:
+            StageTiming copies ordered by stage, then zone
+        """
+        with self._lock:
+            timings = [timing.model_copy() for timing in self._timings]
+        return sorted(timings, key=lambda t: (_stage_rank(t.stage), t.zone_name))
+
+
+def _stage_rank(stage: str) -> int:
+    try:
+        return STAGE_ORDER.index(stage)
+    except ValueError:
+        return len(STAGE_ORDER)
+
+
+def stage_totals(timings: Sequence[StageTiming]) -> List[StageTiming]:
+    """
+    Add up the per-zone timings of each stage.
+
+    Args:
+        timings: Per-zone stage timings
+
+    Returns:
+        One StageTiming per stage with an empty zone name; peak RSS is the
+        largest of the zones
+    """
+    totals: Dict[str, StageTiming] = {}
+    for timing in timings:
+        total = totals.setdefault(timing.stage, StageTiming(stage=timing.stage))
+        total.duration_seconds += timing.duration_seconds
+        total.cpu_seconds += timing.cpu_seconds
+        total.child_cpu_seconds += timing.child_cpu_seconds
+        total.peak_rss_bytes = max(total.peak_rss_bytes, timing.peak_rss_bytes)
+        total.commands += timing.commands
+        total.files += timing.files
+    return sorted(totals.values(), key=lambda t: _stage_rank(t.stage))
+
+
+class ProcessUsage:
+    """CPU time of this process and its children between two points."""
+
+    def __init__(self):
+        """Take the starting sample."""
+        self._cpu = time.process_time()
+        self._child_cpu = self._children_cpu()
+
+    @staticmethod
+    def _children_cpu() -> float:
+        if resource is None:
+            return 0.0
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime
+
+    @property
+    def cpu_seconds(self) -> float:
+        """CPU time of this process since the start."""
+        return time.process_time() - self._cpu
+
+    @property
+    def child_cpu_seconds(self) -> float:
+        """CPU time of child processes that finished since the start."""
+        return self._children_cpu() - self._child_cpu
+
+    @staticmethod
+    def peak_rss_bytes() -> int:
+        """Peak RSS of this process over its lifetime."""
+        if resource is None:
+            return 0
+        # ru_maxrss is in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def write_summary_json(summary: GenerationSummary, path: Path) -> Path:
+    """
+    Export a generation summary as JSON for tracking runs over time.
+
+    Args:
+        summary: Summary returned by OpenAPIGenerator.generate_all()
+        path: Output file
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    document = {
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "stage_totals": [
+            total.model_dump(mode="json")
+            for total in stage_totals(summary.stage_timings)
+        ],
+        "summary": summary.model_dump(mode="json"),
+    }
+    path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+    return path
+
+
+_default_recorder: Optional[StageRecorder] = None
+_default_recorder_lock = threading.Lock()
+
+
+def get_stage_recorder() -> StageRecorder:
+    """
+    Get the process-wide stage recorder.
+
+    Returns:
+        Shared StageRecorder instance
+    """
+    global _default_recorder
+    with _default_recorder_lock:
+        if _default_recorder is None:
+            _default_recorder = StageRecorder()
+        return _default_recorder
@@ -0,0 +1,259 @@
+"""
+Archive Catalog for Django Revolution
+
+SQLite index of the archives in the archive directory, updated on every
+archive write, so listing, filtering and retention do not walk the tree.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+CATALOG_FILENAME = "catalog.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS archives (
+    zone_name TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    format TEXT NOT NULL,
+    path TEXT NOT NULL,
+    metadata_path TEXT,
+    size_bytes INTEGER NOT NULL DEFAULT 0,
+    input_bytes INTEGER NOT NULL DEFAULT 0,
+    created TEXT,
+    typescript_available INTEGER NOT NULL DEFAULT 0,
+    python_available INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (zone_name, timestamp)
+);
+CREATE INDEX IF NOT EXISTS archives_timestamp ON archives (timestamp);
+"""
+
+COLUMNS = (
+    "zone_name",
+    "timestamp",
+    "backend",
+    "format",
+    "path",
+    "metadata_path",
+    "size_bytes",
+    "input_bytes",
+    "created",
+    "typescript_available",
+    "python_available",
+)
+
+
+class ArchiveCatalog:
+    """
+    Archives by zone and timestamp.
+
+    Timestamps use the archive format "%Y%m%d_%H%M%S", so they sort and
+    compare chronologically as text. For the store backend, size_bytes is
+    the size of the blobs the version owns (see ArchiveStore.owned_bytes()).
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize archive catalog.
+
+        Args:
+            db_path: SQLite database file; created if missing
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connect()
+
+    def _connect(self):
+        """Open the database, creating it and its tables if missing."""
+        self.created = not self.db_path.exists()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def reopen_if_missing(self) -> bool:
+        """
+        Reconnect if the database file was deleted, e.g. by cleaning the output.
+
+        A connection to a deleted file cannot be written to any more.
+
+        Returns:
+            Whether a new, empty catalog was created
+        """
+        with self._lock:
+            if self.db_path.exists():
+                return False
+            self._conn.close()
+            self._connect()
+            return True
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def record(self, entry: Dict[str, Any]):
+        """
+        Add or replace the archive of a zone at a timestamp.
+
+        Args:
+            entry: Values for COLUMNS; missing optional values use defaults
+        """
+        self.record_many([entry])
+
+    def record_many(self, entries: Iterable[Dict[str, Any]]):
+        """Add or replace several archives in one transaction."""
+        rows = [
+            (
+                entry["zone_name"],
+                entry["timestamp"],
+                entry.get("backend", "files"),
+                entry.get("format", "zip"),
+                entry["path"],
+                entry.get("metadata_path"),
+                entry.get("size_bytes", 0),
+                entry.get("input_bytes", 0),
+                entry.get("created"),
+                int(bool(entry.get("typescript_available"))),
+                int(bool(entry.get("python_available"))),
+            )
+            for entry in entries
+        ]
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO archives ({', '.join(COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                rows,
+            )
+
+    def _where(
+        self,
+        zone_name: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        backend: Optional[str] = None,
+    ):
+        clauses, params = [], []
+        if zone_name is not None:
+            clauses.append("zone_name = ?")
+            params.append(zone_name)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if backend is not None:
+            clauses.append("backend = ?")
+            params.append(backend)
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def query(
+        self,
+        zone_name: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        backend: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Archives matching the filters, newest first.
+
+        Args:
+            zone_name: Only archives of this zone
+            since: Only archives at or after this timestamp
+            until: Only archives before this timestamp
+            backend: Only archives of this backend
+            limit: Maximum number of archives
+
+        Returns:
+            Archive rows as dictionaries
+        """
+        where, params = self._where(zone_name, since, until, backend)
+        sql = f"SELECT * FROM archives{where} ORDER BY timestamp DESC, zone_name"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {
+                **dict(row),
+                "typescript_available": bool(row["typescript_available"]),
+                "python_available": bool(row["python_available"]),
+            }
+            for row in rows
+        ]
+
+    def totals(
+        self,
+        zone_name: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Archive count and size per zone.
+
+        Returns:
+            Mapping of zone name to {"count", "size_bytes", "input_bytes"}
+        """
+        where, params = self._where(zone_name, since, until)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT zone_name, COUNT(*) AS count, SUM(size_bytes) AS size_bytes, "
+                f"SUM(input_bytes) AS input_bytes FROM archives{where} "
+                "GROUP BY zone_name ORDER BY zone_name",
+                params,
+            ).fetchall()
+        return {
+            row["zone_name"]: {
+                "count": row["count"],
+                "size_bytes": row["size_bytes"] or 0,
+                "input_bytes": row["input_bytes"] or 0,
+            }
+            for row in rows
+        }
+
+    def zones(self) -> List[str]:
+        """Zones with at least one archive."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT zone_name FROM archives ORDER BY zone_name"
+            ).fetchall()
+        return [row["zone_name"] for row in rows]
+
+    def update_sizes(self, sizes: Dict[tuple, int]):
+        """
+        Set the size of archives in the catalog.
+
+        Args:
+            sizes: Mapping of (zone name, timestamp) to size in bytes
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE archives SET size_bytes = ? WHERE zone_name = ? AND timestamp = ?",
+                [(size, zone_name, timestamp) for (zone_name, timestamp), size in sizes.items()],
+            )
+
+    def remove(self, keys: Iterable[tuple]):
+        """
+        Remove archives from the catalog.
+
+        Args:
+            keys: (zone name, timestamp) pairs
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM archives WHERE zone_name = ? AND timestamp = ?",
+                list(keys),
+            )
+
+    def clear(self):
+        """Remove all archives from the catalog."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM archives")
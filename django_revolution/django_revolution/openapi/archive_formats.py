@@ -0,0 +1,311 @@
+"""
+Archive Formats for Django Revolution
+
+Writers for client archives that compress on several threads: zip entries
+are deflated in parallel, tar.gz is written as independently compressed
+gzip members and tar.zst uses zstd's own worker threads.
+"""
+
+import gzip
+import os
+import sys
+import tarfile
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from ..utils import Logger
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Archive format -> file suffix; "store" is a zip without compression
+ARCHIVE_FORMATS = {
+    "zip": ".zip",
+    "store": ".zip",
+    "tar.gz": ".tar.gz",
+    "tar.zst": ".tar.zst",
+}
+
+# Compression level used when none is configured
+DEFAULT_LEVELS = {"zip": 6, "tar.gz": 6, "tar.zst": 3}
+
+# Files above this size are deflated by zipfile itself instead of in memory
+PARALLEL_ZIP_MAX_FILE = 64 * 1024 * 1024
+
+# Pre-deflated zip entries are appended through ZipFile internals, which are
+# only relied on where they are known to behave like ZipFile.write();
+# elsewhere zipfile deflates every entry itself
+PARALLEL_ZIP_PYTHON = ((3, 9), (3, 13))
+PARALLEL_ZIP_SUPPORTED = (
+    PARALLEL_ZIP_PYTHON[0] <= sys.version_info[:2] <= PARALLEL_ZIP_PYTHON[1]
+    and hasattr(zipfile.ZipFile, "_writecheck")
+    and hasattr(zipfile.ZipInfo, "FileHeader")
+)
+
+# Uncompressed bytes per gzip member
+GZIP_CHUNK_SIZE = 1024 * 1024
+
+ArchiveFiles = List[Tuple[Path, str]]
+
+
+def resolve_archive_format(archive_format: str, logger: Optional[Logger] = None) -> str:
+    """
+    Resolve an archive format that can be written in this environment.
+
+    Args:
+        archive_format: Configured archive format
+        logger: Optional logger instance
+
+    Returns:
+        The format, or "tar.gz" for "tar.zst" without the zstandard package
+    """
+    if archive_format == "tar.zst" and zstandard is None:
+        (logger or Logger("archive_formats")).warning(
+            "tar.zst archives need the zstandard package, writing tar.gz instead"
+        )
+        return "tar.gz"
+    return archive_format
+
+
+def archive_zone_name(archive_path: Path) -> Optional[str]:
+    """
+    Zone name of an archive file.
+
+    Args:
+        archive_path: Archive such as "public.tar.gz"
+
+    Returns:
+        Zone name, or None if the file is not an archive
+    """
+    for suffix in sorted(set(ARCHIVE_FORMATS.values()), key=len, reverse=True):
+        if archive_path.name.endswith(suffix):
+            return archive_path.name[: -len(suffix)]
+    return None
+
+
+def _bounded_map(
+    pool: Executor, fn: Callable, items: Iterable, window: int
+) -> Iterator:
+    """Like Executor.map, with at most `window` results held in memory."""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _deflate_file(file_path: Path, level: int) -> Optional[Tuple[int, int, bytes]]:
+    """Raw-deflate a file the way zipfile does; None for large files."""
+    if file_path.stat().st_size > PARALLEL_ZIP_MAX_FILE:
+        return None
+
+    data = file_path.read_bytes()
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return len(data), zlib.crc32(data), compressor.compress(data) + compressor.flush()
+
+
+def _write_deflated(
+    zipf: zipfile.ZipFile,
+    file_path: Path,
+    arcname: str,
+    deflated: Tuple[int, int, bytes],
+):
+    """
+    Append an already deflated entry to a zip file.
+
+    Mirrors what ZipFile.write() does for a seekable file, minus the
+    compression, which happened on a worker thread. Only used when
+    PARALLEL_ZIP_SUPPORTED; entries are at most PARALLEL_ZIP_MAX_FILE, so
+    their local header never needs zip64 fields.
+    """
+    file_size, crc, data = deflated
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.file_size = file_size
+    zinfo.compress_size = len(data)
+    zinfo.CRC = crc
+
+    zipf.fp.seek(zipf.start_dir)
+    zinfo.header_offset = zipf.fp.tell()
+    zipf._writecheck(zinfo)
+    zipf._didModify = True
+    zipf.fp.write(zinfo.FileHeader(zip64=False))
+    zipf.fp.write(data)
+    zipf.start_dir = zipf.fp.tell()
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+
+
+def write_zip(
+    files: ArchiveFiles, archive_path: Path, level: Optional[int], threads: int
+):
+    """
+    Write a zip archive, deflating entries on several threads.
+
+    Args:
+        files: (file, archive name) pairs
+        archive_path: Archive to write
+        level: Deflate level 0-9; None stores files without compression
+        threads: Compression threads
+    """
+    compress_type = zipfile.ZIP_STORED if level is None else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(archive_path, "w", compress_type, compresslevel=level) as zipf:
+        if level is None or threads <= 1 or not PARALLEL_ZIP_SUPPORTED:
+            for file_path, arcname in files:
+                zipf.write(file_path, arcname)
+            return
+
+        with ThreadPoolExecutor(threads, thread_name_prefix="archive-zip") as pool:
+            deflated_files = _bounded_map(
+                pool,
+                lambda item: _deflate_file(item[0], level),
+                files,
+                threads * 4,
+            )
+            for (file_path, arcname), deflated in zip(files, deflated_files):
+                if deflated is None:
+                    zipf.write(file_path, arcname)
+                else:
+                    _write_deflated(zipf, file_path, arcname, deflated)
+
+
+class ParallelGzipWriter:
+    """
+    File object that gzips what is written to it on several threads.
+
+    The data is cut into chunks that are compressed as separate gzip
+    members; concatenated members are a valid gzip file for gzip, tar and
+    Python's gzip module.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        level: int,
+        threads: int,
+        chunk_size: int = GZIP_CHUNK_SIZE,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            fileobj: Binary file to write the gzip stream to
+            level: Compression level 0-9
+            threads: Compression threads
+            chunk_size: Uncompressed bytes per gzip member
+        """
+        self.fileobj = fileobj
+        self.level = level
+        self.threads = max(1, threads)
+        self.chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._pool = ThreadPoolExecutor(self.threads, thread_name_prefix="archive-gzip")
+
+    def _submit(self, chunk: bytes):
+        self._pending.append(
+            self._pool.submit(gzip.compress, chunk, self.level, mtime=0)
+        )
+        # Keep memory bounded while workers are busy
+        while len(self._pending) > self.threads * 2:
+            self.fileobj.write(self._pending.popleft().result())
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self.chunk_size:
+            self._submit(bytes(self._buffer[: self.chunk_size]))
+            del self._buffer[: self.chunk_size]
+        return len(data)
+
+    def close(self):
+        """Compress the remaining data and write all members in order."""
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self.fileobj.write(self._pending.popleft().result())
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+
+
+def _add_files(tar: tarfile.TarFile, files: ArchiveFiles):
+    for file_path, arcname in files:
+        tar.add(file_path, arcname, recursive=False)
+
+
+def write_tar_gz(files: ArchiveFiles, archive_path: Path, level: int, threads: int):
+    """
+    Write a gzip-compressed tar archive, compressing on several threads.
+
+    Args:
+        files: (file, archive name) pairs
+        archive_path: Archive to write
+        level: Compression level 0-9
+        threads: Compression threads
+    """
+    with open(archive_path, "wb") as f:
+        writer = ParallelGzipWriter(f, level, threads)
+        try:
+            with tarfile.open(fileobj=writer, mode="w|") as tar:
+                _add_files(tar, files)
+        finally:
+            writer.close()
+
+
+def write_tar_zst(files: ArchiveFiles, archive_path: Path, level: int, threads: int):
+    """
+    Write a zstd-compressed tar archive using zstd worker threads.
+
+    Args:
+        files: (file, archive name) pairs
+        archive_path: Archive to write
+        level: Compression level 1-22
+        threads: Compression threads
+    """
+    compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+    with open(archive_path, "wb") as f:
+        with compressor.stream_writer(f, closefd=False) as writer:
+            with tarfile.open(fileobj=writer, mode="w|") as tar:
+                _add_files(tar, files)
+
+
+def write_archive(
+    files: ArchiveFiles,
+    archive_path: Path,
+    archive_format: str = "zip",
+    level: Optional[int] = None,
+    threads: Optional[int] = None,
+):
+    """
+    Write an archive in one of ARCHIVE_FORMATS.
+
+    Args:
+        files: (file, archive name) pairs
+        archive_path: Archive to write
+        archive_format: Format from resolve_archive_format()
+        level: Compression level (default: DEFAULT_LEVELS); zlib formats
+            use at most 9
+        threads: Compression threads (default: CPU count)
+    """
+    threads = threads or os.cpu_count() or 1
+
+    if archive_format == "store":
+        write_zip(files, archive_path, None, threads)
+        return
+
+    level = DEFAULT_LEVELS[archive_format] if level is None else level
+    if archive_format == "tar.zst":
+        write_tar_zst(files, archive_path, max(level, 1), threads)
+    elif archive_format == "tar.gz":
+        write_tar_gz(files, archive_path, min(level, 9), threads)
+    else:
+        write_zip(files, archive_path, min(level, 9), threads)
@@ -5,14 +5,31 @@ Manages archiving of generated clients with versioning and compression.
 """
 
 import json
+import os
 import shutil
-import zipfile
-from datetime import datetime
+import threading
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional
-
-from ..config import DjangoRevolutionSettings, GenerationResult
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from ..config import (
+    ArchiveRetentionSettings,
+    DjangoRevolutionSettings,
+    GenerationResult,
+)
+from ..metrics import get_stage_recorder
 from ..utils import Logger, ensure_directories
+from .archive_formats import (
+    ARCHIVE_FORMATS,
+    archive_zone_name,
+    resolve_archive_format,
+    write_archive,
+)
+from .archive_catalog import CATALOG_FILENAME, ArchiveCatalog
+from .archive_retention import archive_key, select_by_rules, select_by_size
+from .archive_store import ArchiveStore
+from .output_writer import MANIFEST_FILENAME
 
 
 class ArchiveManager:
@@ -37,6 +54,26 @@ class ArchiveManager:
         self.archive_dir = output_dir / "archive"
         ensure_directories(self.archive_dir)
 
+        # Deduplicated versions (archive_backend = "store")
+        self.store = ArchiveStore(self.archive_dir / "store", logger)
+
+        # Zones are archived concurrently; selecting archives of all zones
+        # and removing them must not interleave
+        self._removal_lock = threading.Lock()
+
+        # Index of all archives; built from disk the first time
+        self._catalog = ArchiveCatalog(self.archive_dir / CATALOG_FILENAME)
+        if self._catalog.created:
+            self.rebuild_catalog()
+
+    @property
+    def catalog(self) -> ArchiveCatalog:
+        """Archive catalog; rebuilt from disk if its file was deleted meanwhile."""
+        if self._catalog.reopen_if_missing():
+            self.logger.debug("Archive catalog was removed, rebuilding it")
+            self.rebuild_catalog()
+        return self._catalog
+
     def archive_zone_clients(
         self,
         zone_name: str,
@@ -63,142 +100,122 @@ class ArchiveManager:
             # Generate timestamp for versioning
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             date_folder = datetime.now().strftime("%Y-%m-%d")
+            use_store = self.config.archive_backend == "store"
 
-            # Create timestamp-based archive directory
-            files_dir = self.archive_dir / "files"
-            timestamp_dir = files_dir / timestamp
-            timestamp_dir.mkdir(parents=True, exist_ok=True)
+            # Create timestamp-based archive directory; the store keeps
+            # manifests instead
+            timestamp_dir = self.archive_dir / "files" / timestamp
+            if not use_store:
+                timestamp_dir.mkdir(parents=True, exist_ok=True)
 
             # Create latest directory
             latest_dir = self.archive_dir / "latest"
             latest_dir.mkdir(parents=True, exist_ok=True)
 
-            self.logger.debug(
-                f"Ensured archive directories exist: {timestamp_dir}, {latest_dir}"
-            )
+            self.logger.debug(f"Ensured archive directories exist: {latest_dir}")
 
             # Create archive filename
-            archive_filename = f"{zone_name}.zip"
-
-            # Create temporary directory for combined clients
-            temp_dir = self.archive_dir / f"temp_{zone_name}_{timestamp}"
-            temp_dir.mkdir(exist_ok=True)
-
-            try:
-                # Copy TypeScript client if available
-                ts_available = False
-                if typescript_path and typescript_path.exists():
-                    ts_dest = temp_dir / "typescript"
-                    if ts_dest.exists():
-                        import shutil
-
-                        shutil.rmtree(ts_dest)
-                    import shutil
-
-                    shutil.copytree(typescript_path, ts_dest)
-                    ts_available = True
-                    self.logger.debug(
-                        f"Added TypeScript client to archive: {typescript_path}"
-                    )
-
-                # Copy Python client if available
-                py_available = False
-                if python_path and python_path.exists():
-                    py_dest = temp_dir / "python"
-                    py_dest.mkdir(exist_ok=True)
-
-                    # Handle both file and directory cases
-                    if python_path.is_file():
-                        # datamodel-code-generator creates a single file
-                        import shutil
-
-                        shutil.copy2(python_path, py_dest / python_path.name)
-
-                        # Also copy any additional files in the same directory
-                        python_dir = python_path.parent
-                        for additional_file in python_dir.iterdir():
-                            if (
-                                additional_file.is_file()
-                                and additional_file != python_path
-                            ):
-                                shutil.copy2(
-                                    additional_file, py_dest / additional_file.name
-                                )
-                    else:
-                        # datamodel-code-generator creates a file
-                        if py_dest.exists():
-                            import shutil
-
-                            shutil.rmtree(py_dest)
-                        import shutil
-
-                        shutil.copytree(python_path, py_dest)
-
-                    py_available = True
-                    self.logger.debug(f"Added Python client to archive: {python_path}")
-
-                # Create timestamped archive
-                timestamped_path = timestamp_dir / archive_filename
-                self._create_zip_archive(temp_dir, timestamped_path)
-
-                # Create latest archive (overwrite if exists)
-                latest_path = latest_dir / archive_filename
-                self._create_zip_archive(temp_dir, latest_path)
-
-                # Verify archives were created
-                if not timestamped_path.exists():
-                    raise FileNotFoundError(
-                        f"Timestamped archive was not created: {timestamped_path}"
-                    )
-                if not latest_path.exists():
-                    raise FileNotFoundError(
-                        f"Latest archive was not created: {latest_path}"
-                    )
+            archive_format = resolve_archive_format(
+                self.config.archive_format, self.logger
+            )
+            archive_filename = f"{zone_name}{ARCHIVE_FORMATS[archive_format]}"
 
-                self.logger.debug(
-                    f"Verified archives exist: {timestamped_path.name}, {latest_path.name}"
+            # Files are streamed from the client directories into the archive
+            ts_files, ts_stats = [], None
+            if typescript_path and typescript_path.exists():
+                ts_files, ts_stats = self._collect_client_files(
+                    typescript_path, "typescript"
                 )
+                self.logger.debug(f"Added TypeScript client to archive: {typescript_path}")
+
+            py_files, py_stats = [], None
+            if python_path and python_path.exists():
+                py_files, py_stats = self._collect_client_files(python_path, "python")
+                self.logger.debug(f"Added Python client to archive: {python_path}")
+
+            ts_available = ts_stats is not None
+            py_available = py_stats is not None
+            files = ts_files + py_files
+
+            # Generate metadata
+            metadata = self._generate_zone_metadata(
+                zone_name,
+                typescript_path,
+                python_path,
+                timestamp,
+                ts_available,
+                py_available,
+                ts_stats,
+                py_stats,
+            )
 
-                # Log archive sizes
-                timestamped_size = timestamped_path.stat().st_size / (1024 * 1024)  # MB
-                latest_size = latest_path.stat().st_size / (1024 * 1024)  # MB
-                self.logger.debug(
-                    f"Archive sizes - Timestamped: {timestamped_size:.2f}MB, Latest: {latest_size:.2f}MB"
+            latest_path = latest_dir / archive_filename
+            started = time.perf_counter()
+            if use_store:
+                # Only the latest version is kept as an archive
+                self._create_archive(files, latest_path, archive_format)
+                seconds = time.perf_counter() - started
+                archive_path = latest_path
+                latest_mode = "archive"
+
+                store_result = self.store.add_version(
+                    zone_name, timestamp, files, metadata
                 )
+                metadata_path = Path(store_result["manifest"])
+            else:
+                # Create timestamped archive
+                archive_path = timestamp_dir / archive_filename
+                self._create_archive(files, archive_path, archive_format)
+                seconds = time.perf_counter() - started
+
+                # Latest archive shares the file when the filesystem allows it
+                latest_mode = self._link_latest(archive_path, latest_path)
 
-                # Generate metadata
-                metadata = self._generate_zone_metadata(
-                    zone_name,
-                    typescript_path,
-                    python_path,
-                    timestamp,
-                    ts_available,
-                    py_available,
-                )
                 metadata_path = timestamp_dir / f"{zone_name}_metadata.json"
                 self._write_metadata(metadata, metadata_path)
+            self._remove_other_latest(latest_dir, zone_name, latest_path)
 
-                self.logger.success(
-                    f"Archived zone {zone_name} with TypeScript: {ts_available}, Python: {py_available}"
-                )
+            archive_size = archive_path.stat().st_size
+            input_bytes = sum(
+                stats["size_bytes"] for stats in (ts_stats, py_stats) if stats
+            )
+            throughput = input_bytes / (1024 * 1024) / seconds if seconds else 0.0
+            self.logger.debug(
+                f"Archive size: {archive_size / (1024 * 1024):.2f}MB "
+                f"({archive_format}, {throughput:.1f}MB/s), latest: {latest_mode}"
+            )
 
-                return {
-                    "success": True,
-                    "zone_name": zone_name,
-                    "timestamped_archive": str(timestamped_path),
-                    "latest_archive": str(latest_path),
-                    "metadata": str(metadata_path),
-                    "timestamp": timestamp,
-                    "date_folder": date_folder,
-                    "typescript_available": ts_available,
-                    "python_available": py_available,
-                }
+            self.logger.success(
+                f"Archived zone {zone_name} with TypeScript: {ts_available}, Python: {py_available}"
+            )
 
-            finally:
-                # Clean up temporary directory
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir)
-                    self.logger.debug(f"Cleaned up temporary directory: {temp_dir}")
+            result = {
+                "success": True,
+                "zone_name": zone_name,
+                "backend": self.config.archive_backend,
+                "timestamped_archive": None if use_store else str(archive_path),
+                "latest_archive": str(latest_path),
+                "latest_mode": latest_mode,
+                "format": archive_format,
+                "input_bytes": input_bytes,
+                "size_bytes": archive_size,
+                "seconds": round(seconds, 3),
+                "throughput_mb_s": round(throughput, 2),
+                "metadata": str(metadata_path),
+                "timestamp": timestamp,
+                "date_folder": date_folder,
+                "typescript_available": ts_available,
+                "python_available": py_available,
+            }
+            if use_store:
+                result["manifest"] = store_result["manifest"]
+                result["store"] = store_result
+            self.catalog.record(
+                self._catalog_entry(result, store_result if use_store else None)
+            )
+            if self.config.archive_retention.enabled:
+                result["retention"] = self.apply_retention(zone_name)
+            return result
 
         except Exception as e:
             error_msg = f"Failed to archive zone {zone_name}: {str(e)}"
@@ -236,32 +253,108 @@ class ArchiveManager:
         """
         return self.archive_zone_clients(zone_name, python_path=client_path)
 
-    def _create_zip_archive(self, source_path: Path, archive_path: Path):
-        """Create a zip archive."""
+    def _collect_client_files(
+        self, client_path: Path, prefix: str
+    ) -> Tuple[List[Tuple[Path, str]], Dict[str, Any]]:
+        """
+        List the files of a client with their names in the archive.
+
+        Args:
+            client_path: Client directory, or a single generated file whose
+                sibling files belong to the client as well
+            prefix: Top-level archive directory of the client
+
+        Returns:
+            Tuple of ((file, archive name) pairs, client stats)
+        """
+        if client_path.is_file():
+            # Single-file generators put extra files next to the module
+            candidates = sorted(p for p in client_path.parent.iterdir() if p.is_file())
+            root = client_path.parent
+        else:
+            candidates = sorted(p for p in client_path.rglob("*") if p.is_file())
+            root = client_path
+
+        files = []
+        total_size = 0
+        for file_path in candidates:
+            # Skip the output manifest and error log files
+            if file_path.name == MANIFEST_FILENAME or (
+                file_path.name.startswith("error_") and file_path.suffix == ".log"
+            ):
+                continue
+            files.append((file_path, f"{prefix}/{file_path.relative_to(root).as_posix()}"))
+            total_size += file_path.stat().st_size
+
+        return files, {
+            "file_count": len(files),
+            "size_bytes": total_size,
+            "size_mb": round(total_size / (1024 * 1024), 2),
+        }
+
+    def _create_archive(
+        self, files: List[Tuple[Path, str]], archive_path: Path, archive_format: str
+    ):
+        """
+        Create an archive from files in place, without staging copies.
+
+        The archive is written next to its destination and moved into
+        place once complete.
+
+        Args:
+            files: (file, archive name) pairs
+            archive_path: Archive to create
+            archive_format: Archive format (see ARCHIVE_FORMATS)
+        """
+        tmp_path = archive_path.with_name(f".{archive_path.name}.tmp")
         try:
-            with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-                file_count = 0
-                for file_path in source_path.rglob("*"):
-                    if file_path.is_file():
-                        # Skip error log files
-                        if (
-                            file_path.name.startswith("error_")
-                            and file_path.suffix == ".log"
-                        ):
-                            continue
-
-                        # Create relative path for archive
-                        relative_path = file_path.relative_to(source_path)
-                        zipf.write(file_path, relative_path)
-                        file_count += 1
-
-                self.logger.debug(
-                    f"Created ZIP archive with {file_count} files: {archive_path}"
-                )
+            write_archive(
+                files,
+                tmp_path,
+                archive_format,
+                level=self.config.archive_compression_level,
+                threads=self.config.archive_threads,
+            )
+            os.replace(tmp_path, archive_path)
+
+            self.logger.debug(
+                f"Created {archive_format} archive with {len(files)} files: {archive_path}"
+            )
         except Exception as e:
-            self.logger.error(f"Failed to create ZIP archive {archive_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            self.logger.error(f"Failed to create archive {archive_path}: {e}")
             raise
 
+    def _link_latest(self, archive_path: Path, latest_path: Path) -> str:
+        """
+        Atomically point a latest archive at a timestamped archive.
+
+        Args:
+            archive_path: Timestamped archive
+            latest_path: Latest archive to replace
+
+        Returns:
+            "hardlink", or "copy" where the filesystem has no hard links
+        """
+        tmp_path = latest_path.with_name(f".{latest_path.name}.tmp")
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.link(archive_path, tmp_path)
+            mode = "hardlink"
+        except OSError:
+            shutil.copyfile(archive_path, tmp_path)
+            mode = "copy"
+
+        os.replace(tmp_path, latest_path)
+        return mode
+
+    def _remove_other_latest(self, latest_dir: Path, zone_name: str, latest_path: Path):
+        """Remove latest archives of a zone written in another format."""
+        for suffix in set(ARCHIVE_FORMATS.values()):
+            other = latest_dir / f"{zone_name}{suffix}"
+            if other != latest_path:
+                other.unlink(missing_ok=True)
+
     def _generate_zone_metadata(
         self,
         zone_name: str,
@@ -270,8 +363,10 @@ class ArchiveManager:
         timestamp: str,
         ts_available: bool,
         py_available: bool,
+        ts_stats: Optional[Dict[str, Any]] = None,
+        py_stats: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Generate metadata for the archived zone."""
+        """Generate metadata for the archived zone; stats are computed if not given."""
         metadata = {
             "zone_name": zone_name,
             "timestamp": timestamp,
@@ -295,12 +390,12 @@ class ArchiveManager:
 
         # Calculate TypeScript stats
         if ts_available and typescript_path:
-            ts_stats = self._calculate_client_stats(typescript_path)
+            ts_stats = ts_stats or self._calculate_client_stats(typescript_path)
             metadata["clients"]["typescript"].update(ts_stats)
 
         # Calculate Python stats
         if py_available and python_path:
-            py_stats = self._calculate_client_stats(python_path)
+            py_stats = py_stats or self._calculate_client_stats(python_path)
             metadata["clients"]["python"].update(py_stats)
 
         # Calculate total stats
@@ -388,10 +483,12 @@ class ArchiveManager:
             )
 
             # Archive the zone
-            archive_result = self.archive_zone_clients(zone_name, ts_path, py_path)
+            with get_stage_recorder().stage("archive", zone_name) as timing:
+                archive_result = self.archive_zone_clients(zone_name, ts_path, py_path)
             archive_results["zones"][zone_name] = archive_result
 
             if archive_result["success"]:
+                timing.files = 1
                 archive_results["summary"]["successful"] += 1
             else:
                 archive_results["summary"]["failed"] += 1
@@ -403,111 +500,416 @@ class ArchiveManager:
 
         return archive_results
 
-    def list_archives(self) -> Dict[str, Any]:
+    def _archive_files(self, directory: Path) -> List[Path]:
+        """Archives of any supported format in a directory."""
+        return sorted(
+            path
+            for path in directory.iterdir()
+            if path.is_file()
+            and not path.name.startswith(".")
+            and archive_zone_name(path) is not None
+        )
+
+    def _scan_archives(self) -> List[Dict[str, Any]]:
+        """Catalog entries for the archives on disk; walks the whole tree."""
+        entries = []
+
+        files_dir = self.archive_dir / "files"
+        if files_dir.exists():
+            for timestamp_dir in sorted(files_dir.iterdir()):
+                if not timestamp_dir.is_dir():
+                    continue
+                for archive_file in self._archive_files(timestamp_dir):
+                    zone_name = archive_zone_name(archive_file)
+                    metadata_file = timestamp_dir / f"{zone_name}_metadata.json"
+                    metadata = {}
+                    if metadata_file.exists():
+                        try:
+                            with open(metadata_file, "r") as f:
+                                metadata = json.load(f)
+                        except Exception:
+                            pass
+                    clients = metadata.get("clients", {})
+                    stat = archive_file.stat()
+                    entries.append(
+                        {
+                            "zone_name": zone_name,
+                            "timestamp": timestamp_dir.name,
+                            "backend": "files",
+                            "format": archive_file.name[len(zone_name) + 1 :],
+                            "path": str(archive_file),
+                            "metadata_path": (
+                                str(metadata_file) if metadata_file.exists() else None
+                            ),
+                            "size_bytes": stat.st_size,
+                            "input_bytes": metadata.get("total_size_bytes", 0),
+                            "created": metadata.get(
+                                "archive_date",
+                                datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                            ),
+                            "typescript_available": clients.get("typescript", {}).get(
+                                "available", False
+                            ),
+                            "python_available": clients.get("python", {}).get(
+                                "available", False
+                            ),
+                        }
+                    )
+
+        # Store versions own the blobs they were first to reference
+        version_blobs = self.store.version_blobs()
+        owned = self.store.owned_bytes(version_blobs)
+        for zone_name in self.store.list_zones():
+            for version in self.store.list_versions(zone_name):
+                manifest = self.store.load_manifest(zone_name, version)
+                metadata = manifest.get("metadata", {})
+                clients = metadata.get("clients", {})
+                entries.append(
+                    {
+                        "zone_name": zone_name,
+                        "timestamp": version,
+                        "backend": "store",
+                        "format": "manifest",
+                        "path": str(self.store.manifest_path(zone_name, version)),
+                        "metadata_path": str(self.store.manifest_path(zone_name, version)),
+                        "size_bytes": owned.get((zone_name, version), 0),
+                        "input_bytes": sum(entry["size"] for entry in manifest["files"]),
+                        "created": metadata.get("archive_date"),
+                        "typescript_available": clients.get("typescript", {}).get(
+                            "available", False
+                        ),
+                        "python_available": clients.get("python", {}).get(
+                            "available", False
+                        ),
+                    }
+                )
+
+        return entries
+
+    def rebuild_catalog(self) -> int:
         """
-        List available archives.
+        Rebuild the archive catalog from the archives on disk.
+
+        Returns:
+            Number of cataloged archives
+        """
+        entries = self._scan_archives()
+        self.catalog.clear()
+        self.catalog.record_many(entries)
+        self.logger.debug(f"Rebuilt archive catalog with {len(entries)} archives")
+        return len(entries)
+
+    def _catalog_entry(
+        self, result: Dict[str, Any], store_result: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Catalog entry for a successful archive_zone_clients() result."""
+        return {
+            "zone_name": result["zone_name"],
+            "timestamp": result["timestamp"],
+            "backend": result["backend"],
+            "format": "manifest" if store_result else result["format"],
+            "path": (
+                store_result["manifest"] if store_result else result["timestamped_archive"]
+            ),
+            "metadata_path": result["metadata"],
+            "size_bytes": (
+                store_result["new_bytes"] if store_result else result["size_bytes"]
+            ),
+            "input_bytes": result["input_bytes"],
+            "created": datetime.now().isoformat(),
+            "typescript_available": result["typescript_available"],
+            "python_available": result["python_available"],
+        }
+
+    @staticmethod
+    def _catalog_timestamp(value: Optional[Union[str, date, datetime]]) -> Optional[str]:
+        """Convert a date, datetime or ISO string to an archive timestamp."""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, datetime):
+            value = datetime(value.year, value.month, value.day)
+        return value.strftime("%Y%m%d_%H%M%S")
+
+    def _archive_info(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """list_archives() entry for a catalog row."""
+        return {
+            "zone_name": row["zone_name"],
+            "filename": Path(row["path"]).name,
+            "path": row["path"],
+            "format": row["format"],
+            "size_mb": round(row["size_bytes"] / (1024 * 1024), 2),
+            "created": row["created"],
+            "metadata_available": row["metadata_path"] is not None,
+            "typescript_available": row["typescript_available"],
+            "python_available": row["python_available"],
+        }
+
+    def list_archives(
+        self,
+        zone_name: Optional[str] = None,
+        since: Optional[Union[str, date, datetime]] = None,
+        until: Optional[Union[str, date, datetime]] = None,
+    ) -> Dict[str, Any]:
+        """
+        List available archives from the archive catalog.
+
+        Args:
+            zone_name: Only archives of this zone
+            since: Only archives created at or after this date or time
+            until: Only archives created before this date or time
 
         Returns:
             Dictionary of available archives
         """
-        if not self.archive_dir.exists():
-            return {"latest": [], "files": []}
+        rows = self.catalog.query(
+            zone_name, self._catalog_timestamp(since), self._catalog_timestamp(until)
+        )
 
-        # List latest archives
+        # List latest archives; the newest row has the details
         latest_archives = []
         latest_dir = self.archive_dir / "latest"
         if latest_dir.exists():
-            for archive_file in latest_dir.glob("*.zip"):
-                metadata_file = latest_dir / f"{archive_file.stem}_metadata.json"
-
+            newest = {}
+            for row in rows:
+                newest.setdefault(row["zone_name"], row)
+            for archive_file in self._archive_files(latest_dir):
+                archive_zone = archive_zone_name(archive_file)
+                if zone_name is not None and archive_zone != zone_name:
+                    continue
+                row = newest.get(archive_zone)
                 archive_info = {
-                    "zone_name": archive_file.stem,
+                    "zone_name": archive_zone,
                     "filename": archive_file.name,
                     "path": str(archive_file),
                     "size_mb": round(archive_file.stat().st_size / (1024 * 1024), 2),
-                    "created": datetime.fromtimestamp(
-                        archive_file.stat().st_ctime
-                    ).isoformat(),
-                    "metadata_available": metadata_file.exists(),
+                    "created": row["created"] if row else None,
+                    "metadata_available": bool(row and row["metadata_path"]),
                 }
-
-                # Add metadata if available
-                if metadata_file.exists():
-                    try:
-                        with open(metadata_file, "r") as f:
-                            metadata = json.load(f)
-                            archive_info["typescript_available"] = (
-                                metadata.get("clients", {})
-                                .get("typescript", {})
-                                .get("available", False)
-                            )
-                            archive_info["python_available"] = (
-                                metadata.get("clients", {})
-                                .get("python", {})
-                                .get("available", False)
-                            )
-                    except Exception:
-                        pass
-
+                if row:
+                    archive_info["typescript_available"] = row["typescript_available"]
+                    archive_info["python_available"] = row["python_available"]
                 latest_archives.append(archive_info)
 
-        # List timestamp-based archives
+        # Timestamp-based archives (newest first)
         files_archives = []
-        files_dir = self.archive_dir / "files"
-        if files_dir.exists():
-            for timestamp_dir in files_dir.iterdir():
-                if timestamp_dir.is_dir():
-                    timestamp_info = {"timestamp": timestamp_dir.name, "archives": []}
-
-                    for archive_file in timestamp_dir.glob("*.zip"):
-                        if "_metadata" not in archive_file.name:
-                            metadata_file = (
-                                timestamp_dir / f"{archive_file.stem}_metadata.json"
-                            )
-
-                            archive_info = {
-                                "zone_name": archive_file.stem,
-                                "filename": archive_file.name,
-                                "path": str(archive_file),
-                                "size_mb": round(
-                                    archive_file.stat().st_size / (1024 * 1024), 2
-                                ),
-                                "created": datetime.fromtimestamp(
-                                    archive_file.stat().st_ctime
-                                ).isoformat(),
-                                "metadata_available": metadata_file.exists(),
-                            }
-
-                            # Add metadata if available
-                            if metadata_file.exists():
-                                try:
-                                    with open(metadata_file, "r") as f:
-                                        metadata = json.load(f)
-                                        archive_info["typescript_available"] = (
-                                            metadata.get("clients", {})
-                                            .get("typescript", {})
-                                            .get("available", False)
-                                        )
-                                        archive_info["python_available"] = (
-                                            metadata.get("clients", {})
-                                            .get("python", {})
-                                            .get("available", False)
-                                        )
-                                except Exception:
-                                    pass
-
-                            timestamp_info["archives"].append(archive_info)
-
-                    # Sort archives by creation time (newest first)
-                    timestamp_info["archives"].sort(
-                        key=lambda x: x["created"], reverse=True
+        by_timestamp = {}
+        for row in rows:
+            if row["backend"] != "files":
+                continue
+            if row["timestamp"] not in by_timestamp:
+                by_timestamp[row["timestamp"]] = {
+                    "timestamp": row["timestamp"],
+                    "archives": [],
+                }
+                files_archives.append(by_timestamp[row["timestamp"]])
+            by_timestamp[row["timestamp"]]["archives"].append(self._archive_info(row))
+
+        # Versions kept in the deduplicated store (newest first)
+        store_versions = {}
+        for row in rows:
+            if row["backend"] == "store":
+                store_versions.setdefault(row["zone_name"], []).append(row["timestamp"])
+
+        return {
+            "latest": latest_archives,
+            "files": files_archives,
+            "versions": store_versions,
+        }
+
+    def archive_totals(
+        self,
+        zone_name: Optional[str] = None,
+        since: Optional[Union[str, date, datetime]] = None,
+        until: Optional[Union[str, date, datetime]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Archive counts and sizes per zone from the archive catalog.
+
+        Args:
+            zone_name: Only archives of this zone
+            since: Only archives created at or after this date or time
+            until: Only archives created before this date or time
+
+        Returns:
+            Per-zone totals and the overall count and size
+        """
+        zones = self.catalog.totals(
+            zone_name, self._catalog_timestamp(since), self._catalog_timestamp(until)
+        )
+        return {
+            "zones": zones,
+            "count": sum(totals["count"] for totals in zones.values()),
+            "size_bytes": sum(totals["size_bytes"] for totals in zones.values()),
+        }
+
+    def materialize_archive(
+        self,
+        zone_name: str,
+        version: Optional[str] = None,
+        output_path: Optional[Path] = None,
+    ) -> Dict[str, Any]:
+        """
+        Write a version kept in the deduplicated store as an archive.
+
+        Args:
+            zone_name: Name of the zone
+            version: Version timestamp (default: latest)
+            output_path: Archive to write (default:
+                archive/materialized/<zone>_<version><suffix>)
+
+        Returns:
+            Materialize operation result
+        """
+        try:
+            version = version or self.store.load_manifest(zone_name)["version"]
+            archive_format = resolve_archive_format(
+                self.config.archive_format, self.logger
+            )
+            if output_path is None:
+                output_path = (
+                    self.archive_dir
+                    / "materialized"
+                    / f"{zone_name}_{version}{ARCHIVE_FORMATS[archive_format]}"
+                )
+
+            self.store.materialize(
+                zone_name,
+                output_path,
+                version,
+                archive_format,
+                level=self.config.archive_compression_level,
+                threads=self.config.archive_threads,
+            )
+            self.logger.success(f"Materialized {zone_name} {version}: {output_path}")
+
+            return {
+                "success": True,
+                "zone_name": zone_name,
+                "version": version,
+                "archive": str(output_path),
+                "size_bytes": output_path.stat().st_size,
+            }
+
+        except Exception as e:
+            error_msg = f"Failed to materialize zone {zone_name}: {str(e)}"
+            self.logger.error(error_msg)
+
+            return {"success": False, "error": error_msg, "zone_name": zone_name}
+
+    def _remove_archives(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Delete cataloged archives in bulk.
+
+        Args:
+            rows: Catalog rows to delete
+
+        Returns:
+            Bytes reclaimed on disk
+        """
+        reclaimed = 0
+        store_versions = False
+        for row in rows:
+            if row["backend"] == "store":
+                self.store.remove_version(row["zone_name"], row["timestamp"])
+                store_versions = True
+                continue
+
+            paths = [Path(row["path"])]
+            if row["metadata_path"]:
+                paths.append(Path(row["metadata_path"]))
+            for path in paths:
+                try:
+                    stat = path.stat()
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                # Archives still linked from latest/ keep their blocks
+                if stat.st_nlink == 1:
+                    reclaimed += stat.st_size
+            # Timestamp directories go with their last archive
+            try:
+                Path(row["path"]).parent.rmdir()
+            except OSError:
+                pass
+
+        self.catalog.remove((row["zone_name"], row["timestamp"]) for row in rows)
+
+        # Store blobs go once no remaining manifest refers to them; blobs of
+        # removed versions that are still referenced change owner
+        if store_versions:
+            reclaimed += self.store.collect_garbage()["bytes_reclaimed"]
+            self.catalog.update_sizes(
+                self.store.owned_bytes(self.store.version_blobs())
+            )
+        return reclaimed
+
+    def apply_retention(
+        self,
+        zone_name: Optional[str] = None,
+        policy: Optional[ArchiveRetentionSettings] = None,
+    ) -> Dict[str, Any]:
+        """
+        Remove archives the retention policy does not keep.
+
+        Count and age rules are evaluated for one zone when given, which is
+        all that can change after writing an archive of that zone. The size
+        cap is checked against the catalog totals and only looks at every
+        archive when it may be exceeded; store versions then count the blobs
+        they share once.
+
+        Args:
+            zone_name: Only apply count and age rules to this zone
+            policy: Retention policy (default: archive_retention setting)
+
+        Returns:
+            Retention operation result
+        """
+        policy = policy or self.config.archive_retention
+        try:
+            with self._removal_lock:
+                removed = select_by_rules(self.catalog.query(zone_name), policy)
+
+                if policy.max_total_mb is not None:
+                    max_bytes = int(policy.max_total_mb * 1024 * 1024)
+                    # Removing store versions frees at most the blobs they own
+                    totals = self.catalog.totals().values()
+                    total = sum(zone["size_bytes"] for zone in totals) - sum(
+                        row["size_bytes"] for row in removed
+                    )
+                    store_removed = any(row["backend"] == "store" for row in removed)
+                    if total > max_bytes or store_removed:
+                        removed_keys = {archive_key(row) for row in removed}
+                        remaining = [
+                            row
+                            for row in self.catalog.query()
+                            if archive_key(row) not in removed_keys
+                        ]
+                        blobs = None
+                        if any(row["backend"] == "store" for row in remaining):
+                            blobs = self.store.version_blobs()
+                        removed += select_by_size(remaining, max_bytes, blobs)
+
+                bytes_reclaimed = self._remove_archives(removed) if removed else 0
+                if removed:
+                    self.logger.info(
+                        f"Retention removed {len(removed)} archives, "
+                        f"reclaimed {bytes_reclaimed / (1024 * 1024):.2f}MB"
                     )
-                    files_archives.append(timestamp_info)
 
-        # Sort timestamps (newest first)
-        files_archives.sort(key=lambda x: x["timestamp"], reverse=True)
+            return {
+                "success": True,
+                "removed": len(removed),
+                "removed_archives": [archive_key(row) for row in removed],
+                "bytes_reclaimed": bytes_reclaimed,
+            }
 
-        return {"latest": latest_archives, "files": files_archives}
+        except Exception as e:
+            error_msg = f"Failed to apply archive retention: {str(e)}"
+            self.logger.error(error_msg)
+
+            return {"success": False, "error": error_msg}
 
     def clean_old_archives(self, keep_days: int = 30) -> Dict[str, Any]:
         """
@@ -519,39 +921,22 @@ class ArchiveManager:
         Returns:
             Cleanup operation results
         """
-        if not self.archive_dir.exists():
-            return {"removed": 0, "kept": 0}
-
-        from datetime import timedelta
+        cutoff = (datetime.now() - timedelta(days=keep_days)).strftime("%Y%m%d_%H%M%S")
+        with self._removal_lock:
+            old_rows = self.catalog.query(until=cutoff)
 
-        cutoff_date = datetime.now() - timedelta(days=keep_days)
-        removed_count = 0
-        kept_count = 0
-
-        # Clean timestamp-based archives
-        files_dir = self.archive_dir / "files"
-        if files_dir.exists():
-            for timestamp_dir in files_dir.iterdir():
-                if timestamp_dir.is_dir():
-                    try:
-                        # Extract date from timestamp (YYYYMMDD_HHMMSS)
-                        date_str = timestamp_dir.name.split("_")[0]
-                        dir_date = datetime.strptime(date_str, "%Y%m%d")
-                        if dir_date < cutoff_date:
-                            # Remove entire timestamp directory
-                            shutil.rmtree(timestamp_dir)
-                            removed_count += 1
-                            self.logger.info(
-                                f"Removed old archive directory: {timestamp_dir}"
-                            )
-                        else:
-                            kept_count += 1
-                    except (ValueError, IndexError):
-                        # Skip directories that don't match timestamp format
-                        continue
+            for row in old_rows:
+                self.logger.info(f"Removing old archive: {row['path']}")
+            bytes_reclaimed = self._remove_archives(old_rows)
 
+        removed_count = len(old_rows)
+        kept_count = sum(totals["count"] for totals in self.catalog.totals().values())
         self.logger.info(
-            f"Archive cleanup completed: {removed_count} directories removed, {kept_count} kept"
+            f"Archive cleanup completed: {removed_count} archives removed, {kept_count} kept"
         )
 
-        return {"removed": removed_count, "kept": kept_count}
+        return {
+            "removed": removed_count,
+            "kept": kept_count,
+            "bytes_reclaimed": bytes_reclaimed,
+        }
@@ -0,0 +1,166 @@
+"""
+Archive Retention for Django Revolution
+
+Selects cataloged archives to remove under a retention policy: the newest
+N per zone, the newest per day and per week, a maximum age and a cap on
+the total archive size.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..config import ArchiveRetentionSettings
+
+# Catalog rows are identified by zone and timestamp
+ArchiveKey = Tuple[str, str]
+
+
+def archive_key(row: Dict[str, Any]) -> ArchiveKey:
+    """Catalog key of an archive row."""
+    return row["zone_name"], row["timestamp"]
+
+
+def _archive_datetime(row: Dict[str, Any]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(row["timestamp"], "%Y%m%d_%H%M%S")
+    except ValueError:
+        return None
+
+
+def _keep_newest_per_period(
+    rows: List[Dict[str, Any]], periods: int, period_of
+) -> Set[ArchiveKey]:
+    """Newest archive of each of the newest `periods` periods; rows newest first."""
+    kept: Set[ArchiveKey] = set()
+    seen = []
+    for row in rows:
+        moment = _archive_datetime(row)
+        if moment is None:
+            continue
+        period = period_of(moment)
+        if period in seen:
+            continue
+        if len(seen) >= periods:
+            break
+        seen.append(period)
+        kept.add(archive_key(row))
+    return kept
+
+
+def select_by_rules(
+    rows: Iterable[Dict[str, Any]],
+    policy: ArchiveRetentionSettings,
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Archives that the count and age rules of a policy remove.
+
+    An archive is kept if any of keep_last, keep_daily or keep_weekly keeps
+    it; without those rules, all archives are kept. max_age_days then removes
+    old archives. The newest archive of every zone is always kept.
+
+    Args:
+        rows: Catalog rows, newest first
+        policy: Retention policy
+        now: Reference time for max_age_days (default: now)
+
+    Returns:
+        Rows to remove, newest first
+    """
+    by_zone: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_zone.setdefault(row["zone_name"], []).append(row)
+
+    cutoff = None
+    if policy.max_age_days is not None:
+        cutoff = ((now or datetime.now()) - timedelta(days=policy.max_age_days)).strftime(
+            "%Y%m%d_%H%M%S"
+        )
+    count_rules = (policy.keep_last, policy.keep_daily, policy.keep_weekly)
+
+    removed = []
+    for zone_rows in by_zone.values():
+        if any(rule is not None for rule in count_rules):
+            kept = {archive_key(row) for row in zone_rows[: policy.keep_last or 0]}
+            if policy.keep_daily:
+                kept |= _keep_newest_per_period(
+                    zone_rows, policy.keep_daily, lambda moment: moment.date()
+                )
+            if policy.keep_weekly:
+                kept |= _keep_newest_per_period(
+                    zone_rows,
+                    policy.keep_weekly,
+                    lambda moment: moment.isocalendar()[:2],
+                )
+        else:
+            kept = {archive_key(row) for row in zone_rows}
+
+        for index, row in enumerate(zone_rows):
+            if index == 0:
+                continue
+            if archive_key(row) not in kept or (cutoff and row["timestamp"] < cutoff):
+                removed.append(row)
+
+    return sorted(removed, key=lambda row: row["timestamp"], reverse=True)
+
+
+def select_by_size(
+    rows: Iterable[Dict[str, Any]],
+    max_bytes: int,
+    blobs: Optional[Dict[ArchiveKey, Dict[str, int]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Oldest archives to remove until the rest fits into max_bytes.
+
+    The newest archive of every zone is always kept, even if the cap cannot
+    be met. Store versions share blobs: removing one only frees the blobs no
+    other kept version refers to.
+
+    Args:
+        rows: Catalog rows that are kept so far, newest first
+        max_bytes: Size cap for all archives
+        blobs: Blobs of store versions by catalog key, as {SHA-256: size};
+            other rows count with their size_bytes
+
+    Returns:
+        Rows to remove, oldest first
+    """
+    rows = list(rows)
+    blobs = blobs or {}
+
+    total = 0
+    references: Dict[str, int] = {}
+    for row in rows:
+        row_blobs = blobs.get(archive_key(row))
+        if row_blobs is None:
+            total += row["size_bytes"]
+            continue
+        for digest, size in row_blobs.items():
+            if digest not in references:
+                references[digest] = 0
+                total += size
+            references[digest] += 1
+
+    newest: Set[ArchiveKey] = set()
+    zones = set()
+    for row in rows:
+        if row["zone_name"] not in zones:
+            zones.add(row["zone_name"])
+            newest.add(archive_key(row))
+
+    removed = []
+    for row in sorted(rows, key=lambda row: (row["timestamp"], row["zone_name"])):
+        if total <= max_bytes:
+            break
+        if archive_key(row) in newest:
+            continue
+        removed.append(row)
+        row_blobs = blobs.get(archive_key(row))
+        if row_blobs is None:
+            total -= row["size_bytes"]
+            continue
+        for digest, size in row_blobs.items():
+            references[digest] -= 1
+            if not references[digest]:
+                total -= size
+    return removed
@@ -0,0 +1,327 @@
+"""
+Archive Store for Django Revolution
+
+Content-addressed storage for client archives: every file is stored once
+by its SHA-256, and each archived version is a small manifest listing the
+blobs it consists of. Any version can be materialized back into an archive.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..utils import Logger
+from .archive_formats import write_archive
+
+MANIFEST_VERSION = 1
+
+
+class ArchiveStore:
+    """
+    Deduplicated archive versions.
+
+    Layout below the store directory::
+
+        objects/ab/abcdef...      file contents, named by SHA-256
+        manifests/<zone>/<version>.json
+
+    Adding a version and collecting garbage hold the same lock, so garbage
+    collection never sees blobs whose manifest is not written yet.
+    """
+
+    def __init__(self, store_dir: Path, logger: Optional[Logger] = None):
+        """
+        Initialize archive store.
+
+        Args:
+            store_dir: Directory holding objects and manifests
+            logger: Optional logger instance
+        """
+        self.store_dir = store_dir
+        self.objects_dir = store_dir / "objects"
+        self.manifests_dir = store_dir / "manifests"
+        self.logger = logger or Logger("archive_store")
+        self._lock = threading.Lock()
+
+    def object_path(self, digest: str) -> Path:
+        """Path of the blob with the given SHA-256."""
+        return self.objects_dir / digest[:2] / digest
+
+    def manifest_path(self, zone_name: str, version: str) -> Path:
+        """Path of the manifest of a zone version."""
+        return self.manifests_dir / zone_name / f"{version}.json"
+
+    def _tmp_path(self, path: Path) -> Path:
+        return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+
+    def add_file(self, file_path: Path) -> Tuple[str, int, bool]:
+        """
+        Store the contents of a file unless an identical blob exists.
+
+        The blob is garbage until a manifest refers to it; use add_version()
+        to store files that must survive collect_garbage().
+
+        Args:
+            file_path: File to store
+
+        Returns:
+            Tuple of (SHA-256, size, whether a new blob was written)
+        """
+        with open(file_path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        size = file_path.stat().st_size
+
+        blob = self.object_path(digest)
+        if blob.exists():
+            return digest, size, False
+
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(blob)
+        try:
+            shutil.copyfile(file_path, tmp_path)
+            os.replace(tmp_path, blob)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return digest, size, True
+
+    def add_version(
+        self,
+        zone_name: str,
+        version: str,
+        files: List[Tuple[Path, str]],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Store a version of a zone's archive.
+
+        Args:
+            zone_name: Name of the zone
+            version: Version name, e.g. the archive timestamp
+            files: (file, archive name) pairs
+            metadata: Optional metadata kept in the manifest
+
+        Returns:
+            Result with the manifest path and how much was deduplicated
+        """
+        entries = []
+        new_blobs = 0
+        new_bytes = 0
+        total_bytes = 0
+        manifest_path = self.manifest_path(zone_name, version)
+        with self._lock:
+            for file_path, arcname in files:
+                digest, size, created = self.add_file(file_path)
+                entries.append({"path": arcname, "sha256": digest, "size": size})
+                total_bytes += size
+                if created:
+                    new_blobs += 1
+                    new_bytes += size
+
+            manifest = {
+                "manifest_version": MANIFEST_VERSION,
+                "zone_name": zone_name,
+                "version": version,
+                "files": entries,
+                "metadata": metadata or {},
+            }
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._tmp_path(manifest_path)
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, manifest_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+
+        self.logger.debug(
+            f"Stored {zone_name} {version}: {len(entries)} files, "
+            f"{new_blobs} new blobs ({new_bytes} bytes)"
+        )
+        return {
+            "manifest": str(manifest_path),
+            "file_count": len(entries),
+            "total_bytes": total_bytes,
+            "new_blobs": new_blobs,
+            "new_bytes": new_bytes,
+            "reused_blobs": len(entries) - new_blobs,
+        }
+
+    def list_versions(self, zone_name: str) -> List[str]:
+        """
+        Versions of a zone, oldest first.
+
+        Args:
+            zone_name: Name of the zone
+
+        Returns:
+            Version names
+        """
+        zone_dir = self.manifests_dir / zone_name
+        if not zone_dir.exists():
+            return []
+        return sorted(p.stem for p in zone_dir.glob("*.json"))
+
+    def list_zones(self) -> List[str]:
+        """Zones with at least one stored version."""
+        if not self.manifests_dir.exists():
+            return []
+        return sorted(p.name for p in self.manifests_dir.iterdir() if p.is_dir())
+
+    def load_manifest(self, zone_name: str, version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Load the manifest of a zone version.
+
+        Args:
+            zone_name: Name of the zone
+            version: Version name (default: latest)
+
+        Returns:
+            Manifest dictionary
+
+        Raises:
+            FileNotFoundError: If the zone has no such version
+        """
+        if version is None:
+            versions = self.list_versions(zone_name)
+            if not versions:
+                raise FileNotFoundError(f"No archived versions of zone {zone_name}")
+            version = versions[-1]
+
+        with open(self.manifest_path(zone_name, version), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def materialize(
+        self,
+        zone_name: str,
+        archive_path: Path,
+        version: Optional[str] = None,
+        archive_format: str = "zip",
+        level: Optional[int] = None,
+        threads: Optional[int] = None,
+    ) -> Path:
+        """
+        Write a stored version as an archive.
+
+        Args:
+            zone_name: Name of the zone
+            archive_path: Archive to write
+            version: Version name (default: latest)
+            archive_format: Archive format (see ARCHIVE_FORMATS)
+            level: Optional compression level
+            threads: Optional compression threads
+
+        Returns:
+            Path of the written archive
+
+        Raises:
+            FileNotFoundError: If the version or one of its blobs is missing
+        """
+        manifest = self.load_manifest(zone_name, version)
+        files = []
+        for entry in manifest["files"]:
+            blob = self.object_path(entry["sha256"])
+            if not blob.exists():
+                raise FileNotFoundError(
+                    f"Blob {entry['sha256']} of {entry['path']} is missing from the store"
+                )
+            files.append((blob, entry["path"]))
+
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = archive_path.with_name(f".{archive_path.name}.tmp")
+        try:
+            write_archive(files, tmp_path, archive_format, level, threads)
+            os.replace(tmp_path, archive_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return archive_path
+
+    def remove_version(self, zone_name: str, version: str) -> bool:
+        """
+        Remove the manifest of a version; blobs are freed by collect_garbage().
+
+        Returns:
+            Whether the version existed
+        """
+        manifest_path = self.manifest_path(zone_name, version)
+        if not manifest_path.exists():
+            return False
+        manifest_path.unlink()
+        return True
+
+    def referenced_digests(self) -> Set[str]:
+        """SHA-256 of every blob listed by a manifest."""
+        digests: Set[str] = set()
+        if not self.manifests_dir.exists():
+            return digests
+        for manifest_path in self.manifests_dir.glob("*/*.json"):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                digests.update(entry["sha256"] for entry in json.load(f)["files"])
+        return digests
+
+    def version_blobs(self) -> Dict[Tuple[str, str], Dict[str, int]]:
+        """
+        Blobs of every stored version.
+
+        Returns:
+            Mapping of (zone name, version) to {SHA-256: size}
+        """
+        blobs = {}
+        for zone_name in self.list_zones():
+            for version in self.list_versions(zone_name):
+                manifest = self.load_manifest(zone_name, version)
+                blobs[zone_name, version] = {
+                    entry["sha256"]: entry["size"] for entry in manifest["files"]
+                }
+        return blobs
+
+    @staticmethod
+    def owned_bytes(
+        version_blobs: Dict[Tuple[str, str], Dict[str, int]]
+    ) -> Dict[Tuple[str, str], int]:
+        """
+        Size of the blobs each version owns.
+
+        A blob is owned by the oldest version referring to it, so the owned
+        sizes add up to the size of all referenced blobs.
+
+        Args:
+            version_blobs: Result of version_blobs()
+
+        Returns:
+            Mapping of (zone name, version) to bytes
+        """
+        owned = {}
+        seen: Set[str] = set()
+        for key in sorted(version_blobs, key=lambda key: (key[1], key[0])):
+            owned[key] = 0
+            for digest, size in version_blobs[key].items():
+                if digest not in seen:
+                    seen.add(digest)
+                    owned[key] += size
+        return owned
+
+    def collect_garbage(self) -> Dict[str, int]:
+        """
+        Delete blobs no manifest refers to.
+
+        Returns:
+            Number of removed blobs and bytes reclaimed
+        """
+        removed = 0
+        reclaimed = 0
+        with self._lock:
+            referenced = self.referenced_digests()
+            if self.objects_dir.exists():
+                for blob in self.objects_dir.glob("*/*"):
+                    if blob.name.startswith(".") or blob.name in referenced:
+                        continue
+                    reclaimed += blob.stat().st_size
+                    blob.unlink()
+                    removed += 1
+
+        self.logger.debug(f"Removed {removed} unreferenced blobs ({reclaimed} bytes)")
+        return {"removed": removed, "bytes_reclaimed": reclaimed}
@@ -4,7 +4,10 @@ OpenAPI Generator for Django Revolution
 Main coordinator for generating OpenAPI schemas and client libraries.
 """
 
+import json
 import time
+import filecmp
+import threading
 import shutil
 import concurrent.futures
 from pathlib import Path
@@ -12,7 +15,15 @@ from typing import Dict, List, Optional, Tuple
 import jinja2
 from datetime import datetime
 
-from ..config import DjangoRevolutionSettings, GenerationResult, GenerationSummary
+from ..config import (
+    DjangoRevolutionSettings,
+    GenerationResult,
+    GenerationSummary,
+    WorkerStats,
+    PipelineTaskStats,
+    StageTiming,
+    ZoneModel,
+)
 from ..zones import ZoneManager, ZoneDetector
 from ..utils import (
     Logger,
@@ -24,6 +35,29 @@ from ..utils import (
 from .heyapi_ts import HeyAPITypeScriptGenerator
 from .python_client import PythonClientGenerator
 from .archive_manager import ArchiveManager
+from .schema_engine import generate_schema_in_process, is_inprocess_available
+from .worker_pool import SchemaWorkerPool
+from .schema_cache import SchemaCache
+from .schema_diff import diff_schemas
+from .schema_io import (
+    SCHEMA_FORMATS,
+    get_parsed_schema_cache,
+    load_schema,
+    schema_filename,
+)
+from .pipeline import PipelineScheduler
+from .job_scheduler import JobScheduler
+from .output_writer import OutputWriter
+from .sharding import (
+    app_shards,
+    shard_path_prefix,
+    write_merged_schema,
+    write_shard_schemas,
+)
+from .shared_models import COMMON_PACKAGE, write_common_schema
+from ..resources import MB, get_resource_tuner
+from ..metrics import ProcessUsage, get_stage_recorder
+from ..tracing import get_tracer
 
 
 class OpenAPIGenerator:
@@ -50,15 +84,118 @@ class OpenAPIGenerator:
         self.output_dir = Path(self.config.output.base_directory)
         self._setup_directories()
 
-        # Initialize generators
-        self.ts_generator = HeyAPITypeScriptGenerator(self.config, self.logger)
-        self.python_generator = PythonClientGenerator(self.config, self.logger)
+        # Concurrency limits for max_workers="auto" and launch throttling
+        self.resource_tuner = get_resource_tuner()
+        self.resource_tuner.headroom_bytes = self.config.memory_headroom_mb * MB
+
+        # Per-zone stage timings of the current run, and spans when tracing
+        self.stage_recorder = get_stage_recorder()
+        self.tracer = get_tracer()
+
+        # Parsed YAML schemas are reused by diffing, sharding and shared models
+        self.parsed_schema_cache = get_parsed_schema_cache()
+        self.parsed_schema_cache.configure(
+            self.output_dir / self.config.output.schemas_directory / ".parsed"
+            if self.config.parsed_schema_cache
+            else None
+        )
+
+        # Every stage submits its jobs to one shared scheduler
+        self.job_scheduler = JobScheduler(
+            self._worker_budget(), self.config.stage_limits, self.logger
+        )
+
+        # Initialize generators; all output goes through one write-if-changed layer
+        self.output_writer = OutputWriter(self.logger)
+        self.ts_generator = HeyAPITypeScriptGenerator(
+            self.config, self.logger, self.output_writer, self.job_scheduler
+        )
+        self.python_generator = PythonClientGenerator(
+            self.config, self.logger, self.output_writer, self.job_scheduler
+        )
 
         # Initialize additional services
         self.archive_manager = ArchiveManager(self.config, self.logger, self.output_dir)
 
+        # Utilization of the last schema worker pool run
+        self.schema_worker_stats: List[WorkerStats] = []
+
+        # Schema cache results of the last run
+        self.schema_cache_hits: List[str] = []
+        self.schema_cache_misses: List[str] = []
+
+        # Zones skipped by the last incremental run
+        self.unchanged_zones: List[str] = []
+
+        # Client sub-schemas of sharded zones in the current run
+        self.client_shards: Dict[str, Dict[str, Path]] = {}
+        self._client_shards_lock = threading.Lock()
+
+        # Models emitted once into the common package in the current run
+        self.shared_models: List[str] = []
+
+        # Keep the Node worker between runs (watch mode) until ts_generator.close()
+        self.persistent_workers = False
+
+        # Critical path of the last streaming pipeline run
+        self.critical_path: List[PipelineTaskStats] = []
+
         self.logger.info("OpenAPI Generator initialized")
 
+    def _stage_workers(self, stage: str, jobs: int, cpu_bound: bool = False) -> int:
+        """
+        Number of concurrent workers for a stage.
+
+        Args:
+            stage: Stage name ("schema", "typescript", "python", "client")
+            jobs: Number of jobs in the stage
+            cpu_bound: Never exceed the CPU count, even with a fixed max_workers
+
+        Returns:
+            Worker count of at least 1
+        """
+        if not self.config.enable_multithreading:
+            return 1
+
+        workers = self.resource_tuner.stage_workers(
+            stage, jobs, self.config.max_workers
+        )
+        if cpu_bound:
+            workers = min(workers, self.resource_tuner.cpu_count)
+        return max(1, workers)
+
+    def _worker_budget(self) -> int:
+        """Number of jobs all stages may run at the same time."""
+        if not self.config.enable_multithreading:
+            return 1
+        if self.config.max_workers == "auto":
+            return self.resource_tuner.cpu_count
+        return self.config.max_workers
+
+    def _schedule(self, stage: str, jobs: int) -> int:
+        """
+        Apply the limits for a stage to the job scheduler.
+
+        The stage gets its worker count from _stage_workers(), capped by the
+        configured stage_limits; all stages share the global budget.
+
+        Args:
+            stage: Stage name
+            jobs: Number of jobs in the stage
+
+        Returns:
+            Concurrency limit of the stage
+        """
+        workers = self._stage_workers(stage, jobs)
+        limit = self.config.stage_limits.get(stage)
+        if limit:
+            workers = min(workers, limit)
+
+        self.job_scheduler.configure(
+            max_workers=self._worker_budget(), stage_limits={stage: workers}
+        )
+        return workers
+
     def _setup_directories(self):
         """Setup output directories based on configuration."""
         directories = [
@@ -109,8 +246,35 @@ class OpenAPIGenerator:
         self.logger.success("Environment validation completed")
         return True
 
+    def _resolve_schema_engine(self) -> str:
+        """
+        Resolve the schema engine to use for this run.
+
+        Falls back to the subprocess engine when Django or drf-spectacular
+        cannot be used inside the current interpreter.
+
+        Returns:
+            Name of the schema engine ("inprocess", "pool" or "subprocess")
+        """
+        engine = self.config.schema_engine
+
+        if engine in ("inprocess", "pool") and not is_inprocess_available():
+            self.logger.warning(
+                f"{engine.title()} schema generation unavailable (Django not ready), "
+                "falling back to subprocess engine"
+            )
+            engine = "subprocess"
+
+        return engine
+
     def _generate_single_schema(
-        self, zone_name: str, zone, schemas_dir: Path, manage_py: Path
+        self,
+        zone_name: str,
+        zone,
+        schemas_dir: Path,
+        manage_py: Optional[Path] = None,
+        engine: str = "subprocess",
+        path_prefix: Optional[str] = None,
     ) -> Tuple[str, Optional[Path]]:
         """
         Generate schema for a single zone.
@@ -119,7 +283,9 @@ class OpenAPIGenerator:
             zone_name: Name of the zone
             zone: Zone configuration
             schemas_dir: Directory for schemas
-            manage_py: Path to Django manage.py
+            manage_py: Path to Django manage.py (subprocess engine only)
+            engine: Schema engine to use ("inprocess" or "subprocess")
+            path_prefix: SCHEMA_PATH_PREFIX for app shards (in-process only)
 
         Returns:
             Tuple of (zone_name, schema_file_path or None)
@@ -128,33 +294,48 @@ class OpenAPIGenerator:
             self.logger.info(f"Generating schema for zone: {zone_name}")
 
             # Schema file path
-            schema_file = schemas_dir / f"{zone_name}.yaml"
+            schema_file = self._schema_file(schemas_dir, zone_name)
 
             # Create URLconf for this zone
-            urlconf_module = self.zone_manager.create_dynamic_urlconf_module(
-                zone_name, zone
-            )
+            with self.stage_recorder.stage("urlconf", zone_name):
+                urlconf_module = self.zone_manager.create_dynamic_urlconf_module(
+                    zone_name, zone
+                )
 
             if not urlconf_module:
                 self.logger.error(f"Failed to create URLconf for {zone_name}")
                 return zone_name, None
 
-            # Generate schema using drf-spectacular
-            cmd = [
-                "python",
-                str(manage_py),
-                "spectacular",
-                "--file",
-                str(schema_file),
-                "--api-version",
-                zone.version,
-                "--urlconf",
-                urlconf_module.__name__,
-            ]
-
-            success, output = run_command(" ".join(cmd), timeout=60)
+            with self.stage_recorder.stage("schema", zone_name) as timing:
+                if engine == "inprocess":
+                    # Drive drf-spectacular directly in the already booted Django
+                    success, output = generate_schema_in_process(
+                        urlconf_module,
+                        zone.version,
+                        schema_file,
+                        self.logger,
+                        path_prefix,
+                    )
+                else:
+                    # Generate schema using drf-spectacular
+                    cmd = [
+                        "python",
+                        str(manage_py),
+                        "spectacular",
+                        "--file",
+                        str(schema_file),
+                        "--api-version",
+                        zone.version,
+                        "--urlconf",
+                        urlconf_module.__name__,
+                    ]
+                    if self.config.schema_format == "json":
+                        cmd += ["--format", "openapi-json"]
+
+                    success, output = run_command(cmd, timeout=60, stage="schema")
 
             if success and schema_file.exists():
+                timing.files = 1
                 self.logger.success(f"Schema generated: {schema_file}")
                 return zone_name, schema_file
             else:
@@ -165,82 +346,180 @@ class OpenAPIGenerator:
             self.logger.error(f"Exception generating schema for {zone_name}: {e}")
             return zone_name, None
 
-    def generate_schemas(self, zones: Optional[List[str]] = None) -> Dict[str, Path]:
+    def _generate_schemas_with_pool(
+        self,
+        zones_to_process: Dict[str, ZoneModel],
+        schemas_dir: Path,
+        path_prefixes: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Path]:
         """
-        Generate OpenAPI schemas for zones using drf-spectacular with multithreading support.
+        Generate schemas on a pool of warm worker processes.
+
+        Each worker boots Django once and is reused for many zones.
 
         Args:
-            zones: Optional list of zone names. If None, generates for all zones.
+            zones_to_process: Mapping of zone names to zone models
+            schemas_dir: Directory for schemas
+            path_prefixes: SCHEMA_PATH_PREFIX of app shards by zone name
 
         Returns:
             Dictionary mapping zone names to schema file paths
         """
-        self.logger.info("Generating OpenAPI schemas...")
+        size = self._stage_workers("schema", len(zones_to_process), cpu_bound=True)
+        pool = SchemaWorkerPool(self.config, size=size, logger=self.logger)
+        generated_schemas = {}
 
-        # Get zones to process
-        all_zones = self.zone_manager.zones
-        if zones:
-            zones_to_process = {
-                name: zone for name, zone in all_zones.items() if name in zones
+        try:
+            if not pool.start():
+                self.logger.warning(
+                    "Schema worker pool failed to start, using in-process generation"
+                )
+                for zone_name, zone in zones_to_process.items():
+                    zone_name_result, schema_file = self._generate_single_schema(
+                        zone_name,
+                        zone,
+                        schemas_dir,
+                        engine="inprocess",
+                        path_prefix=(path_prefixes or {}).get(zone_name),
+                    )
+                    if schema_file:
+                        generated_schemas[zone_name_result] = schema_file
+                return generated_schemas
+
+            self.logger.info(
+                f"Using schema worker pool with {size} processes "
+                f"for {len(zones_to_process)} zones"
+            )
+
+            jobs = {
+                zone_name: (zone, self._schema_file(schemas_dir, zone_name))
+                for zone_name, zone in zones_to_process.items()
             }
-        else:
-            zones_to_process = all_zones
+            results = pool.generate(jobs, path_prefixes)
+
+            for zone_name, (success, error) in results.items():
+                schema_file = jobs[zone_name][1]
+                generated = success and schema_file.exists()
+                # Zones ran in worker processes; their busy time is the stage
+                self.stage_recorder.record(
+                    StageTiming(
+                        stage="schema",
+                        zone_name=zone_name,
+                        duration_seconds=pool.zone_seconds.get(zone_name, 0.0),
+                        files=1 if generated else 0,
+                    )
+                )
+                if generated:
+                    self.logger.success(f"Schema generated: {schema_file}")
+                    generated_schemas[zone_name] = schema_file
+                else:
+                    self.logger.error(
+                        f"Schema generation failed for {zone_name}: {error}"
+                    )
+        finally:
+            pool.close()
+            self.schema_worker_stats = pool.get_stats()
 
-        if not zones_to_process:
-            self.logger.warning("No zones to process")
-            return {}
+        return generated_schemas
 
-        # Create schemas directory
-        schemas_dir = self.output_dir / self.config.output.schemas_directory
-        schemas_dir.mkdir(parents=True, exist_ok=True)
+    def _run_schema_engine(
+        self, zones_to_process: Dict[str, ZoneModel], schemas_dir: Path
+    ) -> Dict[str, Path]:
+        """
+        Generate schemas for zones with the configured schema engine.
+
+        Args:
+            zones_to_process: Mapping of zone names to zone models
+            schemas_dir: Directory for schemas
+
+        Returns:
+            Dictionary mapping zone names to schema file paths
+        """
+        engine = self._resolve_schema_engine()
 
         # Find Django manage.py
-        manage_py = get_django_manage_py()
-        if not manage_py:
-            self.logger.error("Django manage.py not found")
-            return {}
+        manage_py = None
+        if engine == "subprocess":
+            manage_py = get_django_manage_py()
+            if not manage_py:
+                self.logger.error("Django manage.py not found")
+                return {}
+
+        # Zones sharded by app get one schema per app, generated on parallel
+        # pool workers and merged afterwards. In-process generation is
+        # serialized, and `manage.py spectacular` cannot take the path prefix
+        # that keeps operation ids stable, so other engines do not shard.
+        schema_shards = {}
+        path_prefixes = {}
+        if engine == "pool":
+            expanded = {}
+            for zone_name, zone in zones_to_process.items():
+                sub_zones = app_shards(zone)
+                if sub_zones:
+                    schema_shards[zone_name] = list(sub_zones)
+                    path_prefixes.update(
+                        dict.fromkeys(sub_zones, shard_path_prefix(self.config.api_prefix))
+                    )
+                expanded.update(sub_zones or {zone_name: zone})
+            zones_to_process = expanded
 
         generated_schemas = {}
 
+        if engine == "pool":
+            generated_schemas = self._generate_schemas_with_pool(
+                zones_to_process, schemas_dir, path_prefixes
+            )
+
+        elif engine == "inprocess":
+            # One booted Django serves every zone; drf-spectacular is not
+            # thread-safe, so zones are generated one after another.
+            self.logger.info(
+                f"Using in-process schema generation for {len(zones_to_process)} zones"
+            )
+
+            for zone_name, zone in zones_to_process.items():
+                zone_name_result, schema_file = self._generate_single_schema(
+                    zone_name, zone, schemas_dir, engine=engine
+                )
+                if schema_file:
+                    generated_schemas[zone_name_result] = schema_file
+
         # Check if multithreading is enabled and we have multiple zones
-        if (
-            self.config.enable_multithreading
-            and len(zones_to_process) > 1
-            and self.config.max_workers > 1
+        elif (
+            len(zones_to_process) > 1
+            and self._schedule("schema", len(zones_to_process)) > 1
         ):
+            workers = self.job_scheduler.stage_limit("schema")
 
             self.logger.info(
-                f"Using multithreaded generation with {self.config.max_workers} workers for {len(zones_to_process)} zones"
+                f"Using multithreaded generation with {workers} workers for {len(zones_to_process)} zones"
             )
 
-            # Use ThreadPoolExecutor for concurrent schema generation
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=min(self.config.max_workers, len(zones_to_process))
-            ) as executor:
+            # Submit all schema generation jobs to the shared scheduler
+            future_to_zone = {
+                self.job_scheduler.submit(
+                    "schema",
+                    self._generate_single_schema,
+                    zone_name,
+                    zone,
+                    schemas_dir,
+                    manage_py,
+                    engine,
+                ): zone_name
+                for zone_name, zone in zones_to_process.items()
+            }
 
-                # Submit all schema generation tasks
-                future_to_zone = {
-                    executor.submit(
-                        self._generate_single_schema,
-                        zone_name,
-                        zone,
-                        schemas_dir,
-                        manage_py,
-                    ): zone_name
-                    for zone_name, zone in zones_to_process.items()
-                }
-
-                # Collect results as they complete
-                for future in concurrent.futures.as_completed(future_to_zone):
-                    zone_name = future_to_zone[future]
-                    try:
-                        zone_name_result, schema_file = future.result()
-                        if schema_file:
-                            generated_schemas[zone_name_result] = schema_file
-                    except Exception as e:
-                        self.logger.error(
-                            f"Exception in thread for zone {zone_name}: {e}"
-                        )
+            # Collect results as they complete
+            for future in concurrent.futures.as_completed(future_to_zone):
+                zone_name = future_to_zone[future]
+                try:
+                    zone_name_result, schema_file = future.result()
+                    if schema_file:
+                        generated_schemas[zone_name_result] = schema_file
+                except Exception as e:
+                    self.logger.error(
+                        f"Exception in thread for zone {zone_name}: {e}"
+                    )
         else:
             # Fallback to sequential generation
             if len(zones_to_process) == 1:
@@ -252,11 +531,255 @@ class OpenAPIGenerator:
 
             for zone_name, zone in zones_to_process.items():
                 zone_name_result, schema_file = self._generate_single_schema(
-                    zone_name, zone, schemas_dir, manage_py
+                    zone_name, zone, schemas_dir, manage_py, engine
                 )
                 if schema_file:
                     generated_schemas[zone_name_result] = schema_file
 
+        for zone_name, sub_names in schema_shards.items():
+            schema_file = self._merge_schema_shards(
+                zone_name,
+                [generated_schemas.pop(name, None) for name in sub_names],
+                schemas_dir,
+            )
+            if schema_file:
+                generated_schemas[zone_name] = schema_file
+
+        return generated_schemas
+
+    def _merge_schema_shards(
+        self, zone_name: str, shard_files: List[Optional[Path]], schemas_dir: Path
+    ) -> Optional[Path]:
+        """
+        Merge the per-app schemas of a sharded zone into the zone schema.
+
+        Args:
+            zone_name: Name of the zone
+            shard_files: Schema file of each app, None where generation failed
+            schemas_dir: Directory for schemas
+
+        Returns:
+            Path of the zone schema, or None if a shard failed
+        """
+        generated = [path for path in shard_files if path]
+        if len(generated) < len(shard_files):
+            self.logger.error(
+                f"Schema generation failed for {len(shard_files) - len(generated)} "
+                f"of {len(shard_files)} shards of zone {zone_name}"
+            )
+            for path in generated:
+                path.unlink(missing_ok=True)
+            return None
+
+        schema_file = self._schema_file(schemas_dir, zone_name)
+        if not write_merged_schema(generated, schema_file, self.logger):
+            return None
+
+        self.logger.success(
+            f"Schema generated: {schema_file} (merged from {len(generated)} shards)"
+        )
+        return schema_file
+
+    def _client_shards_for(self, schemas: Dict[str, Path]) -> Dict[str, Dict[str, Path]]:
+        """
+        Split the schemas of sharded zones into client sub-schemas.
+
+        Every zone is split once per run; the sub-schemas are written to the
+        temp directory.
+
+        Args:
+            schemas: Dictionary mapping zone names to schema paths
+
+        Returns:
+            Dictionary mapping sharded zone names to their sub-schema files
+        """
+        zones = self.zone_manager.zones
+        shards_dir = self.output_dir / self.config.output.temp_directory / "shards"
+
+        with self._client_shards_lock:
+            for zone_name, schema_path in schemas.items():
+                zone = zones.get(zone_name)
+                if zone_name in self.client_shards or not (zone and zone.shard_by):
+                    continue
+
+                try:
+                    files = write_shard_schemas(
+                        load_schema(schema_path),
+                        zone,
+                        self.config.api_prefix,
+                        shards_dir / zone_name,
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Could not shard zone {zone_name}: {e}")
+                    files = {}
+
+                if files:
+                    self.logger.info(
+                        f"Zone {zone_name}: {len(files)} client shards by {zone.shard_by}"
+                    )
+                self.client_shards[zone_name] = files
+
+            return {
+                zone_name: self.client_shards[zone_name]
+                for zone_name in schemas
+                if self.client_shards.get(zone_name)
+            }
+
+    def _prepare_shared_models(self, schemas: Dict[str, Path]) -> Dict[str, Path]:
+        """
+        Write the schema of the common package from the zone schemas of a run.
+
+        Zone clients are generated without shared models until the common
+        clients are built, see _use_common_client().
+
+        Args:
+            schemas: Dictionary mapping zone names to schema paths
+
+        Returns:
+            {COMMON_PACKAGE: schema path}, or empty if no models are shared
+        """
+        self.shared_models = []
+        self.ts_generator.common_dir = None
+        self.python_generator.common_dir = None
+
+        if not self.config.shared_models or len(schemas) < 2:
+            return {}
+
+        if COMMON_PACKAGE in self.zone_manager.zones:
+            self.logger.warning(
+                f"A zone is named '{COMMON_PACKAGE}', not emitting shared models"
+            )
+            return {}
+
+        schemas_dir = self.output_dir / self.config.output.schemas_directory
+        schema_file = self._schema_file(schemas_dir, COMMON_PACKAGE)
+        try:
+            with self.stage_recorder.stage("shared_models") as timing:
+                shared = write_common_schema(schemas, schema_file)
+                timing.files = 1 if shared else 0
+        except Exception as e:
+            self.logger.warning(f"Could not determine shared models: {e}")
+            return {}
+
+        if not shared:
+            self.logger.info("No models shared between zones")
+            return {}
+
+        self.shared_models = shared
+        self.logger.info(
+            f"{len(shared)} models shared between zones go to the "
+            f"{COMMON_PACKAGE} package"
+        )
+        return {COMMON_PACKAGE: schema_file}
+
+    def _shared_models_changed(self, common: Dict[str, Path]) -> bool:
+        """
+        Check whether the common clients must be rebuilt.
+
+        Zone clients import from the common package, so when it changes
+        every zone client has to be regenerated as well.
+
+        Args:
+            common: Result of _prepare_shared_models()
+
+        Returns:
+            bool: True if the shared models differ from those the current
+            clients were built with
+        """
+        if not self.config.incremental:
+            return bool(common)
+
+        if not common:
+            built_dir = self._built_schemas_dir()
+            return any(
+                (built_dir / schema_filename(COMMON_PACKAGE, schema_format)).exists()
+                for schema_format in SCHEMA_FORMATS
+            )
+
+        return bool(self.select_changed_zones(common))
+
+    def _use_common_client(self, generator, result: Optional[GenerationResult] = None):
+        """
+        Let the zone clients of a generator import from its common client.
+
+        Args:
+            generator: TypeScript or Python client generator
+            result: Result of building the common client, None if the
+                existing client is still current
+        """
+        client_dir = generator.output_dir / COMMON_PACKAGE
+        if result.success if result else client_dir.exists():
+            generator.common_dir = client_dir
+
+    def generate_schemas(self, zones: Optional[List[str]] = None) -> Dict[str, Path]:
+        """
+        Generate OpenAPI schemas for zones using drf-spectacular with multithreading support.
+
+        Args:
+            zones: Optional list of zone names. If None, generates for all zones.
+
+        Returns:
+            Dictionary mapping zone names to schema file paths
+        """
+        self.logger.info("Generating OpenAPI schemas...")
+
+        # Get zones to process
+        all_zones = self.zone_manager.zones
+        if zones:
+            zones_to_process = {
+                name: zone for name, zone in all_zones.items() if name in zones
+            }
+        else:
+            zones_to_process = all_zones
+
+        if not zones_to_process:
+            self.logger.warning("No zones to process")
+            return {}
+
+        # Create schemas directory
+        schemas_dir = self.output_dir / self.config.output.schemas_directory
+        schemas_dir.mkdir(parents=True, exist_ok=True)
+
+        generated_schemas = {}
+        self.schema_worker_stats = []
+        self.schema_cache_hits = []
+        self.schema_cache_misses = []
+        self.client_shards = {}
+
+        # Reuse schemas whose inputs did not change since the last run
+        schema_cache = None
+        if self.config.schema_cache:
+            schema_cache = SchemaCache(self.config, schemas_dir, self.logger)
+            for zone_name, zone in zones_to_process.items():
+                cached_schema = schema_cache.lookup(zone_name, zone)
+                if cached_schema:
+                    generated_schemas[zone_name] = cached_schema
+
+            self.schema_cache_hits = list(schema_cache.hits)
+            self.schema_cache_misses = list(schema_cache.misses)
+            zones_to_process = {
+                name: zone
+                for name, zone in zones_to_process.items()
+                if name not in generated_schemas
+            }
+
+        if zones_to_process:
+            fresh_schemas = self._run_schema_engine(zones_to_process, schemas_dir)
+            generated_schemas.update(fresh_schemas)
+
+            if schema_cache:
+                for zone_name, schema_file in fresh_schemas.items():
+                    schema_cache.store(
+                        zone_name, zones_to_process[zone_name], schema_file
+                    )
+
+        if schema_cache:
+            schema_cache.save()
+            self.logger.info(
+                f"Schema cache: {len(self.schema_cache_hits)} hits, "
+                f"{len(self.schema_cache_misses)} misses"
+            )
+
         self.logger.info(f"Generated {len(generated_schemas)} schemas")
         return generated_schemas
 
@@ -264,6 +787,7 @@ class OpenAPIGenerator:
         self,
         schemas: Optional[Dict[str, Path]] = None,
         zones: Optional[List[str]] = None,
+        format_files: bool = True,
     ) -> Dict[str, GenerationResult]:
         """
         Generate TypeScript clients for zones with multithreading support.
@@ -271,6 +795,7 @@ class OpenAPIGenerator:
         Args:
             schemas: Optional dictionary of zone schemas
             zones: Optional list of zone names
+            format_files: Format the generated clients in one batch afterwards
 
         Returns:
             Dictionary of generation results
@@ -286,48 +811,15 @@ class OpenAPIGenerator:
             schemas = self.generate_schemas(zones)
 
         # Check if multithreading is enabled and we have multiple schemas
-        if (
-            self.config.enable_multithreading
-            and len(schemas) > 1
-            and self.config.max_workers > 1
-        ):
+        if len(schemas) > 1 and self._schedule("typescript", len(schemas)) > 1:
+            workers = self.job_scheduler.stage_limit("typescript")
 
             self.logger.info(
-                f"Using multithreaded TypeScript generation with {self.config.max_workers} workers for {len(schemas)} schemas"
+                f"Using multithreaded TypeScript generation with {workers} workers for {len(schemas)} schemas"
             )
 
-            # Use ThreadPoolExecutor for concurrent client generation
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=min(self.config.max_workers, len(schemas))
-            ) as executor:
-
-                # Submit all client generation tasks
-                future_to_zone = {
-                    executor.submit(
-                        self.ts_generator.generate_client, zone_name, schema_path
-                    ): zone_name
-                    for zone_name, schema_path in schemas.items()
-                }
-
-                # Collect results as they complete
-                results = {}
-                for future in concurrent.futures.as_completed(future_to_zone):
-                    zone_name = future_to_zone[future]
-                    try:
-                        result = future.result()
-                        results[zone_name] = result
-                    except Exception as e:
-                        self.logger.error(
-                            f"Exception in TypeScript thread for zone {zone_name}: {e}"
-                        )
-                        # Create failed result
-                        results[zone_name] = GenerationResult(
-                            success=False,
-                            zone_name=zone_name,
-                            output_path=Path(),
-                            files_generated=0,
-                            error_message=str(e),
-                        )
+            futures = self._submit_clients("typescript", self.ts_generator, schemas)
+            results = self._collect_clients(futures, "TypeScript")
         else:
             # Fallback to sequential generation
             if len(schemas) == 1:
@@ -341,7 +833,12 @@ class OpenAPIGenerator:
             else:
                 self.logger.info("Using sequential TypeScript generation")
 
-            results = self.ts_generator.generate_all(schemas)
+            results = self.ts_generator.generate_all(
+                schemas, format_files=False, shards=self._client_shards_for(schemas)
+            )
+
+        if format_files:
+            self.ts_generator.format_clients(results)
 
         successful = sum(1 for r in results.values() if r.success)
         self.logger.info(
@@ -376,48 +873,15 @@ class OpenAPIGenerator:
             schemas = self.generate_schemas(zones)
 
         # Check if multithreading is enabled and we have multiple schemas
-        if (
-            self.config.enable_multithreading
-            and len(schemas) > 1
-            and self.config.max_workers > 1
-        ):
+        if len(schemas) > 1 and self._schedule("python", len(schemas)) > 1:
+            workers = self.job_scheduler.stage_limit("python")
 
             self.logger.info(
-                f"Using multithreaded Python generation with {self.config.max_workers} workers for {len(schemas)} schemas"
+                f"Using multithreaded Python generation with {workers} workers for {len(schemas)} schemas"
             )
 
-            # Use ThreadPoolExecutor for concurrent client generation
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=min(self.config.max_workers, len(schemas))
-            ) as executor:
-
-                # Submit all client generation tasks
-                future_to_zone = {
-                    executor.submit(
-                        self.python_generator.generate_client, zone_name, schema_path
-                    ): zone_name
-                    for zone_name, schema_path in schemas.items()
-                }
-
-                # Collect results as they complete
-                results = {}
-                for future in concurrent.futures.as_completed(future_to_zone):
-                    zone_name = future_to_zone[future]
-                    try:
-                        result = future.result()
-                        results[zone_name] = result
-                    except Exception as e:
-                        self.logger.error(
-                            f"Exception in Python thread for zone {zone_name}: {e}"
-                        )
-                        # Create failed result
-                        results[zone_name] = GenerationResult(
-                            success=False,
-                            zone_name=zone_name,
-                            output_path=Path(),
-                            files_generated=0,
-                            error_message=str(e),
-                        )
+            futures = self._submit_clients("python", self.python_generator, schemas)
+            results = self._collect_clients(futures, "Python")
         else:
             # Fallback to sequential generation
             if len(schemas) == 1:
@@ -431,7 +895,9 @@ class OpenAPIGenerator:
             else:
                 self.logger.info("Using sequential Python generation")
 
-            results = self.python_generator.generate_all(schemas)
+            results = self.python_generator.generate_all(
+                schemas, self._client_shards_for(schemas)
+            )
 
         successful = sum(1 for r in results.values() if r.success)
         self.logger.info(
@@ -440,6 +906,661 @@ class OpenAPIGenerator:
 
         return results
 
+    def _submit_clients(
+        self, stage: str, generator, schemas: Dict[str, Path]
+    ) -> Dict[concurrent.futures.Future, str]:
+        """
+        Submit one client generation job per zone to the job scheduler.
+
+        Sharded zones build their shards as further jobs of the same stage.
+
+        Args:
+            stage: Scheduler stage ("typescript" or "python")
+            generator: Client generator with a generate_client() method
+            schemas: Dictionary mapping zone names to schema paths
+
+        Returns:
+            Mapping of futures to zone names
+        """
+        shards = self._client_shards_for(schemas)
+        return {
+            self.job_scheduler.submit(
+                stage,
+                generator.generate_client,
+                zone_name,
+                schema_path,
+                **({"shards": shards[zone_name]} if zone_name in shards else {}),
+            ): zone_name
+            for zone_name, schema_path in schemas.items()
+        }
+
+    def _collect_clients(
+        self, future_to_zone: Dict[concurrent.futures.Future, str], label: str
+    ) -> Dict[str, GenerationResult]:
+        """
+        Wait for client generation jobs.
+
+        Args:
+            future_to_zone: Mapping of futures to zone names
+            label: Client kind for log messages
+
+        Returns:
+            Dictionary of generation results; exceptions become failed results
+        """
+        results = {}
+        for future in concurrent.futures.as_completed(future_to_zone):
+            zone_name = future_to_zone[future]
+            try:
+                results[zone_name] = future.result()
+            except Exception as e:
+                self.logger.error(
+                    f"Exception in {label} job for zone {zone_name}: {e}"
+                )
+                results[zone_name] = GenerationResult(
+                    success=False,
+                    zone_name=zone_name,
+                    output_path=Path(),
+                    files_generated=0,
+                    error_message=str(e),
+                )
+        return results
+
+    def _schema_file(self, schemas_dir: Path, name: str) -> Path:
+        """Schema file of a zone in the configured schema format."""
+        return schemas_dir / schema_filename(name, self.config.schema_format)
+
+    def _built_schemas_dir(self) -> Path:
+        """Directory with copies of the schemas the current clients were built from."""
+        return self.output_dir / self.config.output.schemas_directory / ".built"
+
+    def _generators_fingerprint(self) -> str:
+        """Serialized generator settings that shape every client."""
+        fingerprint = {
+            "version": self.config.version,
+            "generators": self.config.generators.model_dump(mode="json"),
+        }
+        shard_by = {
+            zone_name: zone.shard_by
+            for zone_name, zone in self.zone_manager.zones.items()
+            if zone.shard_by
+        }
+        if shard_by:
+            fingerprint["shard_by"] = shard_by
+        if self.config.shared_models:
+            fingerprint["shared_models"] = True
+        return json.dumps(fingerprint, sort_keys=True)
+
+    def _zone_client_dirs(self, zone_name: str) -> List[Path]:
+        """Output directories of the enabled client generators for a zone."""
+        client_dirs = []
+        if self.config.generators.typescript.enabled:
+            client_dirs.append(self.ts_generator.output_dir / zone_name)
+        if self.config.generators.python.enabled:
+            client_dirs.append(self.python_generator.output_dir / zone_name)
+        return client_dirs
+
+    def select_changed_zones(self, schemas: Dict[str, Path]) -> Dict[str, Path]:
+        """
+        Select zones whose clients must be regenerated.
+
+        Each schema is diffed against the schema its current clients were
+        built from; zones without any operation or component change keep
+        their clients.
+
+        Args:
+            schemas: Dictionary mapping zone names to new schema paths
+
+        Returns:
+            Dictionary of schemas for zones that need new clients
+        """
+        built_dir = self._built_schemas_dir()
+        generators_file = built_dir / "_generators.json"
+
+        try:
+            previous_generators = generators_file.read_text(encoding="utf-8")
+        except OSError:
+            previous_generators = None
+
+        if previous_generators != self._generators_fingerprint():
+            self.logger.info("Generator settings changed, regenerating all clients")
+            return dict(schemas)
+
+        changed = {}
+        for zone_name, schema_path in schemas.items():
+            built_schema = built_dir / schema_path.name
+
+            if not built_schema.exists():
+                self.logger.info(f"Zone {zone_name}: no previous build")
+                changed[zone_name] = schema_path
+                continue
+
+            if not all(path.exists() for path in self._zone_client_dirs(zone_name)):
+                self.logger.info(f"Zone {zone_name}: client output missing")
+                changed[zone_name] = schema_path
+                continue
+
+            # Identical files need no parsing
+            if filecmp.cmp(built_schema, schema_path, shallow=False):
+                continue
+
+            try:
+                diff = diff_schemas(load_schema(built_schema), load_schema(schema_path))
+            except Exception as e:
+                self.logger.warning(f"Could not diff schema for {zone_name}: {e}")
+                changed[zone_name] = schema_path
+                continue
+
+            if diff.has_changes:
+                self.logger.info(f"Zone {zone_name}: {diff.describe()}")
+                changed[zone_name] = schema_path
+
+        return changed
+
+    def _record_built_schemas(
+        self,
+        schemas: Dict[str, Path],
+        typescript_results: Dict[str, GenerationResult],
+        python_results: Dict[str, GenerationResult],
+    ):
+        """
+        Remember the schemas that clients were successfully built from.
+
+        Args:
+            schemas: Schemas the clients were generated from
+            typescript_results: TypeScript generation results
+            python_results: Python generation results
+        """
+        built_dir = self._built_schemas_dir()
+
+        try:
+            built_dir.mkdir(parents=True, exist_ok=True)
+
+            enabled_results = []
+            if self.config.generators.typescript.enabled:
+                enabled_results.append(typescript_results)
+            if self.config.generators.python.enabled:
+                enabled_results.append(python_results)
+
+            for zone_name, schema_path in schemas.items():
+                built_schema = built_dir / schema_path.name
+                succeeded = all(
+                    zone_name in results and results[zone_name].success
+                    for results in enabled_results
+                )
+
+                if succeeded:
+                    shutil.copyfile(schema_path, built_schema)
+                elif built_schema.exists():
+                    built_schema.unlink()
+
+                # Drop the copy from before a schema_format change
+                for schema_format in SCHEMA_FORMATS:
+                    other = built_dir / schema_filename(zone_name, schema_format)
+                    if other != built_schema:
+                        other.unlink(missing_ok=True)
+
+            if not self.shared_models:
+                for schema_format in SCHEMA_FORMATS:
+                    (built_dir / schema_filename(COMMON_PACKAGE, schema_format)).unlink(
+                        missing_ok=True
+                    )
+
+            (built_dir / "_generators.json").write_text(
+                self._generators_fingerprint(), encoding="utf-8"
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to record built schemas: {e}")
+
+    def _remove_stale_clients(self, zone_names: List[str]):
+        """
+        Delete client directories of zones that no longer exist.
+
+        Args:
+            zone_names: Names of all configured zones
+        """
+        output_dirs = {self.ts_generator.output_dir, self.python_generator.output_dir}
+        for output_dir in output_dirs:
+            if not output_dir.exists():
+                continue
+
+            for client_dir in output_dir.iterdir():
+                if (
+                    client_dir.is_dir()
+                    and not client_dir.name.startswith(".")
+                    and client_dir.name not in zone_names
+                ):
+                    deleted = self.output_writer.remove_tree(client_dir)
+                    self.logger.info(
+                        f"Removed stale client {client_dir} ({deleted} files)"
+                    )
+
+    def _run_staged_generation(
+        self, zones_to_process: Dict[str, ZoneModel]
+    ) -> Tuple[
+        Dict[str, GenerationResult], Dict[str, GenerationResult], Dict[str, Path]
+    ]:
+        """
+        Generate all schemas, then all clients.
+
+        Args:
+            zones_to_process: Mapping of zone names to zone models
+
+        Returns:
+            Tuple of (TypeScript results, Python results, schemas of the
+            zones whose clients were generated)
+        """
+        # Generate schemas
+        with self.tracer.span("schemas", "run"):
+            schemas = self.generate_schemas(list(zones_to_process.keys()))
+
+        common = self._prepare_shared_models(schemas)
+        common_changed = self._shared_models_changed(common)
+
+        # Only zones whose schema changed need new clients
+        client_schemas = schemas
+        self.unchanged_zones = []
+        if self.config.incremental:
+            client_schemas = self.select_changed_zones(schemas)
+            if common_changed and len(client_schemas) < len(schemas):
+                self.logger.info("Shared models changed, regenerating all clients")
+                client_schemas = dict(schemas)
+            self.unchanged_zones = sorted(set(schemas) - set(client_schemas))
+
+            self.logger.info(
+                f"Incremental generation: {len(client_schemas)} changed, "
+                f"{len(self.unchanged_zones)} unchanged zones"
+            )
+
+        # The common clients come first; zone clients import from them
+        common_typescript: Dict[str, GenerationResult] = {}
+        common_python: Dict[str, GenerationResult] = {}
+        if common and common_changed:
+            ts_futures = {}
+            py_futures = {}
+            if self.config.generators.typescript.enabled:
+                ts_futures = self._submit_clients("typescript", self.ts_generator, common)
+            if self.config.generators.python.enabled:
+                py_futures = self._submit_clients("python", self.python_generator, common)
+            common_typescript = self._collect_clients(ts_futures, "TypeScript")
+            common_python = self._collect_clients(py_futures, "Python")
+        if common:
+            self._use_common_client(self.ts_generator, common_typescript.get(COMMON_PACKAGE))
+            self._use_common_client(self.python_generator, common_python.get(COMMON_PACKAGE))
+
+        # Generate TypeScript and Python clients in parallel if multithreading is enabled
+        workers = self._stage_workers("client", len(client_schemas) * 2)  # TS + Python
+        if len(client_schemas) > 1 and workers > 1:
+
+            self.logger.info(
+                f"Using multithreaded client generation with {workers} workers"
+            )
+
+            # Per-zone jobs of both generators go straight to the shared
+            # scheduler, so the global budget and stage limits hold for all
+            ts_futures = {}
+            py_futures = {}
+            if self.config.generators.typescript.enabled:
+                self._schedule("typescript", len(client_schemas))
+                ts_futures = self._submit_clients(
+                    "typescript", self.ts_generator, client_schemas
+                )
+            if self.config.generators.python.enabled:
+                self._schedule("python", len(client_schemas))
+                py_futures = self._submit_clients(
+                    "python", self.python_generator, client_schemas
+                )
+
+            typescript_results = self._collect_clients(ts_futures, "TypeScript")
+            python_results = self._collect_clients(py_futures, "Python")
+        else:
+            # Sequential generation
+            self.logger.info("Using sequential client generation")
+
+            # Generate TypeScript clients
+            typescript_results = self.generate_typescript_clients(
+                client_schemas, format_files=False
+            )
+
+            # Generate Python clients
+            python_results = self.generate_python_clients(client_schemas)
+
+        if common_typescript or common_python:
+            typescript_results.update(common_typescript)
+            python_results.update(common_python)
+            client_schemas = {**client_schemas, **common}
+
+        # Format TypeScript clients of all zones in one batch
+        self.ts_generator.format_clients(typescript_results)
+
+        return typescript_results, python_results, client_schemas
+
+    def _run_streaming_pipeline(
+        self, zones_to_process: Dict[str, ZoneModel], archive: bool
+    ) -> Tuple[
+        Dict[str, GenerationResult], Dict[str, GenerationResult], Dict[str, Path]
+    ]:
+        """
+        Generate schemas, clients and archives as a per-zone pipeline.
+
+        Every zone flows schema -> TypeScript/Python -> archive on its own,
+        so clients of fast zones are built while slow schemas still run.
+        TypeScript formatting is a single batched Prettier pass that the
+        archives wait for. All tasks run on the shared job scheduler.
+
+        Args:
+            zones_to_process: Mapping of zone names to zone models
+            archive: Whether to archive each zone's clients
+
+        Returns:
+            Tuple of (TypeScript results, Python results, schemas of the
+            zones whose clients were generated)
+        """
+        schemas_dir = self.output_dir / self.config.output.schemas_directory
+        schemas_dir.mkdir(parents=True, exist_ok=True)
+
+        self.schema_worker_stats = []
+        self.schema_cache_hits = []
+        self.schema_cache_misses = []
+        self.unchanged_zones = []
+        self.client_shards = {}
+
+        schema_cache = None
+        if self.config.schema_cache:
+            schema_cache = SchemaCache(self.config, schemas_dir, self.logger)
+
+        engine = self._resolve_schema_engine()
+        manage_py = None
+        if engine == "subprocess":
+            manage_py = get_django_manage_py()
+            if not manage_py:
+                self.logger.error("Django manage.py not found")
+                return {}, {}, {}
+
+        pool = None
+        if engine == "pool":
+            size = self._stage_workers("schema", len(zones_to_process), cpu_bound=True)
+            pool = SchemaWorkerPool(self.config, size=size, logger=self.logger)
+            if not pool.start():
+                self.logger.warning(
+                    "Schema worker pool failed to start, using in-process generation"
+                )
+                pool.close()
+                pool = None
+                engine = "inprocess"
+
+        ts_enabled = self.config.generators.typescript.enabled
+        py_enabled = self.config.generators.python.enabled
+        zone_schemas: Dict[str, Path] = {}
+        client_schemas: Dict[str, Path] = {}
+
+        def generate_schema(
+            zone_name: str, zone: ZoneModel, path_prefix: Optional[str] = None
+        ) -> Optional[Path]:
+            if not pool:
+                return self._generate_single_schema(
+                    zone_name, zone, schemas_dir, manage_py, engine
+                )[1]
+
+            self.logger.info(f"Generating schema for zone: {zone_name}")
+            schema_file = self._schema_file(schemas_dir, zone_name)
+            with self.stage_recorder.stage("schema", zone_name) as timing:
+                success, error = pool.generate_one(
+                    zone_name, zone, schema_file, path_prefix
+                )
+            if not (success and schema_file.exists()):
+                self.logger.error(f"Schema generation failed for {zone_name}: {error}")
+                return None
+            timing.files = 1
+            self.logger.success(f"Schema generated: {schema_file}")
+            return schema_file
+
+        def schema_stage(zone_name: str, zone: ZoneModel) -> Optional[Path]:
+            schema_file = schema_cache.lookup(zone_name, zone) if schema_cache else None
+
+            if schema_file is None:
+                # Apps of a sharded zone are further schema jobs on the pool
+                sub_zones = app_shards(zone) if pool else {}
+                if sub_zones:
+                    path_prefix = shard_path_prefix(self.config.api_prefix)
+                    futures = self.job_scheduler.run_all(
+                        "schema",
+                        generate_schema,
+                        [(name, sub_zone, path_prefix) for name, sub_zone in sub_zones.items()],
+                    )
+                    schema_file = self._merge_schema_shards(
+                        zone_name,
+                        [None if f.exception() else f.result() for f in futures],
+                        schemas_dir,
+                    )
+                else:
+                    schema_file = generate_schema(zone_name, zone)
+                if not schema_file:
+                    return None
+
+                if schema_cache:
+                    schema_cache.store(zone_name, zone, schema_file)
+
+            zone_schemas[zone_name] = schema_file
+            if self.config.incremental:
+                if not self.select_changed_zones({zone_name: schema_file}):
+                    self.unchanged_zones.append(zone_name)
+                    return None
+
+            client_schemas[zone_name] = schema_file
+            self._client_shards_for({zone_name: schema_file})
+            return schema_file
+
+        def shared_models_stage(*_schema_files: Optional[Path]) -> Optional[Path]:
+            common = self._prepare_shared_models(zone_schemas)
+            if not self._shared_models_changed(common):
+                if common:
+                    self._use_common_client(self.ts_generator)
+                    self._use_common_client(self.python_generator)
+                return None
+
+            # Zone clients import from the common package
+            if self.unchanged_zones:
+                self.logger.info("Shared models changed, regenerating all clients")
+                for zone_name in self.unchanged_zones:
+                    client_schemas[zone_name] = zone_schemas[zone_name]
+                self._client_shards_for(client_schemas)
+                self.unchanged_zones.clear()
+
+            if not common:
+                return None
+            client_schemas[COMMON_PACKAGE] = common[COMMON_PACKAGE]
+            return common[COMMON_PACKAGE]
+
+        def common_client_stage(generator):
+            def run(schema_file: Optional[Path]) -> Optional[GenerationResult]:
+                if schema_file is None:
+                    return None
+                result = generator.generate_client(COMMON_PACKAGE, schema_file)
+                self._use_common_client(generator, result)
+                return result
+
+            return run
+
+        def client_stage(generator, zone_name: str):
+            def run(schema_file: Optional[Path], *_common) -> Optional[GenerationResult]:
+                # Unchanged zones are rebuilt when the shared models changed
+                schema_file = schema_file or client_schemas.get(zone_name)
+                if schema_file is None:
+                    return None
+                shards = self.client_shards.get(zone_name)
+                if shards:
+                    return generator.generate_client(
+                        zone_name, schema_file, shards=shards
+                    )
+                return generator.generate_client(zone_name, schema_file)
+
+            return run
+
+        def format_stage(result: Optional[GenerationResult]) -> bool:
+            # Zones finishing together share a batched Prettier run
+            if result is None:
+                return True
+            return self.ts_generator.format_clients({result.zone_name: result})
+
+        def archive_stage(zone_name: str, client_count: int):
+            def run(*results: Optional[GenerationResult]):
+                # Results of the zone's client tasks; the format result follows
+                results = results[:client_count]
+                paths = [r.output_path if r and r.success else None for r in results]
+                if not any(paths):
+                    return None
+                ts_path = paths.pop(0) if ts_enabled else None
+                py_path = paths.pop(0) if py_enabled else None
+                with self.stage_recorder.stage("archive", zone_name) as timing:
+                    result = self.archive_manager.archive_zone_clients(
+                        zone_name, ts_path, py_path
+                    )
+                timing.files = 1 if result.get("success") else 0
+                return result
+
+            return run
+
+        max_workers = self._stage_workers("client", len(zones_to_process) * 2)
+        for stage in ("schema", "typescript", "python"):
+            self._schedule(stage, len(zones_to_process))
+        scheduler = PipelineScheduler(max_workers, self.logger, self.job_scheduler)
+
+        for zone_name, zone in zones_to_process.items():
+            scheduler.add_task(
+                f"schema:{zone_name}",
+                lambda zone_name=zone_name, zone=zone: schema_stage(zone_name, zone),
+                stage="schema",
+                zone_name=zone_name,
+            )
+
+        # Shared models need every schema; the common clients come before
+        # the zone clients that import from them
+        common_deps = {"typescript": [], "python": []}
+        if self.config.shared_models:
+            scheduler.add_task(
+                "shared_models",
+                shared_models_stage,
+                deps=[f"schema:{name}" for name in zones_to_process],
+                stage="shared_models",
+            )
+            for stage, generator, enabled in (
+                ("typescript", self.ts_generator, ts_enabled),
+                ("python", self.python_generator, py_enabled),
+            ):
+                if enabled:
+                    common_deps[stage].append(f"{stage}:{COMMON_PACKAGE}")
+                    scheduler.add_task(
+                        common_deps[stage][0],
+                        common_client_stage(generator),
+                        deps=["shared_models"],
+                        stage=stage,
+                        zone_name=COMMON_PACKAGE,
+                    )
+
+        def add_format_task(zone_name: str):
+            scheduler.add_task(
+                f"format:{zone_name}",
+                format_stage,
+                deps=[f"typescript:{zone_name}"],
+                stage="format",
+                zone_name=zone_name,
+            )
+            return f"format:{zone_name}"
+
+        archive_tasks = []
+        common_tasks = common_deps["typescript"] + common_deps["python"]
+        format_tasks = []
+        if common_deps["typescript"]:
+            format_tasks.append(add_format_task(COMMON_PACKAGE))
+        if archive and common_tasks:
+            archive_tasks.append((COMMON_PACKAGE, common_tasks, format_tasks))
+
+        for zone_name in zones_to_process:
+            schema_task = f"schema:{zone_name}"
+            client_tasks = []
+            if ts_enabled:
+                client_tasks.append(f"typescript:{zone_name}")
+                scheduler.add_task(
+                    client_tasks[-1],
+                    client_stage(self.ts_generator, zone_name),
+                    deps=[schema_task] + common_deps["typescript"],
+                    stage="typescript",
+                    zone_name=zone_name,
+                )
+            if py_enabled:
+                client_tasks.append(f"python:{zone_name}")
+                scheduler.add_task(
+                    client_tasks[-1],
+                    client_stage(self.python_generator, zone_name),
+                    deps=[schema_task] + common_deps["python"],
+                    stage="python",
+                    zone_name=zone_name,
+                )
+
+            format_tasks = [add_format_task(zone_name)] if ts_enabled else []
+
+            if archive and client_tasks:
+                archive_tasks.append((zone_name, client_tasks, format_tasks))
+
+        # Each zone is archived once its own clients are formatted
+        for zone_name, client_tasks, format_tasks in archive_tasks:
+            scheduler.add_task(
+                f"archive:{zone_name}",
+                archive_stage(zone_name, len(client_tasks)),
+                deps=client_tasks + format_tasks,
+                stage="archive",
+                zone_name=zone_name,
+            )
+
+        self.logger.info(
+            f"Running streaming pipeline for {len(zones_to_process)} zones "
+            f"with {scheduler.max_workers} workers"
+        )
+
+        try:
+            results = scheduler.run()
+        finally:
+            if pool:
+                pool.close()
+                self.schema_worker_stats = pool.get_stats()
+
+        if schema_cache:
+            schema_cache.save()
+            self.schema_cache_hits = list(schema_cache.hits)
+            self.schema_cache_misses = list(schema_cache.misses)
+
+        typescript_results = {}
+        python_results = {}
+        for zone_name in client_schemas:
+            for stage, stage_results in (
+                ("typescript", typescript_results),
+                ("python", python_results),
+            ):
+                task_name = f"{stage}:{zone_name}"
+                if task_name in scheduler.errors:
+                    stage_results[zone_name] = GenerationResult(
+                        success=False,
+                        zone_name=zone_name,
+                        output_path=Path(),
+                        files_generated=0,
+                        error_message=scheduler.errors[task_name],
+                    )
+                elif results.get(task_name):
+                    stage_results[zone_name] = results[task_name]
+
+        self.unchanged_zones.sort()
+        self.critical_path = scheduler.critical_path()
+        if self.critical_path:
+            self.logger.info(
+                "Critical path: "
+                + " -> ".join(
+                    f"{task.name} ({task.duration_seconds:.1f}s)"
+                    for task in self.critical_path
+                )
+            )
+
+        return typescript_results, python_results, client_schemas
+
     def archive_clients(
         self,
         typescript_results: Dict[str, GenerationResult],
@@ -480,6 +1601,8 @@ class OpenAPIGenerator:
             GenerationSummary with results
         """
         start_time = time.time()
+        usage = ProcessUsage()
+        self.stage_recorder.reset()
 
         self.logger.info("Starting complete OpenAPI client generation...")
 
@@ -523,115 +1646,69 @@ class OpenAPIGenerator:
             f"Processing {len(zones_to_process)} zones: {list(zones_to_process.keys())}"
         )
 
-        # Clean output directories
-        self.clean_output()
-
-        # Generate schemas
-        schemas = self.generate_schemas(list(zones_to_process.keys()))
-
-        # Generate TypeScript and Python clients in parallel if multithreading is enabled
-        if (
-            self.config.enable_multithreading
-            and len(schemas) > 1
-            and self.config.max_workers > 1
-        ):
-
-            self.logger.info(
-                f"Using multithreaded client generation with {self.config.max_workers} workers"
+        # Clean output directories (cached schemas survive when caching is on);
+        # clients are kept and only their changed files are rewritten
+        self.output_writer.reset()
+        if not self.config.incremental:
+            self.clean_output(
+                keep_schemas=self.config.schema_cache,
+                keep_clients=True,
+                keep_archive=True,
             )
 
-            # Use ThreadPoolExecutor for concurrent client generation
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=min(
-                    self.config.max_workers, len(schemas) * 2
-                )  # *2 for TS + Python
-            ) as executor:
-
-                # Submit TypeScript generation tasks
-                ts_futures = {
-                    executor.submit(
-                        self.generate_typescript_clients, {zone: schemas[zone]}, [zone]
-                    ): f"ts_{zone}"
-                    for zone in schemas.keys()
-                }
-
-                # Submit Python generation tasks
-                py_futures = {
-                    executor.submit(
-                        self.generate_python_clients, {zone: schemas[zone]}, [zone]
-                    ): f"py_{zone}"
-                    for zone in schemas.keys()
-                }
-
-                # Combine all futures
-                all_futures = {**ts_futures, **py_futures}
-
-                # Collect results
-                typescript_results = {}
-                python_results = {}
-
-                for future in concurrent.futures.as_completed(all_futures):
-                    task_name = all_futures[future]
-                    try:
-                        result = future.result()
-                        if task_name.startswith("ts_"):
-                            zone = task_name[3:]  # Remove "ts_" prefix
-                            typescript_results[zone] = result.get(
-                                zone,
-                                GenerationResult(
-                                    success=False,
-                                    zone_name=zone,
-                                    output_path=Path(),
-                                    files_generated=0,
-                                    error_message="No result returned",
-                                ),
-                            )
-                        elif task_name.startswith("py_"):
-                            zone = task_name[3:]  # Remove "py_" prefix
-                            python_results[zone] = result.get(
-                                zone,
-                                GenerationResult(
-                                    success=False,
-                                    zone_name=zone,
-                                    output_path=Path(),
-                                    files_generated=0,
-                                    error_message="No result returned",
-                                ),
-                            )
-                    except Exception as e:
-                        self.logger.error(
-                            f"Exception in client generation thread for {task_name}: {e}"
-                        )
-                        zone = task_name[3:]  # Remove prefix
-                        failed_result = GenerationResult(
-                            success=False,
-                            zone_name=zone,
-                            output_path=Path(),
-                            files_generated=0,
-                            error_message=str(e),
-                        )
-                        if task_name.startswith("ts_"):
-                            typescript_results[zone] = failed_result
-                        else:
-                            python_results[zone] = failed_result
-        else:
-            # Sequential generation
-            self.logger.info("Using sequential client generation")
-
-            # Generate TypeScript clients
-            typescript_results = self.generate_typescript_clients(schemas)
-
-            # Generate Python clients
-            python_results = self.generate_python_clients(schemas)
+        self.critical_path = []
+        self.job_scheduler.reset_stats()
+        try:
+            with self.tracer.span(
+                f"{self.config.pipeline_mode} generation",
+                "run",
+                zones=list(zones_to_process),
+            ):
+                if self.config.pipeline_mode == "streaming":
+                    typescript_results, python_results, client_schemas = (
+                        self._run_streaming_pipeline(zones_to_process, archive)
+                    )
+                else:
+                    typescript_results, python_results, client_schemas = (
+                        self._run_staged_generation(zones_to_process)
+                    )
+        finally:
+            # The persistent Node worker lives for one run unless kept warm
+            if not self.persistent_workers:
+                self.ts_generator.close()
 
         # Generate consolidated index.ts AFTER all clients are generated
         self.logger.info("Generating consolidated index.ts for all zones...")
         self._generate_consolidated_index(list(zones_to_process.keys()))
+        client_names = list(all_zones.keys())
+        if self.shared_models:
+            client_names.append(COMMON_PACKAGE)
+        self._remove_stale_clients(client_names)
+
+        # Remember what the clients were built from for the next incremental run
+        self._record_built_schemas(client_schemas, typescript_results, python_results)
 
-        # Archive clients if requested
-        if archive:
+        # Archive clients if requested (the streaming pipeline archives per zone)
+        if archive and self.config.pipeline_mode == "staged":
             self.archive_clients(typescript_results, python_results)
 
+        # Unchanged zones keep their previous clients
+        for zone_name in self.unchanged_zones:
+            if self.config.generators.typescript.enabled:
+                typescript_results[zone_name] = GenerationResult(
+                    success=True,
+                    zone_name=zone_name,
+                    output_path=self.ts_generator.output_dir / zone_name,
+                    skipped=True,
+                )
+            if self.config.generators.python.enabled:
+                python_results[zone_name] = GenerationResult(
+                    success=True,
+                    zone_name=zone_name,
+                    output_path=self.python_generator.output_dir / zone_name,
+                    skipped=True,
+                )
+
         # Calculate summary
         successful_typescript = sum(1 for r in typescript_results.values() if r.success)
         failed_typescript = len(typescript_results) - successful_typescript
@@ -655,6 +1732,25 @@ class OpenAPIGenerator:
             duration_seconds=duration,
             typescript_results=typescript_results,
             python_results=python_results,
+            schema_workers=self.schema_worker_stats,
+            schema_cache_hits=self.schema_cache_hits,
+            schema_cache_misses=self.schema_cache_misses,
+            unchanged_zones=self.unchanged_zones,
+            sharded_zones={
+                zone_name: list(files)
+                for zone_name, files in self.client_shards.items()
+                if files
+            },
+            shared_models=self.shared_models,
+            critical_path=self.critical_path,
+            files_written=self.output_writer.written,
+            files_unchanged=self.output_writer.unchanged,
+            files_deleted=self.output_writer.deleted,
+            stage_queues=self.job_scheduler.get_stats(),
+            stage_timings=self.stage_recorder.get_timings(),
+            cpu_seconds=usage.cpu_seconds,
+            child_cpu_seconds=usage.child_cpu_seconds,
+            peak_rss_bytes=usage.peak_rss_bytes(),
         )
 
         # Log final summary
@@ -663,13 +1759,38 @@ class OpenAPIGenerator:
             f"{successful_typescript} TypeScript, {successful_python} Python, "
             f"{total_files} total files"
         )
+        self.logger.info(
+            f"Output files: {summary.files_written} written, "
+            f"{summary.files_unchanged} unchanged, {summary.files_deleted} deleted"
+        )
+        self.logger.info(
+            f"CPU time: {summary.cpu_seconds:.1f}s in process, "
+            f"{summary.child_cpu_seconds:.1f}s in child processes"
+        )
+        for stats in summary.stage_queues:
+            self.logger.debug(
+                f"Stage {stats.stage}: {stats.jobs} jobs, limit {stats.limit}, "
+                f"max queue depth {stats.max_queued}, "
+                f"max wait {stats.max_wait_seconds:.2f}s"
+            )
 
         return summary
 
-    def clean_output(self) -> bool:
+    def clean_output(
+        self,
+        keep_schemas: bool = False,
+        keep_clients: bool = False,
+        keep_archive: bool = False,
+    ) -> bool:
         """
         Clean output directories.
 
+        Args:
+            keep_schemas: Keep the schemas directory (used by the schema cache)
+            keep_clients: Keep generated clients (their files are synced by
+                the output writer instead)
+            keep_archive: Keep archived clients and the archive catalog
+
         Returns:
             bool: True if cleaning successful
         """
@@ -678,11 +1799,28 @@ class OpenAPIGenerator:
             if self.output_dir.exists():
                 # Keep certain files/directories
                 keep_patterns = [".gitkeep", "README.md"]
+                schemas_dir = self.output_dir / self.config.output.schemas_directory
+                client_dirs = [
+                    self.ts_generator.output_dir,
+                    self.python_generator.output_dir,
+                ]
 
                 for item in self.output_dir.iterdir():
                     if any(item.match(pattern) for pattern in keep_patterns):
                         continue
 
+                    if keep_schemas and item == schemas_dir:
+                        continue
+
+                    if keep_archive and item == self.archive_manager.archive_dir:
+                        continue
+
+                    if keep_clients and any(
+                        item == client_dir or item in client_dir.parents
+                        for client_dir in client_dirs
+                    ):
+                        continue
+
                     if item.is_dir():
                         shutil.rmtree(item)
                     else:
@@ -736,8 +1874,7 @@ class OpenAPIGenerator:
             ts_output_dir = (
                 self.output_dir / self.config.output.clients_directory / "typescript"
             )
-            with open(ts_output_dir / "index.ts", "w", encoding="utf-8") as f:
-                f.write(index_content)
+            self.output_writer.write_text(ts_output_dir / "index.ts", index_content)
 
             self.logger.success(
                 f"Consolidated index.ts generated for all zones: {zones}"
@@ -774,9 +1911,14 @@ class OpenAPIGenerator:
             ),
             "output_dir": str(self.output_dir),
             "config": self.config.to_dict(),
+            "schema_engine": self.config.schema_engine,
+            "incremental": self.config.incremental,
+            "pipeline_mode": self.config.pipeline_mode,
+            "shared_models": self.config.shared_models,
             "multithreading": {
                 "enabled": self.config.enable_multithreading,
                 "max_workers": self.config.max_workers,
+                "stage_limits": self.config.stage_limits,
                 "threading_available": True,  # Python's threading is always available
             },
         }
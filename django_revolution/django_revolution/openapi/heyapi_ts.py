@@ -4,18 +4,30 @@ HeyAPI TypeScript Generator for Django Revolution
 Generates TypeScript clients using @hey-api/openapi-ts.
 """
 
+import threading
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
+from ..command_runner import CommandJob, get_command_runner
 from ..config import DjangoRevolutionSettings, GenerationResult
+from ..metrics import get_stage_recorder
 from ..utils import Logger, run_command, check_dependency, ensure_directories
+from .node_worker import HeyAPINodeWorker
+from .output_writer import OutputWriter
+from .prettier import PrettierBatcher, PrettierFormatter, find_typescript_files
+from .shared_models import COMMON_PACKAGE, dedupe_typescript_client
+from .sharding import build_sharded_client
 
 
 class HeyAPITypeScriptGenerator:
     """TypeScript client generator using @hey-api/openapi-ts."""
 
     def __init__(
-        self, config: DjangoRevolutionSettings, logger: Optional[Logger] = None
+        self,
+        config: DjangoRevolutionSettings,
+        logger: Optional[Logger] = None,
+        writer: Optional[OutputWriter] = None,
+        scheduler=None,
     ):
         """
         Initialize TypeScript generator.
@@ -23,10 +35,29 @@ class HeyAPITypeScriptGenerator:
         Args:
             config: Django Revolution settings
             logger: Optional logger instance
+            writer: Optional shared output writer
+            scheduler: Optional job scheduler for building shards in parallel;
+                its "typescript" limit also sizes the Node worker pool
         """
         self.config = config
         self.logger = logger or Logger("heyapi_ts_generator")
         self.output_dir = Path(config.generators.typescript.output_directory)
+        self.writer = writer or OutputWriter(self.logger)
+        self.scheduler = scheduler
+
+        # Client of the shared models package for the current run; zone
+        # clients import the models they share with it
+        self.common_dir: Optional[Path] = None
+
+        # Availability is checked once; Node workers live for one run, each
+        # serving one zone at a time
+        self._available: Optional[bool] = None
+        self._node_workers: List[HeyAPINodeWorker] = []
+        self._idle_node_workers: List[HeyAPINodeWorker] = []
+        self._node_worker_failed = False
+        self._node_worker_lock = threading.Lock()
+        self.formatter = PrettierFormatter(self.output_dir, self.logger)
+        self.format_batcher = PrettierBatcher(self.formatter)
 
     def is_available(self) -> bool:
         """
@@ -35,15 +66,175 @@ class HeyAPITypeScriptGenerator:
         Returns:
             bool: True if available
         """
-        return check_dependency(["npx", "@hey-api/openapi-ts", "--version"])
+        if any(worker.alive for worker in self._node_workers):
+            return True
+
+        if self._available is None:
+            self._available = check_dependency(
+                ["npx", "@hey-api/openapi-ts", "--version"]
+            )
+        return self._available
+
+    def _node_worker_limit(self) -> int:
+        """Number of Node workers: one per concurrent TypeScript job."""
+        if self.scheduler is None:
+            return 1
+        return self.scheduler.stage_limit("typescript")
+
+    def _get_node_worker(self) -> Optional[HeyAPINodeWorker]:
+        """
+        Take an idle Node worker, starting a new one while below the limit.
+
+        Returns:
+            Worker reserved until _release_node_worker(), or None to run npx
+            for this zone
+        """
+        if not self.config.generators.typescript.use_node_worker:
+            return None
+
+        with self._node_worker_lock:
+            while self._idle_node_workers:
+                worker = self._idle_node_workers.pop()
+                if worker.alive:
+                    return worker
+                self._node_workers.remove(worker)
+
+            if self._node_worker_failed:
+                return None
+            if len(self._node_workers) >= self._node_worker_limit():
+                self.logger.debug("All Node workers are busy, running npx")
+                return None
+
+            # Counted while starting, so concurrent zones respect the limit
+            worker = HeyAPINodeWorker(self.logger)
+            self._node_workers.append(worker)
+
+        if not worker.start():
+            with self._node_worker_lock:
+                self._node_workers.remove(worker)
+                if not self._node_worker_failed:
+                    self.logger.warning(
+                        "Persistent Node worker unavailable, running npx per zone"
+                    )
+                self._node_worker_failed = True
+            return None
+
+        self._available = True
+        return worker
+
+    def _release_node_worker(self, worker: HeyAPINodeWorker):
+        """Make a worker taken with _get_node_worker() available again."""
+        with self._node_worker_lock:
+            if worker not in self._node_workers:
+                # Closed meanwhile
+                worker.close()
+            elif worker.alive:
+                self._idle_node_workers.append(worker)
+            else:
+                self._node_workers.remove(worker)
+
+    def _run_openapi_ts(self, schema_path: Path, output_dir: Path) -> Tuple[bool, str]:
+        """
+        Run @hey-api/openapi-ts for one schema.
+
+        Uses an idle persistent Node worker when possible and falls back to
+        running npx for the zone.
+
+        Args:
+            schema_path: Path to OpenAPI schema file
+            output_dir: Output directory for the client
+
+        Returns:
+            Tuple of (success, output or error message)
+        """
+        worker = self._get_node_worker()
+        if worker is not None:
+            try:
+                success, error = worker.generate(schema_path, output_dir, timeout=120)
+            finally:
+                self._release_node_worker(worker)
+            if success or worker.alive:
+                return success, error
+
+            self.logger.warning(f"Node worker failed ({error}), falling back to npx")
+            with self._node_worker_lock:
+                self._node_worker_failed = True
+
+        return run_command(
+            self._npx_command(schema_path, output_dir), timeout=120, stage="typescript"
+        )
 
-    def generate_client(self, zone_name: str, schema_path: Path) -> GenerationResult:
+    @staticmethod
+    def _npx_command(schema_path: Path, output_dir: Path) -> List[str]:
+        """npx command generating one client with @hey-api/openapi-ts."""
+        # Note: --format and --tests options are not supported in hey-api
+        return [
+            "npx",
+            "@hey-api/openapi-ts",
+            "--input",
+            str(schema_path),
+            "--output",
+            str(output_dir),
+        ]
+
+    def _uses_node_worker(self) -> bool:
+        """Whether zones may still be generated by Node workers."""
+        return (
+            self.config.generators.typescript.use_node_worker
+            and not self._node_worker_failed
+        )
+
+    def _run_openapi_ts_npx_batch(
+        self, shards: List[Tuple[str, Path, Path]]
+    ) -> List[Tuple[bool, str]]:
+        """
+        Run npx for the shards of a zone at once.
+
+        The first failing shard fails the zone, so the others are cancelled.
+
+        Args:
+            shards: (shard name, schema path, output directory) triples
+
+        Returns:
+            (success, output) per shard
+        """
+        jobs = [
+            CommandJob(
+                argv=self._npx_command(schema_path, output_dir),
+                timeout=120,
+                name=f"openapi-ts {shard}",
+                stage="typescript",
+            )
+            for shard, schema_path, output_dir in shards
+        ]
+        results = get_command_runner().run_many(jobs, fail_fast=True)
+        return [(result.success, result.output) for result in results]
+
+    def close(self):
+        """Stop the persistent Node workers."""
+        with self._node_worker_lock:
+            idle = self._idle_node_workers
+            self._node_workers = []
+            self._idle_node_workers = []
+            self._node_worker_failed = False
+        # Workers still busy with a job are closed when they are released
+        for worker in idle:
+            worker.close()
+
+    def generate_client(
+        self,
+        zone_name: str,
+        schema_path: Path,
+        shards: Optional[Dict[str, Path]] = None,
+    ) -> GenerationResult:
         """
         Generate TypeScript client for a single zone.
 
         Args:
             zone_name: Name of the zone
             schema_path: Path to OpenAPI schema file
+            shards: Optional sub-schemas of the zone; each one is generated
+                separately and the results are merged into one client
 
         Returns:
             GenerationResult with operation details
@@ -62,44 +253,47 @@ class HeyAPITypeScriptGenerator:
                 error_message=error_msg,
             )
 
-        # Setup output directory
+        # Generate into a staging directory; only changed files are synced
         zone_output_dir = self.output_dir / zone_name
-        ensure_directories(zone_output_dir)
+        staging_dir = self.writer.prepare_staging(zone_output_dir)
 
         try:
             # Generate TypeScript client using @hey-api/openapi-ts
-            cmd = [
-                "npx",
-                "@hey-api/openapi-ts",
-                "--input",
-                str(schema_path),
-                "--output",
-                str(zone_output_dir),
-            ]
-
-            # Add output format option if specified
-            # Note: --format option is not supported in hey-api
-            pass
-
-            # Add test generation if enabled
-            # Note: --tests option is not supported in hey-api
-            pass
-
-            success, output = run_command(" ".join(cmd), timeout=120)
+            with get_stage_recorder().stage("typescript", zone_name) as timing:
+                if shards:
+                    success, output = build_sharded_client(
+                        zone_name,
+                        shards,
+                        lambda shard, path, output_dir: self._run_openapi_ts(
+                            path, output_dir
+                        ),
+                        staging_dir,
+                        self.scheduler,
+                        "typescript",
+                        self.logger,
+                        build_all=(
+                            None
+                            if self._uses_node_worker()
+                            else self._run_openapi_ts_npx_batch
+                        ),
+                    )
+                else:
+                    success, output = self._run_openapi_ts(schema_path, staging_dir)
 
             if success:
+                if self.common_dir and zone_name != COMMON_PACKAGE:
+                    self._import_shared_models(zone_name, staging_dir)
+
                 # Count generated files
-                files_generated = self._count_generated_files(zone_output_dir)
+                files_generated = self._count_generated_files(staging_dir)
+                timing.files = files_generated
 
                 # Generate files using templates
-                self._generate_from_templates(zone_name, zone_output_dir)
+                self._generate_from_templates(zone_name, staging_dir)
 
-                # Format generated TypeScript files if enabled
-                if self.config.generators.typescript.auto_format:
-                    if not self._format_typescript_files(zone_output_dir):
-                        self.logger.warning("⚠️ TypeScript file formatting failed, but generation succeeded")
-                else:
-                    self.logger.debug("TypeScript auto-formatting disabled")
+                self.writer.sync_tree(staging_dir, zone_output_dir)
+
+                # Formatting is batched across zones, see format_clients()
 
                 self.logger.success(
                     f"TypeScript client generated for {zone_name}: {files_generated} files"
@@ -113,6 +307,7 @@ class HeyAPITypeScriptGenerator:
                     error_message="",
                 )
             else:
+                self.writer.discard_staging(zone_output_dir)
                 error_msg = f"TypeScript generation failed: {output}"
                 self.logger.error(error_msg)
 
@@ -125,6 +320,7 @@ class HeyAPITypeScriptGenerator:
                 )
 
         except Exception as e:
+            self.writer.discard_staging(zone_output_dir)
             error_msg = f"TypeScript generation exception: {str(e)}"
             self.logger.error(error_msg)
 
@@ -136,12 +332,40 @@ class HeyAPITypeScriptGenerator:
                 error_message=error_msg,
             )
 
-    def generate_all(self, schemas: Dict[str, Path]) -> Dict[str, GenerationResult]:
+    def _import_shared_models(self, zone_name: str, client_dir: Path):
+        """
+        Replace models of a zone client that the common client declares.
+
+        Args:
+            zone_name: Name of the zone
+            client_dir: Generated client of the zone
+        """
+        try:
+            shared = dedupe_typescript_client(client_dir, self.common_dir)
+        except Exception as e:
+            self.logger.warning(
+                f"Could not import shared models into {zone_name} client: {e}"
+            )
+            return
+
+        if shared:
+            self.logger.info(
+                f"{zone_name}: {len(shared)} models imported from {COMMON_PACKAGE}"
+            )
+
+    def generate_all(
+        self,
+        schemas: Dict[str, Path],
+        format_files: bool = True,
+        shards: Optional[Dict[str, Dict[str, Path]]] = None,
+    ) -> Dict[str, GenerationResult]:
         """
         Generate TypeScript clients for all provided schemas.
 
         Args:
             schemas: Dictionary mapping zone names to schema paths
+            format_files: Format the generated clients in one batch afterwards
+            shards: Optional sub-schemas of sharded zones
 
         Returns:
             Dictionary mapping zone names to generation results
@@ -155,9 +379,14 @@ class HeyAPITypeScriptGenerator:
         results = {}
 
         for zone_name, schema_path in schemas.items():
-            result = self.generate_client(zone_name, schema_path)
+            result = self.generate_client(
+                zone_name, schema_path, (shards or {}).get(zone_name)
+            )
             results[zone_name] = result
 
+        if format_files:
+            self.format_clients(results)
+
         successful = sum(1 for r in results.values() if r.success)
         self.logger.info(
             f"TypeScript generation completed: {successful}/{len(results)} successful"
@@ -165,6 +394,48 @@ class HeyAPITypeScriptGenerator:
 
         return results
 
+    def format_clients(self, results: Dict[str, GenerationResult]) -> bool:
+        """
+        Format generated clients in one batched Prettier pass.
+
+        Safe to call per zone from several threads; concurrent calls share
+        Prettier runs.
+
+        Args:
+            results: TypeScript generation results
+
+        Returns:
+            bool: True if formatting succeeded or was not needed
+        """
+        if not self.config.generators.typescript.auto_format:
+            self.logger.debug("TypeScript auto-formatting disabled")
+            return True
+
+        directories = [
+            result.output_path
+            for result in results.values()
+            if result.success and not result.skipped
+        ]
+        files = find_typescript_files(directories)
+        if not files:
+            self.logger.debug("No TypeScript files to format")
+            return True
+
+        try:
+            zone_name = next(iter(results)) if len(results) == 1 else ""
+            with get_stage_recorder().stage("typescript_format", zone_name) as timing:
+                timing.files = len(files)
+                success, _ = self.format_batcher.format_files(files)
+        except Exception as e:
+            self.logger.error(f"Failed to format TypeScript files: {e}")
+            return False
+
+        if not success:
+            self.logger.warning(
+                "⚠️ TypeScript file formatting failed, but generation succeeded"
+            )
+        return success
+
     def _count_generated_files(self, directory: Path) -> int:
         """
         Count the number of generated files in a directory.
@@ -279,59 +550,3 @@ class HeyAPITypeScriptGenerator:
             "custom_templates": self.config.generators.typescript.custom_templates,
             "auto_format": self.config.generators.typescript.auto_format,
         }
-
-    def _format_typescript_files(self, directory: Path) -> bool:
-        """
-        Format TypeScript files using Prettier.
-        
-        Args:
-            directory: Directory containing TypeScript files
-            
-        Returns:
-            bool: True if formatting succeeded, False otherwise
-        """
-        try:
-            # Check if prettier is available - run from django_revolution directory
-            config_dir = Path(__file__).parent.parent
-            success, output = run_command("npx prettier --version", timeout=10, cwd=config_dir)
-            if not success:
-                self.logger.warning("Prettier not available, skipping TypeScript formatting")
-                return True
-            
-            # Format TypeScript files
-            ts_files = list(directory.glob("**/*.ts")) + list(directory.glob("**/*.tsx"))
-            if ts_files:
-                self.logger.info(f"🎨 Formatting {len(ts_files)} TypeScript files...")
-                
-                # Format all TypeScript files in the directory using config
-                config_dir = Path(__file__).parent.parent
-                prettierrc_path = config_dir / ".prettierrc"
-                
-                # Get all TypeScript files to format
-                ts_file_paths = [str(f) for f in ts_files if f.is_file()]
-                
-                if ts_file_paths:
-                    if prettierrc_path.exists():
-                        command_parts = ["npx", "prettier", "--config", str(prettierrc_path), "--write"] + ts_file_paths
-                    else:
-                        command_parts = ["npx", "prettier", "--write"] + ts_file_paths
-                    
-                    command = " ".join(f'"{part}"' if " " in part else part for part in command_parts)
-                    success, output = run_command(command, cwd=config_dir, timeout=60)
-                else:
-                    self.logger.debug("No TypeScript files found to format")
-                    return True
-                
-                if success:
-                    self.logger.info("✅ TypeScript files formatted successfully")
-                    return True
-                else:
-                    self.logger.warning(f"⚠️ TypeScript formatting failed: {output}")
-                    return False
-            else:
-                self.logger.debug("No TypeScript files to format")
-                return True
-                
-        except Exception as e:
-            self.logger.error(f"Failed to format TypeScript files: {e}")
-            return False
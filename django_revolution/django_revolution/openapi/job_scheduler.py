@@ -0,0 +1,338 @@
+"""
+Job Scheduler for Django Revolution
+
+One shared thread pool for every generation stage, with a global
+concurrency budget, per-stage limits and queue-depth metrics.
+"""
+
+import concurrent.futures
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+from ..config import StageQueueStats
+from ..tracing import get_tracer
+from ..utils import Logger
+
+
+class _Job:
+    """A queued call of a stage."""
+
+    def __init__(self, stage: str, func: Callable[..., Any], args, kwargs):
+        self.stage = stage
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.queued_at = time.perf_counter()
+
+
+class _StageState:
+    """Live counters of a stage."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.queued = 0
+        self.running = 0
+        self.stats = StageQueueStats(stage=stage)
+
+
+class JobScheduler:
+    """Runs jobs of all stages on one pool under shared limits."""
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        stage_limits: Optional[Dict[str, int]] = None,
+        logger: Optional[Logger] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers: Global number of jobs running at the same time
+            stage_limits: Maximum number of running jobs per stage
+            logger: Optional logger instance
+        """
+        self.max_workers = max(1, max_workers)
+        self.stage_limits: Dict[str, int] = dict(stage_limits or {})
+        self.logger = logger or Logger("job_scheduler")
+
+        self._lock = threading.Lock()
+        self._pending: Deque[_Job] = deque()
+        self._stages: Dict[str, _StageState] = {}
+        self._running = 0
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._executor_size = 0
+        self._local = threading.local()
+
+    def configure(
+        self,
+        max_workers: Optional[int] = None,
+        stage_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Change the limits for jobs that have not started yet.
+
+        Args:
+            max_workers: New global budget
+            stage_limits: Per-stage limits to set (other stages keep theirs)
+        """
+        with self._lock:
+            if max_workers is not None:
+                self.max_workers = max(1, max_workers)
+            if stage_limits:
+                self.stage_limits.update(
+                    {stage: max(1, limit) for stage, limit in stage_limits.items()}
+                )
+            self._dispatch()
+
+    def stage_limit(self, stage: str) -> int:
+        """
+        Effective concurrency limit of a stage.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            The stage limit, capped by the global budget
+        """
+        return min(self.stage_limits.get(stage, self.max_workers), self.max_workers)
+
+    def has_capacity(self, stage: str) -> bool:
+        """
+        Check whether a job of a stage submitted now would start right away.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            bool: True if neither the global nor the stage limit is reached
+        """
+        with self._lock:
+            state = self._stages.get(stage)
+            busy = state.running + state.queued if state else 0
+            return (
+                self._running + len(self._pending) < self.max_workers
+                and busy < self.stage_limit(stage)
+            )
+
+    def in_job(self) -> bool:
+        """Whether the calling thread is running a job of this scheduler."""
+        return getattr(self._local, "active", False)
+
+    def submit(
+        self, stage: str, func: Callable[..., Any], *args, **kwargs
+    ) -> concurrent.futures.Future:
+        """
+        Schedule a call.
+
+        Jobs submitted from inside another job run immediately in the calling
+        thread: the caller already holds a slot, and waiting for a second one
+        could deadlock a saturated pool.
+
+        Args:
+            stage: Stage the job is counted and limited under
+            func: Callable to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Future with the result of the call
+        """
+        job = _Job(stage, func, args, kwargs)
+
+        if self.in_job():
+            with self._lock:
+                self._state(stage).stats.jobs += 1
+            self._execute(job, nested=True)
+            return job.future
+
+        with self._lock:
+            state = self._state(stage)
+            state.queued += 1
+            state.stats.jobs += 1
+            state.stats.max_queued = max(state.stats.max_queued, state.queued)
+            self._pending.append(job)
+            self._dispatch()
+
+        return job.future
+
+    def run_all(
+        self, stage: str, func: Callable[..., Any], items: Sequence[Sequence[Any]]
+    ) -> List[concurrent.futures.Future]:
+        """
+        Run a group of calls and wait until all of them finished.
+
+        Unlike submit(), calls made from inside a job are queued too: idle
+        workers take them while the calling thread runs those still queued
+        itself, so the group runs in parallel without the caller waiting
+        for a slot.
+
+        Args:
+            stage: Stage the jobs are counted and limited under
+            func: Callable to run
+            items: Positional arguments of each call
+
+        Returns:
+            Finished futures in the order of items
+        """
+        jobs = [_Job(stage, func, tuple(args), {}) for args in items]
+        if not jobs:
+            return []
+
+        with self._lock:
+            state = self._state(stage)
+            for job in jobs:
+                state.queued += 1
+                state.stats.jobs += 1
+                self._pending.append(job)
+            state.stats.max_queued = max(state.stats.max_queued, state.queued)
+            self._dispatch()
+
+        if self.in_job():
+            for job in jobs:
+                with self._lock:
+                    try:
+                        self._pending.remove(job)
+                    except ValueError:
+                        continue  # already started by a worker
+                    self._stages[stage].queued -= 1
+                self._execute(job, nested=True)
+
+        futures = [job.future for job in jobs]
+        concurrent.futures.wait(futures)
+        return futures
+
+    def _state(self, stage: str) -> _StageState:
+        if stage not in self._stages:
+            self._stages[stage] = _StageState(stage)
+        return self._stages[stage]
+
+    def _dispatch(self):
+        """Start queued jobs in submission order while limits allow. Needs the lock."""
+        if not self._pending or self._running >= self.max_workers:
+            self._trace_queues()
+            return
+
+        if self._executor is None or (
+            self._executor_size < self.max_workers and self._running == 0
+        ):
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="revolution-job"
+            )
+            self._executor_size = self.max_workers
+
+        blocked = deque()
+        while self._pending and self._running < self.max_workers:
+            job = self._pending.popleft()
+            state = self._stages[job.stage]
+            if state.running >= self.stage_limit(job.stage):
+                blocked.append(job)
+                continue
+
+            state.queued -= 1
+            state.running += 1
+            state.stats.max_running = max(state.stats.max_running, state.running)
+            self._running += 1
+            self._executor.submit(self._execute, job)
+
+        blocked.extend(self._pending)
+        self._pending = blocked
+        self._trace_queues()
+
+    def _trace_queues(self):
+        """Record queue depth and running jobs per stage. Needs the lock."""
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.add_counter(
+                "queued", {s.stage: s.queued for s in self._stages.values()}
+            )
+            tracer.add_counter(
+                "running", {s.stage: s.running for s in self._stages.values()}
+            )
+
+    def _execute(self, job: _Job, nested: bool = False):
+        started = time.perf_counter()
+        wait = 0.0 if nested else started - job.queued_at
+
+        if not job.future.set_running_or_notify_cancel():
+            self._finish(job, nested, wait, 0.0, failed=False)
+            return
+
+        outer = self.in_job()
+        self._local.active = True
+        result = error = None
+        try:
+            result = job.func(*job.args, **job.kwargs)
+        except BaseException as e:
+            error = e
+        finally:
+            self._local.active = outer
+            finished = time.perf_counter()
+            failed = error is not None
+            get_tracer().add_span(
+                f"{job.stage} job",
+                "job",
+                started,
+                finished,
+                {"wait_seconds": round(wait, 4), "nested": nested, "failed": failed},
+            )
+            # Stats are final by the time a caller sees the outcome
+            self._finish(job, nested, wait, finished - started, failed)
+
+        if failed:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+    def _finish(
+        self, job: _Job, nested: bool, wait: float, duration: float, failed: bool
+    ):
+        with self._lock:
+            state = self._stages[job.stage]
+            stats = state.stats
+            stats.wait_seconds += wait
+            stats.max_wait_seconds = max(stats.max_wait_seconds, wait)
+            stats.run_seconds += duration
+            if failed:
+                stats.failed += 1
+            if not nested:
+                state.running -= 1
+                self._running -= 1
+                self._dispatch()
+
+    def get_stats(self) -> List[StageQueueStats]:
+        """
+        Get queue metrics of every stage used since the last reset.
+
+        Returns:
+            List of StageQueueStats ordered by stage name
+        """
+        with self._lock:
+            stats = []
+            for stage in sorted(self._stages):
+                item = self._stages[stage].stats.model_copy()
+                item.limit = self.stage_limit(stage)
+                item.wait_seconds = round(item.wait_seconds, 4)
+                item.max_wait_seconds = round(item.max_wait_seconds, 4)
+                item.run_seconds = round(item.run_seconds, 4)
+                stats.append(item)
+            return stats
+
+    def reset_stats(self):
+        """Start new metrics, e.g. at the beginning of a run."""
+        with self._lock:
+            for state in self._stages.values():
+                state.stats = StageQueueStats(stage=state.stage)
+
+    def shutdown(self):
+        """Stop the worker threads after the running jobs finished."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._executor_size = 0
+        if executor is not None:
+            executor.shutdown(wait=True)
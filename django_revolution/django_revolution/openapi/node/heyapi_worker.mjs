@@ -0,0 +1,113 @@
+/**
+ * Persistent @hey-api/openapi-ts worker for Django Revolution.
+ *
+ * Reads one JSON job per line from stdin ({"id", "input", "output"}) and
+ * answers with one JSON line per job ({"id", "success", "error"}) on stdout.
+ * Jobs are processed one at a time because openapi-ts keeps global state.
+ */
+
+import fs from 'node:fs';
+import path from 'node:path';
+import readline from 'node:readline';
+import { pathToFileURL } from 'node:url';
+
+const PACKAGE = '@hey-api/openapi-ts';
+
+// stdout is reserved for the protocol; route library logging to stderr
+const log = (...args) => console.error(...args);
+console.log = log;
+console.info = log;
+console.warn = log;
+
+function send(message) {
+  process.stdout.write(JSON.stringify(message) + '\n');
+}
+
+function packageDirs() {
+  const dirs = [];
+
+  // node_modules of the current project and its parents
+  let dir = process.cwd();
+  while (true) {
+    dirs.push(path.join(dir, 'node_modules', PACKAGE));
+    const parent = path.dirname(dir);
+    if (parent === dir) break;
+    dir = parent;
+  }
+
+  // `npx --package` puts <cache>/node_modules/.bin on PATH
+  for (const entry of (process.env.PATH || '').split(path.delimiter)) {
+    if (path.basename(entry) === '.bin') {
+      dirs.push(path.join(path.dirname(entry), PACKAGE));
+    }
+  }
+
+  return dirs;
+}
+
+function exportTarget(value) {
+  if (typeof value === 'string') return value;
+  if (value && typeof value === 'object') {
+    for (const key of ['import', 'default', 'node', 'require']) {
+      const target = exportTarget(value[key]);
+      if (target) return target;
+    }
+  }
+  return null;
+}
+
+async function loadOpenApiTs() {
+  for (const dir of packageDirs()) {
+    const manifestPath = path.join(dir, 'package.json');
+    if (!fs.existsSync(manifestPath)) continue;
+
+    const manifest = JSON.parse(fs.readFileSync(manifestPath, 'utf-8'));
+    const exportsField = manifest.exports && (manifest.exports['.'] ?? manifest.exports);
+    const entry = exportTarget(exportsField) || manifest.module || manifest.main || 'index.js';
+    const module = await import(pathToFileURL(path.join(dir, entry)).href);
+    return { createClient: module.createClient, version: manifest.version };
+  }
+
+  throw new Error(`${PACKAGE} not found`);
+}
+
+async function main() {
+  let openapiTs;
+  try {
+    openapiTs = await loadOpenApiTs();
+    if (typeof openapiTs.createClient !== 'function') {
+      throw new Error(`${PACKAGE} does not export createClient`);
+    }
+  } catch (error) {
+    send({ type: 'error', error: String(error && error.message ? error.message : error) });
+    process.exit(1);
+  }
+
+  send({ type: 'ready', version: openapiTs.version, pid: process.pid });
+
+  const lines = readline.createInterface({ input: process.stdin });
+  for await (const line of lines) {
+    if (!line.trim()) continue;
+
+    let job;
+    try {
+      job = JSON.parse(line);
+    } catch (error) {
+      send({ id: null, success: false, error: `invalid job: ${error.message}` });
+      continue;
+    }
+
+    try {
+      await openapiTs.createClient({ input: job.input, output: job.output });
+      send({ id: job.id, success: true, error: '' });
+    } catch (error) {
+      send({
+        id: job.id,
+        success: false,
+        error: String(error && error.stack ? error.stack : error),
+      });
+    }
+  }
+}
+
+main();
@@ -0,0 +1,244 @@
+"""
+Node Worker for Django Revolution
+
+Long-lived Node.js process that runs @hey-api/openapi-ts for many zones,
+so npx resolution and Node startup are paid once per run.
+"""
+
+import collections
+import itertools
+import json
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..command_runner import USAGE_SAMPLE_INTERVAL
+from ..resources import ResourceTuner, get_resource_tuner, process_rss_bytes
+from ..utils import Logger
+
+WORKER_SCRIPT = Path(__file__).parent / "node" / "heyapi_worker.mjs"
+
+
+class HeyAPINodeWorker:
+    """Persistent @hey-api/openapi-ts process speaking JSON lines."""
+
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        cwd: Optional[Path] = None,
+        command: Optional[List[str]] = None,
+        startup_timeout: float = 120,
+        tuner: Optional[ResourceTuner] = None,
+    ):
+        """
+        Initialize the Node worker.
+
+        Args:
+            logger: Optional logger instance
+            cwd: Working directory of the Node process
+            command: Command to start the worker (defaults to running the
+                bundled script through npx with @hey-api/openapi-ts)
+            startup_timeout: Seconds to wait for the worker to load openapi-ts
+            tuner: Resource tuner that learns the worker's peak RSS as the
+                "typescript" job size (defaults to the process-wide one)
+        """
+        self.logger = logger or Logger("heyapi_node_worker")
+        self.cwd = cwd
+        self.command = command or [
+            "npx",
+            "--package",
+            "@hey-api/openapi-ts",
+            "node",
+            str(WORKER_SCRIPT),
+        ]
+        self.startup_timeout = startup_timeout
+        self.tuner = tuner or get_resource_tuner()
+        self.version: Optional[str] = None
+
+        self._process: Optional[subprocess.Popen] = None
+        self._replies: "queue.Queue[Optional[dict]]" = queue.Queue()
+        self._stderr: "collections.deque[str]" = collections.deque(maxlen=50)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    @property
+    def alive(self) -> bool:
+        """Whether the Node process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def _read_stdout(self, stream, replies: queue.Queue):
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                replies.put(json.loads(line))
+            except ValueError:
+                self._stderr.append(line)
+        # EOF: wake up anyone waiting for a reply
+        replies.put(None)
+
+    def _read_stderr(self, stream):
+        for line in stream:
+            self._stderr.append(line.rstrip())
+
+    def _recent_output(self) -> str:
+        return "\n".join(self._stderr)
+
+    def start(self) -> bool:
+        """
+        Start the Node process and wait until openapi-ts is loaded.
+
+        Returns:
+            bool: True if the worker is ready for jobs
+        """
+        if self.alive:
+            return True
+
+        # Replies of a previous process must not leak into this one
+        self._replies = queue.Queue()
+
+        try:
+            self._process = subprocess.Popen(
+                self.command,
+                cwd=self.cwd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                # npx runs node as a child; its own group lets both be killed
+                start_new_session=True,
+            )
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Could not start Node worker: {e}")
+            self._process = None
+            return False
+
+        threading.Thread(
+            target=self._read_stdout,
+            args=(self._process.stdout, self._replies),
+            daemon=True,
+        ).start()
+        threading.Thread(
+            target=self._read_stderr, args=(self._process.stderr,), daemon=True
+        ).start()
+
+        try:
+            message = self._replies.get(timeout=self.startup_timeout)
+        except queue.Empty:
+            message = None
+
+        if not message or message.get("type") != "ready":
+            error = (message or {}).get("error") or self._recent_output()
+            self.logger.debug(f"Node worker failed to start: {error}")
+            self.close()
+            return False
+
+        self.version = message.get("version")
+        self.logger.info(
+            f"Started @hey-api/openapi-ts worker {self.version or ''} "
+            f"(pid {message.get('pid')})"
+        )
+        return True
+
+    def generate(
+        self, schema_path: Path, output_dir: Path, timeout: float = 120
+    ) -> Tuple[bool, str]:
+        """
+        Generate a TypeScript client.
+
+        Jobs are serialized; the worker handles one zone at a time.
+
+        Args:
+            schema_path: Path to the OpenAPI schema
+            output_dir: Output directory for the client
+            timeout: Seconds to wait for the job
+
+        Returns:
+            Tuple of (success, error message)
+        """
+        with self._lock:
+            if not self.alive:
+                return False, "Node worker is not running"
+
+            job_id = next(self._ids)
+            job = {"id": job_id, "input": str(schema_path), "output": str(output_dir)}
+
+            try:
+                self._process.stdin.write(json.dumps(job) + "\n")
+                self._process.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self.close()
+                return False, f"Node worker died: {e}"
+
+            # The process tree is sampled while the job runs
+            pid = self._process.pid
+            peak_rss = 0
+            deadline = time.monotonic() + timeout
+            try:
+                while True:
+                    peak_rss = max(peak_rss, process_rss_bytes(pid))
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.close(kill=True)
+                        return False, f"Node worker timed out after {timeout}s"
+
+                    try:
+                        reply = self._replies.get(
+                            timeout=min(remaining, USAGE_SAMPLE_INTERVAL)
+                        )
+                    except queue.Empty:
+                        continue
+
+                    if reply is None:
+                        self.close()
+                        return False, f"Node worker exited: {self._recent_output()}"
+
+                    if reply.get("id") == job_id:
+                        return bool(reply.get("success")), reply.get("error", "")
+            finally:
+                self.tuner.record("typescript", peak_rss)
+
+    def close(self, kill: bool = False):
+        """
+        Stop the Node process and any process it started.
+
+        Args:
+            kill: Kill right away instead of letting a busy worker finish
+        """
+        process, self._process = self._process, None
+        if process is None:
+            return
+
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+
+        if not kill:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
+
+        # A group outlives its leader while members remain, so its id is
+        # not reused even after npx itself has exited
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, ProcessLookupError, PermissionError):
+            if process.poll() is None:
+                process.kill()
+        process.wait()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,260 @@
+"""
+Output Writer for Django Revolution
+
+Writes generated files only when their content changed, so unchanged files
+keep their modification times and downstream build caches stay valid.
+"""
+
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..utils import Logger
+from .schema_cache import hash_file
+
+MANIFEST_FILENAME = ".revolution-manifest.json"
+STAGING_DIRNAME = ".staging"
+
+
+class OutputWriter:
+    """
+    Write-if-changed layer shared by all generators.
+
+    Generated trees are produced in a staging directory and synced into
+    place. A manifest next to each tree remembers the hash of the raw
+    generator output per file, so files that are reformatted after
+    syncing (e.g. by Prettier) are still recognized as unchanged.
+    """
+
+    def __init__(self, logger: Optional[Logger] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            logger: Optional logger instance
+        """
+        self.logger = logger or Logger("output_writer")
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset the counters at the start of a run."""
+        with self._lock:
+            self.written = 0
+            self.unchanged = 0
+            self.deleted = 0
+
+    def _count(self, written: int = 0, unchanged: int = 0, deleted: int = 0):
+        with self._lock:
+            self.written += written
+            self.unchanged += unchanged
+            self.deleted += deleted
+
+    def write_bytes(self, path: Path, data: bytes) -> bool:
+        """
+        Write a file unless it already has this content.
+
+        Args:
+            path: File to write
+            data: New content
+
+        Returns:
+            bool: True if the file was written
+        """
+        try:
+            if path.read_bytes() == data:
+                self._count(unchanged=1)
+                return False
+        except OSError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        self._count(written=1)
+        return True
+
+    def write_text(self, path: Path, content: str, encoding: str = "utf-8") -> bool:
+        """
+        Write a text file unless it already has this content.
+
+        Args:
+            path: File to write
+            content: New content
+            encoding: Text encoding
+
+        Returns:
+            bool: True if the file was written
+        """
+        return self.write_bytes(path, content.encode(encoding))
+
+    @staticmethod
+    def staging_dir(target_dir: Path) -> Path:
+        """
+        Staging directory for a generated tree.
+
+        It lives next to the target so staged files can be moved into
+        place without copying.
+        """
+        return target_dir.parent / STAGING_DIRNAME / target_dir.name
+
+    def prepare_staging(self, target_dir: Path) -> Path:
+        """
+        Create an empty staging directory for a generated tree.
+
+        Args:
+            target_dir: Final location of the tree
+
+        Returns:
+            Path of the staging directory
+        """
+        staging_dir = self.staging_dir(target_dir)
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+        staging_dir.mkdir(parents=True)
+        return staging_dir
+
+    def discard_staging(self, target_dir: Path):
+        """Remove the staging directory of a tree."""
+        staging_dir = self.staging_dir(target_dir)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+        # Drop the staging root once the last tree is done
+        try:
+            staging_dir.parent.rmdir()
+        except OSError:
+            pass
+
+    def _load_manifest(self, target_dir: Path) -> Dict[str, List[Optional[str]]]:
+        try:
+            with open(target_dir / MANIFEST_FILENAME, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, target_dir: Path, manifest: Dict[str, List[Optional[str]]]):
+        with open(target_dir / MANIFEST_FILENAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+    def _is_unchanged(
+        self, target: Path, raw_hash: str, entry: Optional[List[Optional[str]]]
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Check a target file against the manifest.
+
+        Returns:
+            Tuple of (unchanged, hash of the target file)
+        """
+        if not target.is_file():
+            return False, None
+
+        target_hash = hash_file(target)
+        if target_hash == raw_hash:
+            return True, target_hash
+
+        if entry is None:
+            return False, target_hash
+
+        previous_raw, previous_final = entry
+        # Same generator output; the target only differs by post-processing,
+        # unless it was modified since the last sync
+        unchanged = previous_raw == raw_hash and previous_final in (None, target_hash)
+        return unchanged, target_hash
+
+    def sync_tree(self, staging_dir: Path, target_dir: Path) -> Tuple[int, int, int]:
+        """
+        Move a staged tree into place, touching only changed files.
+
+        Files missing from the staged tree are deleted from the target and
+        the staging directory is removed afterwards.
+
+        Args:
+            staging_dir: Freshly generated tree
+            target_dir: Final location of the tree
+
+        Returns:
+            Tuple of (written, unchanged, deleted) file counts
+        """
+        target_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest(target_dir)
+        new_manifest: Dict[str, List[Optional[str]]] = {}
+        written = unchanged = deleted = 0
+
+        try:
+            for source in sorted(staging_dir.rglob("*")):
+                if not source.is_file():
+                    continue
+
+                relative = source.relative_to(staging_dir).as_posix()
+                if relative == MANIFEST_FILENAME:
+                    continue
+
+                target = target_dir / relative
+                raw_hash = hash_file(source)
+                is_unchanged, target_hash = self._is_unchanged(
+                    target, raw_hash, manifest.get(relative)
+                )
+
+                if is_unchanged:
+                    new_manifest[relative] = [raw_hash, target_hash]
+                    unchanged += 1
+                    continue
+
+                if target.is_dir():
+                    shutil.rmtree(target)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(source, target)
+                # Post-processing after the sync may still rewrite the file
+                new_manifest[relative] = [raw_hash, None]
+                written += 1
+
+            for target in sorted(target_dir.rglob("*"), reverse=True):
+                relative = target.relative_to(target_dir).as_posix()
+                if relative == MANIFEST_FILENAME or relative in new_manifest:
+                    continue
+
+                if target.is_dir():
+                    # Only directories left empty by deleted files
+                    if not any(target.iterdir()):
+                        target.rmdir()
+                    continue
+
+                target.unlink()
+                deleted += 1
+
+            self._save_manifest(target_dir, new_manifest)
+        finally:
+            self.discard_staging(target_dir)
+
+        self._count(written, unchanged, deleted)
+        self.logger.debug(
+            f"Synced {target_dir}: {written} written, {unchanged} unchanged, "
+            f"{deleted} deleted"
+        )
+        return written, unchanged, deleted
+
+    def remove_tree(self, target_dir: Path) -> int:
+        """
+        Delete a generated tree that is no longer produced.
+
+        Args:
+            target_dir: Tree to delete
+
+        Returns:
+            Number of files deleted
+        """
+        if not target_dir.exists():
+            return 0
+
+        files = sum(
+            1
+            for path in target_dir.rglob("*")
+            if path.is_file() and path.name != MANIFEST_FILENAME
+        )
+        shutil.rmtree(target_dir)
+        self._count(deleted=files)
+        return files
@@ -0,0 +1,253 @@
+"""
+Pipeline Scheduler for Django Revolution
+
+DAG scheduler that lets every zone flow through its generation stages
+independently under a global concurrency limit.
+"""
+
+import concurrent.futures
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..config import PipelineTaskStats
+from ..tracing import get_tracer
+from ..utils import Logger
+from .job_scheduler import JobScheduler
+
+
+class _Task:
+    """A node of the pipeline graph."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        deps: Sequence[str],
+        stage: str,
+        zone_name: str,
+        depth: int,
+    ):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.stage = stage
+        self.zone_name = zone_name
+        self.depth = depth
+        self.dependents: List[str] = []
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+
+class PipelineScheduler:
+    """Runs a graph of tasks as soon as their dependencies have finished."""
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        logger: Optional[Logger] = None,
+        jobs: Optional[JobScheduler] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers: Maximum number of tasks running at the same time
+            logger: Optional logger instance
+            jobs: Shared job scheduler to run tasks on; its stage limits then
+                apply to the tasks. Without one a private thread pool is used.
+        """
+        self.max_workers = max(1, max_workers)
+        self.logger = logger or Logger("pipeline")
+        self.jobs = jobs
+        self._tasks: Dict[str, _Task] = {}
+        self._origin = 0.0
+
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+
+    def add_task(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        deps: Sequence[str] = (),
+        stage: str = "",
+        zone_name: str = "",
+    ):
+        """
+        Add a task to the graph.
+
+        The task is called with the results of its dependencies as positional
+        arguments, in the order of ``deps``. Dependencies must be added first,
+        which keeps the graph acyclic.
+
+        Args:
+            name: Unique task name
+            func: Callable to run
+            deps: Names of tasks that must finish first
+            stage: Stage label used in reports (e.g. "schema", "typescript")
+            zone_name: Zone the task belongs to
+        """
+        if name in self._tasks:
+            raise ValueError(f"Duplicate pipeline task: {name}")
+
+        unknown = [dep for dep in deps if dep not in self._tasks]
+        if unknown:
+            raise ValueError(f"Unknown dependencies for {name}: {unknown}")
+
+        depth = 1 + max((self._tasks[dep].depth for dep in deps), default=0)
+        self._tasks[name] = _Task(name, func, deps, stage, zone_name, depth)
+        for dep in deps:
+            self._tasks[dep].dependents.append(name)
+
+    def _execute(self, task: _Task) -> Any:
+        task.started = time.perf_counter()
+        try:
+            return task.func(*(self.results.get(dep) for dep in task.deps))
+        finally:
+            task.finished = time.perf_counter()
+            get_tracer().add_span(
+                task.name,
+                "pipeline",
+                task.started,
+                task.finished,
+                {"stage": task.stage, "zone_name": task.zone_name},
+            )
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every task.
+
+        Ready tasks deeper in the graph are started first, so zones whose
+        schema is done move on to their clients before new schemas start.
+        Tasks whose dependencies failed are not run.
+
+        Returns:
+            Mapping of task name to its result
+        """
+        self._origin = time.perf_counter()
+        remaining = {name: len(task.deps) for name, task in self._tasks.items()}
+        counter = itertools.count()
+        ready: List = []
+
+        def push(task: _Task):
+            heapq.heappush(ready, (-task.depth, next(counter), task.name))
+
+        for task in self._tasks.values():
+            if not task.deps:
+                push(task)
+
+        executor = None
+        if self.jobs is None:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers
+            )
+
+        def submit(task: _Task) -> concurrent.futures.Future:
+            if executor is not None:
+                return executor.submit(self._execute, task)
+            return self.jobs.submit(task.stage, self._execute, task)
+
+        try:
+            running: Dict[concurrent.futures.Future, _Task] = {}
+
+            while ready or running:
+                # Tasks of stages at their limit wait here instead of holding
+                # a slot, so other stages can use it meanwhile
+                deferred = []
+                while ready and len(running) < self.max_workers:
+                    item = heapq.heappop(ready)
+                    task = self._tasks[item[2]]
+                    if (
+                        self.jobs is not None
+                        and running
+                        and not self.jobs.has_capacity(task.stage)
+                    ):
+                        deferred.append(item)
+                        continue
+                    running[submit(task)] = task
+                for item in deferred:
+                    heapq.heappush(ready, item)
+
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        self.results[task.name] = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Pipeline task {task.name} failed: {e}")
+                        self.errors[task.name] = str(e)
+                        self._skip_dependents(task, remaining)
+                        continue
+
+                    for dependent in task.dependents:
+                        if dependent in self.errors:
+                            continue
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            push(self._tasks[dependent])
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        return self.results
+
+    def _skip_dependents(self, task: _Task, remaining: Dict[str, int]):
+        """Mark every task downstream of a failed task as failed."""
+        for name in task.dependents:
+            if name not in self.errors:
+                self.errors[name] = f"dependency failed: {task.name}"
+                remaining[name] = -1
+                self._skip_dependents(self._tasks[name], remaining)
+
+    def _stats(self, task: _Task) -> PipelineTaskStats:
+        return PipelineTaskStats(
+            name=task.name,
+            stage=task.stage,
+            zone_name=task.zone_name,
+            start_seconds=round(task.started - self._origin, 4),
+            duration_seconds=round(task.finished - task.started, 4),
+        )
+
+    def get_stats(self) -> List[PipelineTaskStats]:
+        """
+        Get timings of all executed tasks.
+
+        Returns:
+            List of PipelineTaskStats ordered by start time
+        """
+        executed = [t for t in self._tasks.values() if t.finished is not None]
+        return [self._stats(t) for t in sorted(executed, key=lambda t: t.started)]
+
+    def critical_path(self) -> List[PipelineTaskStats]:
+        """
+        Get the chain of tasks that determined the total run time.
+
+        Starting from the task that finished last, follows the dependency that
+        finished last at each step.
+
+        Returns:
+            List of PipelineTaskStats from the first to the last task
+        """
+        executed = [t for t in self._tasks.values() if t.finished is not None]
+        if not executed:
+            return []
+
+        task = max(executed, key=lambda t: t.finished)
+        path = [task]
+        while True:
+            deps = [
+                self._tasks[dep]
+                for dep in task.deps
+                if self._tasks[dep].finished is not None
+            ]
+            if not deps:
+                break
+            task = max(deps, key=lambda t: t.finished)
+            path.append(task)
+
+        return [self._stats(t) for t in reversed(path)]
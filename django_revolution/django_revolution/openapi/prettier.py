@@ -0,0 +1,274 @@
+"""
+Prettier Formatter for Django Revolution
+
+Formats generated TypeScript files of all zones in batched Prettier runs,
+skipping files that are unchanged since they were last formatted. Batches
+run concurrently; the first failing batch cancels the others.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..command_runner import CommandJob, get_command_runner
+from ..utils import Logger, run_command
+from .schema_cache import hash_file
+
+# Argument lists share ARG_MAX with the environment; stay well below the
+# smallest common limit.
+MAX_COMMAND_LENGTH = 100_000
+
+TYPESCRIPT_PATTERNS = ("**/*.ts", "**/*.tsx")
+
+
+def find_typescript_files(directories: Iterable[Path]) -> List[Path]:
+    """
+    Collect TypeScript files below directories.
+
+    Args:
+        directories: Directories to search
+
+    Returns:
+        Sorted list of TypeScript files
+    """
+    files = set()
+    for directory in directories:
+        if directory.exists():
+            for pattern in TYPESCRIPT_PATTERNS:
+                files.update(path for path in directory.glob(pattern) if path.is_file())
+    return sorted(files)
+
+
+class PrettierFormatter:
+    """Batched Prettier runs with a cache of already formatted files."""
+
+    CACHE_FILENAME = ".prettier-cache.json"
+
+    def __init__(self, cache_dir: Path, logger: Optional[Logger] = None):
+        """
+        Initialize the formatter.
+
+        Args:
+            cache_dir: Directory holding the formatted-files cache
+            logger: Optional logger instance
+        """
+        self.logger = logger or Logger("prettier")
+        self.cache_path = cache_dir / self.CACHE_FILENAME
+
+        # Prettier runs from the package directory, where .prettierrc lives
+        self.config_dir = Path(__file__).parent.parent
+        self.prettierrc_path = self.config_dir / ".prettierrc"
+
+        self._available: Optional[bool] = None
+        self._version = ""
+
+    def is_available(self) -> bool:
+        """
+        Check once whether Prettier can be run.
+
+        Returns:
+            bool: True if available
+        """
+        if self._available is None:
+            success, output = run_command(
+                ["npx", "prettier", "--version"],
+                cwd=self.config_dir,
+                timeout=30,
+                stage="format",
+            )
+            self._available = success
+            self._version = output.strip() if success else ""
+        return self._available
+
+    def _config_key(self) -> str:
+        """Identify the Prettier version and configuration used for formatting."""
+        digest = hashlib.sha256(self._version.encode())
+        if self.prettierrc_path.exists():
+            digest.update(hash_file(self.prettierrc_path).encode())
+        return digest.hexdigest()
+
+    def _load_cache(self) -> Dict[str, str]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if cache.get("config") != self._config_key():
+            return {}
+        return cache.get("files", {})
+
+    def _save_cache(self, files: Dict[str, str]):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump({"config": self._config_key(), "files": files}, f, indent=2)
+        except OSError as e:
+            self.logger.debug(f"Failed to write Prettier cache: {e}")
+
+    def _base_command(self) -> List[str]:
+        command = ["npx", "prettier"]
+        if self.prettierrc_path.exists():
+            command += ["--config", str(self.prettierrc_path)]
+        return command + ["--write"]
+
+    def _chunks(self, files: List[str]) -> Iterator[List[str]]:
+        """Split files into argument lists that fit the command length limit."""
+        base_length = sum(len(arg) + 1 for arg in self._base_command())
+        chunk: List[str] = []
+        length = base_length
+
+        for path in files:
+            path_length = len(path) + 1
+            if chunk and length + path_length > MAX_COMMAND_LENGTH:
+                yield chunk
+                chunk, length = [], base_length
+            chunk.append(path)
+            length += path_length
+
+        if chunk:
+            yield chunk
+
+    def format_files(self, files: List[Path]) -> Tuple[bool, int]:
+        """
+        Format files that changed since they were last formatted.
+
+        Args:
+            files: TypeScript files to format
+
+        Returns:
+            Tuple of (success, number of files formatted)
+        """
+        if not files:
+            return True, 0
+
+        if not self.is_available():
+            self.logger.warning("Prettier not available, skipping TypeScript formatting")
+            return True, 0
+
+        cache = self._load_cache()
+        pending = [
+            str(path)
+            for path in files
+            if cache.get(str(path)) != hash_file(path)
+        ]
+
+        skipped = len(files) - len(pending)
+        if not pending:
+            self.logger.info(f"All {skipped} TypeScript files already formatted")
+            return True, 0
+
+        self.logger.info(
+            f"🎨 Formatting {len(pending)} TypeScript files ({skipped} unchanged)..."
+        )
+
+        chunks = list(self._chunks(pending))
+        jobs = [
+            CommandJob(
+                argv=self._base_command() + chunk,
+                cwd=self.config_dir,
+                timeout=300,
+                name="prettier",
+                stage="format",
+            )
+            for chunk in chunks
+        ]
+        results = get_command_runner().run_many(jobs, fail_fast=True)
+
+        success = True
+        for chunk, result in zip(chunks, results):
+            if not result.success:
+                if not result.cancelled:
+                    self.logger.warning(
+                        f"⚠️ TypeScript formatting failed: {result.output}"
+                    )
+                success = False
+                continue
+
+            for path in chunk:
+                cache[path] = hash_file(Path(path))
+
+        # Forget files that no longer exist
+        cache = {path: digest for path, digest in cache.items() if Path(path).exists()}
+        self._save_cache(cache)
+
+        if success:
+            self.logger.info("✅ TypeScript files formatted successfully")
+
+        return success, len(pending)
+
+
+class _Batch:
+    """Files of the format requests collected into one Prettier run."""
+
+    def __init__(self):
+        self.files: List[Path] = []
+        self.done = False
+        self.success = True
+        self.formatted = 0
+
+
+class PrettierBatcher:
+    """
+    Coalesce format requests of concurrently finishing zones.
+
+    The first request runs Prettier right away; requests arriving while it
+    runs are collected and formatted together in the next run, so each zone
+    waits only for the batch holding its own files.
+    """
+
+    def __init__(self, formatter: PrettierFormatter):
+        """
+        Initialize the batcher.
+
+        Args:
+            formatter: Formatter running the batched Prettier commands
+        """
+        self.formatter = formatter
+        self._condition = threading.Condition()
+        self._open: Optional[_Batch] = None
+        self._running = False
+
+    def format_files(self, files: List[Path]) -> Tuple[bool, int]:
+        """
+        Format files together with those of other pending requests.
+
+        Blocks until the batch holding these files has been formatted.
+
+        Args:
+            files: TypeScript files to format
+
+        Returns:
+            Tuple of (success, number of files formatted in the batch)
+        """
+        with self._condition:
+            if self._open is None:
+                self._open = _Batch()
+            batch = self._open
+            batch.files.extend(files)
+
+            while self._running and not batch.done:
+                self._condition.wait()
+            if batch.done:
+                return batch.success, batch.formatted
+
+            # Lead this batch; requests from now on open the next one
+            self._open = None
+            self._running = True
+
+        success, formatted = False, 0
+        try:
+            success, formatted = self.formatter.format_files(
+                sorted(set(batch.files))
+            )
+        finally:
+            with self._condition:
+                batch.done = True
+                batch.success = success
+                batch.formatted = formatted
+                self._running = False
+                self._condition.notify_all()
+
+        return success, formatted
@@ -10,6 +10,7 @@ from typing import Dict, Optional, Any
 from ..config import DjangoRevolutionSettings, GenerationResult
 from ..utils import Logger, ensure_directories
 from ..generators import ModernPythonGenerator
+from .output_writer import OutputWriter
 
 
 class PythonClientGenerator:
@@ -25,7 +26,11 @@ class PythonClientGenerator:
     """
 
     def __init__(
-        self, config: DjangoRevolutionSettings, logger: Optional[Logger] = None
+        self,
+        config: DjangoRevolutionSettings,
+        logger: Optional[Logger] = None,
+        writer: Optional[OutputWriter] = None,
+        scheduler=None,
     ):
         """
         Initialize Python generator.
@@ -33,13 +38,24 @@ class PythonClientGenerator:
         Args:
             config: Django Revolution settings
             logger: Optional logger instance
+            writer: Optional shared output writer
+            scheduler: Optional job scheduler for building shards in parallel
         """
         self.config = config
         self.logger = logger or Logger("python_client_generator")
         self.output_dir = Path(config.generators.python.output_directory)
         
         # Initialize the modern generator
-        self._generator = ModernPythonGenerator(config, self.logger)
+        self._generator = ModernPythonGenerator(config, self.logger, writer, scheduler)
+
+    @property
+    def common_dir(self) -> Optional[Path]:
+        """Client of the shared models package for the current run."""
+        return self._generator.common_dir
+
+    @common_dir.setter
+    def common_dir(self, value: Optional[Path]):
+        self._generator.common_dir = value
 
     def is_openapi_generator_available(self) -> bool:
         """
@@ -50,30 +66,43 @@ class PythonClientGenerator:
         """
         return self._generator.is_available()
 
-    def generate_client(self, zone_name: str, schema_path: Path) -> GenerationResult:
+    def generate_client(
+        self,
+        zone_name: str,
+        schema_path: Path,
+        schema: Optional[Dict[str, Any]] = None,
+        shards: Optional[Dict[str, Path]] = None,
+    ) -> GenerationResult:
         """
         Generate Python client for a single zone.
 
         Args:
             zone_name: Name of the zone
             schema_path: Path to OpenAPI schema file
+            schema: Optional already parsed schema
+            shards: Optional sub-schemas to build and merge into one package
 
         Returns:
             GenerationResult with operation details
         """
-        return self._generator.generate_client(zone_name, schema_path)
+        return self._generator.generate_client(zone_name, schema_path, schema, shards)
 
-    def generate_all(self, schemas: Dict[str, Path]) -> Dict[str, GenerationResult]:
+    def generate_all(
+        self,
+        schemas: Dict[str, Path],
+        shards: Optional[Dict[str, Dict[str, Path]]] = None,
+    ) -> Dict[str, GenerationResult]:
         """
         Generate Python clients for all provided schemas.
 
         Args:
             schemas: Dictionary mapping zone names to schema paths
+            shards: Optional sub-schemas of sharded zones
 
         Returns:
             Dictionary mapping zone names to generation results
         """
-        return self._generator.generate_all(schemas)
+        return self._generator.generate_all(schemas, shards)
 
     def clean_output(self) -> bool:
         """
@@ -0,0 +1,239 @@
+"""
+Schema Cache for Django Revolution
+
+Content-addressed cache that lets unchanged zones reuse their last schema.
+"""
+
+import hashlib
+import importlib.util
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import DjangoRevolutionSettings, ZoneModel
+from ..utils import Logger
+from .schema_io import schema_filename
+
+# App modules whose source determines a zone's schema
+FINGERPRINT_MODULES = ("urls", "views", "serializers", "models")
+
+
+def _stable_default(value: Any) -> str:
+    """JSON fallback that avoids memory addresses in reprs of classes/functions."""
+    if hasattr(value, "__module__") and hasattr(value, "__qualname__"):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, (set, frozenset)):
+        return json.dumps(sorted(map(str, value)))
+    text = str(value)
+    return type(value).__name__ if " at 0x" in text else text
+
+
+def hash_file(path: Path) -> str:
+    """
+    Calculate the SHA-256 of a file.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def module_files(module_name: str) -> List[Path]:
+    """
+    Source files of a module, or of every module in a package.
+
+    Args:
+        module_name: Dotted module name
+
+    Returns:
+        Python source files; empty if the module cannot be found
+    """
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return []
+
+    if spec is None:
+        return []
+
+    if spec.submodule_search_locations:
+        files = []
+        for location in spec.submodule_search_locations:
+            files.extend(sorted(Path(location).rglob("*.py")))
+        return files
+
+    if spec.origin and spec.origin.endswith(".py"):
+        return [Path(spec.origin)]
+
+    return []
+
+
+class SchemaCache:
+    """Caches zone schemas keyed by a fingerprint of everything that shapes them."""
+
+    INDEX_FILENAME = ".schema_cache.json"
+
+    def __init__(
+        self,
+        config: DjangoRevolutionSettings,
+        schemas_dir: Path,
+        logger: Optional[Logger] = None,
+    ):
+        """
+        Initialize schema cache.
+
+        Args:
+            config: Django Revolution settings
+            schemas_dir: Directory holding zone schemas
+            logger: Optional logger instance
+        """
+        self.config = config
+        self.schemas_dir = schemas_dir
+        self.logger = logger or Logger("schema_cache")
+        self.index_path = schemas_dir / self.INDEX_FILENAME
+        self._index = self._load_index()
+        self._environment: Optional[str] = None
+        self._fingerprints: Dict[str, str] = {}
+
+        self.hits: List[str] = []
+        self.misses: List[str] = []
+
+    def _load_index(self) -> Dict[str, Dict[str, str]]:
+        """Load the cache index from disk."""
+        if not self.index_path.exists():
+            return {}
+
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Ignoring unreadable schema cache index: {e}")
+            return {}
+
+    def save(self):
+        """Persist the cache index."""
+        try:
+            self.schemas_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump(self._index, f, indent=2, sort_keys=True)
+        except OSError as e:
+            self.logger.warning(f"Failed to write schema cache index: {e}")
+
+    def _environment_fingerprint(self) -> str:
+        """Fingerprint of inputs shared by all zones (settings and versions)."""
+        if self._environment is None:
+            from django.conf import settings
+            import drf_spectacular
+            import rest_framework
+
+            environment = {
+                "api_prefix": self.config.api_prefix,
+                "drf_spectacular": drf_spectacular.__version__,
+                "rest_framework": rest_framework.VERSION,
+                "spectacular_settings": getattr(settings, "SPECTACULAR_SETTINGS", {}),
+                "rest_framework_settings": getattr(settings, "REST_FRAMEWORK", {}),
+            }
+            self._environment = json.dumps(
+                environment, sort_keys=True, default=_stable_default
+            )
+
+        return self._environment
+
+    def fingerprint(self, zone_name: str, zone: ZoneModel) -> str:
+        """
+        Fingerprint a zone's schema inputs.
+
+        Args:
+            zone_name: Name of the zone
+            zone: Zone model configuration
+
+        Returns:
+            Hex digest identifying the zone's schema inputs
+        """
+        if zone_name in self._fingerprints:
+            return self._fingerprints[zone_name]
+
+        digest = hashlib.sha256()
+        digest.update(zone_name.encode())
+        digest.update(zone.model_dump_json().encode())
+        digest.update(self._environment_fingerprint().encode())
+
+        for app in zone.apps:
+            for module in FINGERPRINT_MODULES:
+                for path in module_files(f"{app}.{module}"):
+                    digest.update(str(path).encode())
+                    digest.update(hash_file(path).encode())
+
+        self._fingerprints[zone_name] = digest.hexdigest()
+        return self._fingerprints[zone_name]
+
+    def lookup(self, zone_name: str, zone: ZoneModel) -> Optional[Path]:
+        """
+        Look up a cached schema for a zone.
+
+        Args:
+            zone_name: Name of the zone
+            zone: Zone model configuration
+
+        Returns:
+            Path to the cached schema on a hit, None on a miss
+        """
+        entry = self._index.get(zone_name)
+        schema_file = self.schemas_dir / schema_filename(
+            zone_name, self.config.schema_format
+        )
+
+        try:
+            hit = (
+                entry is not None
+                and schema_file.exists()
+                and entry.get("fingerprint") == self.fingerprint(zone_name, zone)
+                and entry.get("schema_sha256") == hash_file(schema_file)
+            )
+        except Exception as e:
+            self.logger.debug(f"Schema cache lookup failed for {zone_name}: {e}")
+            hit = False
+
+        if hit:
+            self.hits.append(zone_name)
+            self.logger.info(f"Schema cache hit for zone: {zone_name}")
+            return schema_file
+
+        self.misses.append(zone_name)
+        return None
+
+    def store(self, zone_name: str, zone: ZoneModel, schema_file: Path):
+        """
+        Record a freshly generated schema.
+
+        Args:
+            zone_name: Name of the zone
+            zone: Zone model configuration
+            schema_file: Generated schema file
+        """
+        try:
+            self._index[zone_name] = {
+                "fingerprint": self.fingerprint(zone_name, zone),
+                "schema_sha256": hash_file(schema_file),
+            }
+        except Exception as e:
+            self.logger.debug(f"Could not cache schema for {zone_name}: {e}")
+
+    def invalidate(self, zone_name: Optional[str] = None):
+        """
+        Drop cache entries.
+
+        Args:
+            zone_name: Zone to invalidate; all zones if None
+        """
+        if zone_name is None:
+            self._index.clear()
+        else:
+            self._index.pop(zone_name, None)
@@ -0,0 +1,142 @@
+"""
+Schema Diff for Django Revolution
+
+Structural comparison of OpenAPI schemas by operations and components.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+
+class SchemaDiff(BaseModel):
+    """Differences between two versions of a zone schema."""
+
+    added_operations: List[str] = Field(default_factory=list)
+    removed_operations: List[str] = Field(default_factory=list)
+    changed_operations: List[str] = Field(default_factory=list)
+    added_components: List[str] = Field(default_factory=list)
+    removed_components: List[str] = Field(default_factory=list)
+    changed_components: List[str] = Field(default_factory=list)
+    metadata_changed: bool = Field(
+        False, description="Top-level data (info, servers, security, ...) changed"
+    )
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether the schemas differ in anything that affects generated clients."""
+        return self.metadata_changed or any(
+            (
+                self.added_operations,
+                self.removed_operations,
+                self.changed_operations,
+                self.added_components,
+                self.removed_components,
+                self.changed_components,
+            )
+        )
+
+    def describe(self) -> str:
+        """Short human readable description of the diff."""
+        if not self.has_changes:
+            return "no changes"
+
+        parts = []
+        operations = (
+            len(self.added_operations),
+            len(self.removed_operations),
+            len(self.changed_operations),
+        )
+        components = (
+            len(self.added_components),
+            len(self.removed_components),
+            len(self.changed_components),
+        )
+        if any(operations):
+            parts.append("operations +{}/-{}/~{}".format(*operations))
+        if any(components):
+            parts.append("components +{}/-{}/~{}".format(*components))
+        if self.metadata_changed:
+            parts.append("metadata changed")
+        return ", ".join(parts)
+
+
+def _digest(value: Any) -> str:
+    """Order-independent digest of a JSON-compatible value."""
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _operations(schema: Dict[str, Any]) -> Dict[str, str]:
+    """Map "METHOD /path" to a digest of the operation (including path-level data)."""
+    operations = {}
+    for path, path_item in (schema.get("paths") or {}).items():
+        if not isinstance(path_item, dict):
+            continue
+        shared = {k: v for k, v in path_item.items() if k not in HTTP_METHODS}
+        for method in HTTP_METHODS:
+            if method in path_item:
+                operations[f"{method.upper()} {path}"] = _digest(
+                    [shared, path_item[method]]
+                )
+    return operations
+
+
+def _components(schema: Dict[str, Any]) -> Dict[str, str]:
+    """Map "section/name" to a digest of each component."""
+    components = {}
+    for section, items in (schema.get("components") or {}).items():
+        if not isinstance(items, dict):
+            continue
+        for name, component in items.items():
+            components[f"{section}/{name}"] = _digest(component)
+    return components
+
+
+def _metadata(schema: Dict[str, Any]) -> str:
+    """Digest of everything except paths and components."""
+    return _digest({k: v for k, v in schema.items() if k not in ("paths", "components")})
+
+
+def _compare(old: Dict[str, str], new: Dict[str, str]):
+    added = sorted(set(new) - set(old))
+    removed = sorted(set(old) - set(new))
+    changed = sorted(key for key in set(old) & set(new) if old[key] != new[key])
+    return added, removed, changed
+
+
+def diff_schemas(
+    old_schema: Optional[Dict[str, Any]], new_schema: Dict[str, Any]
+) -> SchemaDiff:
+    """
+    Compare two OpenAPI schemas.
+
+    Args:
+        old_schema: Previous schema (None if there was none)
+        new_schema: Current schema
+
+    Returns:
+        SchemaDiff describing added, removed and changed items
+    """
+    old_schema = old_schema or {}
+
+    added_ops, removed_ops, changed_ops = _compare(
+        _operations(old_schema), _operations(new_schema)
+    )
+    added_comps, removed_comps, changed_comps = _compare(
+        _components(old_schema), _components(new_schema)
+    )
+
+    return SchemaDiff(
+        added_operations=added_ops,
+        removed_operations=removed_ops,
+        changed_operations=changed_ops,
+        added_components=added_comps,
+        removed_components=removed_comps,
+        changed_components=changed_comps,
+        metadata_changed=_metadata(old_schema) != _metadata(new_schema),
+    )
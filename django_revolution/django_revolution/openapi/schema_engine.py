@@ -0,0 +1,147 @@
+"""
+Schema Engine for Django Revolution
+
+In-process OpenAPI schema generation using drf-spectacular's SchemaGenerator.
+"""
+
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Optional, Tuple
+
+from ..utils import Logger
+
+# drf-spectacular keeps warning/error bookkeeping (GENERATOR_STATS) in module
+# globals, so in-process generations are serialized within one interpreter.
+_spectacular_lock = threading.Lock()
+
+
+def ensure_django_ready() -> bool:
+    """
+    Make sure Django is configured and the app registry is loaded.
+
+    Returns:
+        bool: True if Django is ready for in-process schema generation
+    """
+    try:
+        import django
+        from django.apps import apps
+        from django.conf import settings
+    except ImportError:
+        return False
+
+    if apps.ready:
+        return True
+
+    try:
+        if not settings.configured:
+            return False
+        django.setup()
+        return apps.ready
+    except Exception:
+        return False
+
+
+def is_inprocess_available() -> bool:
+    """
+    Check if schemas can be generated inside the current interpreter.
+
+    Returns:
+        bool: True if drf-spectacular is importable and Django is ready
+    """
+    try:
+        import drf_spectacular  # noqa: F401
+    except ImportError:
+        return False
+
+    return ensure_django_ready()
+
+
+def build_schema(
+    urlconf_module: ModuleType,
+    api_version: Optional[str],
+    path_prefix: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build an OpenAPI schema dictionary for a URLconf module.
+
+    Args:
+        urlconf_module: URLconf module (e.g. from ZoneManager.create_dynamic_urlconf_module)
+        api_version: API version passed to the generator
+        path_prefix: SCHEMA_PATH_PREFIX to use unless one is configured; keeps
+            operation ids and tags of a single app the same as for its zone
+
+    Returns:
+        OpenAPI schema as a dictionary
+    """
+    from drf_spectacular.drainage import GENERATOR_STATS
+    from drf_spectacular.settings import patched_settings, spectacular_settings
+
+    with _spectacular_lock:
+        patches = None
+        if path_prefix and spectacular_settings.SCHEMA_PATH_PREFIX is None:
+            patches = {"SCHEMA_PATH_PREFIX": path_prefix}
+
+        with patched_settings(patches):
+            GENERATOR_STATS.reset()
+            generator_class = spectacular_settings.DEFAULT_GENERATOR_CLASS
+            generator = generator_class(urlconf=urlconf_module, api_version=api_version)
+            schema = generator.get_schema(request=None, public=True)
+            GENERATOR_STATS.emit_summary()
+
+    return schema
+
+
+def render_schema(schema: Dict[str, Any], schema_format: str = "yaml") -> bytes:
+    """
+    Render a schema dictionary the same way `manage.py spectacular` does.
+
+    Args:
+        schema: OpenAPI schema dictionary
+        schema_format: "yaml" or "json" (`--format openapi-json`)
+
+    Returns:
+        Rendered schema document
+    """
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+    if schema_format == "json":
+        return OpenApiJsonRenderer().render(schema, renderer_context={})
+    return OpenApiYamlRenderer().render(schema, renderer_context={})
+
+
+def generate_schema_in_process(
+    urlconf_module: ModuleType,
+    api_version: Optional[str],
+    schema_file: Path,
+    logger: Optional[Logger] = None,
+    path_prefix: Optional[str] = None,
+) -> Tuple[bool, str]:
+    """
+    Generate a zone schema file without spawning a `manage.py` subprocess.
+
+    Args:
+        urlconf_module: URLconf module for the zone
+        api_version: API version passed to the generator
+        schema_file: Destination schema file
+        logger: Optional logger instance
+        path_prefix: Optional SCHEMA_PATH_PREFIX, see build_schema()
+
+    Returns:
+        Tuple of (success, error message)
+    """
+    logger = logger or Logger("schema_engine")
+
+    try:
+        schema = build_schema(urlconf_module, api_version, path_prefix)
+        output = render_schema(schema, "json" if schema_file.suffix == ".json" else "yaml")
+
+        schema_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(schema_file, "wb") as f:
+            f.write(output)
+
+        logger.debug(f"In-process schema written: {schema_file}")
+        return True, ""
+
+    except Exception as e:
+        return False, str(e)
@@ -0,0 +1,220 @@
+"""
+Schema I/O for Django Revolution
+
+Reads and writes zone schemas as YAML or JSON. YAML goes through libyaml
+when PyYAML was built with it, and parsed YAML schemas are cached on disk
+by content hash so internal consumers (diffing, sharding, shared models)
+do not parse the same document twice.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import yaml
+
+# Formats the schema stage can write, see the schema_format setting
+SCHEMA_FORMATS = ("yaml", "json")
+
+# libyaml bindings are optional in PyYAML builds
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def schema_filename(name: str, schema_format: str = "yaml") -> str:
+    """
+    File name of a schema in the given format.
+
+    Args:
+        name: Zone (or shard) name
+        schema_format: One of SCHEMA_FORMATS
+
+    Returns:
+        File name such as "public.yaml"
+    """
+    return f"{name}.{schema_format}"
+
+
+def dump_schema(schema: Dict[str, Any], schema_format: str = "yaml") -> str:
+    """
+    Serialize a schema dictionary.
+
+    Args:
+        schema: OpenAPI schema dictionary
+        schema_format: One of SCHEMA_FORMATS
+
+    Returns:
+        Serialized schema document
+    """
+    if schema_format == "json":
+        return json.dumps(schema, indent=2, ensure_ascii=False)
+    return yaml.dump(schema, Dumper=SafeDumper, sort_keys=False, allow_unicode=True)
+
+
+def write_schema(schema: Dict[str, Any], schema_file: Path):
+    """
+    Write a schema file in the format given by its suffix.
+
+    Args:
+        schema: OpenAPI schema dictionary
+        schema_file: Destination ".json", ".yaml" or ".yml" file
+    """
+    schema_format = "json" if schema_file.suffix == ".json" else "yaml"
+    schema_file.write_text(dump_schema(schema, schema_format), encoding="utf-8")
+
+
+def parse_schema(content: bytes, json_format: bool = False) -> Dict[str, Any]:
+    """
+    Parse a serialized schema.
+
+    Args:
+        content: Schema document
+        json_format: Whether the document is JSON rather than YAML
+
+    Returns:
+        Parsed schema dictionary
+    """
+    if json_format:
+        return json.loads(content)
+    return yaml.load(content, Loader=SafeLoader) or {}
+
+
+class ParsedSchemaCache:
+    """Pickled parsed schemas keyed by the SHA-256 of the schema file."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 256):
+        """
+        Initialize parsed schema cache.
+
+        Args:
+            cache_dir: Directory for cache entries; caching is off while None
+            max_entries: Entries kept on disk, least recently used go first
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def configure(self, cache_dir: Optional[Path], max_entries: Optional[int] = None):
+        """
+        Point the cache at a directory.
+
+        Args:
+            cache_dir: Directory for cache entries, None to disable caching
+            max_entries: Optional new entry limit
+        """
+        with self._lock:
+            self.cache_dir = cache_dir
+            if max_entries is not None:
+                self.max_entries = max_entries
+
+    @property
+    def enabled(self) -> bool:
+        """Whether parsed schemas are cached."""
+        return self.cache_dir is not None
+
+    def load(self, schema_path: Path) -> Dict[str, Any]:
+        """
+        Load a schema file, reusing the parsed form of identical content.
+
+        JSON parses about as fast as a pickle loads, so only YAML schemas
+        are cached.
+
+        Args:
+            schema_path: Path to a YAML or JSON schema
+
+        Returns:
+            Parsed schema dictionary
+        """
+        content = Path(schema_path).read_bytes()
+        json_format = Path(schema_path).suffix == ".json"
+        cache_dir = self.cache_dir
+        if json_format or cache_dir is None:
+            return parse_schema(content, json_format)
+
+        entry = cache_dir / f"{hashlib.sha256(content).hexdigest()}.pickle"
+        try:
+            with open(entry, "rb") as f:
+                schema = pickle.load(f)
+            os.utime(entry)
+            self.hits += 1
+            return schema
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # Truncated or written by an incompatible version
+            entry.unlink(missing_ok=True)
+
+        self.misses += 1
+        schema = parse_schema(content)
+        self._store(entry, schema)
+        return schema
+
+    def _store(self, entry: Path, schema: Dict[str, Any]):
+        """Write a cache entry atomically and prune old entries."""
+        temp = entry.with_name(f".{entry.name}.{os.getpid()}.{threading.get_ident()}")
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp, "wb") as f:
+                pickle.dump(schema, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, entry)
+        except OSError:
+            temp.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._prune(entry.parent)
+
+    def _prune(self, cache_dir: Path):
+        entries = []
+        for path in cache_dir.glob("*.pickle"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries :]:
+            path.unlink(missing_ok=True)
+
+    def clear(self):
+        """Delete all cache entries."""
+        if self.cache_dir is not None and self.cache_dir.is_dir():
+            for path in self.cache_dir.glob("*.pickle"):
+                path.unlink(missing_ok=True)
+
+
+_default_cache: Optional[ParsedSchemaCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_parsed_schema_cache() -> ParsedSchemaCache:
+    """
+    Get the process-wide parsed schema cache.
+
+    Returns:
+        Shared ParsedSchemaCache instance
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ParsedSchemaCache()
+        return _default_cache
+
+
+def load_schema(schema_path: Path) -> Dict[str, Any]:
+    """
+    Load an OpenAPI schema file.
+
+    Args:
+        schema_path: Path to a YAML or JSON schema
+
+    Returns:
+        Parsed schema dictionary
+    """
+    return get_parsed_schema_cache().load(Path(schema_path))
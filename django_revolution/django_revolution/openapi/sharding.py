@@ -0,0 +1,647 @@
+"""
+Schema Sharding for Django Revolution
+
+Splits the schema of a large zone into per-app or per-tag sub-schemas that
+are generated and built into clients in parallel, then merges the results
+into one schema and one client package.
+"""
+
+import ast
+import contextvars
+import copy
+import json
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..config import ZoneModel
+from ..utils import Logger
+from .schema_diff import HTTP_METHODS
+from .schema_io import load_schema, write_schema
+
+SHARD_STRATEGIES = ("app", "tag")
+
+# Operations that match no app (or have no tag) end up in this shard
+DEFAULT_SHARD = "default"
+
+_REF_PATTERN = re.compile(r"^#/components/([^/]+)/(.+)$")
+
+
+def shard_label(value: str) -> str:
+    """Make an app label or tag usable as a file and zone name."""
+    label = re.sub(r"[^A-Za-z0-9_-]+", "_", value.split(".")[-1]).strip("_").lower()
+    return label or DEFAULT_SHARD
+
+
+def app_shards(zone: ZoneModel) -> Dict[str, ZoneModel]:
+    """
+    Split a zone into one sub-zone per app for schema generation.
+
+    Args:
+        zone: Zone with shard_by="app"
+
+    Returns:
+        Mapping of sub-zone name to sub-zone, empty if the zone has one app
+    """
+    if zone.shard_by != "app" or len(zone.apps) < 2:
+        return {}
+
+    shards = {}
+    for app in zone.apps:
+        name = f"{zone.name}__{shard_label(app)}"
+        shards[name] = ZoneModel(
+            **{**zone.model_dump(), "name": name, "apps": [app], "shard_by": None}
+        )
+    return shards
+
+
+def shard_path_prefix(api_prefix: str) -> str:
+    """
+    SCHEMA_PATH_PREFIX for generating the schema of one app of a zone.
+
+    drf-spectacular derives operation ids and default tags from the paths
+    below the common prefix of all endpoints. For a zone with several apps
+    that is the API prefix, so app shards use it as well.
+
+    Args:
+        api_prefix: API prefix the zone's app URLs live under
+
+    Returns:
+        Path prefix regular expression
+    """
+    return re.escape("/" + api_prefix.strip("/"))
+
+
+def _collect_refs(node: Any, refs: List[Tuple[str, str]]):
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            match = _REF_PATTERN.match(ref)
+            if match:
+                refs.append((match.group(1), match.group(2)))
+        for value in node.values():
+            _collect_refs(value, refs)
+    elif isinstance(node, list):
+        for value in node:
+            _collect_refs(value, refs)
+
+
+def component_refs(node: Any) -> List[Tuple[str, str]]:
+    """
+    Components a schema fragment references directly.
+
+    Args:
+        node: Part of a schema
+
+    Returns:
+        List of (components section, name) pairs
+    """
+    refs: List[Tuple[str, str]] = []
+    _collect_refs(node, refs)
+    return refs
+
+
+def _referenced_components(
+    components: Dict[str, Dict[str, Any]], roots: Any
+) -> Dict[str, Dict[str, Any]]:
+    """Components reachable from roots, following references transitively."""
+    pending: List[Tuple[str, str]] = []
+    _collect_refs(roots, pending)
+
+    selected: Dict[str, Dict[str, Any]] = {}
+    while pending:
+        section, name = pending.pop()
+        if name in selected.get(section, {}):
+            continue
+        component = components.get(section, {}).get(name)
+        if component is None:
+            continue
+        selected.setdefault(section, {})[name] = component
+        _collect_refs(component, pending)
+
+    # Security schemes are referenced by name, not by $ref
+    if "securitySchemes" in components:
+        selected["securitySchemes"] = dict(components["securitySchemes"])
+
+    return {
+        section: {name: entries[name] for name in sorted(entries)}
+        for section, entries in selected.items()
+    }
+
+
+def _operation_shard(
+    path: str, operation: Dict[str, Any], zone: ZoneModel, api_prefix: str
+) -> str:
+    if zone.shard_by == "tag":
+        tags = operation.get("tags") or [DEFAULT_SHARD]
+        return shard_label(str(tags[0]))
+
+    parts = path.strip("/").split("/")
+    app_names = {app.split(".")[-1] for app in zone.apps}
+    if len(parts) > 1 and parts[0] == api_prefix and parts[1] in app_names:
+        return shard_label(parts[1])
+    return DEFAULT_SHARD
+
+
+def split_schema(
+    schema: Dict[str, Any], zone: ZoneModel, api_prefix: str
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Split a zone schema into sub-schemas by app or by first tag.
+
+    Every sub-schema keeps the top-level data of the zone schema and only the
+    components its operations reference.
+
+    Args:
+        schema: Zone schema
+        zone: Zone with shard_by set
+        api_prefix: API prefix the zone's app URLs live under
+
+    Returns:
+        Mapping of shard name to sub-schema, empty if there is only one shard
+    """
+    if zone.shard_by not in SHARD_STRATEGIES:
+        return {}
+
+    shard_paths: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for path, item in (schema.get("paths") or {}).items():
+        for method, operation in item.items():
+            if method not in HTTP_METHODS or not isinstance(operation, dict):
+                continue
+            shard = _operation_shard(path, operation, zone, api_prefix)
+            shard_item = shard_paths.setdefault(shard, {}).setdefault(path, {})
+            shard_item[method] = operation
+            # Path-level entries (parameters, summary) apply to every operation
+            for key, value in item.items():
+                if key not in HTTP_METHODS:
+                    shard_item.setdefault(key, value)
+
+    if len(shard_paths) < 2:
+        return {}
+
+    components = schema.get("components") or {}
+    tags = schema.get("tags")
+    shards = {}
+    for shard in sorted(shard_paths):
+        paths = shard_paths[shard]
+        sub_schema = {
+            key: value
+            for key, value in schema.items()
+            if key not in ("paths", "components", "tags")
+        }
+        sub_schema["paths"] = paths
+        sub_schema["components"] = _referenced_components(components, paths)
+        if tags:
+            used = {
+                tag
+                for item in paths.values()
+                for operation in item.values()
+                if isinstance(operation, dict)
+                for tag in operation.get("tags") or []
+            }
+            sub_schema["tags"] = [tag for tag in tags if tag.get("name") in used]
+        shards[shard] = sub_schema
+    return shards
+
+
+def write_shard_schemas(
+    schema: Dict[str, Any], zone: ZoneModel, api_prefix: str, shards_dir: Path
+) -> Dict[str, Path]:
+    """
+    Split a zone schema and write the sub-schemas as JSON files.
+
+    Args:
+        schema: Zone schema
+        zone: Zone with shard_by set
+        api_prefix: API prefix the zone's app URLs live under
+        shards_dir: Directory for the sub-schema files
+
+    Returns:
+        Mapping of shard name to sub-schema file, empty if not sharded
+    """
+    shards = split_schema(schema, zone, api_prefix)
+    if shards_dir.exists():
+        shutil.rmtree(shards_dir)
+    if not shards:
+        return {}
+
+    shards_dir.mkdir(parents=True)
+    files = {}
+    for shard, sub_schema in shards.items():
+        files[shard] = shards_dir / f"{shard}.json"
+        files[shard].write_text(json.dumps(sub_schema), encoding="utf-8")
+    return files
+
+
+def merge_schemas(schemas: Sequence[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Merge sub-schemas of a zone into one schema.
+
+    Paths are combined and components with the same name are kept once.
+
+    Args:
+        schemas: Sub-schemas; top-level data is taken from the first one
+
+    Returns:
+        Tuple of (merged schema, components that differed between shards;
+        the first definition wins)
+    """
+    merged = copy.deepcopy(dict(schemas[0])) if schemas else {}
+    paths: Dict[str, Dict[str, Any]] = {}
+    components: Dict[str, Dict[str, Any]] = {}
+    tags: Dict[str, Any] = {}
+    conflicts: List[str] = []
+
+    for schema in schemas:
+        for path, item in (schema.get("paths") or {}).items():
+            paths.setdefault(path, {}).update(item)
+        for section, entries in (schema.get("components") or {}).items():
+            merged_section = components.setdefault(section, {})
+            for name, component in entries.items():
+                if name not in merged_section:
+                    merged_section[name] = component
+                elif merged_section[name] != component:
+                    conflicts.append(f"{section}/{name}")
+        for tag in schema.get("tags") or []:
+            tags.setdefault(tag.get("name"), tag)
+
+    merged["paths"] = {path: paths[path] for path in sorted(paths)}
+    merged["components"] = {
+        section: {name: entries[name] for name in sorted(entries)}
+        for section, entries in components.items()
+    }
+    if tags:
+        merged["tags"] = list(tags.values())
+    return merged, sorted(set(conflicts))
+
+
+def write_merged_schema(
+    shard_files: Sequence[Path], schema_file: Path, logger: Optional[Logger] = None
+) -> bool:
+    """
+    Merge sub-schema files into a zone schema file and delete them.
+
+    Args:
+        shard_files: Sub-schema files (YAML or JSON)
+        schema_file: Zone schema file to write
+        logger: Optional logger instance
+
+    Returns:
+        bool: True if the zone schema was written
+    """
+    logger = logger or Logger("sharding")
+    try:
+        schema, conflicts = merge_schemas([load_schema(path) for path in shard_files])
+        if conflicts:
+            logger.warning(
+                f"Components differ between shards of {schema_file.stem}, "
+                f"keeping the first definition: {', '.join(conflicts)}"
+            )
+        write_schema(schema, schema_file)
+    except Exception as e:
+        logger.error(f"Failed to merge schema shards of {schema_file.stem}: {e}")
+        return False
+    finally:
+        for path in shard_files:
+            Path(path).unlink(missing_ok=True)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Client merging
+# ---------------------------------------------------------------------------
+
+_TS_DECLARATION = re.compile(
+    r"^export\s+(?:declare\s+)?(?:async\s+)?"
+    r"(type|interface|const|let|var|enum|function|class|namespace)\s+([A-Za-z_$][\w$]*)"
+)
+_TS_NAMED_IMPORT = re.compile(
+    r"^import\s+(type\s+)?\{([^}]*)\}\s*from\s*(['\"][^'\"]+['\"]);?\s*$", re.S
+)
+
+
+def _is_comment(lines: Sequence[str]) -> bool:
+    return all(
+        not line.strip() or line.lstrip().startswith(("/*", "*", "//"))
+        for line in lines
+    )
+
+
+def typescript_statements(source: str) -> List[Tuple[str, str]]:
+    """
+    Split a generated TypeScript module into top-level statements.
+
+    Returns:
+        List of (statement with its doc comment, statement code)
+    """
+    statements: List[List[str]] = []
+    current: List[str] = []
+    for line in source.splitlines():
+        top_level = line[:1] not in ("", " ", "\t", "}", ")", "]", "*")
+        # A comment directly above a declaration belongs to it
+        if current and (
+            (top_level and not _is_comment(current))
+            or (not line.strip() and _is_comment(current))
+        ):
+            statements.append(current)
+            current = []
+        if current or line.strip():
+            current.append(line)
+    if current:
+        statements.append(current)
+
+    result = []
+    for lines in statements:
+        code = [line for line in lines if not _is_comment([line])]
+        result.append(("\n".join(lines).strip(), "\n".join(code).strip()))
+    return result
+
+
+def typescript_declaration(code: str) -> Optional[Tuple[str, str]]:
+    """
+    Kind and name of an exported TypeScript declaration.
+
+    Args:
+        code: Statement code without its doc comment
+
+    Returns:
+        Tuple of (kind, name), or None if the statement declares nothing
+    """
+    match = _TS_DECLARATION.match(code)
+    return match.groups() if match else None
+
+
+def join_typescript_statements(statements: Sequence[str]) -> str:
+    """
+    Join top-level TypeScript statements into a module.
+
+    Consecutive imports stay on adjacent lines; other statements are
+    separated by a blank line.
+
+    Args:
+        statements: Statements with their doc comments
+
+    Returns:
+        Module source
+    """
+    output = ""
+    previous_import = False
+    for statement in statements:
+        is_import = statement.startswith(("import ", "export type {", "export {"))
+        if output:
+            output += "\n" if is_import and previous_import else "\n\n"
+        output += statement
+        previous_import = is_import
+    return output + "\n"
+
+
+def merge_typescript_modules(sources: Sequence[str]) -> str:
+    """
+    Merge generated TypeScript modules of several shards.
+
+    Named imports from the same module are combined and declarations with
+    the same name and kind are kept once.
+
+    Args:
+        sources: Module sources; the first one wins on conflicts
+
+    Returns:
+        Merged module source
+    """
+    statements: List[Any] = []
+    imports: Dict[Tuple[str, bool], List[str]] = {}
+    seen = set()
+
+    for source in sources:
+        for statement, code in typescript_statements(source):
+            match = _TS_NAMED_IMPORT.match(code)
+            if match:
+                key = (match.group(3), bool(match.group(1)))
+                specifiers = [s.strip() for s in match.group(2).split(",") if s.strip()]
+                if key not in imports:
+                    imports[key] = []
+                    statements.append(key)
+                for specifier in specifiers:
+                    if specifier not in imports[key]:
+                        imports[key].append(specifier)
+                continue
+
+            key = typescript_declaration(code) or statement
+            if key in seen:
+                continue
+            seen.add(key)
+            statements.append(statement)
+
+    rendered = []
+    for statement in statements:
+        if isinstance(statement, tuple):
+            module, type_only = statement
+            keyword = "import type" if type_only else "import"
+            statement = f"{keyword} {{ {', '.join(imports[statement])} }} from {module};"
+        rendered.append(statement)
+    return join_typescript_statements(rendered)
+
+
+def merge_python_inits(sources: Sequence[str]) -> str:
+    """
+    Merge generated ``__init__.py`` modules of several shards.
+
+    Relative imports and ``__all__`` entries are combined; other statements
+    are kept once.
+
+    Args:
+        sources: Module sources; the docstring of the first one is kept
+
+    Returns:
+        Merged module source
+
+    Raises:
+        SyntaxError: If a source cannot be parsed
+    """
+    docstring = None
+    imports: Dict[Tuple[int, str], List[str]] = {}
+    exported: List[str] = []
+    statements: List[str] = []
+
+    for source in sources:
+        tree = ast.parse(source)
+        if docstring is None:
+            docstring = ast.get_docstring(tree, clean=False)
+
+        for node in tree.body:
+            if (
+                isinstance(node, ast.Expr)
+                and isinstance(node.value, ast.Constant)
+                and isinstance(node.value.value, str)
+            ):
+                continue
+            if isinstance(node, ast.ImportFrom) and node.level:
+                names = imports.setdefault((node.level, node.module or ""), [])
+                for alias in node.names:
+                    name = alias.name if not alias.asname else f"{alias.name} as {alias.asname}"
+                    if name not in names:
+                        names.append(name)
+                continue
+            if (
+                isinstance(node, ast.Assign)
+                and [getattr(t, "id", None) for t in node.targets] == ["__all__"]
+                and isinstance(node.value, (ast.Tuple, ast.List))
+            ):
+                for element in node.value.elts:
+                    if isinstance(element, ast.Constant) and element.value not in exported:
+                        exported.append(element.value)
+                continue
+            statement = ast.unparse(node)
+            if statement not in statements:
+                statements.append(statement)
+
+    lines = []
+    if docstring is not None:
+        lines += [f'"""{docstring}"""', ""]
+    for (level, module), names in sorted(imports.items(), key=lambda item: item[0][1]):
+        lines.append(f"from {'.' * level}{module} import {', '.join(sorted(names))}")
+    if statements:
+        lines += [""] + statements
+    if exported:
+        lines += ["", "__all__ = ("]
+        lines += [f'    "{name}",' for name in sorted(exported)]
+        lines.append(")")
+    return "\n".join(lines) + "\n"
+
+
+def merge_client_trees(shard_dirs: Sequence[Path], target_dir: Path) -> List[str]:
+    """
+    Merge client trees generated from the shards of a zone.
+
+    Files with the same content are written once. Different versions of a
+    TypeScript module or a Python ``__init__.py`` are merged; for any other
+    file the version of the first shard is kept.
+
+    Args:
+        shard_dirs: Generated client directories, one per shard
+        target_dir: Directory for the merged client
+
+    Returns:
+        Relative paths of files whose shard versions could not be merged
+    """
+    files: Dict[Path, List[Path]] = {}
+    for shard_dir in shard_dirs:
+        for path in sorted(shard_dir.rglob("*")):
+            if path.is_file():
+                files.setdefault(path.relative_to(shard_dir), []).append(path)
+
+    conflicts = []
+    for relative, paths in files.items():
+        target = target_dir / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        contents: List[bytes] = []
+        for path in paths:
+            content = path.read_bytes()
+            if content not in contents:
+                contents.append(content)
+
+        if len(contents) == 1:
+            shutil.copyfile(paths[0], target)
+            continue
+
+        sources = [content.decode("utf-8") for content in contents]
+        try:
+            if relative.suffix == ".ts":
+                merged = merge_typescript_modules(sources)
+            elif relative.name == "__init__.py":
+                merged = merge_python_inits(sources)
+            else:
+                merged = None
+        except (SyntaxError, UnicodeDecodeError):
+            merged = None
+
+        if merged is None:
+            conflicts.append(relative.as_posix())
+            shutil.copyfile(paths[0], target)
+        else:
+            target.write_text(merged, encoding="utf-8")
+
+    return conflicts
+
+
+def build_sharded_client(
+    zone_name: str,
+    shards: Dict[str, Path],
+    build: Callable[[str, Path, Path], Tuple[bool, str]],
+    target_dir: Path,
+    scheduler=None,
+    stage: str = "",
+    logger: Optional[Logger] = None,
+    build_all: Optional[
+        Callable[[List[Tuple[str, Path, Path]]], List[Tuple[bool, str]]]
+    ] = None,
+) -> Tuple[bool, str]:
+    """
+    Generate a client per shard and merge them into one client tree.
+
+    Args:
+        zone_name: Name of the zone
+        shards: Mapping of shard name to sub-schema file
+        build: Generates one shard: build(shard_name, schema_path, output_dir)
+        target_dir: Directory for the merged client
+        scheduler: Job scheduler to run the shards on in parallel
+        stage: Scheduler stage of the shard jobs
+        logger: Optional logger instance
+        build_all: Generates all shards at once from (shard name, schema
+            path, output dir) triples; used instead of build when given
+
+    Returns:
+        Tuple of (success, error message)
+    """
+    logger = logger or Logger("sharding")
+    work_dir = target_dir.with_name(f"{target_dir.name}.shards")
+    if work_dir.exists():
+        shutil.rmtree(work_dir)
+
+    # Each job runs in a copy of the caller's context, so commands of the
+    # shards are counted in the caller's stage timing
+    items = [
+        (contextvars.copy_context(), shard, schema_path, work_dir / shard)
+        for shard, schema_path in shards.items()
+    ]
+
+    def run(context, shard, schema_path, output_dir):
+        output_dir.mkdir(parents=True)
+        return context.run(build, shard, schema_path, output_dir)
+
+    try:
+        if build_all is not None:
+            for item in items:
+                item[3].mkdir(parents=True)
+            results = build_all([item[1:] for item in items])
+        elif scheduler is not None:
+            futures = scheduler.run_all(stage, run, items)
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append((False, str(e)))
+        else:
+            results = [run(*item) for item in items]
+
+        errors = [
+            f"shard {shard}: {error}"
+            for (_, shard, _, _), (success, error) in zip(items, results)
+            if not success
+        ]
+        if errors:
+            return False, "; ".join(errors)
+
+        conflicts = merge_client_trees([item[3] for item in items], target_dir)
+        if conflicts:
+            logger.warning(
+                f"Shard versions of these {zone_name} client files differ, "
+                f"keeping the first: {', '.join(conflicts)}"
+            )
+        logger.info(f"Merged {len(shards)} shards into the {zone_name} client")
+        return True, ""
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
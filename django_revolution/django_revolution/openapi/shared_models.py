@@ -0,0 +1,285 @@
+"""
+Shared Models for Django Revolution
+
+Finds components that several zones define identically, emits them once
+into a common client package and makes zone clients import those models
+instead of generating their own copies.
+"""
+
+import ast
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .schema_io import load_schema, write_schema
+from .sharding import (
+    component_refs,
+    join_typescript_statements,
+    typescript_declaration,
+    typescript_statements,
+)
+
+# Zone name of the client package that holds the shared models
+COMMON_PACKAGE = "common"
+
+# Generated TypeScript modules that only declare models
+TS_MODEL_MODULES = ("types.gen.ts", "schemas.gen.ts")
+
+_TS_TYPE_KINDS = ("type", "interface")
+
+
+def find_shared_components(schemas: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Find component schemas that several zones share.
+
+    A component is shared when at least two zones define it and every zone
+    that defines it does so identically. Components that reference a
+    component that is not shared are not shared either, so the common
+    package is self-contained.
+
+    Args:
+        schemas: Mapping of zone name to parsed zone schema
+
+    Returns:
+        Shared components by name, sorted by name
+    """
+    definitions: Dict[str, Dict[str, Any]] = {}
+    zones: Dict[str, int] = {}
+    conflicting = set()
+
+    for schema in schemas.values():
+        components = (schema.get("components") or {}).get("schemas") or {}
+        for name, component in components.items():
+            canonical = json.dumps(component, sort_keys=True)
+            if name not in definitions:
+                definitions[name] = {canonical: component}
+            elif canonical not in definitions[name]:
+                conflicting.add(name)
+            zones[name] = zones.get(name, 0) + 1
+
+    shared = {
+        name: next(iter(forms.values()))
+        for name, forms in definitions.items()
+        if zones[name] > 1 and name not in conflicting
+    }
+
+    # Drop components that (transitively) depend on unshared ones
+    changed = True
+    while changed:
+        changed = False
+        for name in list(shared):
+            refs = component_refs(shared[name])
+            if any(section != "schemas" or ref not in shared for section, ref in refs):
+                del shared[name]
+                changed = True
+
+    return {name: shared[name] for name in sorted(shared)}
+
+
+def build_common_schema(
+    schemas: Dict[str, Dict[str, Any]], shared: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build the schema of the common package.
+
+    Args:
+        schemas: Mapping of zone name to parsed zone schema
+        shared: Shared components from find_shared_components()
+
+    Returns:
+        Schema without operations that declares the shared components
+    """
+    first = next(iter(schemas.values()), {})
+    return {
+        "openapi": first.get("openapi", "3.0.3"),
+        "info": {
+            "title": "Common Models",
+            "version": (first.get("info") or {}).get("version", "1.0.0"),
+            "description": "Models shared by several API zones",
+        },
+        "paths": {},
+        "components": {"schemas": shared},
+    }
+
+
+def write_common_schema(schemas: Dict[str, Path], schema_file: Path) -> List[str]:
+    """
+    Write the schema of the common package for a set of zone schemas.
+
+    Args:
+        schemas: Mapping of zone name to schema file
+        schema_file: Common schema file to write; removed if nothing is shared
+
+    Returns:
+        Names of the shared components
+    """
+    parsed = {zone_name: load_schema(Path(path)) for zone_name, path in schemas.items()}
+    shared = find_shared_components(parsed)
+    if not shared:
+        schema_file.unlink(missing_ok=True)
+        return []
+
+    write_schema(build_common_schema(parsed, shared), schema_file)
+    return list(shared)
+
+
+def _normalize_typescript(code: str) -> str:
+    """Declaration code without the differences Prettier introduces."""
+    return re.sub(r"[\s;,]+", "", code).replace('"', "'")
+
+
+def _typescript_reexports(module: str, types: List[str], values: List[str]) -> List[str]:
+    lines = []
+    if types:
+        lines.append(f"import type {{ {', '.join(types)} }} from '{module}';")
+    if values:
+        lines.append(f"import {{ {', '.join(values)} }} from '{module}';")
+    if types:
+        lines.append(f"export type {{ {', '.join(types)} }} from '{module}';")
+    if values:
+        lines.append(f"export {{ {', '.join(values)} }} from '{module}';")
+    return lines
+
+
+def dedupe_typescript_client(client_dir: Path, common_dir: Path) -> List[str]:
+    """
+    Replace model declarations of a zone client by imports from the common client.
+
+    Only declarations that are identical to the common client's are
+    replaced; the zone modules re-export the imported models, so code using
+    the zone client keeps working. The common client is expected next to
+    the zone client.
+
+    Args:
+        client_dir: Generated TypeScript client of a zone
+        common_dir: TypeScript client of the common package
+
+    Returns:
+        Names of the models now imported from the common client
+    """
+    shared: List[str] = []
+
+    for module in TS_MODEL_MODULES:
+        zone_file = client_dir / module
+        common_file = common_dir / module
+        if not (zone_file.exists() and common_file.exists()):
+            continue
+
+        common = {}
+        for _, code in typescript_statements(common_file.read_text(encoding="utf-8")):
+            key = typescript_declaration(code)
+            if key:
+                common[key] = _normalize_typescript(code)
+
+        kept: List[Tuple[str, str]] = []
+        types: List[str] = []
+        values: List[str] = []
+        for statement, code in typescript_statements(zone_file.read_text(encoding="utf-8")):
+            key = typescript_declaration(code)
+            if key and common.get(key) == _normalize_typescript(code):
+                kind, name = key
+                names = types if kind in _TS_TYPE_KINDS else values
+                if name not in names:
+                    names.append(name)
+                continue
+            kept.append((statement, code))
+
+        if not (types or values):
+            continue
+
+        # A value import brings the type of the same name along
+        types = [name for name in types if name not in values]
+        target = f"../{COMMON_PACKAGE}/{module[: -len('.ts')]}"
+
+        position = 0
+        while position < len(kept) and (
+            not kept[position][1] or kept[position][1].startswith("import ")
+        ):
+            position += 1
+        statements = [statement for statement, _ in kept]
+        statements[position:position] = _typescript_reexports(target, types, values)
+
+        zone_file.write_text(join_typescript_statements(statements), encoding="utf-8")
+        shared += [name for name in types + values if name not in shared]
+
+    return sorted(shared)
+
+
+def _defined_names(tree: ast.Module) -> List[str]:
+    """Public names a generated model module defines at the top level."""
+    names = []
+    for node in tree.body:
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            names.append(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            # T = TypeVar("T", bound="Model") is an implementation detail
+            value = node.value
+            if (
+                isinstance(value, ast.Call)
+                and getattr(value.func, "id", None) == "TypeVar"
+            ):
+                continue
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names += [target.id for target in targets if isinstance(target, ast.Name)]
+    return [name for name in names if not name.startswith("_")]
+
+
+def _python_shim(module: str, names: Sequence[str]) -> str:
+    lines = [
+        f'"""Shared model, defined in {module}."""',
+        "",
+        f"from {module} import {', '.join(names)}",
+        "",
+        "__all__ = (",
+    ]
+    lines += [f'    "{name}",' for name in names]
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+
+def dedupe_python_client(
+    client_dir: Path, package: str, common_dir: Path, common_package: str
+) -> List[str]:
+    """
+    Replace model modules of a zone client by imports from the common package.
+
+    Only modules whose code is identical to the common package's are
+    replaced; the remaining module imports the model, so imports of the
+    zone package keep working.
+
+    Args:
+        client_dir: Generated Python client project of a zone
+        package: Package name of the zone client
+        common_dir: Python client project of the common package
+        common_package: Package name of the common client
+
+    Returns:
+        Names of the model modules now imported from the common package
+    """
+    models_dir = client_dir / package / "models"
+    common_models = common_dir / common_package / "models"
+    if not (models_dir.is_dir() and common_models.is_dir()):
+        return []
+
+    shared = []
+    for common_file in sorted(common_models.glob("*.py")):
+        zone_file = models_dir / common_file.name
+        if common_file.name == "__init__.py" or not zone_file.exists():
+            continue
+
+        try:
+            common_tree = ast.parse(common_file.read_text(encoding="utf-8"))
+            zone_tree = ast.parse(zone_file.read_text(encoding="utf-8"))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+
+        names = _defined_names(common_tree)
+        if not names or ast.dump(common_tree) != ast.dump(zone_tree):
+            continue
+
+        module = f"{common_package}.models.{common_file.stem}"
+        zone_file.write_text(_python_shim(module, names), encoding="utf-8")
+        shared.append(common_file.stem)
+
+    return shared
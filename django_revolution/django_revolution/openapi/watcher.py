@@ -0,0 +1,309 @@
+"""
+Zone Watcher for Django Revolution
+
+Keeps a generator (and its Django process) warm, polls the sources of each
+zone's apps and regenerates the schemas and clients of the zones whose apps
+changed.
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from ..config import GenerationSummary
+from ..utils import Logger
+from .schema_cache import SchemaCache, module_files
+
+# App modules registered with Django's app registry; they cannot be
+# imported a second time, so changing them restarts the process
+RESTART_MODULES = ("models", "apps")
+
+# App modules that are never re-imported (and do not shape schemas)
+KEEP_MODULES = ("admin", "migrations")
+
+# Modification time and size of every watched file
+Snapshot = Dict[Path, Tuple[int, int]]
+
+
+def app_sources(app: str) -> Dict[Path, Tuple[str, ...]]:
+    """
+    Source files of an app with their module path inside the app.
+
+    Args:
+        app: Dotted app module name
+
+    Returns:
+        Mapping of file to module name parts below the app, e.g.
+        ("serializers", "user"); empty parts for a single-module app
+    """
+    try:
+        spec = importlib.util.find_spec(app)
+    except (ImportError, ValueError):
+        return {}
+
+    search_locations = (spec and spec.submodule_search_locations) or []
+    locations = [Path(location) for location in search_locations]
+    sources = {}
+    for path in module_files(app):
+        location = next((loc for loc in locations if path.is_relative_to(loc)), None)
+        relative = path.relative_to(location) if location else Path(path.name)
+        sources[path] = (*relative.parent.parts, relative.stem) if location else ()
+    return sources
+
+
+class ZoneWatcher:
+    """Regenerates the schemas and clients of zones whose app sources change."""
+
+    def __init__(
+        self,
+        generator,
+        zones: Optional[List[str]] = None,
+        debounce: Optional[float] = None,
+        poll_interval: float = 0.25,
+        on_summary: Optional[Callable[[GenerationSummary], None]] = None,
+        logger: Optional[Logger] = None,
+        on_start: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initialize zone watcher.
+
+        Args:
+            generator: OpenAPIGenerator to run; it stays warm between runs
+            zones: Zones to watch (default: all zones)
+            debounce: Seconds without further changes before regenerating
+                (default: watch_debounce_ms setting)
+            poll_interval: Seconds between scans of the watched files
+            on_summary: Called with the summary of every generation run
+            logger: Optional logger instance
+            on_start: Called before every generation run
+        """
+        self.generator = generator
+        self.logger = logger or Logger("zone_watcher")
+        self.debounce = (
+            generator.config.watch_debounce_ms / 1000 if debounce is None else debounce
+        )
+        self.poll_interval = poll_interval
+        self.on_summary = on_summary
+        self.on_start = on_start
+        self.zones = {
+            name: zone
+            for name, zone in generator.zone_manager.zones.items()
+            if not zones or name in zones
+        }
+
+        self.cycles = 0
+        self._snapshot: Snapshot = {}
+        self._owners: Dict[Path, Dict[str, Tuple[str, ...]]] = {}
+        self._stop = threading.Event()
+
+    def _scan(self) -> Snapshot:
+        """Stat the source files of all watched apps."""
+        snapshot: Snapshot = {}
+        owners: Dict[Path, Dict[str, Tuple[str, ...]]] = {}
+
+        for zone in self.zones.values():
+            for app in zone.apps:
+                for path, parts in app_sources(app).items():
+                    if set(parts) & set(KEEP_MODULES):
+                        continue
+                    owners.setdefault(path, {})[app] = parts
+                    if path in snapshot:
+                        continue
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+        # Deleted files keep their owners until the change is handled
+        for path in self._owners.keys() - owners.keys():
+            owners[path] = self._owners[path]
+        self._owners = owners
+        return snapshot
+
+    def poll(self) -> Set[Path]:
+        """
+        Scan the watched files once.
+
+        Returns:
+            Files added, modified or deleted since the previous scan
+        """
+        snapshot = self._scan()
+        changed = {
+            path
+            for path in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = snapshot
+        return changed
+
+    def wait_for_changes(self) -> Set[Path]:
+        """
+        Block until files changed and then stayed quiet for the debounce delay.
+
+        Returns:
+            Changed files; empty if the watcher was stopped
+        """
+        changed: Set[Path] = set()
+        last_change = 0.0
+
+        while not self._stop.wait(self.poll_interval):
+            changes = self.poll()
+            if changes:
+                changed |= changes
+                last_change = time.monotonic()
+            elif changed and time.monotonic() - last_change >= self.debounce:
+                return changed
+
+        return set()
+
+    def changed_apps(self, paths: Set[Path]) -> Set[str]:
+        """Apps owning any of the changed files."""
+        apps: Set[str] = set()
+        for path in paths:
+            apps.update(self._owners.get(path, {}))
+        return apps
+
+    def affected_zones(self, paths: Set[Path]) -> List[str]:
+        """
+        Zones whose schemas may change with the changed files.
+
+        Args:
+            paths: Changed files
+
+        Returns:
+            Names of the affected zones, in configuration order
+        """
+        apps = self.changed_apps(paths)
+        return [
+            name for name, zone in self.zones.items() if apps.intersection(zone.apps)
+        ]
+
+    def needs_restart(self, paths: Set[Path]) -> bool:
+        """Whether a changed file defines models or app configs."""
+        return any(
+            set(parts) & set(RESTART_MODULES)
+            for path in paths
+            for parts in self._owners.get(path, {}).values()
+        )
+
+    def _reload_apps(self, apps: Set[str]):
+        """Forget imported app modules so the next schema run imports them again."""
+        for name in list(sys.modules):
+            parts = name.split(".")
+            for app in apps:
+                if not name.startswith(f"{app}."):
+                    continue
+                app_parts = parts[len(app.split(".")) :]
+                if not set(app_parts) & set(RESTART_MODULES + KEEP_MODULES):
+                    del sys.modules[name]
+                break
+
+        # Zone URLconfs include the old app URLconfs
+        for name in list(sys.modules):
+            if name.startswith("django_revolution_dynamic_"):
+                del sys.modules[name]
+        self.generator.zone_manager.clear_cache()
+
+        from django.urls import clear_url_caches
+
+        clear_url_caches()
+
+    def _invalidate_schema_cache(self, zone_names: List[str]):
+        """Drop cached schemas of the zones; the cache only fingerprints some modules."""
+        config = self.generator.config
+        schemas_dir = self.generator.output_dir / config.output.schemas_directory
+        cache = SchemaCache(config, schemas_dir, self.logger)
+        for zone_name in zone_names:
+            cache.invalidate(zone_name)
+        cache.save()
+
+    def regenerate(self, paths: Set[Path]) -> Optional[GenerationSummary]:
+        """
+        Regenerate the zones affected by changed files.
+
+        Args:
+            paths: Changed files
+
+        Returns:
+            Summary of the run, or None if no zone was affected
+        """
+        if self.needs_restart(paths):
+            self.logger.info("Models or app configs changed, restarting")
+            self.restart()
+            return None
+
+        zone_names = self.affected_zones(paths)
+        if not zone_names:
+            return None
+
+        names = ", ".join(sorted(path.name for path in paths))
+        self.logger.info(f"Changed: {names}; regenerating {', '.join(zone_names)}")
+
+        self._reload_apps(self.changed_apps(paths))
+        # Deleted files are handled now
+        self._owners = {
+            path: apps for path, apps in self._owners.items() if path in self._snapshot
+        }
+        self._invalidate_schema_cache(zone_names)
+        summary = self._generate()
+
+        self.logger.success(
+            f"Regenerated {', '.join(zone_names)} in {summary.duration_seconds:.1f}s"
+        )
+        if self.on_summary:
+            self.on_summary(summary)
+        return summary
+
+    def _generate(self) -> GenerationSummary:
+        """Run the generator for all watched zones."""
+        if self.on_start:
+            self.on_start()
+        return self.generator.generate_all(zones=list(self.zones), archive=False)
+
+    def restart(self):
+        """Replace the process by a fresh one with the same command line."""
+        self.generator.ts_generator.close()
+        self.generator.job_scheduler.shutdown()
+        os.execv(sys.executable, sys.orig_argv)
+
+    def run(self, max_cycles: Optional[int] = None):
+        """
+        Generate once, then regenerate changed zones until stopped.
+
+        Args:
+            max_cycles: Stop after this many regenerations (default: never)
+        """
+        # Every run covers all watched zones, so the index and shared models
+        # stay complete; unaffected zones reuse their cached schema and clients
+        self.generator.persistent_workers = True
+        self.generator.config.schema_cache = True
+        self.generator.config.incremental = True
+
+        try:
+            summary = self._generate()
+            if self.on_summary:
+                self.on_summary(summary)
+
+            self._snapshot = self._scan()
+            self.logger.info(
+                f"Watching {len(self._snapshot)} files of {len(self.zones)} zones"
+            )
+
+            while max_cycles is None or self.cycles < max_cycles:
+                changed = self.wait_for_changes()
+                if not changed:
+                    break
+                self.regenerate(changed)
+                self.cycles += 1
+        finally:
+            self.generator.persistent_workers = False
+            self.generator.ts_generator.close()
+
+    def stop(self):
+        """Stop watching; safe to call from another thread."""
+        self._stop.set()
@@ -0,0 +1,426 @@
+"""
+Schema Worker Pool for Django Revolution
+
+Warm worker processes that boot Django once and generate zone schemas
+for many zones over a pipe.
+"""
+
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..config import DjangoRevolutionSettings, WorkerStats, ZoneModel
+from ..tracing import get_tracer
+from ..utils import Logger
+
+# Seconds a worker may take for one zone, as for `manage.py spectacular`
+JOB_TIMEOUT = 60
+
+# Seconds a worker may take to boot Django
+STARTUP_TIMEOUT = 60
+
+# Workers are started from a multi-threaded parent (command runner,
+# job scheduler, feeder threads); spawn avoids forking held locks
+START_METHOD = "spawn"
+
+
+def _worker_main(conn, config: DjangoRevolutionSettings):
+    """
+    Worker process entry point.
+
+    Boots Django once, then serves (zone_name, zone_config, schema_file,
+    path_prefix) jobs until a None sentinel is received.
+    """
+    from ..zones import ZoneManager
+    from .schema_engine import ensure_django_ready, generate_schema_in_process
+
+    # Spawned workers start without Django; settings are only configured
+    # once touched, so boot it from the settings module explicitly
+    if os.environ.get("DJANGO_SETTINGS_MODULE"):
+        try:
+            import django
+
+            django.setup()
+        except Exception as e:
+            conn.send(("error", f"Django setup failed in worker process: {e}"))
+            conn.close()
+            return
+
+    if not ensure_django_ready():
+        conn.send(("error", "Django is not configured in worker process"))
+        conn.close()
+        return
+
+    zone_manager = ZoneManager(config)
+    logger = Logger("schema_worker")
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+
+        if job is None:
+            break
+
+        zone_name, zone_config, schema_file, path_prefix = job
+        started = time.perf_counter()
+
+        try:
+            zone = ZoneModel(**zone_config)
+            urlconf_module = zone_manager.create_dynamic_urlconf_module(zone_name, zone)
+            success, error = generate_schema_in_process(
+                urlconf_module, zone.version, Path(schema_file), logger, path_prefix
+            )
+        except Exception as e:
+            success, error = False, str(e)
+
+        conn.send(("done", success, error, time.perf_counter() - started))
+
+    conn.close()
+
+
+class _Worker:
+    """Parent-side handle of a single worker process."""
+
+    def __init__(self, worker_id: int, process, conn):
+        self.worker_id = worker_id
+        self.process = process
+        self.conn = conn
+        self.pid = 0
+        self.jobs = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.perf_counter()
+        self.stopped_at: Optional[float] = None
+        self.alive = True
+
+    def stats(self) -> WorkerStats:
+        end = self.stopped_at or time.perf_counter()
+        lifetime = max(end - self.started_at, 1e-9)
+        return WorkerStats(
+            worker_id=self.worker_id,
+            pid=self.pid,
+            jobs=self.jobs,
+            busy_seconds=round(self.busy_seconds, 4),
+            lifetime_seconds=round(lifetime, 4),
+            utilization=round(min(self.busy_seconds / lifetime, 1.0), 4),
+        )
+
+
+class SchemaWorkerPool:
+    """Pool of warm schema worker processes sized by CPU count."""
+
+    def __init__(
+        self,
+        config: DjangoRevolutionSettings,
+        size: Optional[int] = None,
+        logger: Optional[Logger] = None,
+        job_timeout: float = JOB_TIMEOUT,
+        startup_timeout: float = STARTUP_TIMEOUT,
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            config: Django Revolution settings
+            size: Number of worker processes (defaults to CPU count)
+            logger: Optional logger instance
+            job_timeout: Seconds before a worker busy with one zone is killed
+                and replaced
+            startup_timeout: Seconds a worker may take to boot Django
+        """
+        self.config = config
+        self.logger = logger or Logger("schema_worker_pool")
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.job_timeout = job_timeout
+        self.startup_timeout = startup_timeout
+        self._workers: List[_Worker] = []
+        self._worker_ids = itertools.count()
+        # Busy seconds of the worker that generated each zone
+        self.zone_seconds: Dict[str, float] = {}
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        # Replacement workers still booting
+        self._respawns: List[threading.Thread] = []
+
+        # Spawned workers boot Django themselves from DJANGO_SETTINGS_MODULE
+        self._context = multiprocessing.get_context(START_METHOD)
+
+    def _spawn(self) -> _Worker:
+        """Start a worker process without waiting for it to boot."""
+        worker_id = next(self._worker_ids)
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.config),
+            name=f"django-revolution-schema-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(worker_id, process, parent_conn)
+
+    def _await_ready(self, worker: _Worker) -> bool:
+        """Wait for a spawned worker to boot Django and make it available."""
+        try:
+            if worker.conn.poll(self.startup_timeout):
+                status, payload = worker.conn.recv()
+            else:
+                status, payload = (
+                    "error",
+                    f"not ready after {self.startup_timeout} seconds",
+                )
+        except (EOFError, OSError):
+            status, payload = "error", "worker exited during startup"
+
+        if status != "ready":
+            self.logger.warning(
+                f"Schema worker {worker.worker_id} failed to start: {payload}"
+            )
+            self._kill(worker)
+            return False
+
+        worker.pid = payload
+        with self._lock:
+            self._workers.append(worker)
+        self._idle.put(worker)
+        return True
+
+    def _kill(self, worker: _Worker):
+        """Stop a worker that is stuck, dead or failed to start."""
+        worker.alive = False
+        if worker.stopped_at is None:
+            worker.stopped_at = time.perf_counter()
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join(timeout=5)
+        worker.conn.close()
+
+    def _replace(self, worker: _Worker):
+        """Start a replacement for a dead worker in the background."""
+
+        def respawn():
+            try:
+                self._await_ready(self._spawn())
+            except OSError as e:
+                self.logger.warning(
+                    f"Failed to replace schema worker {worker.worker_id}: {e}"
+                )
+
+        thread = threading.Thread(
+            target=respawn,
+            name=f"django-revolution-respawn-{worker.worker_id}",
+            daemon=True,
+        )
+        with self._lock:
+            self._respawns.append(thread)
+        thread.start()
+
+    def _has_workers(self) -> bool:
+        """Whether a worker is alive or a replacement is still booting."""
+        with self._lock:
+            self._respawns = [t for t in self._respawns if t.is_alive()]
+            return bool(self._respawns) or any(w.alive for w in self._workers)
+
+    def start(self) -> bool:
+        """
+        Start worker processes and wait until each one has booted Django.
+
+        Returns:
+            bool: True if at least one worker is ready
+        """
+        starting = [self._spawn() for _ in range(self.size)]
+
+        # Workers boot concurrently; collect their readiness afterwards
+        for worker in starting:
+            self._await_ready(worker)
+
+        if self._workers:
+            self.logger.info(f"Started {len(self._workers)} schema worker processes")
+
+        return bool(self._workers)
+
+    def _run_job(
+        self,
+        worker: _Worker,
+        zone_name: str,
+        zone: ZoneModel,
+        schema_file: Path,
+        path_prefix: Optional[str] = None,
+    ) -> Tuple[bool, str, float]:
+        """Send one zone to a worker and wait for its reply."""
+        started = time.perf_counter()
+        try:
+            worker.conn.send(
+                (zone_name, zone.model_dump(), str(schema_file), path_prefix)
+            )
+            if worker.conn.poll(self.job_timeout):
+                _, success, error, busy = worker.conn.recv()
+            else:
+                self._kill(worker)
+                success, error, busy = (
+                    False,
+                    f"schema worker timed out after {self.job_timeout} seconds",
+                    time.perf_counter() - started,
+                )
+        except (EOFError, OSError) as e:
+            self._kill(worker)
+            success, error, busy = False, f"schema worker died: {e}", 0.0
+
+        with self._lock:
+            worker.jobs += 1
+            worker.busy_seconds += busy
+
+        # One track per worker process
+        get_tracer().add_span(
+            f"schema {zone_name}",
+            "worker",
+            started,
+            time.perf_counter(),
+            {"worker_id": worker.worker_id, "busy_seconds": busy, "success": success},
+            track=worker.process.pid,
+            track_name=f"schema worker {worker.worker_id} (pid {worker.process.pid})",
+        )
+
+        return success, error, busy
+
+    def generate_one(
+        self,
+        zone_name: str,
+        zone: ZoneModel,
+        schema_file: Path,
+        path_prefix: Optional[str] = None,
+    ) -> Tuple[bool, str]:
+        """
+        Generate the schema of a single zone on the next idle worker.
+
+        Safe to call from several threads; each call blocks until a worker
+        is free.
+
+        Args:
+            zone_name: Name of the zone
+            zone: Zone model configuration
+            schema_file: Schema file to write
+            path_prefix: Optional SCHEMA_PATH_PREFIX (used for app shards)
+
+        Returns:
+            Tuple of (success, error message)
+        """
+        while self._has_workers():
+            try:
+                worker = self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            if not worker.alive:
+                continue
+
+            try:
+                success, error, busy = self._run_job(
+                    worker, zone_name, zone, schema_file, path_prefix
+                )
+                with self._lock:
+                    self.zone_seconds[zone_name] = busy
+                return success, error
+            finally:
+                if worker.alive:
+                    self._idle.put(worker)
+                else:
+                    # Keep the pool at its size after a hung or crashed
+                    # worker; the replacement boots in the background
+                    self._replace(worker)
+
+        return False, "no schema worker available"
+
+    def generate(
+        self,
+        jobs: Dict[str, Tuple[ZoneModel, Path]],
+        path_prefixes: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Tuple[bool, str]]:
+        """
+        Generate schemas for zones on the worker processes.
+
+        Args:
+            jobs: Mapping of zone name to (zone, schema file path)
+            path_prefixes: Optional SCHEMA_PATH_PREFIX per zone name
+
+        Returns:
+            Mapping of zone name to (success, error message)
+        """
+        pending: "queue.Queue[str]" = queue.Queue()
+        for zone_name in jobs:
+            pending.put(zone_name)
+
+        results: Dict[str, Tuple[bool, str]] = {}
+
+        def feed():
+            while True:
+                try:
+                    zone_name = pending.get_nowait()
+                except queue.Empty:
+                    return
+
+                zone, schema_file = jobs[zone_name]
+                results[zone_name] = self.generate_one(
+                    zone_name, zone, schema_file, (path_prefixes or {}).get(zone_name)
+                )
+
+        threads = [
+            threading.Thread(target=feed, daemon=True)
+            for worker in self._workers
+            if worker.alive
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Zones left over when no worker was started
+        while not pending.empty():
+            zone_name = pending.get_nowait()
+            results[zone_name] = (False, "no schema worker available")
+
+        return results
+
+    def close(self):
+        """Stop all worker processes."""
+        with self._lock:
+            respawns = list(self._respawns)
+        for thread in respawns:
+            thread.join(timeout=self.startup_timeout)
+
+        for worker in self._workers:
+            if worker.alive:
+                try:
+                    worker.conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
+            if worker.stopped_at is None:
+                worker.stopped_at = time.perf_counter()
+            worker.alive = False
+
+    def get_stats(self) -> List[WorkerStats]:
+        """
+        Get per-worker utilization.
+
+        Returns:
+            List of WorkerStats, one per started worker
+        """
+        return [worker.stats() for worker in self._workers]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,264 @@
+"""
+Resource Tuning for Django Revolution
+
+Sizes per-stage concurrency from CPU count and available memory, learns
+the memory footprint of jobs from the child processes they start, and
+tells launchers to wait while memory headroom is low.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from .utils import Logger
+
+MB = 1024 * 1024
+
+# Expected peak RSS per job until a real one has been measured
+DEFAULT_JOB_RSS = {
+    "schema": 250 * MB,
+    "typescript": 400 * MB,
+    "python": 200 * MB,
+    "format": 300 * MB,
+    "archive": 50 * MB,
+}
+FALLBACK_JOB_RSS = 250 * MB
+
+# Stages made of several job kinds are sized for their heaviest kind
+COMPOSITE_STAGES = {"client": ("typescript", "python")}
+
+
+def available_memory_bytes() -> Optional[int]:
+    """
+    Memory available to new processes without swapping.
+
+    Returns:
+        Bytes available, or None if unknown on this platform
+    """
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _children(pid: int) -> list:
+    children = []
+    for task in Path(f"/proc/{pid}/task").glob("*/children"):
+        try:
+            children.extend(int(child) for child in task.read_text().split())
+        except (OSError, ValueError):
+            continue
+    return children
+
+
+def _process_tree(pid: int, include_children: bool = True):
+    """Yield a process ID and, optionally, the IDs of all its descendants."""
+    pending = [pid]
+    seen = set()
+
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        yield current
+
+        if include_children:
+            pending.extend(_children(current))
+
+
+def process_rss_bytes(pid: int, include_children: bool = True) -> int:
+    """
+    Resident memory of a process and, optionally, all its descendants.
+
+    Only supported where /proc is available; returns 0 elsewhere.
+
+    Args:
+        pid: Process ID
+        include_children: Add the RSS of descendant processes (npx starts
+            node as a child, for example)
+
+    Returns:
+        RSS in bytes
+    """
+    total = 0
+    for current in _process_tree(pid, include_children):
+        try:
+            with open(f"/proc/{current}/status", "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except (OSError, ValueError, IndexError):
+            continue
+
+    return total
+
+
+def process_cpu_seconds(pid: int, include_children: bool = True) -> float:
+    """
+    CPU time (user + system) used so far by a process and its descendants.
+
+    Includes children that already exited and were waited for. Only
+    supported where /proc is available; returns 0 elsewhere.
+
+    Args:
+        pid: Process ID
+        include_children: Add the CPU time of running descendant processes
+
+    Returns:
+        CPU time in seconds
+    """
+    try:
+        ticks_per_second = os.sysconf("SC_CLK_TCK")
+    except (AttributeError, OSError, ValueError):
+        return 0.0
+
+    ticks = 0
+    for current in _process_tree(pid, include_children):
+        try:
+            with open(f"/proc/{current}/stat", "r", encoding="utf-8") as f:
+                # Fields after the command name, which may contain spaces;
+                # utime, stime, cutime and cstime are fields 14-17
+                fields = f.read().rsplit(")", 1)[1].split()
+            ticks += sum(int(value) for value in fields[11:15])
+        except (OSError, ValueError, IndexError):
+            continue
+
+    return ticks / ticks_per_second
+
+
+class ResourceTuner:
+    """Concurrency limits and launch throttling based on CPU and memory."""
+
+    def __init__(
+        self,
+        cpu_count: Optional[int] = None,
+        headroom_bytes: int = 512 * MB,
+        logger: Optional[Logger] = None,
+    ):
+        """
+        Initialize the tuner.
+
+        Args:
+            cpu_count: CPUs to plan for (defaults to the usable CPUs)
+            headroom_bytes: Memory to keep free for the rest of the system
+            logger: Optional logger instance
+        """
+        self.cpu_count = cpu_count or self._usable_cpus()
+        self.headroom_bytes = headroom_bytes
+        self.logger = logger or Logger("resource_tuner")
+
+        self._job_rss: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _usable_cpus() -> int:
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:
+            return os.cpu_count() or 1
+
+    def record(self, stage: str, rss_bytes: int):
+        """
+        Remember the peak RSS of a finished job.
+
+        Args:
+            stage: Stage the job belongs to
+            rss_bytes: Peak RSS of the job's process tree
+        """
+        if not stage or rss_bytes <= 0:
+            return
+        with self._lock:
+            self._job_rss[stage] = max(self._job_rss.get(stage, 0), rss_bytes)
+
+    def job_rss(self, stage: str) -> int:
+        """
+        Expected peak RSS of one job of a stage.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Measured peak if known, otherwise a default estimate
+        """
+        if stage in COMPOSITE_STAGES:
+            return max(self.job_rss(part) for part in COMPOSITE_STAGES[stage])
+        with self._lock:
+            measured = self._job_rss.get(stage)
+        return measured or DEFAULT_JOB_RSS.get(stage, FALLBACK_JOB_RSS)
+
+    def stage_workers(
+        self, stage: str, jobs: int, configured: Union[int, str] = "auto"
+    ) -> int:
+        """
+        Number of concurrent jobs for a stage.
+
+        Args:
+            stage: Stage name
+            jobs: Number of jobs in the stage
+            configured: max_workers setting, an int or "auto"
+
+        Returns:
+            Worker count of at least 1
+        """
+        jobs = max(1, jobs)
+        if configured != "auto":
+            return max(1, min(int(configured), jobs))
+
+        workers = min(jobs, self.cpu_count)
+
+        available = available_memory_bytes()
+        if available is not None:
+            budget = available - self.headroom_bytes
+            workers = min(workers, budget // self.job_rss(stage))
+
+        workers = max(1, workers)
+        self.logger.debug(
+            f"Auto workers for {stage}: {workers} "
+            f"({self.cpu_count} CPUs, {jobs} jobs, "
+            f"~{self.job_rss(stage) // MB} MB per job)"
+        )
+        return workers
+
+    def has_headroom(self, stage: str) -> bool:
+        """
+        Check whether a new job of a stage fits into free memory.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            bool: True if the job can start now (or memory is unknown)
+        """
+        available = available_memory_bytes()
+        if available is None:
+            return True
+        return available - self.job_rss(stage) >= self.headroom_bytes
+
+
+_default_tuner: Optional[ResourceTuner] = None
+_default_tuner_lock = threading.Lock()
+
+
+def get_resource_tuner() -> ResourceTuner:
+    """
+    Get the process-wide resource tuner.
+
+    Returns:
+        Shared ResourceTuner instance
+    """
+    global _default_tuner
+    with _default_tuner_lock:
+        if _default_tuner is None:
+            _default_tuner = ResourceTuner()
+        return _default_tuner
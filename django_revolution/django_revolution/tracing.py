@@ -0,0 +1,199 @@
+"""
+Run Tracing for Django Revolution
+
+Records spans of a generation run (stages per zone, scheduler jobs,
+pipeline tasks, child processes) as Chrome trace events that can be
+opened in Perfetto or chrome://tracing.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class TraceRecorder:
+    """Collects trace events from all threads while enabled."""
+
+    def __init__(self):
+        """Initialize a disabled recorder."""
+        self.enabled = False
+        self._events: List[Dict[str, Any]] = []
+        self._tracks: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._origin = 0.0
+        self._pid = os.getpid()
+
+    def start(self):
+        """Drop previous events and start recording."""
+        with self._lock:
+            self._events = []
+            self._tracks = {}
+            self._origin = time.perf_counter()
+            self._pid = os.getpid()
+            self.enabled = True
+
+    def stop(self):
+        """Stop recording; collected events are kept until the next start."""
+        self.enabled = False
+
+    def _ts(self, when: float) -> float:
+        """perf_counter() value to microseconds since start."""
+        return round((when - self._origin) * 1_000_000, 1)
+
+    def _thread_track(self) -> int:
+        thread = threading.current_thread()
+        tid = threading.get_native_id()
+        if tid not in self._tracks:
+            self._tracks[tid] = thread.name
+        return tid
+
+    def add_span(
+        self,
+        name: str,
+        category: str,
+        started: float,
+        finished: float,
+        args: Optional[Dict[str, Any]] = None,
+        track: Optional[int] = None,
+        track_name: str = "",
+    ):
+        """
+        Record a finished span.
+
+        Args:
+            name: Span label
+            category: Event category (stage, job, pipeline, process, run)
+            started: time.perf_counter() at the start
+            finished: time.perf_counter() at the end
+            args: Extra values shown with the span
+            track: Track (tid) to put the span on; defaults to the calling thread
+            track_name: Name of the track when a custom track is used
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if track is None:
+                track = self._thread_track()
+            elif track not in self._tracks:
+                self._tracks[track] = track_name or str(track)
+
+            self._events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": self._ts(started),
+                    "dur": round((finished - started) * 1_000_000, 1),
+                    "pid": self._pid,
+                    "tid": track,
+                    "args": args or {},
+                }
+            )
+
+    @contextmanager
+    def span(self, name: str, category: str, **args) -> Iterator[Dict[str, Any]]:
+        """
+        Record the enclosed block as a span on the calling thread.
+
+        Args:
+            name: Span label
+            category: Event category
+            **args: Extra values shown with the span
+
+        Yields:
+            The args dictionary; values added inside the block are recorded
+        """
+        started = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.add_span(name, category, started, time.perf_counter(), args)
+
+    def add_counter(self, name: str, values: Dict[str, float]):
+        """
+        Record the current value of a counter track (e.g. queue depth).
+
+        Args:
+            name: Counter name
+            values: Series name to value
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._events.append(
+                {
+                    "name": name,
+                    "ph": "C",
+                    "ts": self._ts(time.perf_counter()),
+                    "pid": self._pid,
+                    "args": dict(values),
+                }
+            )
+
+    def get_events(self) -> List[Dict[str, Any]]:
+        """
+        Get the recorded events including track names.
+
+        Returns:
+            List of trace events
+        """
+        with self._lock:
+            metadata = [
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "args": {"name": "django-revolution"},
+                }
+            ]
+            metadata += [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self._tracks.items()
+            ]
+            return metadata + list(self._events)
+
+    def write(self, path: Path) -> Path:
+        """
+        Write the events as a Chrome trace file.
+
+        Args:
+            path: Output file
+
+        Returns:
+            Path of the written file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        document = {"traceEvents": self.get_events(), "displayTimeUnit": "ms"}
+        path.write_text(json.dumps(document), encoding="utf-8")
+        return path
+
+
+_default_tracer: Optional[TraceRecorder] = None
+_default_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> TraceRecorder:
+    """
+    Get the process-wide trace recorder.
+
+    Returns:
+        Shared TraceRecorder instance
+    """
+    global _default_tracer
+    with _default_tracer_lock:
+        if _default_tracer is None:
+            _default_tracer = TraceRecorder()
+        return _default_tracer
@@ -6,10 +6,10 @@ Common utilities for logging, error handling, and system operations.
 
 import logging
 import os
-import subprocess
+import shlex
 import shutil
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 from rich.console import Console
 from rich.logging import RichHandler
 
@@ -183,11 +183,9 @@ def check_dependency(cmd: list) -> bool:
     Returns:
         bool: True if dependency is available
     """
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        return result.returncode == 0
-    except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-        return False
+    from .command_runner import get_command_runner
+
+    return get_command_runner().run(cmd, timeout=10, quiet=True).success
 
 
 def install_dependency(cmd: list) -> bool:
@@ -200,13 +198,8 @@ def install_dependency(cmd: list) -> bool:
     Returns:
         bool: True if installation successful
     """
-    try:
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=300  # 5 minutes
-        )
-        return result.returncode == 0
-    except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-        return False
+    success, _ = run_command(cmd, timeout=300)  # 5 minutes
+    return success
 
 
 def ensure_directories(*paths: Path) -> bool:
@@ -232,51 +225,35 @@ def ensure_directories(*paths: Path) -> bool:
 
 
 def run_command(
-    command: str, cwd: Optional[Path] = None, timeout: int = 120
+    command: Union[str, Sequence[str]],
+    cwd: Optional[Path] = None,
+    timeout: int = 120,
+    stage: str = "",
 ) -> Tuple[bool, str]:
     """
-    Run a shell command and return result.
+    Run a command and return result.
+
+    Commands run without a shell on the shared asyncio command runner;
+    output is streamed to the debug log while the command runs.
 
     Args:
-        command: Command to run
+        command: Argument list (a string is split like a shell would)
         cwd: Working directory
         timeout: Command timeout in seconds
+        stage: Stage whose memory expectation the command's peak RSS updates
+            (default: "command:<program>")
 
     Returns:
         Tuple of (success, output)
     """
-    logger = Logger("command_runner")
+    from .command_runner import get_command_runner
 
-    try:
-        logger.debug(f"Running command: {command}")
-        if cwd:
-            logger.debug(f"Working directory: {cwd}")
-
-        result = subprocess.run(
-            command,
-            shell=True,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
+    argv = shlex.split(command) if isinstance(command, str) else list(command)
+    if not argv:
+        return False, "Empty command"
 
-        output = result.stdout or result.stderr
-        success = result.returncode == 0
-
-        if success:
-            logger.debug(f"Command succeeded: {output}")
-        else:
-            logger.warning(f"Command failed (code {result.returncode}): {output}")
-
-        return success, output
-
-    except subprocess.TimeoutExpired:
-        logger.error(f"Command timed out after {timeout} seconds")
-        return False, f"Command timed out after {timeout} seconds"
-    except Exception as e:
-        logger.error(f"Command execution failed: {e}")
-        return False, str(e)
+    result = get_command_runner().run(argv, cwd=cwd, timeout=timeout, stage=stage)
+    return result.success, result.output
 
 
 def render_template(template_content: str, context: Dict[str, Any]) -> str:
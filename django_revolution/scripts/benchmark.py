@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+"""
+Django Revolution Benchmark
+
+Generates a synthetic Django project with a configurable number of zones,
+apps, models, serializers and viewsets, runs OpenAPIGenerator.generate_all
+on it and records wall time, CPU time and memory per stage. Results are
+written as a JSON baseline that runs on other commits can be compared with.
+
+Usage:
+    python scripts/benchmark.py --zones 8 --output bench/baseline.json
+    python scripts/benchmark.py --zones 8 --compare bench/baseline.json
+
+Every repetition runs in a fresh Python process, so Django setup and peak
+memory are measured per run. Client generators that are not installed
+(@hey-api/openapi-ts, openapi-python-client) are replaced by stubs that
+write clients of a similar shape; the baseline records which ones were
+stubbed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+console = Console()
+
+FIELD_TYPES = [
+    "models.CharField(max_length=100)",
+    "models.IntegerField(default=0)",
+    "models.BooleanField(default=False)",
+    "models.DateTimeField(auto_now_add=True)",
+    "models.DecimalField(max_digits=10, decimal_places=2, default=0)",
+    "models.TextField(blank=True)",
+    "models.EmailField(blank=True)",
+    "models.JSONField(default=dict)",
+]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic project
+# ---------------------------------------------------------------------------
+
+
+def app_label(zone_index: int, app_index: int) -> str:
+    return f"bench_z{zone_index}_a{app_index}"
+
+
+def write_app(root: Path, label: str, models: int, fields: int):
+    """Write one app with models, serializers, viewsets and a router."""
+    app_dir = root / label
+    app_dir.mkdir(parents=True, exist_ok=True)
+    (app_dir / "__init__.py").write_text("")
+
+    model_lines = ["from django.db import models", ""]
+    for m in range(models):
+        model_lines.append(f"class Model{m}(models.Model):")
+        for f in range(fields):
+            model_lines.append(f"    field_{f} = {FIELD_TYPES[f % len(FIELD_TYPES)]}")
+        if m > 0:
+            model_lines.append(
+                f"    parent = models.ForeignKey('Model{m - 1}', "
+                "on_delete=models.CASCADE, null=True, blank=True)"
+            )
+        model_lines += ["", "    class Meta:", f"        app_label = '{label}'", ""]
+    (app_dir / "models.py").write_text("\n".join(model_lines))
+
+    serializer_lines = [
+        "from rest_framework import serializers",
+        "from . import models",
+        "",
+    ]
+    view_lines = [
+        "from rest_framework import viewsets",
+        "from . import models, serializers",
+        "",
+    ]
+    url_lines = [
+        "from rest_framework.routers import DefaultRouter",
+        "from . import views",
+        "",
+        "router = DefaultRouter()",
+    ]
+    for m in range(models):
+        serializer_lines += [
+            f"class Model{m}Serializer(serializers.ModelSerializer):",
+            "    class Meta:",
+            f"        model = models.Model{m}",
+            "        fields = '__all__'",
+            "",
+        ]
+        view_lines += [
+            f"class Model{m}ViewSet(viewsets.ModelViewSet):",
+            f"    queryset = models.Model{m}.objects.all()",
+            f"    serializer_class = serializers.Model{m}Serializer",
+            "",
+        ]
+        url_lines.append(f"router.register('model{m}', views.Model{m}ViewSet)")
+    url_lines += ["", "urlpatterns = router.urls", ""]
+
+    (app_dir / "serializers.py").write_text("\n".join(serializer_lines))
+    (app_dir / "views.py").write_text("\n".join(view_lines))
+    (app_dir / "urls.py").write_text("\n".join(url_lines))
+
+
+def write_project(root: Path, params: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    """
+    Write the synthetic project.
+
+    Returns:
+        Zone configuration for DJANGO_REVOLUTION["zones"]
+    """
+    project_dir = root / "bench_project"
+    project_dir.mkdir(parents=True, exist_ok=True)
+    (project_dir / "__init__.py").write_text("")
+    (project_dir / "urls.py").write_text("urlpatterns = []\n")
+
+    zones = {}
+    for z in range(params["zones"]):
+        apps = []
+        for a in range(params["apps"]):
+            label = app_label(z, a)
+            write_app(root, label, params["models"], params["fields"])
+            apps.append(label)
+        zones[f"zone{z}"] = {
+            "apps": apps,
+            "title": f"Zone {z}",
+            "description": f"Synthetic benchmark zone {z}",
+            "public": z % 2 == 0,
+            "auth_required": z % 2 == 1,
+        }
+    return zones
+
+
+# ---------------------------------------------------------------------------
+# Generator stubs
+# ---------------------------------------------------------------------------
+
+
+def _schema_shape(schema_path: Path):
+    from django_revolution.openapi.schema_io import load_schema
+
+    schema = load_schema(schema_path)
+    operations = [
+        (path, method, operation.get("operationId", f"{method}_{path}"))
+        for path, item in (schema.get("paths") or {}).items()
+        for method, operation in item.items()
+        if isinstance(operation, dict)
+    ]
+    components = sorted((schema.get("components") or {}).get("schemas") or {})
+    return operations, components
+
+
+def stub_openapi_ts(schema_path: Path, output_dir: Path):
+    """Write a TypeScript client shaped like @hey-api/openapi-ts output."""
+    operations, components = _schema_shape(schema_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    types = [
+        f"export type {name} = {{\n    id?: number;\n    [key: string]: unknown;\n}};\n"
+        for name in components
+    ]
+    sdk = ["import type { Options } from './types.gen';\n"]
+    for path, method, operation_id in operations:
+        sdk.append(
+            f"export const {operation_id} = (options?: Options) => "
+            f"client.{method}({{ url: '{path}', ...options }});\n"
+        )
+
+    (output_dir / "types.gen.ts").write_text("\n".join(types) + "export type Options = {};\n")
+    (output_dir / "sdk.gen.ts").write_text("\n".join(sdk))
+    (output_dir / "index.ts").write_text(
+        "export * from './types.gen';\nexport * from './sdk.gen';\n"
+    )
+    return True, ""
+
+
+def stub_openapi_python_client(zone_name, schema_path, zone_output_dir, schema=None):
+    """Write a Python client shaped like openapi-python-client output."""
+    operations, components = _schema_shape(schema_path)
+    package_dir = zone_output_dir / f"django_revolution_{zone_name}"
+    (package_dir / "models").mkdir(parents=True, exist_ok=True)
+    (package_dir / "api").mkdir(parents=True, exist_ok=True)
+
+    (package_dir / "__init__.py").write_text('"""Generated client."""\n')
+    (package_dir / "client.py").write_text("class Client:\n    pass\n")
+    (package_dir / "models" / "__init__.py").write_text("")
+    (package_dir / "api" / "__init__.py").write_text("")
+
+    for name in components:
+        (package_dir / "models" / f"{name.lower()}.py").write_text(
+            "from attrs import define\n\n\n"
+            f"@define\nclass {name}:\n    id: int = 0\n\n"
+            "    def to_dict(self):\n        return {'id': self.id}\n"
+        )
+    for path, method, operation_id in operations:
+        (package_dir / "api" / f"{operation_id}.py").write_text(
+            "def _get_kwargs():\n"
+            f"    return {{'method': '{method}', 'url': '{path}'}}\n\n\n"
+            "def sync(client):\n    return client.request(**_get_kwargs())\n"
+        )
+    return True, ""
+
+
+def typescript_available() -> bool:
+    """Whether a real @hey-api/openapi-ts can run without a download."""
+    return bool(
+        shutil.which("openapi-ts")
+        or (Path.cwd() / "node_modules" / ".bin" / "openapi-ts").exists()
+    )
+
+
+def python_client_available() -> bool:
+    try:
+        import openapi_python_client  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# One measured run (child process)
+# ---------------------------------------------------------------------------
+
+
+def run_once(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Set up Django for the synthetic project and run generate_all once."""
+    from unittest.mock import patch
+
+    project_root = Path(spec["project_root"])
+    sys.path.insert(0, str(project_root))
+
+    import django
+    from django.conf import settings
+
+    apps = [app for zone in spec["zones"].values() for app in zone["apps"]]
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY="benchmark",
+        INSTALLED_APPS=[
+            "django.contrib.contenttypes",
+            "django.contrib.auth",
+            "rest_framework",
+            "drf_spectacular",
+            *apps,
+        ],
+        DATABASES={
+            "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        },
+        ROOT_URLCONF="bench_project.urls",
+        REST_FRAMEWORK={
+            "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema"
+        },
+        DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+        USE_TZ=True,
+    )
+    setup_start = time.perf_counter()
+    django.setup()
+    setup_seconds = time.perf_counter() - setup_start
+
+    from django_revolution.config import DjangoRevolutionSettings
+    from django_revolution.metrics import stage_totals
+    from django_revolution.openapi.generator import OpenAPIGenerator
+
+    output_dir = Path(spec["output_dir"])
+    shutil.rmtree(output_dir, ignore_errors=True)
+
+    config = DjangoRevolutionSettings(
+        api_prefix="api",
+        auto_install_deps=False,
+        zones=spec["zones"],
+        max_workers=spec["max_workers"],
+        enable_multithreading=spec["max_workers"] != 1,
+        schema_engine=spec["schema_engine"],
+        schema_format=spec["schema_format"],
+        pipeline_mode=spec["pipeline_mode"],
+        output={"base_directory": str(output_dir)},
+        generators={
+            "typescript": {"output_directory": str(output_dir / "clients" / "typescript")},
+            "python": {"output_directory": str(output_dir / "clients" / "python")},
+        },
+    )
+    generator = OpenAPIGenerator(config)
+
+    with_stubs = []
+    if spec["stub_typescript"]:
+        with_stubs += [
+            patch.object(generator.ts_generator, "is_available", return_value=True),
+            patch.object(
+                generator.ts_generator, "_run_openapi_ts", side_effect=stub_openapi_ts
+            ),
+            patch.object(
+                generator.ts_generator.formatter,
+                "format_files",
+                side_effect=lambda files: (True, 0),
+            ),
+        ]
+    if spec["stub_python"]:
+        python_generator = generator.python_generator._generator
+        with_stubs += [
+            patch.object(python_generator, "_use_in_process", return_value=True),
+            patch.object(
+                python_generator,
+                "_generate_in_process",
+                side_effect=stub_openapi_python_client,
+            ),
+        ]
+
+    for stub in with_stubs:
+        stub.start()
+    try:
+        started = time.perf_counter()
+        summary = generator.generate_all(archive=spec["archive"])
+        wall_seconds = time.perf_counter() - started
+    finally:
+        for stub in with_stubs:
+            stub.stop()
+
+    return {
+        "wall_seconds": wall_seconds,
+        "django_setup_seconds": setup_seconds,
+        "cpu_seconds": summary.cpu_seconds,
+        "child_cpu_seconds": summary.child_cpu_seconds,
+        "peak_rss_bytes": summary.peak_rss_bytes,
+        "files": summary.total_files_generated,
+        "failed": summary.failed_typescript + summary.failed_python,
+        "stages": [
+            total.model_dump(exclude={"zone_name"})
+            for total in stage_totals(summary.stage_timings)
+        ],
+    }
+
+
+def run_child(spec: Dict[str, Any], workdir: Path) -> Dict[str, Any]:
+    """Run one repetition in a fresh interpreter."""
+    spec_file = workdir / "spec.json"
+    result_file = workdir / "result.json"
+    spec_file.write_text(json.dumps(spec))
+    result_file.unlink(missing_ok=True)
+
+    completed = subprocess.run(
+        [sys.executable, __file__, "--run-once", str(spec_file), str(result_file)],
+        stdout=subprocess.DEVNULL if not spec["verbose"] else None,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if completed.returncode != 0 or not result_file.exists():
+        raise RuntimeError(f"Benchmark run failed:\n{completed.stderr[-4000:]}")
+    return json.loads(result_file.read_text())
+
+
+# ---------------------------------------------------------------------------
+# Aggregation and comparison
+# ---------------------------------------------------------------------------
+
+
+def aggregate(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median times and maximum memory over repetitions."""
+
+    def median(values):
+        return round(statistics.median(values), 4) if values else 0.0
+
+    stages: Dict[str, Dict[str, Any]] = {}
+    names = []
+    for run in runs:
+        for stage in run["stages"]:
+            if stage["stage"] not in names:
+                names.append(stage["stage"])
+
+    for name in names:
+        entries = [s for run in runs for s in run["stages"] if s["stage"] == name]
+        stages[name] = {
+            "duration_seconds": median([s["duration_seconds"] for s in entries]),
+            "cpu_seconds": median([s["cpu_seconds"] for s in entries]),
+            "child_cpu_seconds": median([s["child_cpu_seconds"] for s in entries]),
+            "peak_rss_bytes": max(s["peak_rss_bytes"] for s in entries),
+            "commands": max(s["commands"] for s in entries),
+            "files": max(s["files"] for s in entries),
+        }
+
+    total = {
+        key: median([run[key] for run in runs])
+        for key in ("wall_seconds", "django_setup_seconds", "cpu_seconds", "child_cpu_seconds")
+    }
+    total["peak_rss_bytes"] = max(run["peak_rss_bytes"] for run in runs)
+    total["files"] = max(run["files"] for run in runs)
+    return {"total": total, "stages": stages}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    min_seconds: float,
+) -> List[str]:
+    """
+    Print stage deltas and return the names of regressed entries.
+
+    An entry regresses when it is slower by more than ``threshold``
+    (relative) and ``min_seconds`` (absolute).
+    """
+    if baseline["meta"]["params"] != current["meta"]["params"]:
+        console.print("⚠️  Baseline was recorded with different project parameters")
+    if baseline["meta"]["stubs"] != current["meta"]["stubs"]:
+        console.print("⚠️  Baseline was recorded with different generator stubs")
+
+    table = Table(title="📊 Benchmark Comparison")
+    table.add_column("Stage", style="cyan", no_wrap=True)
+    table.add_column("Baseline", justify="right")
+    table.add_column("Current", justify="right")
+    table.add_column("Change", justify="right")
+
+    rows = [("total", baseline["total"]["wall_seconds"], current["total"]["wall_seconds"])]
+    for name, stage in current["stages"].items():
+        old = baseline["stages"].get(name, {}).get("duration_seconds")
+        rows.append((name, old, stage["duration_seconds"]))
+
+    regressions = []
+    for name, old, new in rows:
+        if old is None:
+            table.add_row(name, "-", f"{new:.2f}s", "new")
+            continue
+        change = (new - old) / old if old else 0.0
+        regressed = new - old > min_seconds and change > threshold
+        if regressed:
+            regressions.append(name)
+        style = "red" if regressed else ("green" if change < -threshold else "")
+        table.add_row(
+            name,
+            f"{old:.2f}s",
+            f"{new:.2f}s",
+            f"[{style}]{change:+.1%}[/{style}]" if style else f"{change:+.1%}",
+        )
+
+    console.print(table)
+    return regressions
+
+
+def show_results(result: Dict[str, Any]):
+    table = Table(title="⏱️  Benchmark Results (median)")
+    table.add_column("Stage", style="cyan", no_wrap=True)
+    table.add_column("Wall", justify="right")
+    table.add_column("CPU", justify="right")
+    table.add_column("Child CPU", justify="right")
+    table.add_column("Child RSS", justify="right")
+    table.add_column("Files", justify="right")
+
+    for name, stage in result["stages"].items():
+        table.add_row(
+            name,
+            f"{stage['duration_seconds']:.2f}s",
+            f"{stage['cpu_seconds']:.2f}s",
+            f"{stage['child_cpu_seconds']:.2f}s",
+            f"{stage['peak_rss_bytes'] // (1024 * 1024)} MB",
+            str(stage["files"]),
+        )
+    total = result["total"]
+    table.add_row(
+        "[bold]total[/bold]",
+        f"{total['wall_seconds']:.2f}s",
+        f"{total['cpu_seconds']:.2f}s",
+        f"{total['child_cpu_seconds']:.2f}s",
+        "",
+        str(total["files"]),
+    )
+    console.print(table)
+    console.print(
+        f"Django setup {total['django_setup_seconds']:.2f}s, "
+        f"peak RSS {total['peak_rss_bytes'] // (1024 * 1024)} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark Django Revolution on a synthetic project"
+    )
+    parser.add_argument("--zones", type=int, default=4, help="Number of zones")
+    parser.add_argument("--apps", type=int, default=2, help="Apps per zone")
+    parser.add_argument("--models", type=int, default=5, help="Models (and viewsets) per app")
+    parser.add_argument("--fields", type=int, default=8, help="Fields per model")
+    parser.add_argument("--repeat", type=int, default=3, help="Measured runs (median is reported)")
+    parser.add_argument("--max-workers", default="auto", help="max_workers setting")
+    parser.add_argument(
+        "--schema-engine", default="inprocess", choices=["inprocess", "pool", "subprocess"]
+    )
+    parser.add_argument("--schema-format", default="yaml", choices=["yaml", "json"])
+    parser.add_argument("--pipeline-mode", default="staged", choices=["staged", "streaming"])
+    parser.add_argument("--shard-by", choices=["app", "tag"], help="Shard every zone")
+    parser.add_argument("--no-archive", action="store_true", help="Skip archiving")
+    parser.add_argument(
+        "--stubs",
+        default="auto",
+        choices=["auto", "all", "none"],
+        help="Stub client generators: when unavailable (auto), always or never",
+    )
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare with a baseline JSON file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Relative slowdown that fails --compare"
+    )
+    parser.add_argument(
+        "--min-seconds", type=float, default=0.05, help="Ignore slowdowns smaller than this"
+    )
+    parser.add_argument("--workdir", help="Keep the project and output here")
+    parser.add_argument("--verbose", action="store_true", help="Show generator output")
+    parser.add_argument("--run-once", nargs=2, metavar=("SPEC", "RESULT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_once:
+        spec_file, result_file = args.run_once
+        result = run_once(json.loads(Path(spec_file).read_text()))
+        Path(result_file).write_text(json.dumps(result))
+        return 0
+
+    params = {
+        "zones": args.zones,
+        "apps": args.apps,
+        "models": args.models,
+        "fields": args.fields,
+    }
+    stubs = {
+        "typescript": args.stubs == "all" or (args.stubs == "auto" and not typescript_available()),
+        "python": args.stubs == "all" or (args.stubs == "auto" and not python_client_available()),
+    }
+    max_workers = int(args.max_workers) if args.max_workers.isdigit() else args.max_workers
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="revolution-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    try:
+        project_root = workdir / "project"
+        shutil.rmtree(project_root, ignore_errors=True)
+        zones = write_project(project_root, params)
+        if args.shard_by:
+            for zone in zones.values():
+                zone["shard_by"] = args.shard_by
+        console.print(
+            f"🏗️  Synthetic project: {args.zones} zones x {args.apps} apps x "
+            f"{args.models} models ({args.fields} fields) in {project_root}"
+        )
+        stubbed = [name for name, stub in stubs.items() if stub]
+        if stubbed:
+            console.print(f"🧩 Stubbed generators: {', '.join(stubbed)}")
+
+        spec = {
+            "project_root": str(project_root),
+            "output_dir": str(workdir / "output"),
+            "zones": zones,
+            "max_workers": max_workers,
+            "schema_engine": args.schema_engine,
+            "schema_format": args.schema_format,
+            "pipeline_mode": args.pipeline_mode,
+            "archive": not args.no_archive,
+            "stub_typescript": stubs["typescript"],
+            "stub_python": stubs["python"],
+            "verbose": args.verbose,
+        }
+
+        runs = []
+        for index in range(args.repeat):
+            run = run_child(spec, workdir)
+            console.print(
+                f"  run {index + 1}/{args.repeat}: {run['wall_seconds']:.2f}s"
+                + (f", {run['failed']} failed clients" if run["failed"] else "")
+            )
+            runs.append(run)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {
+        "meta": {
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": params,
+            "settings": {
+                "max_workers": max_workers,
+                "schema_engine": args.schema_engine,
+                "schema_format": args.schema_format,
+                "pipeline_mode": args.pipeline_mode,
+                "shard_by": args.shard_by,
+                "archive": not args.no_archive,
+            },
+            "stubs": stubs,
+            "repeat": args.repeat,
+        },
+        **aggregate(runs),
+        "runs": runs,
+    }
+    show_results(result)
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(result, indent=2))
+        console.print(f"💾 Results written to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(baseline, result, args.threshold, args.min_seconds)
+        if regressions:
+            console.print(f"❌ Slower than baseline: {', '.join(regressions)}")
+            return 1
+        console.print("✅ No regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
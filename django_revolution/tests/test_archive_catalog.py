@@ -0,0 +1,193 @@
+"""
+Tests for Django Revolution archive catalog.
+"""
+
+import json
+import pytest
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from django_revolution.config import DjangoRevolutionSettings
+from django_revolution.openapi.archive_catalog import ArchiveCatalog
+from django_revolution.openapi.archive_manager import ArchiveManager
+from django_revolution.utils import Logger
+
+
+def entry(zone_name, timestamp, size_bytes=100, **values):
+    return {
+        "zone_name": zone_name,
+        "timestamp": timestamp,
+        "path": f"/archive/files/{timestamp}/{zone_name}.zip",
+        "size_bytes": size_bytes,
+        **values,
+    }
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = ArchiveCatalog(tmp_path / "catalog.sqlite3")
+    catalog.record_many(
+        [
+            entry("public", "20300101_000000", 100),
+            entry("public", "20300102_000000", 200, typescript_available=True),
+            entry("admin", "20300102_000000", 50),
+        ]
+    )
+    yield catalog
+    catalog.close()
+
+
+class TestArchiveCatalog:
+    """Test catalog queries."""
+
+    def test_query(self, catalog):
+        """Test filtering by zone and timestamp, newest first."""
+        assert [(r["zone_name"], r["timestamp"]) for r in catalog.query()] == [
+            ("admin", "20300102_000000"),
+            ("public", "20300102_000000"),
+            ("public", "20300101_000000"),
+        ]
+        assert [r["timestamp"] for r in catalog.query("public", until="20300102_000000")] == [
+            "20300101_000000"
+        ]
+        assert catalog.query(since="20300102_000000", limit=1)[0]["zone_name"] == "admin"
+        assert catalog.query("public")[0]["typescript_available"] is True
+
+    def test_totals(self, catalog):
+        """Test that sizes are summed per zone."""
+        assert catalog.totals() == {
+            "admin": {"count": 1, "size_bytes": 50, "input_bytes": 0},
+            "public": {"count": 2, "size_bytes": 300, "input_bytes": 0},
+        }
+
+    def test_replace_and_remove(self, catalog, tmp_path):
+        """Test that rows are keyed by zone and timestamp and persist."""
+        catalog.record(entry("public", "20300101_000000", 10))
+        catalog.remove([("admin", "20300102_000000")])
+
+        reopened = ArchiveCatalog(tmp_path / "catalog.sqlite3")
+        assert reopened.totals() == {
+            "public": {"count": 2, "size_bytes": 210, "input_bytes": 0}
+        }
+        assert not reopened.created
+        reopened.close()
+
+
+class TestCatalogedArchives:
+    """Test that ArchiveManager keeps and uses the catalog."""
+
+    @pytest.fixture
+    def ts_dir(self, tmp_path):
+        ts_dir = tmp_path / "clients" / "typescript" / "public"
+        ts_dir.mkdir(parents=True)
+        (ts_dir / "index.ts").write_text("export * from './types.gen';\n")
+        return ts_dir
+
+    def archive(self, manager, ts_dir, moment, zone_name="public"):
+        with patch("django_revolution.openapi.archive_manager.datetime") as mock_datetime:
+            mock_datetime.now.return_value = moment
+            return manager.archive_zone_clients(zone_name, typescript_path=ts_dir)
+
+    @pytest.fixture
+    def manager(self, tmp_path, ts_dir):
+        manager = ArchiveManager(DjangoRevolutionSettings(), Logger("test_catalog"), tmp_path)
+        self.archive(manager, ts_dir, datetime(2030, 1, 1))
+        self.archive(manager, ts_dir, datetime(2030, 1, 2))
+        self.archive(manager, ts_dir, datetime(2030, 1, 2), zone_name="admin")
+        return manager
+
+    def test_list_archives_without_walking(self, manager):
+        """Test that listing reads the catalog instead of metadata files."""
+        with patch("builtins.open", side_effect=AssertionError("walked the tree")):
+            archives = manager.list_archives(zone_name="public", since=date(2030, 1, 2))
+
+        assert [group["timestamp"] for group in archives["files"]] == ["20300102_000000"]
+        [info] = archives["files"][0]["archives"]
+        assert info["filename"] == "public.zip"
+        assert info["typescript_available"] is True
+        assert [a["zone_name"] for a in archives["latest"]] == ["public"]
+
+    def test_archive_totals(self, manager):
+        """Test size totals per zone."""
+        totals = manager.archive_totals(until="2030-01-02")
+
+        assert list(totals["zones"]) == ["public"]
+        assert totals["count"] == 1
+        assert totals["size_bytes"] == Path(
+            manager.archive_dir / "files" / "20300101_000000" / "public.zip"
+        ).stat().st_size
+
+    def test_rebuild_from_disk(self, manager, tmp_path):
+        """Test that a missing catalog is rebuilt from the archives on disk."""
+        expected = manager.catalog.query()
+        manager.catalog.close()
+        (manager.archive_dir / "catalog.sqlite3").unlink()
+
+        rebuilt = ArchiveManager(DjangoRevolutionSettings(), Logger("test_catalog"), tmp_path)
+
+        rows = rebuilt.catalog.query()
+        key = lambda row: (row["zone_name"], row["timestamp"], row["size_bytes"], row["path"])
+        assert sorted(map(key, rows)) == sorted(map(key, expected))
+        metadata = json.loads(Path(rows[0]["metadata_path"]).read_text())
+        assert rows[0]["input_bytes"] == metadata["total_size_bytes"]
+
+    def test_clean_old_archives(self, manager):
+        """Test that old archives are removed from disk and catalog."""
+        with patch("django_revolution.openapi.archive_manager.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2030, 1, 30, 12)
+            result = manager.clean_old_archives(keep_days=29)
+
+        assert (result["removed"], result["kept"]) == (1, 2)
+        assert result["bytes_reclaimed"] > 0
+        assert not (manager.archive_dir / "files" / "20300101_000000").exists()
+        assert [r["timestamp"] for r in manager.catalog.query("public")] == [
+            "20300102_000000"
+        ]
+
+
+class TestCatalogAfterCleanOutput:
+    """Test that the catalog survives cleaning the output directory."""
+
+    @pytest.fixture
+    def generator(self, tmp_path):
+        from django_revolution.openapi.generator import OpenAPIGenerator
+
+        config = DjangoRevolutionSettings(
+            output={"base_directory": str(tmp_path / "openapi")}
+        )
+        generator = OpenAPIGenerator(config)
+        yield generator
+        generator.job_scheduler.shutdown()
+
+    @pytest.fixture
+    def ts_dir(self, tmp_path):
+        ts_dir = tmp_path / "clients" / "public"
+        ts_dir.mkdir(parents=True)
+        (ts_dir / "index.ts").write_text("export * from './types.gen';\n")
+        return ts_dir
+
+    def test_archive_after_full_clean(self, generator, ts_dir):
+        """Test that a deleted catalog is recreated on the next archive write."""
+        manager = generator.archive_manager
+        manager.archive_zone_clients("admin", typescript_path=ts_dir)
+
+        assert generator.clean_output()
+        assert not (manager.archive_dir / "catalog.sqlite3").exists()
+        result = manager.archive_zone_clients("public", typescript_path=ts_dir)
+
+        assert result["success"]
+        assert [row["zone_name"] for row in manager.catalog.query()] == ["public"]
+
+    def test_clean_keeps_archive(self, generator, ts_dir):
+        """Test that generation runs keep the archive history."""
+        manager = generator.archive_manager
+        manager.archive_zone_clients("admin", typescript_path=ts_dir)
+
+        assert generator.clean_output(keep_archive=True)
+        manager.archive_zone_clients("public", typescript_path=ts_dir)
+
+        assert sorted(row["zone_name"] for row in manager.catalog.query()) == [
+            "admin",
+            "public",
+        ]
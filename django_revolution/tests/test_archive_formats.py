@@ -0,0 +1,163 @@
+"""
+Tests for Django Revolution archive formats.
+"""
+
+import gzip
+import os
+import tarfile
+import zipfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from django_revolution.openapi import archive_formats
+from django_revolution.openapi.archive_formats import (
+    ParallelGzipWriter,
+    archive_zone_name,
+    resolve_archive_format,
+    write_archive,
+)
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Files of various sizes, one large enough to span several gzip members."""
+    src = tmp_path / "src"
+    src.mkdir()
+    contents = {
+        "empty.txt": b"",
+        "index.ts": b"export * from './types.gen';\n" * 50,
+        "random.bin": os.urandom(300_000),
+        "models.py": b"class User: ...\n" * 100_000,
+    }
+    pairs = []
+    for name, content in contents.items():
+        (src / name).write_bytes(content)
+        pairs.append((src / name, f"client/{name}"))
+    return pairs
+
+
+def read_zip(path: Path):
+    with zipfile.ZipFile(path) as zipf:
+        assert zipf.testzip() is None
+        return {info.filename: zipf.read(info) for info in zipf.infolist()}, {
+            info.compress_type for info in zipf.infolist()
+        }
+
+
+def expected(files):
+    return {arcname: path.read_bytes() for path, arcname in files}
+
+
+class TestZip:
+    """Test zip archives with parallel deflate."""
+
+    @pytest.mark.parametrize("threads", [1, 4])
+    def test_round_trip(self, files, tmp_path, threads):
+        """Test that entries deflated on threads read back intact."""
+        archive = tmp_path / "out.zip"
+
+        write_archive(files, archive, "zip", level=6, threads=threads)
+
+        contents, compress_types = read_zip(archive)
+        assert contents == expected(files)
+        assert compress_types == {zipfile.ZIP_DEFLATED}
+        assert [name for name in contents] == [arcname for _, arcname in files]
+
+    def test_parallel_path_used(self, files, tmp_path):
+        """Test that pre-deflated entries are written where zipfile is supported."""
+        archive = tmp_path / "out.zip"
+
+        with patch.object(
+            archive_formats, "_write_deflated", wraps=archive_formats._write_deflated
+        ) as write_deflated:
+            write_archive(files, archive, "zip", threads=4)
+
+        assert write_deflated.called == archive_formats.PARALLEL_ZIP_SUPPORTED
+        assert read_zip(archive)[0] == expected(files)
+
+    def test_unsupported_python(self, files, tmp_path):
+        """Test that zipfile deflates every entry where its internals are not known."""
+        archive = tmp_path / "out.zip"
+
+        with patch.object(archive_formats, "PARALLEL_ZIP_SUPPORTED", False), patch.object(
+            archive_formats, "_write_deflated"
+        ) as write_deflated:
+            write_archive(files, archive, "zip", threads=4)
+
+        write_deflated.assert_not_called()
+        contents, compress_types = read_zip(archive)
+        assert contents == expected(files)
+        assert compress_types == {zipfile.ZIP_DEFLATED}
+
+    def test_large_files_deflated_by_zipfile(self, files, tmp_path):
+        """Test that files above the in-memory limit are written by zipfile."""
+        archive = tmp_path / "out.zip"
+
+        with patch(
+            "django_revolution.openapi.archive_formats.PARALLEL_ZIP_MAX_FILE", 1000
+        ):
+            write_archive(files, archive, "zip", threads=4)
+
+        assert read_zip(archive)[0] == expected(files)
+
+    def test_store(self, files, tmp_path):
+        """Test that store mode writes uncompressed entries."""
+        archive = tmp_path / "out.zip"
+
+        write_archive(files, archive, "store")
+
+        contents, compress_types = read_zip(archive)
+        assert contents == expected(files)
+        assert compress_types == {zipfile.ZIP_STORED}
+
+
+class TestTarGz:
+    """Test tar.gz archives with parallel gzip members."""
+
+    def test_round_trip(self, files, tmp_path):
+        """Test that multi-member archives are read by tarfile."""
+        archive = tmp_path / "out.tar.gz"
+
+        with patch("django_revolution.openapi.archive_formats.GZIP_CHUNK_SIZE", 64 * 1024):
+            write_archive(files, archive, "tar.gz", level=1, threads=4)
+
+        with tarfile.open(archive, "r:gz") as tar:
+            contents = {
+                member.name: tar.extractfile(member).read() for member in tar.getmembers()
+            }
+        assert contents == expected(files)
+
+    def test_members_in_order(self, tmp_path):
+        """Test that chunks are written in order whatever finishes first."""
+        data = os.urandom(50_000)
+        with open(tmp_path / "out.gz", "wb") as f:
+            writer = ParallelGzipWriter(f, level=6, threads=8, chunk_size=1000)
+            for start in range(0, len(data), 777):
+                writer.write(data[start : start + 777])
+            writer.close()
+
+        assert gzip.decompress((tmp_path / "out.gz").read_bytes()) == data
+
+
+class TestFormatHelpers:
+    """Test format resolution and archive names."""
+
+    def test_zstd_fallback(self):
+        """Test that tar.zst needs zstandard."""
+        with patch("django_revolution.openapi.archive_formats.zstandard", None):
+            assert resolve_archive_format("tar.zst") == "tar.gz"
+        assert resolve_archive_format("store") == "store"
+
+    @pytest.mark.parametrize(
+        "name,zone",
+        [
+            ("public.zip", "public"),
+            ("public.v2.tar.gz", "public.v2"),
+            ("admin.tar.zst", "admin"),
+            ("public_metadata.json", None),
+        ],
+    )
+    def test_archive_zone_name(self, name, zone):
+        """Test that zone names are found for every archive suffix."""
+        assert archive_zone_name(Path(name)) == zone
@@ -0,0 +1,168 @@
+"""
+Tests for Django Revolution client archives.
+"""
+
+import json
+import tarfile
+import zipfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from django_revolution.config import DjangoRevolutionSettings
+from django_revolution.openapi.archive_manager import ArchiveManager
+from django_revolution.openapi.output_writer import MANIFEST_FILENAME
+from django_revolution.utils import Logger
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ArchiveManager(DjangoRevolutionSettings(), Logger("test_archive"), tmp_path)
+
+
+@pytest.fixture
+def clients(tmp_path):
+    ts_dir = tmp_path / "clients" / "typescript" / "public"
+    py_dir = tmp_path / "clients" / "python" / "public"
+    (ts_dir / "core").mkdir(parents=True)
+    (py_dir / "django_revolution_public").mkdir(parents=True)
+    (ts_dir / "index.ts").write_text("export * from './types.gen';\n")
+    (ts_dir / "core" / "client.ts").write_text("export const client = {};\n")
+    (ts_dir / MANIFEST_FILENAME).write_text("{}")
+    (py_dir / "django_revolution_public" / "__init__.py").write_text("")
+    (py_dir / "error_generation.log").write_text("boom\n")
+    return ts_dir, py_dir
+
+
+class TestArchiveZoneClients:
+    """Test archiving the clients of a zone."""
+
+    def test_archive_contents(self, manager, clients):
+        """Test that both clients are streamed into one archive."""
+        result = manager.archive_zone_clients("public", *clients)
+
+        assert result["success"]
+        with zipfile.ZipFile(result["timestamped_archive"]) as zipf:
+            assert sorted(zipf.namelist()) == [
+                "python/django_revolution_public/__init__.py",
+                "typescript/core/client.ts",
+                "typescript/index.ts",
+            ]
+        # Nothing is staged next to the archives
+        assert sorted(p.name for p in manager.archive_dir.iterdir()) == [
+            "catalog.sqlite3",
+            "files",
+            "latest",
+        ]
+
+        metadata = json.loads(Path(result["metadata"]).read_text())
+        assert metadata["clients"]["typescript"]["file_count"] == 2
+        assert metadata["total_files"] == 3
+
+    def test_latest_is_hardlink(self, manager, clients):
+        """Test that latest shares the timestamped archive and is replaced atomically."""
+        first = manager.archive_zone_clients("public", *clients)
+        with patch("django_revolution.openapi.archive_manager.datetime") as mock_datetime:
+            mock_datetime.now.return_value.strftime.side_effect = lambda fmt: (
+                "20300101_000000" if "%H" in fmt else "2030-01-01"
+            )
+            mock_datetime.now.return_value.isoformat.return_value = "2030-01-01T00:00:00"
+            (clients[0] / "index.ts").write_text("export {};\n")
+            second = manager.archive_zone_clients("public", *clients)
+
+        latest = Path(second["latest_archive"])
+        assert second["latest_mode"] == "hardlink"
+        assert latest.samefile(second["timestamped_archive"])
+        # The earlier archive is left alone
+        with zipfile.ZipFile(first["timestamped_archive"]) as zipf:
+            assert zipf.read("typescript/index.ts") == b"export * from './types.gen';\n"
+
+    def test_latest_copy_fallback(self, manager, clients):
+        """Test that latest is copied where hard links are not supported."""
+        with patch(
+            "django_revolution.openapi.archive_manager.os.link", side_effect=OSError
+        ):
+            result = manager.archive_zone_clients("public", *clients)
+
+        assert result["latest_mode"] == "copy"
+        with open(result["latest_archive"], "rb") as latest, open(
+            result["timestamped_archive"], "rb"
+        ) as timestamped:
+            assert latest.read() == timestamped.read()
+
+    def test_single_file_python_client(self, manager, tmp_path):
+        """Test that a single generated module is archived with its siblings."""
+        py_dir = tmp_path / "models"
+        py_dir.mkdir()
+        (py_dir / "models.py").write_text("class User: ...\n")
+        (py_dir / "README.md").write_text("# models\n")
+
+        result = manager.archive_zone_clients("public", python_path=py_dir / "models.py")
+
+        with zipfile.ZipFile(result["timestamped_archive"]) as zipf:
+            assert sorted(zipf.namelist()) == ["python/README.md", "python/models.py"]
+        assert result["typescript_available"] is False
+
+    def test_failed_archive_leaves_no_partial_file(self, manager, clients):
+        """Test that an archive that cannot be written is not left behind."""
+        manager.config.archive_threads = 2
+        with patch(
+            "django_revolution.openapi.archive_formats._deflate_file",
+            side_effect=OSError("disk full"),
+        ):
+            result = manager.archive_zone_clients("public", *clients)
+
+        assert not result["success"]
+        assert list(manager.archive_dir.rglob("*.zip*")) == []
+
+
+class TestArchiveFormats:
+    """Test the archive_format setting."""
+
+    def test_throughput_reported(self, manager, clients):
+        """Test that the result reports the format, sizes and throughput."""
+        result = manager.archive_zone_clients("public", *clients)
+
+        assert result["format"] == "zip"
+        assert result["input_bytes"] == sum(
+            len(p.read_bytes())
+            for p in (
+                clients[0] / "index.ts",
+                clients[0] / "core" / "client.ts",
+                clients[1] / "django_revolution_public" / "__init__.py",
+            )
+        )
+        assert result["seconds"] >= 0
+        assert result["throughput_mb_s"] >= 0
+
+    def test_tar_gz(self, manager, clients):
+        """Test that tar.gz archives replace the latest zip of the zone."""
+        manager.archive_zone_clients("public", *clients)
+        manager.config.archive_format = "tar.gz"
+
+        result = manager.archive_zone_clients("public", *clients)
+
+        assert result["latest_archive"].endswith("public.tar.gz")
+        with tarfile.open(result["latest_archive"], "r:gz") as tar:
+            assert "typescript/index.ts" in tar.getnames()
+        latest = manager.list_archives()["latest"]
+        assert [(a["zone_name"], a["filename"]) for a in latest] == [
+            ("public", "public.tar.gz")
+        ]
+
+    def test_tar_zst_fallback(self, manager, clients):
+        """Test that tar.zst falls back to tar.gz without zstandard."""
+        manager.config.archive_format = "tar.zst"
+
+        with patch("django_revolution.openapi.archive_formats.zstandard", None):
+            result = manager.archive_zone_clients("public", *clients)
+
+        assert result["format"] == "tar.gz"
+        assert result["timestamped_archive"].endswith("public.tar.gz")
+
+    def test_invalid_settings_rejected(self):
+        """Test that unknown formats and levels fail validation."""
+        with pytest.raises(ValueError):
+            DjangoRevolutionSettings(archive_format="rar")
+        with pytest.raises(ValueError):
+            DjangoRevolutionSettings(archive_compression_level=23)
@@ -0,0 +1,258 @@
+"""
+Tests for Django Revolution archive retention.
+"""
+
+import threading
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from django_revolution.config import ArchiveRetentionSettings, DjangoRevolutionSettings
+from django_revolution.openapi.archive_manager import ArchiveManager
+from django_revolution.openapi.archive_retention import select_by_rules, select_by_size
+from django_revolution.utils import Logger
+
+
+def rows(zone_name, *timestamps, size_bytes=100):
+    return [
+        {"zone_name": zone_name, "timestamp": timestamp, "size_bytes": size_bytes}
+        for timestamp in sorted(timestamps, reverse=True)
+    ]
+
+
+def removed(selected):
+    return [(row["zone_name"], row["timestamp"]) for row in selected]
+
+
+# Four archives on Monday 2030-01-07, two on Tuesday, one the week before
+HISTORY = rows(
+    "public",
+    "20300101_120000",
+    "20300107_090000",
+    "20300107_100000",
+    "20300107_110000",
+    "20300107_120000",
+    "20300108_090000",
+    "20300108_100000",
+)
+
+
+class TestSelectByRules:
+    """Test count and age rules."""
+
+    def test_no_rules_keep_everything(self):
+        """Test that an empty policy removes nothing."""
+        assert select_by_rules(HISTORY, ArchiveRetentionSettings()) == []
+
+    def test_keep_last(self):
+        """Test that only the newest archives of each zone are kept."""
+        policy = ArchiveRetentionSettings(keep_last=2)
+        history = HISTORY + rows("admin", "20300101_000000")
+
+        assert removed(select_by_rules(history, policy)) == [
+            ("public", "20300107_120000"),
+            ("public", "20300107_110000"),
+            ("public", "20300107_100000"),
+            ("public", "20300107_090000"),
+            ("public", "20300101_120000"),
+        ]
+
+    def test_keep_daily_and_weekly(self):
+        """Test that thinning keeps the newest archive per day and per week."""
+        policy = ArchiveRetentionSettings(keep_daily=2, keep_weekly=2)
+
+        assert removed(select_by_rules(HISTORY, policy)) == [
+            ("public", "20300108_090000"),
+            ("public", "20300107_110000"),
+            ("public", "20300107_100000"),
+            ("public", "20300107_090000"),
+        ]
+
+    def test_max_age_keeps_newest(self):
+        """Test that old archives go, but never the newest of a zone."""
+        policy = ArchiveRetentionSettings(max_age_days=1)
+
+        selected = select_by_rules(HISTORY, policy, now=datetime(2030, 1, 8, 9, 30))
+
+        assert removed(selected) == [
+            ("public", "20300107_090000"),
+            ("public", "20300101_120000"),
+        ]
+        everything_old = select_by_rules(HISTORY, policy, now=datetime(2031, 1, 1))
+        assert len(everything_old) == len(HISTORY) - 1
+
+
+class TestSelectBySize:
+    """Test the total size cap."""
+
+    def test_oldest_first_across_zones(self):
+        """Test that the oldest archives of any zone go first."""
+        history = rows("public", "20300103_000000", "20300101_000000") + rows(
+            "admin", "20300104_000000", "20300102_000000"
+        )
+
+        assert removed(select_by_size(history, 250)) == [
+            ("public", "20300101_000000"),
+            ("admin", "20300102_000000"),
+        ]
+        assert select_by_size(history, 400) == []
+
+    def test_newest_per_zone_kept(self):
+        """Test that the cap never removes the newest archive of a zone."""
+        history = rows("public", "20300102_000000") + rows("admin", "20300101_000000")
+
+        assert select_by_size(history, 10) == []
+
+    def test_store_versions_share_blobs(self):
+        """Test that removing a store version only frees blobs it alone holds."""
+        history = rows("public", "20300103_000000", "20300102_000000", "20300101_000000")
+        blobs = {
+            ("public", "20300101_000000"): {"shared": 1000, "day1": 10},
+            ("public", "20300102_000000"): {"shared": 1000, "day2": 10},
+            ("public", "20300103_000000"): {"shared": 1000, "day3": 10},
+        }
+
+        assert removed(select_by_size(history, 1015, blobs)) == [
+            ("public", "20300101_000000"),
+            ("public", "20300102_000000"),
+        ]
+        assert select_by_size(history, 1030, blobs) == []
+
+
+class TestApplyRetention:
+    """Test retention after archive writes."""
+
+    @pytest.fixture
+    def ts_dir(self, tmp_path):
+        ts_dir = tmp_path / "clients" / "typescript" / "public"
+        ts_dir.mkdir(parents=True)
+        (ts_dir / "index.ts").write_text("export * from './types.gen';\n")
+        return ts_dir
+
+    def archive(self, manager, ts_dir, moment):
+        with patch("django_revolution.openapi.archive_manager.datetime") as mock_datetime:
+            mock_datetime.now.return_value = moment
+            return manager.archive_zone_clients("public", typescript_path=ts_dir)
+
+    @pytest.mark.parametrize("backend", ["files", "store"])
+    def test_keep_last_after_each_write(self, tmp_path, ts_dir, backend):
+        """Test that each archive write prunes the zone incrementally."""
+        config = DjangoRevolutionSettings(
+            archive_backend=backend, archive_retention={"keep_last": 2}
+        )
+        manager = ArchiveManager(config, Logger("test_retention"), tmp_path)
+
+        results = []
+        for day in range(1, 5):
+            (ts_dir / "index.ts").write_text(f"export const day = {day};\n")
+            results.append(self.archive(manager, ts_dir, datetime(2030, 1, day)))
+
+        assert [result["retention"]["removed"] for result in results] == [0, 0, 1, 1]
+        assert results[-1]["retention"]["removed_archives"] == [
+            ("public", "20300102_000000")
+        ]
+        assert results[-1]["retention"]["bytes_reclaimed"] > 0
+        assert [row["timestamp"] for row in manager.catalog.query()] == [
+            "20300104_000000",
+            "20300103_000000",
+        ]
+        if backend == "files":
+            assert sorted(p.name for p in (manager.archive_dir / "files").iterdir()) == [
+                "20300103_000000",
+                "20300104_000000",
+            ]
+        else:
+            assert manager.store.list_versions("public") == [
+                "20300103_000000",
+                "20300104_000000",
+            ]
+            assert len(list(manager.store.objects_dir.glob("*/*"))) == 2
+
+    def test_size_cap(self, tmp_path, ts_dir):
+        """Test that the size cap removes the oldest archives."""
+        manager = ArchiveManager(DjangoRevolutionSettings(), Logger("test_retention"), tmp_path)
+        for day in range(1, 4):
+            self.archive(manager, ts_dir, datetime(2030, 1, day))
+        archive_size = manager.archive_totals()["size_bytes"] // 3
+
+        result = manager.apply_retention(
+            policy=ArchiveRetentionSettings(max_total_mb=archive_size * 1.5 / (1024 * 1024))
+        )
+
+        assert result["removed_archives"] == [
+            ("public", "20300101_000000"),
+            ("public", "20300102_000000"),
+        ]
+        # Both archives held their own copy plus metadata
+        assert result["bytes_reclaimed"] > 2 * archive_size
+
+    def test_size_cap_store(self, tmp_path, ts_dir):
+        """Test that the size cap counts blobs shared by store versions once."""
+        config = DjangoRevolutionSettings(archive_backend="store")
+        manager = ArchiveManager(config, Logger("test_retention"), tmp_path)
+        (ts_dir / "types.gen.ts").write_text("x" * 10000)
+        for day in range(1, 4):
+            (ts_dir / "index.ts").write_text(f"export const day = {day};\n")
+            self.archive(manager, ts_dir, datetime(2030, 1, day))
+        blobs = list(manager.store.objects_dir.glob("*/*"))
+        assert manager.archive_totals()["size_bytes"] == sum(
+            blob.stat().st_size for blob in blobs
+        )
+
+        # Room for the shared blob and little more
+        result = manager.apply_retention(
+            policy=ArchiveRetentionSettings(max_total_mb=10030 / (1024 * 1024))
+        )
+
+        assert result["removed_archives"] == [
+            ("public", "20300101_000000"),
+            ("public", "20300102_000000"),
+        ]
+        blobs = list(manager.store.objects_dir.glob("*/*"))
+        assert len(blobs) == 2
+        assert manager.archive_totals()["size_bytes"] == sum(
+            blob.stat().st_size for blob in blobs
+        )
+
+    def test_concurrent_size_cap_removes_once(self, tmp_path, ts_dir):
+        """Test that zones finishing together do not remove the same archives."""
+        manager = ArchiveManager(DjangoRevolutionSettings(), Logger("test_retention"), tmp_path)
+        for day in range(1, 4):
+            self.archive(manager, ts_dir, datetime(2030, 1, day))
+        archive_size = manager.archive_totals()["size_bytes"] // 3
+        policy = ArchiveRetentionSettings(max_total_mb=archive_size * 1.5 / (1024 * 1024))
+
+        remove_archives = manager._remove_archives
+
+        def slow_remove(rows):
+            time.sleep(0.2)
+            return remove_archives(rows)
+
+        results = []
+        with patch.object(manager, "_remove_archives", side_effect=slow_remove):
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(manager.apply_retention(policy=policy))
+                )
+                for _ in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        removed = [key for result in results for key in result["removed_archives"]]
+        assert sorted(removed) == [
+            ("public", "20300101_000000"),
+            ("public", "20300102_000000"),
+        ]
+        assert sorted(result["bytes_reclaimed"] > 0 for result in results) == [False, True]
+
+    def test_disabled_by_default(self, tmp_path, ts_dir):
+        """Test that archives are not pruned without a policy."""
+        manager = ArchiveManager(DjangoRevolutionSettings(), Logger("test_retention"), tmp_path)
+
+        result = self.archive(manager, ts_dir, datetime(2030, 1, 1))
+
+        assert "retention" not in result
@@ -0,0 +1,167 @@
+"""
+Tests for Django Revolution deduplicated archive store.
+"""
+
+import tarfile
+import threading
+import zipfile
+import pytest
+from unittest.mock import patch
+
+from django_revolution.config import DjangoRevolutionSettings
+from django_revolution.openapi.archive_manager import ArchiveManager
+from django_revolution.openapi.archive_store import ArchiveStore
+from django_revolution.utils import Logger
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArchiveStore(tmp_path / "store", Logger("test_store"))
+
+
+@pytest.fixture
+def client_files(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "index.ts").write_text("export * from './types.gen';\n")
+    (src / "types.gen.ts").write_text("export type User = { id: number };\n")
+    (src / "copy.ts").write_text("export type User = { id: number };\n")
+    return [(path, f"typescript/{path.name}") for path in sorted(src.iterdir())]
+
+
+class TestArchiveStore:
+    """Test storing and materializing versions."""
+
+    def test_blobs_stored_once(self, store, client_files):
+        """Test that identical contents share a blob within and across versions."""
+        first = store.add_version("public", "20300101_000000", client_files)
+        second = store.add_version("public", "20300102_000000", client_files)
+
+        assert (first["new_blobs"], first["reused_blobs"]) == (2, 1)
+        assert (second["new_blobs"], second["new_bytes"]) == (0, 0)
+        assert len(list(store.objects_dir.glob("*/*"))) == 2
+        assert store.list_versions("public") == ["20300101_000000", "20300102_000000"]
+
+    def test_materialize_historical_version(self, store, client_files, tmp_path):
+        """Test that an older version is rebuilt with its own contents."""
+        store.add_version("public", "20300101_000000", client_files)
+        client_files[0][0].write_text("export {};\n")
+        store.add_version("public", "20300102_000000", client_files)
+
+        old = store.materialize("public", tmp_path / "old.zip", "20300101_000000")
+        latest = store.materialize("public", tmp_path / "latest.zip")
+
+        with zipfile.ZipFile(old) as zipf:
+            assert zipf.testzip() is None
+            assert zipf.namelist() == [arcname for _, arcname in client_files]
+            assert zipf.read("typescript/copy.ts") == b"export type User = { id: number };\n"
+        with zipfile.ZipFile(latest) as zipf:
+            assert zipf.read("typescript/copy.ts") == b"export {};\n"
+
+    def test_missing_blob(self, store, client_files, tmp_path):
+        """Test that a version with a missing blob is not materialized."""
+        store.add_version("public", "20300101_000000", client_files)
+        next(store.objects_dir.glob("*/*")).unlink()
+
+        with pytest.raises(FileNotFoundError):
+            store.materialize("public", tmp_path / "out.zip")
+        assert not (tmp_path / "out.zip").exists()
+
+    def test_collect_garbage(self, store, client_files):
+        """Test that only blobs of removed versions are deleted."""
+        store.add_version("public", "20300101_000000", client_files)
+        client_files[1][0].write_text("export {};\n")
+        store.add_version("public", "20300102_000000", client_files)
+
+        store.remove_version("public", "20300101_000000")
+        result = store.collect_garbage()
+
+        assert result == {
+            "removed": 1,
+            "bytes_reclaimed": len("export * from './types.gen';\n"),
+        }
+        assert store.list_versions("public") == ["20300102_000000"]
+
+    def test_collect_garbage_while_adding_version(self, store, client_files, tmp_path):
+        """Test that garbage collection keeps blobs of a version being added."""
+        add_file = store.add_file
+        added = []
+        collector = threading.Thread(target=store.collect_garbage)
+
+        def add_file_then_collect(file_path):
+            result = add_file(file_path)
+            added.append(file_path)
+            if len(added) == len(client_files):
+                # All blobs are written, the manifest is not yet
+                collector.start()
+                collector.join(timeout=0.2)
+            return result
+
+        with patch.object(store, "add_file", side_effect=add_file_then_collect):
+            store.add_version("public", "20300101_000000", client_files)
+        collector.join()
+
+        archive = store.materialize("public", tmp_path / "out.zip")
+        with zipfile.ZipFile(archive) as zipf:
+            assert len(zipf.namelist()) == 3
+
+
+class TestStoreBackend:
+    """Test archiving with archive_backend = "store"."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        config = DjangoRevolutionSettings(archive_backend="store")
+        return ArchiveManager(config, Logger("test_archive"), tmp_path)
+
+    @pytest.fixture
+    def ts_dir(self, tmp_path):
+        ts_dir = tmp_path / "clients" / "typescript" / "public"
+        ts_dir.mkdir(parents=True)
+        (ts_dir / "index.ts").write_text("export * from './types.gen';\n")
+        return ts_dir
+
+    def archive(self, manager, ts_dir, timestamp):
+        with patch("django_revolution.openapi.archive_manager.datetime") as mock_datetime:
+            mock_datetime.now.return_value.strftime.side_effect = lambda fmt: (
+                timestamp if "%H" in fmt else "2030-01-01"
+            )
+            mock_datetime.now.return_value.isoformat.return_value = "2030-01-01T00:00:00"
+            return manager.archive_zone_clients("public", typescript_path=ts_dir)
+
+    def test_runs_share_blobs(self, manager, ts_dir):
+        """Test that runs write manifests and the latest archive only."""
+        first = self.archive(manager, ts_dir, "20300101_000000")
+        second = self.archive(manager, ts_dir, "20300101_010000")
+
+        assert second["success"]
+        assert second["timestamped_archive"] is None
+        assert second["store"]["reused_blobs"] == 1
+        assert first["manifest"] != second["manifest"]
+        assert not (manager.archive_dir / "files").exists()
+        with zipfile.ZipFile(second["latest_archive"]) as zipf:
+            assert zipf.namelist() == ["typescript/index.ts"]
+        assert manager.list_archives()["versions"] == {
+            "public": ["20300101_010000", "20300101_000000"]
+        }
+
+    def test_materialize_archive(self, manager, ts_dir, tmp_path):
+        """Test that a stored version is written in the configured format."""
+        self.archive(manager, ts_dir, "20300101_000000")
+        (ts_dir / "index.ts").write_text("export {};\n")
+        self.archive(manager, ts_dir, "20300101_010000")
+        manager.config.archive_format = "tar.gz"
+
+        result = manager.materialize_archive("public", "20300101_000000")
+
+        assert result["archive"].endswith("public_20300101_000000.tar.gz")
+        with tarfile.open(result["archive"], "r:gz") as tar:
+            content = tar.extractfile("typescript/index.ts").read()
+        assert content == b"export * from './types.gen';\n"
+
+    def test_materialize_unknown_zone(self, manager):
+        """Test that materializing an unknown zone fails cleanly."""
+        result = manager.materialize_archive("missing")
+
+        assert not result["success"]
+        assert "missing" in result["error"]
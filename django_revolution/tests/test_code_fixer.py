@@ -0,0 +1,93 @@
+"""
+Tests for Django Revolution generated code fixer.
+"""
+
+import ast
+import os
+
+from django_revolution.generators import code_fixer
+from django_revolution.generators.code_fixer import fix_generated_code, fix_source
+
+BROKEN_MULTIPART = '''
+class Body:
+    def to_multipart(self) -> types.RequestFiles:
+        files: types.RequestFiles = []
+
+        if not isinstance(self.name, Unset):
+            files.append(("name", (None, str(self.name).encode(), "text/plain"))
+        else:
+            files.append(("name", (None, b"", "text/plain"))
+        for item in self.tags:
+            files.append(("tags", (None, str(item).encode(), "text/plain"))
+
+        return files
+'''
+
+WRAPPED_CALL = '''
+def to_multipart(self):
+    files = []
+    files.append(
+        ("name", (None, self.name, "text/plain")),
+    )
+    return files
+'''
+
+
+class TestFixSource:
+    """Test the single-pass source fixer."""
+
+    def test_closes_unbalanced_append_calls(self):
+        """Test that broken multipart bodies become valid Python."""
+        fixed = fix_source(BROKEN_MULTIPART)
+
+        ast.parse(fixed)
+        assert fixed.count('"text/plain")))') == 3
+
+    def test_valid_source_unchanged(self):
+        """Test that code which already parses is left alone."""
+        assert fix_source(WRAPPED_CALL) == WRAPPED_CALL
+
+    def test_wrapped_call_not_closed(self):
+        """Test that an append spanning several lines is not treated as broken."""
+        source = WRAPPED_CALL + "x = (\n"
+
+        assert fix_source(source) == source
+
+
+class TestFixGeneratedCode:
+    """Test fixing a generated client directory."""
+
+    def _make_client(self, tmp_path, broken_files=3):
+        client_dir = tmp_path / "client"
+        (client_dir / "models").mkdir(parents=True)
+        for index in range(broken_files):
+            (client_dir / "models" / f"body_{index}.py").write_text(BROKEN_MULTIPART)
+        plain = client_dir / "models" / "user.py"
+        plain.write_text("class User:\n    name: str\n")
+        os.utime(plain, (1_000_000, 1_000_000))
+        return client_dir, plain
+
+    def test_only_multipart_files_touched(self, tmp_path):
+        """Test that files without multipart code are never rewritten."""
+        client_dir, plain = self._make_client(tmp_path)
+
+        report = fix_generated_code(client_dir)
+
+        assert report.files_scanned == 4
+        assert report.files_candidate == 3
+        assert report.files_fixed == 3
+        assert report.workers == 0
+        assert plain.stat().st_mtime == 1_000_000
+        for path in report.fixed_paths:
+            ast.parse(open(path).read())
+
+    def test_process_pool(self, tmp_path, monkeypatch):
+        """Test that many candidate files are fixed by worker processes."""
+        monkeypatch.setattr(code_fixer, "POOL_THRESHOLD", 2)
+        client_dir, _ = self._make_client(tmp_path, broken_files=4)
+
+        report = fix_generated_code(client_dir, max_workers=2)
+
+        assert report.workers == 2
+        assert report.files_fixed == 4
+        assert report.errors == []
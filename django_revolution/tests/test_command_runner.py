@@ -0,0 +1,122 @@
+"""
+Tests for Django Revolution asyncio command runner.
+"""
+
+import sys
+import time
+import pytest
+from unittest.mock import patch
+
+from django_revolution.command_runner import CommandJob, CommandRunner, get_command_runner
+from django_revolution.utils import run_command
+
+
+def python_job(code: str, **kwargs) -> CommandJob:
+    return CommandJob(argv=[sys.executable, "-c", code], **kwargs)
+
+
+@pytest.fixture
+def runner():
+    return CommandRunner(max_concurrency=2)
+
+
+class TestCommandRunner:
+    """Test running argv commands on the shared event loop."""
+
+    def test_captures_output(self, runner):
+        """Test that stdout and stderr are collected separately."""
+        result = runner.run(
+            [sys.executable, "-c", "import sys; print('out'); print('err', file=sys.stderr)"]
+        )
+
+        assert result.success
+        assert result.stdout == "out\n"
+        assert result.stderr == "err\n"
+
+    def test_arguments_not_interpreted_by_shell(self, runner):
+        """Test that argv entries reach the program unchanged."""
+        result = runner.run([sys.executable, "-c", "import sys; print(sys.argv[1])", "a b; $HOME"])
+
+        assert result.stdout == "a b; $HOME\n"
+
+    def test_timeout_kills_process(self, runner):
+        """Test that a job exceeding its timeout is killed."""
+        start = time.monotonic()
+        result = runner.run([sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.5)
+
+        assert result.timed_out
+        assert not result.success
+        assert time.monotonic() - start < 10
+
+    def test_long_output_line(self, runner):
+        """Test that lines longer than the stream buffer are captured."""
+        result = runner.run(
+            [sys.executable, "-c", "print('x' * 200000); print('ü' * 100000)"]
+        )
+
+        assert result.success
+        assert result.stdout == "x" * 200000 + "\n" + "ü" * 100000 + "\n"
+
+    def test_error_while_running(self, runner):
+        """Test that errors reading output are reported and the process is killed."""
+        start = time.monotonic()
+        with patch.object(runner, "_stream", side_effect=ValueError("broken pipe")):
+            result = runner.run([sys.executable, "-c", "import time; time.sleep(30)"])
+
+        assert not result.success
+        assert "broken pipe" in result.error
+        assert time.monotonic() - start < 10
+
+    def test_missing_program(self, runner):
+        """Test that a program that cannot be started is reported, not raised."""
+        result = runner.run(["django-revolution-no-such-program"], quiet=True)
+
+        assert not result.success
+        assert result.error
+
+    def test_fail_fast_cancels_siblings(self, runner):
+        """Test that the first failure cancels the remaining jobs."""
+        results = runner.run_many(
+            [
+                python_job("import time; time.sleep(30)"),
+                python_job("raise SystemExit(3)"),
+                python_job("print('queued')"),
+            ]
+        )
+
+        assert results[0].cancelled
+        assert results[1].returncode == 3
+        assert all(not result.success for result in results)
+
+    def test_bounded_concurrency(self, runner):
+        """Test that no more than max_concurrency jobs run at once."""
+        jobs = [python_job("import time; time.sleep(0.3)") for _ in range(4)]
+
+        start = time.monotonic()
+        results = runner.run_many(jobs, fail_fast=False)
+
+        assert all(result.success for result in results)
+        assert time.monotonic() - start >= 0.6
+
+
+class TestRunCommand:
+    """Test the run_command() compatibility wrapper."""
+
+    def test_accepts_argv(self):
+        """Test that argument lists are run as-is."""
+        assert run_command([sys.executable, "-c", "print('ok')"]) == (True, "ok\n")
+
+    def test_string_is_split(self):
+        """Test that string commands are split instead of passed to a shell."""
+        success, output = run_command(f"{sys.executable} -c 'print(1 + 1)'")
+
+        assert success
+        assert output == "2\n"
+
+    def test_stage(self):
+        """Test that the peak RSS is recorded under the given stage."""
+        runner = get_command_runner()
+        with patch.object(runner.tuner, "record") as mock_record:
+            run_command([sys.executable, "-c", "pass"], stage="schema")
+
+        assert mock_record.call_args[0][0] == "schema"
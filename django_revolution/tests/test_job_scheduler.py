@@ -0,0 +1,173 @@
+"""
+Tests for Django Revolution shared job scheduler.
+"""
+
+import threading
+import time
+import pytest
+
+from django_revolution.config import DjangoRevolutionSettings
+from django_revolution.openapi.job_scheduler import JobScheduler
+from django_revolution.openapi.pipeline import PipelineScheduler
+
+
+class ConcurrencyProbe:
+    """Callable that records how many calls overlap, overall and per stage."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.current = {}
+        self.peak = {}
+
+    def __call__(self, stage: str):
+        with self.lock:
+            self.current[stage] = self.current.get(stage, 0) + 1
+            total = sum(self.current.values())
+            self.peak[stage] = max(self.peak.get(stage, 0), self.current[stage])
+            self.peak["*"] = max(self.peak.get("*", 0), total)
+        time.sleep(self.delay)
+        with self.lock:
+            self.current[stage] -= 1
+        return stage
+
+
+class TestJobScheduler:
+    """Test the global budget, stage limits and metrics."""
+
+    def test_results_and_exceptions(self):
+        """Test that futures carry results and exceptions of their jobs."""
+        scheduler = JobScheduler(max_workers=2)
+
+        def fail():
+            raise RuntimeError("boom")
+
+        ok = scheduler.submit("python", lambda: 42)
+        failed = scheduler.submit("python", fail)
+
+        assert ok.result(timeout=5) == 42
+        with pytest.raises(RuntimeError):
+            failed.result(timeout=5)
+        assert scheduler.get_stats()[0].failed == 1
+        scheduler.shutdown()
+
+    def test_global_budget(self):
+        """Test that all stages together stay within max_workers."""
+        scheduler = JobScheduler(max_workers=3)
+        probe = ConcurrencyProbe()
+
+        futures = [
+            scheduler.submit(stage, probe, stage)
+            for stage in ("schema", "typescript", "python") * 4
+        ]
+        for future in futures:
+            future.result(timeout=5)
+
+        assert probe.peak["*"] <= 3
+        scheduler.shutdown()
+
+    def test_stage_limit_leaves_room_for_other_stages(self):
+        """Test that a limited stage queues while other stages keep running."""
+        scheduler = JobScheduler(max_workers=4, stage_limits={"typescript": 1})
+        probe = ConcurrencyProbe()
+
+        futures = [scheduler.submit("typescript", probe, "typescript") for _ in range(4)]
+        futures += [scheduler.submit("python", probe, "python") for _ in range(3)]
+        for future in futures:
+            future.result(timeout=5)
+
+        assert probe.peak["typescript"] == 1
+        assert probe.peak["python"] == 3
+
+        stats = {item.stage: item for item in scheduler.get_stats()}
+        assert stats["typescript"].limit == 1
+        assert stats["typescript"].jobs == 4
+        assert stats["typescript"].max_running == 1
+        assert stats["typescript"].max_queued >= 3
+        assert stats["typescript"].max_wait_seconds > 0
+        scheduler.shutdown()
+
+    def test_nested_submit_runs_inline(self):
+        """Test that a job submitting more jobs cannot deadlock a full pool."""
+        scheduler = JobScheduler(max_workers=1)
+
+        def outer():
+            inner = scheduler.submit("python", threading.get_ident)
+            return threading.get_ident(), inner.result(timeout=1)
+
+        outer_thread, inner_thread = scheduler.submit("client", outer).result(timeout=5)
+
+        assert outer_thread == inner_thread
+        scheduler.shutdown()
+
+    def test_run_all_from_job_uses_idle_workers(self):
+        """Test that a group started by a job runs in parallel."""
+        scheduler = JobScheduler(max_workers=3)
+        probe = ConcurrencyProbe(delay=0.1)
+
+        def outer():
+            futures = scheduler.run_all("python", probe, [("python",)] * 3)
+            return [future.result() for future in futures]
+
+        assert scheduler.submit("python", outer).result(timeout=5) == ["python"] * 3
+        assert probe.peak["python"] >= 2
+        scheduler.shutdown()
+
+    def test_run_all_from_job_in_full_pool(self):
+        """Test that the calling job runs its group itself when no worker is free."""
+        scheduler = JobScheduler(max_workers=1)
+
+        def outer():
+            futures = scheduler.run_all("python", lambda: threading.get_ident(), [()] * 2)
+            return threading.get_ident(), {future.result() for future in futures}
+
+        outer_thread, inner_threads = scheduler.submit("python", outer).result(timeout=5)
+
+        assert inner_threads == {outer_thread}
+        scheduler.shutdown()
+
+    def test_configure_and_reset(self):
+        """Test that limits can be changed and metrics restarted."""
+        scheduler = JobScheduler(max_workers=2)
+        scheduler.submit("schema", lambda: None).result(timeout=5)
+
+        scheduler.configure(max_workers=8, stage_limits={"schema": 3})
+        assert scheduler.stage_limit("schema") == 3
+        assert scheduler.stage_limit("python") == 8
+
+        scheduler.reset_stats()
+        assert scheduler.get_stats()[0].jobs == 0
+        scheduler.shutdown()
+
+
+class TestPipelineOnJobScheduler:
+    """Test running the streaming pipeline on the shared scheduler."""
+
+    def test_stage_limits_apply_to_pipeline(self):
+        """Test that pipeline tasks obey the stage limits of the scheduler."""
+        jobs = JobScheduler(max_workers=4, stage_limits={"typescript": 1})
+        probe = ConcurrencyProbe()
+        pipeline = PipelineScheduler(max_workers=4, jobs=jobs)
+
+        for zone in ("a", "b", "c"):
+            pipeline.add_task(f"typescript:{zone}", lambda: probe("typescript"), stage="typescript")
+            pipeline.add_task(f"python:{zone}", lambda: probe("python"), stage="python")
+        results = pipeline.run()
+
+        assert len(results) == 6
+        assert probe.peak["typescript"] == 1
+        assert probe.peak["python"] > 1
+        jobs.shutdown()
+
+
+class TestStageLimitsSetting:
+    """Test the stage_limits setting."""
+
+    def test_default_limits_node_jobs(self):
+        """Test that TypeScript (Node) jobs are limited by default."""
+        assert DjangoRevolutionSettings().stage_limits == {"typescript": 4}
+
+    def test_invalid(self):
+        """Test that limits below one are rejected."""
+        with pytest.raises(ValueError):
+            DjangoRevolutionSettings(stage_limits={"python": 0})
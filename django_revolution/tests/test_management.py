@@ -376,4 +376,41 @@ class TestMultithreadingManagement:
             
             mock_cli_main.assert_called_once()
             call_args = mock_cli_main.call_args[0][0]
-            assert '--status' in call_args 
\ No newline at end of file
+            assert '--status' in call_args 
+
+class TestWatchOutputs:
+    """Test trace and metrics output in watch mode."""
+
+    def test_watch_writes_trace_and_metrics_per_run(self, tmp_path):
+        """Test that every watch regeneration gets numbered output files."""
+        from django_revolution.config import GenerationSummary
+        from django_revolution.tracing import get_tracer
+
+        class FakeWatcher:
+            def __init__(self, generator, zones=None, on_summary=None, on_start=None):
+                self.on_summary = on_summary
+                self.on_start = on_start
+
+            def run(self):
+                for run in range(2):
+                    self.on_start()
+                    with get_tracer().span(f"run {run}", "generate"):
+                        pass
+                    self.on_summary(GenerationSummary(total_zones=run + 1))
+
+        with patch('django_revolution.cli.ZoneWatcher', FakeWatcher):
+            Command().handle(
+                watch=True,
+                trace=str(tmp_path / "trace.json"),
+                metrics_json=str(tmp_path / "metrics.json"),
+            )
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "metrics.1.json",
+            "metrics.2.json",
+            "trace.1.json",
+            "trace.2.json",
+        ]
+        assert '"total_zones": 2' in (tmp_path / "metrics.2.json").read_text()
+        trace = (tmp_path / "trace.2.json").read_text()
+        assert "run 1" in trace and "run 0" not in trace
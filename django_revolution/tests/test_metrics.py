@@ -0,0 +1,129 @@
+"""
+Tests for Django Revolution stage metrics.
+"""
+
+import json
+import os
+import sys
+import threading
+import pytest
+
+from django_revolution.command_runner import CommandRunner
+from django_revolution.config import GenerationSummary, StageTiming
+from django_revolution.metrics import (
+    ProcessUsage,
+    StageRecorder,
+    stage_totals,
+    write_summary_json,
+)
+from django_revolution.resources import process_cpu_seconds
+
+requires_proc = pytest.mark.skipif(
+    not os.path.exists("/proc/self/stat"), reason="/proc required"
+)
+
+BUSY_LOOP = "import time\nend = time.process_time() + 0.5\nwhile time.process_time() < end: pass"
+
+
+class TestStageRecorder:
+    """Test recording stage timings."""
+
+    def test_records_duration_and_files(self):
+        """Test that a stage is timed and keeps files set after the block."""
+        recorder = StageRecorder()
+
+        with recorder.stage("schema", "public") as timing:
+            sum(range(100000))
+        timing.files = 1
+
+        [recorded] = recorder.get_timings()
+        assert recorded.stage == "schema"
+        assert recorded.zone_name == "public"
+        assert recorded.duration_seconds > 0
+        assert recorded.cpu_seconds > 0
+        assert recorded.files == 1
+
+    def test_threads_record_separately(self):
+        """Test that stages opened on different threads do not mix."""
+        recorder = StageRecorder()
+
+        def work(zone_name):
+            with recorder.stage("python", zone_name):
+                pass
+
+        threads = [threading.Thread(target=work, args=(zone,)) for zone in ("b", "a")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [t.zone_name for t in recorder.get_timings()] == ["a", "b"]
+
+    @requires_proc
+    def test_commands_counted_in_open_stage(self):
+        """Test that child process usage is added to the current stage."""
+        recorder = StageRecorder()
+        runner = CommandRunner()
+
+        with recorder.stage("python_format", "public"):
+            result = runner.run([sys.executable, "-c", BUSY_LOOP])
+        runner.run([sys.executable, "-c", "pass"])
+
+        [timing] = recorder.get_timings()
+        assert result.success
+        assert timing.commands == 1
+        assert timing.child_cpu_seconds >= 0.2
+        assert timing.peak_rss_bytes > 0
+
+    def test_stage_totals(self):
+        """Test that zone timings are summed per stage in pipeline order."""
+        timings = [
+            StageTiming(stage="python", zone_name="a", duration_seconds=1, files=3),
+            StageTiming(stage="schema", zone_name="a", duration_seconds=2, peak_rss_bytes=5),
+            StageTiming(stage="python", zone_name="b", duration_seconds=2, files=4),
+            StageTiming(stage="schema", zone_name="b", duration_seconds=1, peak_rss_bytes=7),
+        ]
+
+        schema, python = stage_totals(timings)
+
+        assert (schema.stage, schema.duration_seconds, schema.peak_rss_bytes) == ("schema", 3, 7)
+        assert (python.stage, python.files) == ("python", 7)
+
+
+class TestProcessUsage:
+    """Test whole-run CPU accounting."""
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="resource module required")
+    def test_child_cpu(self):
+        """Test that CPU time of finished children is counted."""
+        usage = ProcessUsage()
+
+        CommandRunner().run([sys.executable, "-c", BUSY_LOOP])
+
+        assert usage.child_cpu_seconds >= 0.4
+        assert usage.peak_rss_bytes() > 0
+
+    @requires_proc
+    def test_process_cpu_seconds(self):
+        """Test reading the CPU time of a running process."""
+        sum(range(10 ** 6))
+        assert process_cpu_seconds(os.getpid()) > 0
+
+
+class TestJsonExport:
+    """Test exporting summaries."""
+
+    def test_write_summary_json(self, tmp_path):
+        """Test that the export holds the summary and stage totals."""
+        summary = GenerationSummary(
+            total_zones=1,
+            stage_timings=[StageTiming(stage="schema", zone_name="public", files=1)],
+        )
+
+        path = write_summary_json(summary, tmp_path / "metrics" / "run.json")
+        document = json.loads(path.read_text())
+
+        assert document["summary"]["total_zones"] == 1
+        assert document["summary"]["stage_timings"][0]["zone_name"] == "public"
+        assert document["stage_totals"][0]["files"] == 1
+        assert "recorded_at" in document
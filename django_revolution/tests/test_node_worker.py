@@ -0,0 +1,271 @@
+"""
+Tests for Django Revolution persistent hey-api Node worker.
+"""
+
+import json
+import shutil
+import sys
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from django_revolution.command_runner import CommandResult
+from django_revolution.config import DjangoRevolutionSettings
+from django_revolution.openapi.heyapi_ts import HeyAPITypeScriptGenerator
+from django_revolution.openapi.job_scheduler import JobScheduler
+from django_revolution.openapi.node_worker import HeyAPINodeWorker, WORKER_SCRIPT
+from django_revolution.resources import ResourceTuner
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="Node.js required")
+
+FAKE_OPENAPI_TS = """
+import fs from 'node:fs';
+import path from 'node:path';
+
+export async function createClient({ input, output }) {
+  console.log('noisy library output');
+  if (!fs.existsSync(input)) {
+    throw new Error(`missing input ${input}`);
+  }
+  fs.mkdirSync(output, { recursive: true });
+  fs.writeFileSync(path.join(output, 'index.ts'), `// ${process.pid}\\n`);
+}
+"""
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    """Create a project with a fake @hey-api/openapi-ts package."""
+    package_dir = tmp_path / "node_modules" / "@hey-api" / "openapi-ts"
+    package_dir.mkdir(parents=True)
+    (package_dir / "package.json").write_text(
+        json.dumps(
+            {
+                "name": "@hey-api/openapi-ts",
+                "version": "0.0.0-test",
+                "type": "module",
+                "exports": {".": {"import": {"default": "./index.js"}}},
+            }
+        )
+    )
+    (package_dir / "index.js").write_text(FAKE_OPENAPI_TS)
+    (tmp_path / "schema.yaml").write_text("openapi: 3.0.3\n")
+    return tmp_path
+
+
+# Stands in for npx: reports ready, starts a child like npx starts node and
+# never answers a job
+HUNG_WORKER = """
+import json, os, subprocess, sys
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(300)"])
+with open(sys.argv[1], "w") as f:
+    f.write(str(child.pid))
+print(json.dumps({"type": "ready", "version": "hung", "pid": os.getpid()}), flush=True)
+for line in sys.stdin:
+    pass
+child.wait()
+"""
+
+
+def process_running(pid: int) -> bool:
+    """Whether a process exists and is not a zombie waiting to be reaped."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+
+def make_worker(project_dir: Path) -> HeyAPINodeWorker:
+    return HeyAPINodeWorker(
+        cwd=project_dir, command=["node", str(WORKER_SCRIPT)], startup_timeout=30
+    )
+
+
+class TestHeyAPINodeWorker:
+    """Test the JSON-lines Node worker."""
+
+    def test_generates_many_zones_in_one_process(self, project_dir):
+        """Test that one Node process serves several zones."""
+        with make_worker(project_dir) as worker:
+            assert worker.version == "0.0.0-test"
+            for zone in ("alpha", "beta"):
+                success, error = worker.generate(
+                    project_dir / "schema.yaml", project_dir / "out" / zone
+                )
+                assert success, error
+
+        alpha = (project_dir / "out" / "alpha" / "index.ts").read_text()
+        beta = (project_dir / "out" / "beta" / "index.ts").read_text()
+        assert alpha == beta
+        assert not worker.alive
+
+    def test_job_error_keeps_worker_running(self, project_dir):
+        """Test that a failing job is reported and the worker stays usable."""
+        with make_worker(project_dir) as worker:
+            success, error = worker.generate(
+                project_dir / "missing.yaml", project_dir / "out" / "broken"
+            )
+            assert success is False
+            assert "missing input" in error
+            assert worker.alive
+
+            success, _ = worker.generate(
+                project_dir / "schema.yaml", project_dir / "out" / "ok"
+            )
+            assert success
+
+    def test_records_peak_rss(self, project_dir):
+        """Test that the worker's memory use becomes the TypeScript job size."""
+        tuner = ResourceTuner(cpu_count=2)
+        worker = HeyAPINodeWorker(
+            cwd=project_dir, command=["node", str(WORKER_SCRIPT)], tuner=tuner
+        )
+
+        with worker:
+            success, error = worker.generate(
+                project_dir / "schema.yaml", project_dir / "out" / "public"
+            )
+
+        assert success, error
+        assert tuner._job_rss["typescript"] > 0
+
+    @pytest.mark.skipif(not Path("/proc").exists(), reason="procfs required")
+    def test_timeout_kills_child_processes(self, tmp_path):
+        """Test that a timed-out job leaves no orphaned child behind."""
+        pid_file = tmp_path / "child.pid"
+        worker = HeyAPINodeWorker(
+            command=[sys.executable, "-c", HUNG_WORKER, str(pid_file)],
+            startup_timeout=30,
+        )
+
+        assert worker.start()
+        child_pid = int(pid_file.read_text())
+        assert process_running(child_pid)
+
+        success, error = worker.generate(
+            tmp_path / "schema.yaml", tmp_path / "out", timeout=1
+        )
+
+        assert success is False
+        assert "timed out" in error
+        deadline = time.monotonic() + 5
+        while process_running(child_pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not process_running(child_pid)
+
+    def test_start_fails_without_package(self, tmp_path):
+        """Test that a missing openapi-ts package is detected at startup."""
+        worker = make_worker(tmp_path)
+
+        assert worker.start() is False
+        assert not worker.alive
+
+
+class TestTypeScriptGeneratorWorker:
+    """Test worker usage and fallback in HeyAPITypeScriptGenerator."""
+
+    @pytest.fixture
+    def generator(self, tmp_path):
+        config = DjangoRevolutionSettings(
+            generators={"typescript": {"output_directory": str(tmp_path / "ts")}}
+        )
+        return HeyAPITypeScriptGenerator(config)
+
+    def test_fallback_to_npx(self, generator, tmp_path):
+        """Test that generation runs npx per zone when the worker cannot start."""
+        with patch.object(HeyAPINodeWorker, "start", return_value=False), patch(
+            "django_revolution.openapi.heyapi_ts.run_command",
+            return_value=(True, ""),
+        ) as mock_run_command:
+            success, _ = generator._run_openapi_ts(
+                tmp_path / "schema.yaml", tmp_path / "ts" / "public"
+            )
+            generator._run_openapi_ts(
+                tmp_path / "schema.yaml", tmp_path / "ts" / "private"
+            )
+
+        assert success
+        assert mock_run_command.call_count == 2
+        assert "@hey-api/openapi-ts" in mock_run_command.call_args[0][0]
+        assert mock_run_command.call_args[1]["stage"] == "typescript"
+
+    def test_worker_pool(self, project_dir, tmp_path):
+        """Test that concurrent zones get separate workers up to the TypeScript limit."""
+        config = DjangoRevolutionSettings(
+            generators={"typescript": {"output_directory": str(tmp_path / "ts")}}
+        )
+        generator = HeyAPITypeScriptGenerator(
+            config, scheduler=JobScheduler(4, {"typescript": 2})
+        )
+
+        with patch(
+            "django_revolution.openapi.heyapi_ts.HeyAPINodeWorker",
+            side_effect=lambda logger: make_worker(project_dir),
+        ):
+            first = generator._get_node_worker()
+            second = generator._get_node_worker()
+            assert first is not None and second is not None
+            assert first._process.pid != second._process.pid
+
+            # Pool exhausted: the zone runs npx
+            with patch(
+                "django_revolution.openapi.heyapi_ts.run_command",
+                return_value=(True, ""),
+            ) as mock_run_command:
+                success, _ = generator._run_openapi_ts(
+                    project_dir / "schema.yaml", project_dir / "out" / "third"
+                )
+            assert success
+            mock_run_command.assert_called_once()
+
+            # Released workers are reused
+            generator._release_node_worker(first)
+            assert generator._get_node_worker() is first
+            generator._release_node_worker(first)
+            generator._release_node_worker(second)
+
+        generator.close()
+        assert not first.alive and not second.alive
+
+    def test_npx_shards_fail_fast(self, generator, tmp_path):
+        """Test that npx runs the shards of a zone together and stops at a failure."""
+        generator.config.generators.typescript.use_node_worker = False
+        schema_path = tmp_path / "schema.yaml"
+        schema_path.write_text("openapi: 3.0.3\n")
+        runner = MagicMock()
+        runner.run_many.return_value = [
+            CommandResult(argv=[], returncode=1, stderr="users exploded"),
+            CommandResult(argv=[], cancelled=True, error="Cancelled"),
+        ]
+
+        with patch(
+            "django_revolution.openapi.heyapi_ts.get_command_runner",
+            return_value=runner,
+        ):
+            result = generator.generate_client(
+                "shop", schema_path, {"users": schema_path, "orders": schema_path}
+            )
+
+        assert not result.success
+        assert "shard users: users exploded" in result.error_message
+        jobs = runner.run_many.call_args[0][0]
+        assert [job.stage for job in jobs] == ["typescript", "typescript"]
+        assert runner.run_many.call_args[1]["fail_fast"] is True
+
+    def test_worker_disabled(self, generator):
+        """Test that the worker can be turned off."""
+        generator.config.generators.typescript.use_node_worker = False
+
+        assert generator._get_node_worker() is None
+
+    def test_is_available_cached(self, generator):
+        """Test that the npx version check runs only once."""
+        with patch(
+            "django_revolution.openapi.heyapi_ts.check_dependency", return_value=True
+        ) as mock_check:
+            assert generator.is_available()
+            assert generator.is_available()
+
+        assert mock_check.call_count == 1
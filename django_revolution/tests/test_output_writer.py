@@ -0,0 +1,113 @@
+"""
+Tests for Django Revolution write-if-changed output layer.
+"""
+
+import os
+import pytest
+from pathlib import Path
+
+from django_revolution.openapi.output_writer import (
+    MANIFEST_FILENAME,
+    OutputWriter,
+)
+
+
+def stage(writer: OutputWriter, target: Path, files: dict) -> Path:
+    """Create a staged tree with the given files."""
+    staging_dir = writer.prepare_staging(target)
+    for name, content in files.items():
+        path = staging_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return staging_dir
+
+
+def age(path: Path):
+    """Move a file's mtime into the past."""
+    os.utime(path, (1_000_000, 1_000_000))
+
+
+@pytest.fixture
+def writer():
+    return OutputWriter()
+
+
+class TestWriteText:
+    """Test single file writes."""
+
+    def test_unchanged_content_not_written(self, tmp_path, writer):
+        """Test that identical content keeps the file's mtime."""
+        path = tmp_path / "index.ts"
+        assert writer.write_text(path, "export {}")
+        age(path)
+
+        assert not writer.write_text(path, "export {}")
+        assert path.stat().st_mtime == 1_000_000
+        assert (writer.written, writer.unchanged) == (1, 1)
+
+    def test_changed_content_written(self, tmp_path, writer):
+        """Test that new content replaces the file."""
+        path = tmp_path / "index.ts"
+        writer.write_text(path, "export {}")
+
+        assert writer.write_text(path, "export { a }")
+        assert path.read_text() == "export { a }"
+
+
+class TestSyncTree:
+    """Test syncing staged trees into place."""
+
+    def test_only_changed_files_written(self, tmp_path, writer):
+        """Test that unchanged files keep their mtime and stale ones go."""
+        target = tmp_path / "clients" / "public"
+        writer.sync_tree(
+            stage(writer, target, {"a.ts": "a", "b.ts": "b", "old/c.ts": "c"}), target
+        )
+        for name in ("a.ts", "b.ts"):
+            age(target / name)
+
+        counts = writer.sync_tree(
+            stage(writer, target, {"a.ts": "a", "b.ts": "changed"}), target
+        )
+
+        assert counts == (1, 1, 1)
+        assert (target / "a.ts").stat().st_mtime == 1_000_000
+        assert (target / "b.ts").read_text() == "changed"
+        assert not (target / "old").exists()
+        assert not writer.staging_dir(target).exists()
+        assert not (tmp_path / "clients" / ".staging").exists()
+
+    def test_post_processed_files_stay_unchanged(self, tmp_path, writer):
+        """Test that files reformatted after syncing are not rewritten."""
+        target = tmp_path / "public"
+        writer.sync_tree(stage(writer, target, {"a.ts": "raw"}), target)
+        (target / "a.ts").write_text("formatted")
+        age(target / "a.ts")
+
+        counts = writer.sync_tree(stage(writer, target, {"a.ts": "raw"}), target)
+
+        assert counts == (0, 1, 0)
+        assert (target / "a.ts").read_text() == "formatted"
+
+    def test_modified_target_restored(self, tmp_path, writer):
+        """Test that manual edits to recorded output are overwritten."""
+        target = tmp_path / "public"
+        writer.sync_tree(stage(writer, target, {"a.ts": "raw"}), target)
+        (target / "a.ts").write_text("formatted")
+        writer.sync_tree(stage(writer, target, {"a.ts": "raw"}), target)
+
+        (target / "a.ts").write_text("edited by hand")
+        counts = writer.sync_tree(stage(writer, target, {"a.ts": "raw"}), target)
+
+        assert counts == (1, 0, 0)
+        assert (target / "a.ts").read_text() == "raw"
+
+    def test_manifest_not_treated_as_stale(self, tmp_path, writer):
+        """Test that the manifest survives syncs and tree removal counts."""
+        target = tmp_path / "public"
+        writer.sync_tree(stage(writer, target, {"a.ts": "a"}), target)
+
+        assert (target / MANIFEST_FILENAME).exists()
+        assert writer.sync_tree(stage(writer, target, {"a.ts": "a"}), target) == (0, 1, 0)
+        assert writer.remove_tree(target) == 1
+        assert writer.deleted == 1
@@ -0,0 +1,211 @@
+"""
+Tests for Django Revolution pipeline scheduler and streaming generation.
+"""
+
+import threading
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from django_revolution.config import DjangoRevolutionSettings, GenerationResult
+from django_revolution.openapi.generator import OpenAPIGenerator
+from django_revolution.openapi.pipeline import PipelineScheduler
+from django_revolution.zones import ZoneManager
+
+from test_schema_engine import make_urlconf
+
+
+class TestPipelineScheduler:
+    """Test the DAG scheduler."""
+
+    def test_dependencies_receive_results(self):
+        """Test that tasks get their dependencies' results in order."""
+        scheduler = PipelineScheduler(max_workers=4)
+        scheduler.add_task("a", lambda: 2)
+        scheduler.add_task("b", lambda: 3)
+        scheduler.add_task("c", lambda a, b: a * 10 + b, deps=["a", "b"])
+
+        results = scheduler.run()
+
+        assert results == {"a": 2, "b": 3, "c": 23}
+
+    def test_unknown_dependency_rejected(self):
+        """Test that dependencies must be added first."""
+        scheduler = PipelineScheduler()
+
+        with pytest.raises(ValueError):
+            scheduler.add_task("b", lambda a: a, deps=["a"])
+
+    def test_concurrency_limit(self):
+        """Test that no more than max_workers tasks run at once."""
+        scheduler = PipelineScheduler(max_workers=2)
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def task():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+        for i in range(6):
+            scheduler.add_task(f"t{i}", task)
+
+        scheduler.run()
+
+        assert max(peak) == 2
+
+    def test_downstream_tasks_first(self):
+        """Test that a zone's clients start before the next zone's schema."""
+        scheduler = PipelineScheduler(max_workers=1)
+        order = []
+
+        for zone in ("a", "b"):
+            scheduler.add_task(
+                f"schema:{zone}", lambda z=zone: order.append(f"schema:{z}")
+            )
+            scheduler.add_task(
+                f"client:{zone}",
+                lambda _, z=zone: order.append(f"client:{z}"),
+                deps=[f"schema:{zone}"],
+            )
+
+        scheduler.run()
+
+        assert order == ["schema:a", "client:a", "schema:b", "client:b"]
+
+    def test_failure_skips_dependents(self):
+        """Test that a failing task stops its downstream tasks only."""
+        scheduler = PipelineScheduler(max_workers=2)
+
+        def fail():
+            raise RuntimeError("boom")
+
+        scheduler.add_task("schema:a", fail)
+        scheduler.add_task("client:a", lambda s: s, deps=["schema:a"])
+        scheduler.add_task("schema:b", lambda: "ok")
+
+        results = scheduler.run()
+
+        assert scheduler.errors["schema:a"] == "boom"
+        assert scheduler.errors["client:a"] == "dependency failed: schema:a"
+        assert results == {"schema:b": "ok"}
+
+    def test_critical_path(self):
+        """Test that the critical path follows the slowest chain."""
+        scheduler = PipelineScheduler(max_workers=4)
+        scheduler.add_task("fast", lambda: None, stage="schema", zone_name="fast")
+        scheduler.add_task("slow", lambda: time.sleep(0.05), stage="schema")
+        scheduler.add_task("client", lambda _: time.sleep(0.01), deps=["slow"])
+
+        scheduler.run()
+        path = scheduler.critical_path()
+
+        assert [task.name for task in path] == ["slow", "client"]
+        assert path[0].duration_seconds >= 0.05
+        assert path[1].start_seconds >= path[0].duration_seconds
+
+
+class TestStreamingGeneration:
+    """Test the streaming per-zone pipeline in OpenAPIGenerator."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        return DjangoRevolutionSettings(
+            pipeline_mode="streaming",
+            zones={
+                "alpha": {"apps": ["tests.alpha"], "version": "v1"},
+                "beta": {"apps": ["tests.beta"], "version": "v1"},
+            },
+            output={"base_directory": str(tmp_path / "openapi")},
+            generators={
+                "typescript": {"output_directory": str(tmp_path / "ts")},
+                "python": {"output_directory": str(tmp_path / "py")},
+            },
+        )
+
+    def test_invalid_pipeline_mode_rejected(self):
+        """Test that unknown pipeline modes fail validation."""
+        with pytest.raises(ValueError):
+            DjangoRevolutionSettings(pipeline_mode="parallel")
+
+    def test_streaming_pipeline(self, config):
+        """Test that every zone flows through schema, clients and archive."""
+        generator = OpenAPIGenerator(config)
+
+        def fake_client(zone_name, schema_path):
+            assert Path(schema_path).exists()
+            return GenerationResult(
+                success=True,
+                zone_name=zone_name,
+                output_path=Path(schema_path).parent,
+                files_generated=1,
+            )
+
+        with patch.object(
+            ZoneManager, "create_dynamic_urlconf_module", return_value=make_urlconf()
+        ), patch.object(
+            generator, "validate_environment", return_value=True
+        ), patch.object(
+            generator.ts_generator, "generate_client", side_effect=fake_client
+        ), patch.object(
+            generator.python_generator, "generate_client", side_effect=fake_client
+        ), patch.object(
+            generator.archive_manager,
+            "archive_zone_clients",
+            return_value={"success": True},
+        ) as mock_archive:
+            summary = generator.generate_all()
+
+        assert set(summary.typescript_results) == {"alpha", "beta"}
+        assert set(summary.python_results) == {"alpha", "beta"}
+        assert summary.successful_typescript == 2
+        assert summary.successful_python == 2
+        assert mock_archive.call_count == 2
+
+        stages = [task.stage for task in summary.critical_path]
+        assert stages[0] == "schema"
+        assert stages[-1] == "archive"
+
+    def test_failed_typescript_zone_does_not_block_archives(self, config):
+        """Test that other zones are archived when one zone's TypeScript fails."""
+        generator = OpenAPIGenerator(config)
+
+        def fake_client(zone_name, schema_path):
+            return GenerationResult(
+                success=True,
+                zone_name=zone_name,
+                output_path=Path(schema_path).parent,
+                files_generated=1,
+            )
+
+        def failing_ts_client(zone_name, schema_path):
+            if zone_name == "alpha":
+                raise RuntimeError("hey-api crashed")
+            return fake_client(zone_name, schema_path)
+
+        with patch.object(
+            ZoneManager, "create_dynamic_urlconf_module", return_value=make_urlconf()
+        ), patch.object(
+            generator, "validate_environment", return_value=True
+        ), patch.object(
+            generator.ts_generator, "generate_client", side_effect=failing_ts_client
+        ), patch.object(
+            generator.python_generator, "generate_client", side_effect=fake_client
+        ), patch.object(
+            generator.ts_generator, "format_clients", return_value=True
+        ) as mock_format, patch.object(
+            generator.archive_manager,
+            "archive_zone_clients",
+            return_value={"success": True},
+        ) as mock_archive:
+            summary = generator.generate_all()
+
+        assert summary.typescript_results["alpha"].success is False
+        assert summary.successful_typescript == 1
+        assert [call.args[0] for call in mock_archive.call_args_list] == ["beta"]
+        assert [list(call.args[0]) for call in mock_format.call_args_list] == [["beta"]]
@@ -0,0 +1,243 @@
+"""
+Tests for Django Revolution batched Prettier formatting.
+"""
+
+import threading
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from django_revolution.command_runner import CommandResult
+from django_revolution.config import DjangoRevolutionSettings, GenerationResult
+from django_revolution.openapi import prettier
+from django_revolution.openapi.heyapi_ts import HeyAPITypeScriptGenerator
+from django_revolution.openapi.prettier import (
+    PrettierBatcher,
+    PrettierFormatter,
+    find_typescript_files,
+)
+
+
+class FakePrettier:
+    """Stands in for `npx prettier` and records every invocation."""
+
+    def __init__(self):
+        self.commands = []
+        self.fail_fast = []
+
+    def __call__(self, command, cwd=None, timeout=None, stage=""):
+        assert stage == "format"
+        assert command[-1] == "--version"
+        return True, "3.0.0\n"
+
+    def run_many(self, jobs, fail_fast=True):
+        self.fail_fast.append(fail_fast)
+        results = []
+        for job in jobs:
+            assert job.stage == "format"
+            self.commands.append(job.argv)
+            for path in job.argv[3:]:
+                file_path = Path(path)
+                file_path.write_text(file_path.read_text().strip() + ";\n")
+            results.append(CommandResult(argv=job.argv, returncode=0))
+        return results
+
+
+@pytest.fixture
+def fake_prettier():
+    fake = FakePrettier()
+    with patch("django_revolution.openapi.prettier.run_command", side_effect=fake), patch(
+        "django_revolution.openapi.prettier.get_command_runner", return_value=fake
+    ):
+        yield fake
+
+
+@pytest.fixture
+def zone_dirs(tmp_path):
+    dirs = []
+    for zone in ("public", "private"):
+        zone_dir = tmp_path / "ts" / zone
+        (zone_dir / "services").mkdir(parents=True)
+        (zone_dir / "index.ts").write_text("export {}")
+        (zone_dir / "services" / "api.ts").write_text("export const api = 1")
+        (zone_dir / "package.json").write_text("{}")
+        dirs.append(zone_dir)
+    return dirs
+
+
+class TestPrettierFormatter:
+    """Test batching and caching of Prettier runs."""
+
+    def test_find_typescript_files(self, zone_dirs):
+        """Test that only TypeScript files are collected."""
+        files = find_typescript_files(zone_dirs)
+
+        assert len(files) == 4
+        assert all(path.suffix == ".ts" for path in files)
+
+    def test_single_invocation_for_all_zones(self, tmp_path, zone_dirs, fake_prettier):
+        """Test that files of every zone are formatted in one run."""
+        formatter = PrettierFormatter(tmp_path / "ts")
+
+        success, formatted = formatter.format_files(find_typescript_files(zone_dirs))
+
+        assert success
+        assert formatted == 4
+        assert len(fake_prettier.commands) == 1
+
+    def test_unchanged_files_skipped(self, tmp_path, zone_dirs, fake_prettier):
+        """Test that already formatted files are not formatted again."""
+        files = find_typescript_files(zone_dirs)
+        PrettierFormatter(tmp_path / "ts").format_files(files)
+
+        (zone_dirs[0] / "index.ts").write_text("export { changed }")
+        success, formatted = PrettierFormatter(tmp_path / "ts").format_files(files)
+
+        assert success
+        assert formatted == 1
+        assert fake_prettier.commands[-1][3:] == [str(zone_dirs[0] / "index.ts")]
+
+    def test_config_change_invalidates_cache(self, tmp_path, zone_dirs, fake_prettier):
+        """Test that a different Prettier version reformats everything."""
+        files = find_typescript_files(zone_dirs)
+        PrettierFormatter(tmp_path / "ts").format_files(files)
+
+        formatter = PrettierFormatter(tmp_path / "ts")
+        formatter._available = True
+        formatter._version = "4.0.0"
+
+        assert formatter.format_files(files) == (True, 4)
+
+    def test_chunks_run_together(self, tmp_path, zone_dirs, fake_prettier, monkeypatch):
+        """Test that all chunks go to the runner in one batch that fails fast."""
+        monkeypatch.setattr(prettier, "MAX_COMMAND_LENGTH", 200)
+        files = find_typescript_files(zone_dirs)
+
+        success, formatted = PrettierFormatter(tmp_path / "ts").format_files(files)
+
+        assert success and formatted == 4
+        assert len(fake_prettier.commands) > 1
+        assert fake_prettier.fail_fast == [True]
+
+    def test_failed_chunk_not_cached(self, tmp_path, zone_dirs, fake_prettier, monkeypatch):
+        """Test that files of failed or cancelled chunks are formatted again."""
+        monkeypatch.setattr(prettier, "MAX_COMMAND_LENGTH", 200)
+        files = find_typescript_files(zone_dirs)
+        failing = [
+            CommandResult(argv=[], returncode=1),
+            *(CommandResult(argv=[], cancelled=True) for _ in range(len(files))),
+        ]
+
+        with patch.object(
+            fake_prettier, "run_many", side_effect=lambda jobs, fail_fast: failing[: len(jobs)]
+        ):
+            assert PrettierFormatter(tmp_path / "ts").format_files(files) == (False, 4)
+
+        assert PrettierFormatter(tmp_path / "ts").format_files(files) == (True, 4)
+
+    def test_chunks_respect_command_length(self, tmp_path, monkeypatch):
+        """Test that long file lists are split into several commands."""
+        monkeypatch.setattr(prettier, "MAX_COMMAND_LENGTH", 200)
+        formatter = PrettierFormatter(tmp_path)
+        files = [f"/very/long/path/to/generated/file_{i}.ts" for i in range(20)]
+
+        chunks = list(formatter._chunks(files))
+
+        assert len(chunks) > 1
+        assert [path for chunk in chunks for path in chunk] == files
+        for chunk in chunks:
+            command = formatter._base_command() + chunk
+            assert sum(len(arg) + 1 for arg in command) <= 200
+
+
+class TestPrettierBatcher:
+    """Test coalescing of concurrent format requests."""
+
+    def test_requests_during_a_run_share_the_next_batch(self, tmp_path):
+        """Test that zones finishing while Prettier runs are formatted together."""
+        started, release = threading.Event(), threading.Event()
+        batches = []
+
+        class SlowFormatter:
+            def format_files(self, files):
+                batches.append(files)
+                started.set()
+                release.wait(5)
+                return True, len(files)
+
+        batcher = PrettierBatcher(SlowFormatter())
+        files = [tmp_path / f"{zone}.ts" for zone in ("alpha", "beta", "gamma")]
+        results = {}
+
+        def request(path):
+            results[path.stem] = batcher.format_files([path])
+
+        first = threading.Thread(target=request, args=(files[0],))
+        first.start()
+        started.wait(5)
+        others = [threading.Thread(target=request, args=(path,)) for path in files[1:]]
+        for thread in others:
+            thread.start()
+        # Let both late requests join the open batch before the first run ends
+        while len(batcher._open.files if batcher._open else []) < 2:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in [first] + others:
+            thread.join(5)
+
+        assert batches == [[files[0]], files[1:]]
+        assert results == {"alpha": (True, 1), "beta": (True, 2), "gamma": (True, 2)}
+
+    def test_failed_run_reported_to_its_batch(self, tmp_path):
+        """Test that a formatter error fails the batch and frees the batcher."""
+
+        class BrokenFormatter:
+            calls = 0
+
+            def format_files(self, files):
+                self.calls += 1
+                if self.calls == 1:
+                    raise RuntimeError("prettier crashed")
+                return True, len(files)
+
+        batcher = PrettierBatcher(BrokenFormatter())
+
+        with pytest.raises(RuntimeError):
+            batcher.format_files([tmp_path / "alpha.ts"])
+        assert batcher.format_files([tmp_path / "beta.ts"]) == (True, 1)
+
+
+class TestFormatClients:
+    """Test the batched formatting stage of the TypeScript generator."""
+
+    @pytest.fixture
+    def generator(self, tmp_path):
+        config = DjangoRevolutionSettings(
+            generators={"typescript": {"output_directory": str(tmp_path / "ts")}}
+        )
+        return HeyAPITypeScriptGenerator(config)
+
+    def _results(self, zone_dirs, **kwargs):
+        return {
+            zone_dir.name: GenerationResult(
+                success=True, zone_name=zone_dir.name, output_path=zone_dir, **kwargs
+            )
+            for zone_dir in zone_dirs
+        }
+
+    def test_formats_successful_zones(self, generator, zone_dirs, fake_prettier):
+        """Test that all zones share one Prettier invocation."""
+        assert generator.format_clients(self._results(zone_dirs))
+        assert len(fake_prettier.commands) == 1
+
+    def test_skipped_zones_not_formatted(self, generator, zone_dirs, fake_prettier):
+        """Test that unchanged zones of incremental runs are left alone."""
+        assert generator.format_clients(self._results(zone_dirs, skipped=True))
+        assert fake_prettier.commands == []
+
+    def test_auto_format_disabled(self, generator, zone_dirs, fake_prettier):
+        """Test that formatting can be turned off."""
+        generator.config.generators.typescript.auto_format = False
+
+        assert generator.format_clients(self._results(zone_dirs))
+        assert fake_prettier.commands == []
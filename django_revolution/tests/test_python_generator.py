@@ -0,0 +1,149 @@
+"""
+Tests for Django Revolution in-process Python client generation.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from django_revolution.command_runner import CommandResult
+from django_revolution.config import DjangoRevolutionSettings
+from django_revolution.generators import ModernPythonGenerator
+from django_revolution.generators.code_fixer import CodeFixReport
+from django_revolution.openapi.job_scheduler import JobScheduler
+from django_revolution.openapi.python_client import PythonClientGenerator
+
+
+def fake_generation(zone_name, schema_path, zone_output_dir, schema=None):
+    """Write a minimal client like openapi-python-client would."""
+    package_dir = zone_output_dir / f"django_revolution_{zone_name}"
+    package_dir.mkdir(parents=True, exist_ok=True)
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "client.py").write_text("class Client: ...\n")
+    return True, ""
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / "public.json"
+    path.write_text('{"openapi": "3.0.3", "info": {"title": "t", "version": "1"}, "paths": {}}')
+    return path
+
+
+@pytest.fixture
+def generator(tmp_path):
+    config = DjangoRevolutionSettings(
+        generators={"python": {"output_directory": str(tmp_path / "python")}}
+    )
+    generator = ModernPythonGenerator(config)
+    # Post-processing is covered elsewhere and needs ruff/black
+    with patch.object(generator, "_format_python_files"), patch.object(
+        generator, "_enhance_client"
+    ):
+        yield generator
+
+
+class TestInProcessGeneration:
+    """Test choosing between the library API and the CLI."""
+
+    def test_in_process_skips_cli(self, generator, schema_path):
+        """Test that no subprocess is started when the library is importable."""
+        generator._in_process_available = True
+
+        with patch.object(
+            generator, "_generate_in_process", side_effect=fake_generation
+        ) as mock_in_process, patch(
+            "django_revolution.generators.modern_generator.get_command_runner"
+        ) as mock_runner:
+            result = generator.generate_client("public", schema_path)
+
+        assert result.success, result.error_message
+        assert result.files_generated == 2
+        mock_in_process.assert_called_once()
+        mock_runner.return_value.run.assert_not_called()
+
+    def test_parsed_schema_passed_through(self, tmp_path, schema_path):
+        """Test that an already parsed schema reaches the library call."""
+        config = DjangoRevolutionSettings(
+            generators={"python": {"output_directory": str(tmp_path / "python")}}
+        )
+        client_generator = PythonClientGenerator(config)
+        client_generator._generator._in_process_available = True
+        schema = {"openapi": "3.0.3", "paths": {}}
+
+        with patch.object(
+            client_generator._generator,
+            "_generate_in_process",
+            return_value=(False, "boom"),
+        ) as mock_in_process:
+            result = client_generator.generate_client("public", schema_path, schema)
+
+        assert not result.success
+        assert "boom" in result.error_message
+        assert mock_in_process.call_args[0][3] is schema
+
+    def test_cli_used_when_disabled(self, generator, schema_path):
+        """Test that in_process=False keeps using the CLI."""
+        generator.config.generators.python.in_process = False
+        generator._command = ["openapi-python-client"]
+        generator._command_probed = True
+
+        with patch.object(generator, "_generate_in_process") as mock_in_process, patch(
+            "django_revolution.generators.modern_generator.get_command_runner"
+        ) as mock_runner:
+            mock_runner.return_value.run.return_value = CommandResult(
+                argv=["openapi-python-client"], returncode=1, stderr="cli failed"
+            )
+            result = generator.generate_client("public", schema_path)
+
+        assert not result.success
+        assert "cli failed" in result.error_message
+        mock_in_process.assert_not_called()
+        assert "--config" in mock_runner.return_value.run.call_args[0][0]
+
+    def test_cli_command_probed_once(self, generator):
+        """Test that the CLI lookup is not repeated for every zone."""
+        with patch(
+            "django_revolution.generators.modern_generator.get_command_runner"
+        ) as mock_runner:
+            mock_runner.return_value.run.return_value = CommandResult(
+                argv=["openapi-python-client", "--version"], returncode=0
+            )
+            assert generator._get_command() == ["openapi-python-client"]
+            assert generator._get_command() == ["openapi-python-client"]
+
+        assert mock_runner.return_value.run.call_count == 1
+
+    def test_client_config(self, generator):
+        """Test the per-zone settings shared by both modes."""
+        config = generator._client_config("public")
+
+        assert config["package_name_override"] == "django_revolution_public"
+        assert config["client_class_name"] == "PublicClient"
+        assert config["post_hooks"] == []
+
+
+class TestCodeFixerWorkers:
+    """Test sizing of the code fixer's process pool."""
+
+    def test_fixer_shares_scheduler_budget(self, tmp_path):
+        """Test that concurrent Python jobs split the global worker budget."""
+        scheduler = JobScheduler(max_workers=8, stage_limits={"python": 3})
+        generator = ModernPythonGenerator(scheduler=scheduler)
+
+        with patch(
+            "django_revolution.generators.modern_generator.fix_generated_code",
+            return_value=CodeFixReport(),
+        ) as mock_fix:
+            generator._fix_generated_code_bugs(tmp_path)
+
+        mock_fix.assert_called_once_with(tmp_path, 2)
+
+    def test_fixer_defaults_without_scheduler(self, tmp_path):
+        """Test that a standalone generator leaves sizing to the fixer."""
+        with patch(
+            "django_revolution.generators.modern_generator.fix_generated_code",
+            return_value=CodeFixReport(),
+        ) as mock_fix:
+            ModernPythonGenerator()._fix_generated_code_bugs(tmp_path)
+
+        mock_fix.assert_called_once_with(tmp_path, None)
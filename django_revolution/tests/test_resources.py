@@ -0,0 +1,140 @@
+"""
+Tests for Django Revolution adaptive worker tuning.
+"""
+
+import os
+import sys
+import pytest
+from unittest.mock import patch
+
+from django_revolution import resources
+from django_revolution.command_runner import CommandJob, CommandRunner
+from django_revolution.config import DjangoRevolutionSettings
+from django_revolution.resources import (
+    MB,
+    ResourceTuner,
+    available_memory_bytes,
+    process_rss_bytes,
+)
+
+requires_proc = pytest.mark.skipif(
+    not os.path.exists("/proc/self/status"), reason="/proc required"
+)
+
+
+class TestResourceTuner:
+    """Test per-stage worker sizing."""
+
+    def test_fixed_max_workers(self):
+        """Test that a configured number is only capped by the job count."""
+        tuner = ResourceTuner(cpu_count=4)
+
+        assert tuner.stage_workers("typescript", 10, 20) == 10
+        assert tuner.stage_workers("typescript", 30, 20) == 20
+
+    def test_auto_limited_by_cpus(self):
+        """Test that auto mode never starts more workers than CPUs."""
+        tuner = ResourceTuner(cpu_count=4)
+
+        with patch.object(resources, "available_memory_bytes", return_value=64 * 1024 * MB):
+            assert tuner.stage_workers("typescript", 20) == 4
+            assert tuner.stage_workers("typescript", 2) == 2
+
+    def test_auto_limited_by_memory(self):
+        """Test that auto mode fits the expected job RSS into free memory."""
+        tuner = ResourceTuner(cpu_count=16, headroom_bytes=512 * MB)
+        tuner.record("typescript", 500 * MB)
+
+        with patch.object(resources, "available_memory_bytes", return_value=2048 * MB):
+            assert tuner.stage_workers("typescript", 20) == 3
+
+        with patch.object(resources, "available_memory_bytes", return_value=600 * MB):
+            assert tuner.stage_workers("typescript", 20) == 1
+
+    def test_composite_stage_uses_heaviest_job(self):
+        """Test that mixed client stages plan for the larger client kind."""
+        tuner = ResourceTuner(cpu_count=2)
+        tuner.record("typescript", 100 * MB)
+        tuner.record("python", 300 * MB)
+
+        assert tuner.job_rss("client") == 300 * MB
+
+    def test_has_headroom(self):
+        """Test the launch throttle threshold."""
+        tuner = ResourceTuner(cpu_count=2, headroom_bytes=512 * MB)
+        tuner.record("python", 256 * MB)
+
+        with patch.object(resources, "available_memory_bytes", return_value=1024 * MB):
+            assert tuner.has_headroom("python")
+        with patch.object(resources, "available_memory_bytes", return_value=700 * MB):
+            assert not tuner.has_headroom("python")
+        with patch.object(resources, "available_memory_bytes", return_value=None):
+            assert tuner.has_headroom("python")
+
+
+@requires_proc
+class TestMeasurement:
+    """Test memory measurement through /proc."""
+
+    def test_available_memory(self):
+        """Test that free memory can be read."""
+        assert available_memory_bytes() > 0
+
+    def test_process_rss(self):
+        """Test that the RSS of the current process is measured."""
+        assert process_rss_bytes(os.getpid()) > 10 * MB
+
+    def test_runner_records_peak_rss(self):
+        """Test that the command runner reports job RSS to the tuner."""
+        tuner = ResourceTuner(cpu_count=2)
+        runner = CommandRunner(tuner=tuner)
+
+        result = runner.run(
+            [sys.executable, "-c", "data = bytearray(64 * 1024 * 1024); import time; time.sleep(0.6)"],
+            stage="python",
+        )
+
+        assert result.success
+        assert result.peak_rss_bytes > 64 * MB
+        assert tuner.job_rss("python") == result.peak_rss_bytes
+
+
+class TestLaunchThrottle:
+    """Test that launches wait while memory is low."""
+
+    def test_waits_for_running_job(self):
+        """Test that a second job starts only after the first finished."""
+        tuner = ResourceTuner(cpu_count=2)
+        runner = CommandRunner(max_concurrency=2, tuner=tuner)
+        code = "import time; print(time.monotonic()); time.sleep(0.5); print(time.monotonic())"
+
+        with patch.object(tuner, "has_headroom", return_value=False):
+            results = runner.run_many(
+                [
+                    CommandJob(argv=[sys.executable, "-c", code]),
+                    CommandJob(argv=[sys.executable, "-c", code]),
+                ]
+            )
+
+        first_end = float(results[0].stdout.split()[1])
+        second_start = float(results[1].stdout.split()[0])
+        assert second_start >= first_end
+
+
+class TestMaxWorkersSetting:
+    """Test the max_workers setting."""
+
+    def test_auto(self):
+        """Test that 'auto' is accepted in any case."""
+        assert DjangoRevolutionSettings(max_workers="AUTO").max_workers == "auto"
+
+    def test_numeric_string(self):
+        """Test that numbers given as strings are converted."""
+        assert DjangoRevolutionSettings(max_workers="8").max_workers == 8
+
+    def test_invalid(self):
+        """Test that other values are rejected."""
+        with pytest.raises(ValueError):
+            DjangoRevolutionSettings(max_workers="many")
+        with pytest.raises(ValueError):
+            DjangoRevolutionSettings(max_workers=0)
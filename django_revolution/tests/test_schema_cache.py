@@ -0,0 +1,131 @@
+"""
+Tests for Django Revolution schema cache.
+"""
+
+import importlib
+import sys
+import pytest
+
+from django_revolution.config import DjangoRevolutionSettings, ZoneModel
+from django_revolution.openapi.schema_cache import SchemaCache
+
+
+class TestSchemaCache:
+    """Test content-addressed schema caching."""
+
+    @pytest.fixture
+    def app_dir(self, tmp_path, monkeypatch):
+        """Create an importable app package with the fingerprinted modules."""
+        app_dir = tmp_path / "src" / "cache_sample_app"
+        app_dir.mkdir(parents=True)
+        (app_dir / "__init__.py").write_text("")
+        (app_dir / "urls.py").write_text("urlpatterns = []\n")
+        (app_dir / "views.py").write_text("# views\n")
+        (app_dir / "serializers").mkdir()
+        (app_dir / "serializers" / "__init__.py").write_text("")
+        (app_dir / "serializers" / "user.py").write_text("# user serializer\n")
+
+        monkeypatch.syspath_prepend(str(tmp_path / "src"))
+        importlib.invalidate_caches()
+        yield app_dir
+
+        # Each test builds the package in its own tmp_path
+        for name in list(sys.modules):
+            if name.startswith("cache_sample_app"):
+                del sys.modules[name]
+
+    @pytest.fixture
+    def zone(self):
+        return ZoneModel(name="sample", apps=["cache_sample_app"], version="v1")
+
+    @pytest.fixture
+    def schemas_dir(self, tmp_path):
+        schemas_dir = tmp_path / "schemas"
+        schemas_dir.mkdir()
+        (schemas_dir / "sample.yaml").write_text("openapi: 3.0.3\n")
+        return schemas_dir
+
+    def _store(self, config, schemas_dir, zone):
+        cache = SchemaCache(config, schemas_dir)
+        cache.store("sample", zone, schemas_dir / "sample.yaml")
+        cache.save()
+
+    def test_hit_for_unchanged_inputs(self, app_dir, zone, schemas_dir):
+        """Test that unchanged inputs reuse the stored schema."""
+        config = DjangoRevolutionSettings()
+        self._store(config, schemas_dir, zone)
+
+        cache = SchemaCache(config, schemas_dir)
+        assert cache.lookup("sample", zone) == schemas_dir / "sample.yaml"
+        assert cache.hits == ["sample"]
+        assert cache.misses == []
+
+    def test_miss_on_source_change(self, app_dir, zone, schemas_dir):
+        """Test that editing an app module invalidates the zone."""
+        config = DjangoRevolutionSettings()
+        self._store(config, schemas_dir, zone)
+
+        (app_dir / "serializers" / "user.py").write_text("# changed\n")
+
+        cache = SchemaCache(config, schemas_dir)
+        assert cache.lookup("sample", zone) is None
+        assert cache.misses == ["sample"]
+
+    def test_miss_on_zone_config_change(self, app_dir, zone, schemas_dir):
+        """Test that changing the ZoneModel invalidates the zone."""
+        config = DjangoRevolutionSettings()
+        self._store(config, schemas_dir, zone)
+
+        changed_zone = ZoneModel(name="sample", apps=["cache_sample_app"], version="v2")
+
+        cache = SchemaCache(config, schemas_dir)
+        assert cache.lookup("sample", changed_zone) is None
+
+    def test_miss_on_schema_file_change(self, app_dir, zone, schemas_dir):
+        """Test that a modified schema file is not trusted."""
+        config = DjangoRevolutionSettings()
+        self._store(config, schemas_dir, zone)
+
+        (schemas_dir / "sample.yaml").write_text("openapi: 3.1.0\n")
+
+        cache = SchemaCache(config, schemas_dir)
+        assert cache.lookup("sample", zone) is None
+
+    def test_miss_on_api_prefix_change(self, app_dir, zone, schemas_dir):
+        """Test that shared settings are part of the fingerprint."""
+        self._store(DjangoRevolutionSettings(), schemas_dir, zone)
+
+        cache = SchemaCache(DjangoRevolutionSettings(api_prefix="v2"), schemas_dir)
+        assert cache.lookup("sample", zone) is None
+
+    def test_invalidate(self, app_dir, zone, schemas_dir):
+        """Test dropping cache entries."""
+        config = DjangoRevolutionSettings()
+        self._store(config, schemas_dir, zone)
+
+        cache = SchemaCache(config, schemas_dir)
+        cache.invalidate("sample")
+        assert cache.lookup("sample", zone) is None
+
+
+class TestCleanOutputKeepsSchemas:
+    """Test that cached schemas survive output cleaning."""
+
+    def test_clean_output_keep_schemas(self, tmp_path):
+        from django_revolution.openapi.generator import OpenAPIGenerator
+
+        config = DjangoRevolutionSettings(
+            output={"base_directory": str(tmp_path / "openapi")}
+        )
+        generator = OpenAPIGenerator(config)
+        schema_file = generator.output_dir / "schemas" / "public.yaml"
+        schema_file.write_text("openapi: 3.0.3\n")
+        stale_file = generator.output_dir / "clients" / "stale.txt"
+        stale_file.write_text("stale")
+
+        assert generator.clean_output(keep_schemas=True)
+        assert schema_file.exists()
+        assert not stale_file.exists()
+
+        assert generator.clean_output()
+        assert not schema_file.exists()
@@ -0,0 +1,184 @@
+"""
+Tests for Django Revolution schema diffs and incremental generation.
+"""
+
+import copy
+import pytest
+import yaml
+
+from django_revolution.config import DjangoRevolutionSettings, GenerationResult
+from django_revolution.openapi.generator import OpenAPIGenerator
+from django_revolution.openapi.schema_diff import diff_schemas
+from django_revolution.openapi.schema_io import load_schema
+
+BASE_SCHEMA = {
+    "openapi": "3.0.3",
+    "info": {"title": "Public API", "version": "v1"},
+    "paths": {
+        "/api/posts/": {
+            "get": {"operationId": "posts_list", "responses": {"200": {}}},
+            "post": {"operationId": "posts_create", "responses": {"201": {}}},
+        }
+    },
+    "components": {
+        "schemas": {
+            "Post": {"type": "object", "properties": {"title": {"type": "string"}}}
+        }
+    },
+}
+
+
+class TestSchemaDiff:
+    """Test structural schema comparison."""
+
+    def test_identical_schemas(self):
+        """Test that key order does not count as a change."""
+        reordered = yaml.safe_load(yaml.safe_dump(BASE_SCHEMA, sort_keys=True))
+
+        diff = diff_schemas(BASE_SCHEMA, reordered)
+
+        assert not diff.has_changes
+        assert diff.describe() == "no changes"
+
+    def test_operation_changes(self):
+        """Test added, removed and changed operations."""
+        new_schema = copy.deepcopy(BASE_SCHEMA)
+        paths = new_schema["paths"]
+        del paths["/api/posts/"]["post"]
+        paths["/api/posts/"]["get"]["parameters"] = [{"name": "page", "in": "query"}]
+        paths["/api/posts/{id}/"] = {"delete": {"operationId": "posts_destroy"}}
+
+        diff = diff_schemas(BASE_SCHEMA, new_schema)
+
+        assert diff.added_operations == ["DELETE /api/posts/{id}/"]
+        assert diff.removed_operations == ["POST /api/posts/"]
+        assert diff.changed_operations == ["GET /api/posts/"]
+        assert diff.has_changes
+
+    def test_component_changes(self):
+        """Test changed and added components."""
+        new_schema = copy.deepcopy(BASE_SCHEMA)
+        schemas = new_schema["components"]["schemas"]
+        schemas["Post"]["properties"]["body"] = {"type": "string"}
+        schemas["Comment"] = {"type": "object"}
+
+        diff = diff_schemas(BASE_SCHEMA, new_schema)
+
+        assert diff.added_components == ["schemas/Comment"]
+        assert diff.changed_components == ["schemas/Post"]
+        assert diff.added_operations == []
+
+    def test_metadata_change(self):
+        """Test that top-level changes are detected."""
+        new_schema = copy.deepcopy(BASE_SCHEMA)
+        new_schema["info"]["version"] = "v2"
+
+        assert diff_schemas(BASE_SCHEMA, new_schema).metadata_changed
+
+    def test_no_previous_schema(self):
+        """Test that everything is new without a previous schema."""
+        diff = diff_schemas(None, BASE_SCHEMA)
+
+        assert diff.added_operations == ["GET /api/posts/", "POST /api/posts/"]
+        assert diff.added_components == ["schemas/Post"]
+
+    def test_load_schema(self, tmp_path):
+        """Test loading YAML and JSON schema files."""
+        import json
+
+        yaml_file = tmp_path / "zone.yaml"
+        yaml_file.write_text(yaml.safe_dump(BASE_SCHEMA))
+        json_file = tmp_path / "zone.json"
+        json_file.write_text(json.dumps(BASE_SCHEMA))
+
+        assert load_schema(yaml_file) == BASE_SCHEMA
+        assert load_schema(json_file) == BASE_SCHEMA
+
+
+class TestIncrementalSelection:
+    """Test selection of zones that need new clients."""
+
+    @pytest.fixture
+    def generator(self, tmp_path):
+        config = DjangoRevolutionSettings(
+            incremental=True,
+            output={"base_directory": str(tmp_path / "openapi")},
+            generators={
+                "typescript": {"output_directory": str(tmp_path / "ts")},
+                "python": {"output_directory": str(tmp_path / "py")},
+            },
+        )
+        return OpenAPIGenerator(config)
+
+    def _write_schema(self, generator, zone_name, schema):
+        schema_file = (
+            generator.output_dir
+            / generator.config.output.schemas_directory
+            / f"{zone_name}.yaml"
+        )
+        schema_file.write_text(yaml.safe_dump(schema, sort_keys=False))
+        return schema_file
+
+    def _build(self, generator, schemas):
+        """Pretend clients were generated successfully for the schemas."""
+        results = {}
+        for zone_name in schemas:
+            for client_dir in generator._zone_client_dirs(zone_name):
+                client_dir.mkdir(parents=True, exist_ok=True)
+            results[zone_name] = GenerationResult(
+                success=True, zone_name=zone_name, output_path=client_dir
+            )
+        generator._record_built_schemas(schemas, results, results)
+
+    def test_first_run_selects_all(self, generator):
+        """Test that zones without a previous build are regenerated."""
+        schemas = {"public": self._write_schema(generator, "public", BASE_SCHEMA)}
+
+        assert generator.select_changed_zones(schemas) == schemas
+
+    def test_only_changed_zones_selected(self, generator):
+        """Test that zones with identical operations and components are skipped."""
+        schemas = {
+            "public": self._write_schema(generator, "public", BASE_SCHEMA),
+            "private": self._write_schema(generator, "private", BASE_SCHEMA),
+        }
+        self._build(generator, schemas)
+
+        # Same content in a different key order is not a change
+        reordered = yaml.safe_load(yaml.safe_dump(BASE_SCHEMA, sort_keys=True))
+        self._write_schema(generator, "public", reordered)
+        changed_schema = copy.deepcopy(BASE_SCHEMA)
+        changed_schema["components"]["schemas"]["Post"]["required"] = ["title"]
+        self._write_schema(generator, "private", changed_schema)
+
+        assert list(generator.select_changed_zones(schemas)) == ["private"]
+
+    def test_missing_client_output_selected(self, generator, tmp_path):
+        """Test that a deleted client directory forces regeneration."""
+        schemas = {"public": self._write_schema(generator, "public", BASE_SCHEMA)}
+        self._build(generator, schemas)
+
+        (tmp_path / "py" / "public").rmdir()
+
+        assert list(generator.select_changed_zones(schemas)) == ["public"]
+
+    def test_generator_settings_change_selects_all(self, generator):
+        """Test that changed generator settings rebuild every client."""
+        schemas = {"public": self._write_schema(generator, "public", BASE_SCHEMA)}
+        self._build(generator, schemas)
+
+        generator.config.version = "2.0.0"
+
+        assert list(generator.select_changed_zones(schemas)) == ["public"]
+
+    def test_failed_build_not_recorded(self, generator):
+        """Test that zones with failed clients are retried on the next run."""
+        schemas = {"public": self._write_schema(generator, "public", BASE_SCHEMA)}
+        failed = {
+            "public": GenerationResult(
+                success=False, zone_name="public", output_path=generator.output_dir
+            )
+        }
+        generator._record_built_schemas(schemas, failed, failed)
+
+        assert list(generator.select_changed_zones(schemas)) == ["public"]
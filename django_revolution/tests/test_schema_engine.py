@@ -0,0 +1,244 @@
+"""
+Tests for Django Revolution schema engines and worker pool.
+"""
+
+import time
+import types
+import pytest
+import yaml
+from unittest.mock import patch
+
+from django.urls import path
+from rest_framework import serializers
+from rest_framework.generics import RetrieveAPIView
+from drf_spectacular.openapi import AutoSchema
+
+from django_revolution.config import DjangoRevolutionSettings
+from django_revolution.zones import ZoneManager
+from django_revolution.openapi.generator import OpenAPIGenerator
+from django_revolution.openapi.schema_engine import (
+    build_schema,
+    generate_schema_in_process,
+    is_inprocess_available,
+)
+from django_revolution.openapi.worker_pool import SchemaWorkerPool
+
+
+def fork_workers():
+    """Fork pool workers so they inherit mocks patched in the test."""
+    return patch("django_revolution.openapi.worker_pool.START_METHOD", "fork")
+
+
+class PingSerializer(serializers.Serializer):
+    message = serializers.CharField()
+
+
+class PingView(RetrieveAPIView):
+    serializer_class = PingSerializer
+    schema = AutoSchema()
+
+
+def make_urlconf(name: str = "test_engine_urls") -> types.ModuleType:
+    """Create an in-memory URLconf module with a single endpoint."""
+    module = types.ModuleType(name)
+    module.urlpatterns = [path("api/ping/", PingView.as_view())]
+    return module
+
+
+class TestSchemaEngine:
+    """Test in-process schema generation."""
+
+    def test_inprocess_available(self):
+        """Test that Django booted by conftest is usable in-process."""
+        assert is_inprocess_available() is True
+
+    def test_build_schema(self):
+        """Test schema building against an in-memory URLconf."""
+        schema = build_schema(make_urlconf(), "v1")
+
+        assert schema["openapi"].startswith("3.")
+        assert "/api/ping/" in schema["paths"]
+        assert "Ping" in schema["components"]["schemas"]
+
+    def test_generate_schema_file(self, tmp_path):
+        """Test that the rendered schema is written as YAML."""
+        schema_file = tmp_path / "schemas" / "ping.yaml"
+
+        success, error = generate_schema_in_process(make_urlconf(), "v1", schema_file)
+
+        assert success is True
+        assert error == ""
+        with open(schema_file) as f:
+            schema = yaml.safe_load(f)
+        assert "/api/ping/" in schema["paths"]
+
+    def test_generate_schema_failure(self, tmp_path):
+        """Test that generation errors are reported instead of raised."""
+        broken = types.ModuleType("broken_urls")
+        broken.urlpatterns = None
+
+        success, error = generate_schema_in_process(
+            broken, "v1", tmp_path / "broken.yaml"
+        )
+
+        assert success is False
+        assert error
+
+
+class TestGeneratorSchemaEngine:
+    """Test schema engine selection in OpenAPIGenerator."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        return DjangoRevolutionSettings(
+            zones={"ping": {"apps": ["tests"], "version": "v1"}},
+            output={"base_directory": str(tmp_path / "openapi")},
+        )
+
+    def test_invalid_engine_rejected(self):
+        """Test that unknown engines fail validation."""
+        with pytest.raises(ValueError):
+            DjangoRevolutionSettings(schema_engine="threads")
+
+    def test_inprocess_generation(self, config):
+        """Test that generate_schemas uses the in-process engine."""
+        generator = OpenAPIGenerator(config)
+
+        with patch.object(
+            generator.zone_manager,
+            "create_dynamic_urlconf_module",
+            return_value=make_urlconf("ping_zone_urls"),
+        ), patch("django_revolution.openapi.generator.run_command") as mock_run_command:
+            schemas = generator.generate_schemas()
+
+        assert set(schemas) == {"ping"}
+        assert schemas["ping"].exists()
+        mock_run_command.assert_not_called()
+
+    def test_fallback_to_subprocess(self, config):
+        """Test fallback when Django is not usable in-process."""
+        generator = OpenAPIGenerator(config)
+
+        with patch(
+            "django_revolution.openapi.generator.is_inprocess_available",
+            return_value=False,
+        ):
+            assert generator._resolve_schema_engine() == "subprocess"
+
+
+class TestSchemaWorkerPool:
+    """Test the warm schema worker pool."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        return DjangoRevolutionSettings(
+            schema_engine="pool",
+            zones={
+                "alpha": {"apps": ["tests.alpha"], "version": "v1"},
+                "beta": {"apps": ["tests.beta"], "version": "v1"},
+                "gamma": {"apps": ["tests.gamma"], "version": "v1"},
+            },
+            output={"base_directory": str(tmp_path / "openapi")},
+        )
+
+    def test_pool_reuses_workers(self, config, tmp_path):
+        """Test that two workers serve three zones and report utilization."""
+        zones = config.get_zones()
+        jobs = {name: (zone, tmp_path / f"{name}.yaml") for name, zone in zones.items()}
+
+        # Forked workers inherit the patched in-memory URLconf
+        with patch.object(
+            ZoneManager, "create_dynamic_urlconf_module", return_value=make_urlconf()
+        ), fork_workers():
+            with SchemaWorkerPool(config, size=2) as pool:
+                results = pool.generate(jobs)
+            stats = pool.get_stats()
+
+        assert all(success for success, _ in results.values())
+        assert all(path.exists() for _, path in jobs.values())
+        assert len(stats) == 2
+        assert sum(worker.jobs for worker in stats) == 3
+        assert all(0.0 <= worker.utilization <= 1.0 for worker in stats)
+
+    def test_spawned_workers_boot_django(self, config):
+        """Test that workers started with spawn set up Django themselves."""
+        pool = SchemaWorkerPool(config, size=1)
+        assert pool._context.get_start_method() == "spawn"
+
+        try:
+            assert pool.start()
+        finally:
+            pool.close()
+
+    def test_hung_worker_replaced(self, config, tmp_path):
+        """Test that a worker exceeding the job timeout is killed and replaced."""
+        zones = config.get_zones()
+        jobs = {name: (zone, tmp_path / f"{name}.yaml") for name, zone in zones.items()}
+
+        def generate(urlconf, version, schema_file, logger, path_prefix=None):
+            if schema_file.stem == "alpha":
+                time.sleep(30)
+            schema_file.write_text("openapi: 3.0.3\n")
+            return True, ""
+
+        with patch.object(
+            ZoneManager, "create_dynamic_urlconf_module", return_value=make_urlconf()
+        ), patch(
+            "django_revolution.openapi.schema_engine.generate_schema_in_process",
+            side_effect=generate,
+        ), fork_workers():
+            with SchemaWorkerPool(config, size=1, job_timeout=1) as pool:
+                results = pool.generate(jobs)
+            stats = pool.get_stats()
+
+        assert results["alpha"][0] is False
+        assert "timed out" in results["alpha"][1]
+        assert results["beta"] == (True, "") and results["gamma"] == (True, "")
+        assert len(stats) == 2
+
+    def test_failed_respawn_keeps_job_result(self, config, tmp_path):
+        """Test that a replacement failing to start does not mask the job result."""
+        zone = config.get_zones()["alpha"]
+
+        def generate(urlconf, version, schema_file, logger, path_prefix=None):
+            time.sleep(30)
+            return True, ""
+
+        with patch.object(
+            ZoneManager, "create_dynamic_urlconf_module", return_value=make_urlconf()
+        ), patch(
+            "django_revolution.openapi.schema_engine.generate_schema_in_process",
+            side_effect=generate,
+        ), fork_workers():
+            with SchemaWorkerPool(config, size=1, job_timeout=1) as pool:
+                with patch.object(pool, "_spawn", side_effect=OSError("no fds")):
+                    success, error = pool.generate_one(
+                        "alpha", zone, tmp_path / "alpha.yaml"
+                    )
+                    pool.close()
+
+        assert success is False
+        assert "timed out" in error
+        assert len(pool.get_stats()) == 1
+
+    def test_generator_reports_worker_stats(self, config):
+        """Test that generate_schemas exposes pool utilization."""
+        generator = OpenAPIGenerator(config)
+        generator.stage_recorder.reset()
+
+        with patch.object(
+            ZoneManager, "create_dynamic_urlconf_module", return_value=make_urlconf()
+        ), fork_workers():
+            schemas = generator.generate_schemas()
+
+        assert set(schemas) == {"alpha", "beta", "gamma"}
+        assert generator.schema_worker_stats
+        assert sum(w.jobs for w in generator.schema_worker_stats) == 3
+        schema_timings = [
+            timing
+            for timing in generator.stage_recorder.get_timings()
+            if timing.stage == "schema"
+        ]
+        assert [timing.zone_name for timing in schema_timings] == ["alpha", "beta", "gamma"]
+        assert all(timing.duration_seconds > 0 for timing in schema_timings)
+        assert all(timing.files == 1 for timing in schema_timings)
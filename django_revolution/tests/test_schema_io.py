@@ -0,0 +1,201 @@
+"""
+Tests for Django Revolution schema I/O.
+"""
+
+import json
+import pytest
+import yaml
+from unittest.mock import patch
+
+from django_revolution.config import DjangoRevolutionSettings
+from django_revolution.openapi.generator import OpenAPIGenerator
+from django_revolution.openapi.schema_io import (
+    ParsedSchemaCache,
+    SafeLoader,
+    dump_schema,
+    get_parsed_schema_cache,
+    load_schema,
+    write_schema,
+)
+
+from test_schema_engine import make_urlconf
+
+SCHEMA = {
+    "openapi": "3.0.3",
+    "info": {"title": "Ping API", "version": "v1", "description": "Grüße"},
+    "paths": {"/api/ping/": {"get": {"operationId": "ping_retrieve"}}},
+}
+
+
+class TestSchemaFiles:
+    """Test writing and reading schemas by file suffix."""
+
+    @pytest.mark.parametrize("suffix", [".yaml", ".json"])
+    def test_round_trip(self, tmp_path, suffix):
+        """Test that a written schema loads back unchanged."""
+        schema_file = tmp_path / f"ping{suffix}"
+
+        write_schema(SCHEMA, schema_file)
+
+        assert load_schema(schema_file) == SCHEMA
+
+    def test_json_output(self, tmp_path):
+        """Test that .json files hold JSON and keep non-ASCII text readable."""
+        schema_file = tmp_path / "ping.json"
+
+        write_schema(SCHEMA, schema_file)
+
+        assert json.loads(schema_file.read_text(encoding="utf-8")) == SCHEMA
+        assert "Grüße" in schema_file.read_text(encoding="utf-8")
+
+    def test_yaml_keeps_key_order(self):
+        """Test that YAML output keeps the order of the schema."""
+        assert dump_schema(SCHEMA).startswith("openapi: 3.0.3\ninfo:")
+
+    def test_libyaml_when_available(self):
+        """Test that the C loader is used when PyYAML was built with libyaml."""
+        assert (SafeLoader is getattr(yaml, "CSafeLoader", None)) == yaml.__with_libyaml__
+
+
+class TestParsedSchemaCache:
+    """Test the on-disk cache of parsed schemas."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return ParsedSchemaCache(tmp_path / ".parsed")
+
+    @pytest.fixture
+    def schema_file(self, tmp_path):
+        path = tmp_path / "ping.yaml"
+        write_schema(SCHEMA, path)
+        return path
+
+    def test_hit_for_same_content(self, cache, schema_file):
+        """Test that identical content is parsed once."""
+        assert cache.load(schema_file) == SCHEMA
+        # Different file, same content
+        copy = schema_file.with_name("copy.yaml")
+        copy.write_bytes(schema_file.read_bytes())
+
+        with patch("django_revolution.openapi.schema_io.parse_schema") as parse:
+            assert cache.load(copy) == SCHEMA
+
+        parse.assert_not_called()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_miss_on_change(self, cache, schema_file):
+        """Test that changed content is parsed again."""
+        cache.load(schema_file)
+        write_schema({**SCHEMA, "paths": {}}, schema_file)
+
+        assert cache.load(schema_file)["paths"] == {}
+        assert cache.misses == 2
+
+    def test_loaded_schemas_are_independent(self, cache, schema_file):
+        """Test that callers may modify what they loaded."""
+        cache.load(schema_file)["paths"].clear()
+
+        assert cache.load(schema_file) == SCHEMA
+
+    def test_json_not_cached(self, cache, tmp_path):
+        """Test that JSON schemas are parsed directly."""
+        schema_file = tmp_path / "ping.json"
+        write_schema(SCHEMA, schema_file)
+
+        assert cache.load(schema_file) == SCHEMA
+        assert not cache.cache_dir.exists()
+
+    def test_corrupt_entry(self, cache, schema_file):
+        """Test that an unreadable entry is replaced."""
+        cache.load(schema_file)
+        [entry] = cache.cache_dir.glob("*.pickle")
+        entry.write_bytes(b"not a pickle")
+
+        assert cache.load(schema_file) == SCHEMA
+        assert cache.load(schema_file) == SCHEMA
+        assert cache.hits == 1
+
+    def test_prune(self, tmp_path):
+        """Test that only max_entries entries are kept."""
+        cache = ParsedSchemaCache(tmp_path / ".parsed", max_entries=2)
+        for version in range(4):
+            schema_file = tmp_path / f"v{version}.yaml"
+            write_schema({**SCHEMA, "info": {"version": str(version)}}, schema_file)
+            cache.load(schema_file)
+
+        assert len(list(cache.cache_dir.glob("*.pickle"))) == 2
+
+    def test_disabled(self, tmp_path, schema_file):
+        """Test that a cache without directory only parses."""
+        cache = ParsedSchemaCache()
+
+        assert cache.load(schema_file) == SCHEMA
+        assert cache.misses == 0
+
+
+class TestSchemaFormatSetting:
+    """Test the schema_format and parsed_schema_cache settings."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        return DjangoRevolutionSettings(
+            schema_format="json",
+            zones={"ping": {"apps": ["tests"], "version": "v1"}},
+            output={"base_directory": str(tmp_path / "openapi")},
+        )
+
+    def test_invalid_format_rejected(self):
+        """Test that unknown formats fail validation."""
+        with pytest.raises(ValueError):
+            DjangoRevolutionSettings(schema_format="toml")
+
+    def test_inprocess_json_schema(self, config):
+        """Test that zone schemas are written as JSON."""
+        generator = OpenAPIGenerator(config)
+
+        with patch.object(
+            generator.zone_manager,
+            "create_dynamic_urlconf_module",
+            return_value=make_urlconf("ping_json_urls"),
+        ):
+            schemas = generator.generate_schemas()
+
+        assert schemas["ping"].name == "ping.json"
+        assert "/api/ping/" in json.loads(schemas["ping"].read_text())["paths"]
+
+    def test_subprocess_json_schema(self, config, tmp_path):
+        """Test that `manage.py spectacular` is asked for JSON."""
+        generator = OpenAPIGenerator(config)
+        zone = generator.zone_manager.zones["ping"]
+        schemas_dir = tmp_path / "schemas"
+        schemas_dir.mkdir()
+
+        def spectacular(cmd, timeout, stage):
+            (schemas_dir / "ping.json").write_text("{}")
+            return True, ""
+
+        with patch.object(
+            generator.zone_manager,
+            "create_dynamic_urlconf_module",
+            return_value=make_urlconf("ping_json_urls"),
+        ), patch(
+            "django_revolution.openapi.generator.run_command", side_effect=spectacular
+        ) as mock_run_command:
+            _, schema_file = generator._generate_single_schema(
+                "ping", zone, schemas_dir, tmp_path / "manage.py", "subprocess"
+            )
+
+        assert schema_file == schemas_dir / "ping.json"
+        assert mock_run_command.call_args[0][0][-2:] == ["--format", "openapi-json"]
+        assert mock_run_command.call_args[1]["stage"] == "schema"
+
+    def test_generator_configures_cache(self, config, tmp_path):
+        """Test that the parsed schema cache lives next to the schemas."""
+        OpenAPIGenerator(config)
+        assert get_parsed_schema_cache().cache_dir == (
+            tmp_path / "openapi" / "schemas" / ".parsed"
+        )
+
+        config.parsed_schema_cache = False
+        OpenAPIGenerator(config)
+        assert not get_parsed_schema_cache().enabled
@@ -0,0 +1,292 @@
+"""
+Tests for Django Revolution schema sharding.
+"""
+
+import pytest
+import yaml
+from unittest.mock import patch
+
+from django_revolution.config import DjangoRevolutionSettings, ZoneModel
+from django_revolution.openapi.generator import OpenAPIGenerator
+from django_revolution.openapi.job_scheduler import JobScheduler
+from django_revolution.openapi.sharding import (
+    app_shards,
+    build_sharded_client,
+    merge_client_trees,
+    merge_python_inits,
+    merge_schemas,
+    merge_typescript_modules,
+    split_schema,
+)
+
+
+def operation(operation_id, tag, ref=None):
+    response = {"200": {"description": ""}}
+    if ref:
+        response["200"]["content"] = {
+            "application/json": {"schema": {"$ref": f"#/components/schemas/{ref}"}}
+        }
+    return {"operationId": operation_id, "tags": [tag], "responses": response}
+
+
+SCHEMA = {
+    "openapi": "3.0.3",
+    "info": {"title": "Shop API", "version": "v1"},
+    "paths": {
+        "/api/users/": {"get": operation("users_list", "users", "User")},
+        "/api/orders/": {
+            "get": operation("orders_list", "orders", "Order"),
+            "parameters": [{"name": "page", "in": "query"}],
+        },
+        "/api/orders/export/": {"get": operation("orders_export", "reports")},
+    },
+    "components": {
+        "schemas": {
+            "Order": {
+                "type": "object",
+                "properties": {"buyer": {"$ref": "#/components/schemas/User"}},
+            },
+            "User": {"type": "object", "properties": {"id": {"type": "integer"}}},
+            "Unused": {"type": "object"},
+        },
+        "securitySchemes": {"jwtAuth": {"type": "http", "scheme": "bearer"}},
+    },
+    "tags": [{"name": "users"}, {"name": "orders"}, {"name": "reports"}],
+}
+
+
+def shop_zone(shard_by):
+    return ZoneModel(name="shop", apps=["shop.users", "shop.orders"], shard_by=shard_by)
+
+
+class TestSplitSchema:
+    """Test splitting a zone schema into sub-schemas."""
+
+    def test_split_by_tag_keeps_referenced_components(self):
+        """Test that each shard gets its operations and their components."""
+        shards = split_schema(SCHEMA, shop_zone("tag"), "api")
+
+        assert sorted(shards) == ["orders", "reports", "users"]
+        orders = shards["orders"]
+        assert list(orders["paths"]) == ["/api/orders/"]
+        assert orders["paths"]["/api/orders/"]["parameters"][0]["name"] == "page"
+        # User is only referenced through Order
+        assert sorted(orders["components"]["schemas"]) == ["Order", "User"]
+        assert "jwtAuth" in orders["components"]["securitySchemes"]
+        assert orders["tags"] == [{"name": "orders"}]
+        assert orders["info"] == SCHEMA["info"]
+
+    def test_split_by_app(self):
+        """Test that operations are grouped by the app in their path."""
+        shards = split_schema(SCHEMA, shop_zone("app"), "api")
+
+        assert sorted(shards) == ["orders", "users"]
+        assert sorted(shards["orders"]["paths"]) == ["/api/orders/", "/api/orders/export/"]
+
+    def test_single_shard_is_not_split(self):
+        """Test that a zone whose operations fall into one shard is not sharded."""
+        schema = {**SCHEMA, "paths": {"/api/users/": SCHEMA["paths"]["/api/users/"]}}
+
+        assert split_schema(schema, shop_zone("tag"), "api") == {}
+        assert split_schema(SCHEMA, shop_zone(None), "api") == {}
+
+    def test_merge_restores_schema(self):
+        """Test that merging the shards gives back the used part of the schema."""
+        shards = split_schema(SCHEMA, shop_zone("tag"), "api")
+
+        merged, conflicts = merge_schemas(list(shards.values()))
+
+        assert conflicts == []
+        assert merged["paths"] == SCHEMA["paths"]
+        assert sorted(merged["components"]["schemas"]) == ["Order", "User"]
+
+    def test_merge_reports_conflicting_components(self):
+        """Test that different components of the same name keep the first one."""
+        first = {"paths": {}, "components": {"schemas": {"User": {"type": "object"}}}}
+        second = {"paths": {}, "components": {"schemas": {"User": {"type": "string"}}}}
+
+        merged, conflicts = merge_schemas([first, second])
+
+        assert merged["components"]["schemas"]["User"] == {"type": "object"}
+        assert conflicts == ["schemas/User"]
+
+
+class TestAppShards:
+    """Test per-app sub-zones for schema generation."""
+
+    def test_sub_zones(self):
+        """Test that every app becomes a zone of its own."""
+        shards = app_shards(shop_zone("app"))
+
+        assert list(shards) == ["shop__users", "shop__orders"]
+        assert shards["shop__orders"].apps == ["shop.orders"]
+        assert shards["shop__orders"].shard_by is None
+
+    def test_invalid_strategy(self):
+        """Test that unknown shard strategies are rejected."""
+        with pytest.raises(ValueError):
+            shop_zone("model")
+
+
+class TestMergeClients:
+    """Test merging client trees built from shards."""
+
+    def test_typescript_modules(self):
+        """Test that imports are combined and shared types kept once."""
+        users = (
+            "// generated\n\n"
+            "import type { UsersListData } from './types.gen';\n\n"
+            "/**\n * Shared user\n */\n"
+            "export type User = {\n    id: number;\n};\n\n"
+            "export const usersList = () => client.get({ url: '/api/users/' });\n"
+        )
+        orders = (
+            "// generated\n\n"
+            "import type { OrdersListData } from './types.gen';\n\n"
+            "/**\n * Shared user\n */\n"
+            "export type User = {\n    id: number;\n};\n\n"
+            "export const ordersList = () => client.get({ url: '/api/orders/' });\n"
+        )
+
+        merged = merge_typescript_modules([users, orders])
+
+        assert merged.count("export type User") == 1
+        assert merged.count("Shared user") == 1
+        assert "import type { UsersListData, OrdersListData } from './types.gen';" in merged
+        assert "export const usersList" in merged and "export const ordersList" in merged
+        assert merged.startswith("// generated\n\nimport type")
+
+    def test_python_inits(self):
+        """Test that model imports and __all__ entries are combined."""
+        users = '"""Models"""\n\nfrom .user import User\n\n__all__ = ("User",)\n'
+        orders = (
+            '"""Models"""\n\nfrom .order import Order\nfrom .user import User\n\n'
+            '__all__ = ("Order", "User")\n'
+        )
+
+        merged = merge_python_inits([users, orders])
+
+        assert merged == (
+            '"""Models"""\n\n'
+            "from .order import Order\n"
+            "from .user import User\n\n"
+            '__all__ = (\n    "Order",\n    "User",\n)\n'
+        )
+
+    def test_trees(self, tmp_path):
+        """Test that identical files are copied and others merged or kept."""
+        users, orders, target = tmp_path / "users", tmp_path / "orders", tmp_path / "out"
+        for shard_dir, name in ((users, "users"), (orders, "orders")):
+            (shard_dir / "api").mkdir(parents=True)
+            (shard_dir / "client.py").write_text("class Client: ...\n")
+            (shard_dir / "api" / f"{name}_list.py").write_text("def sync(): ...\n")
+            (shard_dir / "index.ts").write_text(f"export const {name} = 1;\n")
+            (shard_dir / "README.md").write_text(f"# {name}\n")
+
+        conflicts = merge_client_trees([users, orders], target)
+
+        assert conflicts == ["README.md"]
+        assert (target / "README.md").read_text() == "# users\n"
+        assert (target / "client.py").read_text() == "class Client: ...\n"
+        assert sorted(p.name for p in (target / "api").iterdir()) == [
+            "orders_list.py",
+            "users_list.py",
+        ]
+        assert "export const orders" in (target / "index.ts").read_text()
+
+    def test_build_from_full_pool(self, tmp_path):
+        """Test that shards of a job are built even when no worker is free."""
+        scheduler = JobScheduler(max_workers=1)
+        shards = {"users": tmp_path / "users.json", "orders": tmp_path / "orders.json"}
+        target = tmp_path / "client"
+        target.mkdir()
+
+        def build(shard, schema_path, output_dir):
+            (output_dir / f"{shard}.py").write_text(schema_path.name)
+            return True, ""
+
+        future = scheduler.submit(
+            "python", build_sharded_client, "shop", shards, build, target, scheduler, "python"
+        )
+
+        assert future.result(timeout=5) == (True, "")
+        assert sorted(p.name for p in target.iterdir()) == ["orders.py", "users.py"]
+        assert not (tmp_path / "client.shards").exists()
+        scheduler.shutdown()
+
+    def test_failed_shard_fails_client(self, tmp_path):
+        """Test that a failing shard fails the whole client."""
+        target = tmp_path / "client"
+        target.mkdir()
+
+        def build(shard, schema_path, output_dir):
+            return shard != "orders", f"{shard} exploded"
+
+        success, error = build_sharded_client(
+            "shop", {"users": None, "orders": None}, build, target
+        )
+
+        assert not success
+        assert error == "shard orders: orders exploded"
+
+    def test_build_all(self, tmp_path):
+        """Test that all shards can be handed to one batch builder."""
+        target = tmp_path / "client"
+        target.mkdir()
+        batches = []
+
+        def build_all(shards):
+            batches.append([shard for shard, _, _ in shards])
+            for shard, _, output_dir in shards:
+                (output_dir / f"{shard}.ts").write_text("")
+            return [(True, "")] * len(shards)
+
+        success, _ = build_sharded_client(
+            "shop", {"users": None, "orders": None}, None, target, build_all=build_all
+        )
+
+        assert success
+        assert batches == [["users", "orders"]]
+        assert sorted(p.name for p in target.iterdir()) == ["orders.ts", "users.ts"]
+
+
+class TestShardedGeneration:
+    """Test sharded zones in the generator."""
+
+    @pytest.fixture
+    def generator(self, tmp_path):
+        config = DjangoRevolutionSettings(
+            zones={"shop": {"apps": ["shop.users", "shop.orders"], "shard_by": "tag"}},
+            api_prefix="api",
+            output={"base_directory": str(tmp_path / "openapi")},
+            generators={
+                "typescript": {"output_directory": str(tmp_path / "ts")},
+                "python": {"output_directory": str(tmp_path / "py")},
+            },
+        )
+        return OpenAPIGenerator(config)
+
+    def test_typescript_client_from_shards(self, generator, tmp_path):
+        """Test that a sharded zone is built per shard into one client."""
+        schema_file = tmp_path / "shop.yaml"
+        schema_file.write_text(yaml.safe_dump(SCHEMA, sort_keys=False))
+        built = []
+
+        def fake_openapi_ts(schema_path, output_dir):
+            built.append(schema_path.stem)
+            (output_dir / f"{schema_path.stem}.gen.ts").write_text("export {};\n")
+            return True, ""
+
+        with patch.object(
+            generator.ts_generator, "_run_openapi_ts", side_effect=fake_openapi_ts
+        ):
+            [future] = generator._submit_clients(
+                "typescript", generator.ts_generator, {"shop": schema_file}
+            )
+            result = future.result(timeout=10)
+
+        assert result.success
+        assert sorted(built) == ["orders", "reports", "users"]
+        assert (tmp_path / "ts" / "shop" / "reports.gen.ts").exists()
+        assert sorted(generator.client_shards["shop"]) == ["orders", "reports", "users"]
+        generator.job_scheduler.shutdown()
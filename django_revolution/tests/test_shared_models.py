@@ -0,0 +1,259 @@
+"""
+Tests for Django Revolution shared models across zones.
+"""
+
+import pytest
+import yaml
+from unittest.mock import patch
+
+from django_revolution.config import DjangoRevolutionSettings, GenerationResult
+from django_revolution.openapi.generator import OpenAPIGenerator
+from django_revolution.openapi.shared_models import (
+    COMMON_PACKAGE,
+    dedupe_python_client,
+    dedupe_typescript_client,
+    find_shared_components,
+    write_common_schema,
+)
+from django_revolution.zones import ZoneManager
+
+from test_schema_engine import make_urlconf
+
+USER = {"type": "object", "properties": {"id": {"type": "integer"}}}
+PAGE = {
+    "type": "object",
+    "properties": {"results": {"type": "array", "items": {"$ref": "#/components/schemas/User"}}},
+}
+
+
+def zone_schema(**components):
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": "API", "version": "v1"},
+        "paths": {},
+        "components": {"schemas": components},
+    }
+
+
+class TestFindSharedComponents:
+    """Test detecting components shared between zones."""
+
+    def test_identical_components_are_shared(self):
+        """Test that components defined identically by two zones are shared."""
+        shared = find_shared_components(
+            {
+                "public": zone_schema(User=USER, PaginatedUserList=PAGE),
+                "admin": zone_schema(User=USER, PaginatedUserList=PAGE, Audit={}),
+            }
+        )
+
+        assert list(shared) == ["PaginatedUserList", "User"]
+        assert shared["User"] == USER
+
+    def test_differing_component_is_not_shared(self):
+        """Test that a component one zone defines differently stays per zone."""
+        other_user = {"type": "object", "properties": {"id": {"type": "string"}}}
+
+        shared = find_shared_components(
+            {
+                "public": zone_schema(User=USER, PaginatedUserList=PAGE),
+                "admin": zone_schema(User=USER, PaginatedUserList=PAGE),
+                "staff": zone_schema(User=other_user),
+            }
+        )
+
+        # The page refers to User, which differs between zones
+        assert shared == {}
+
+    def test_single_zone_shares_nothing(self):
+        """Test that components of one zone are never shared."""
+        assert find_shared_components({"public": zone_schema(User=USER)}) == {}
+
+    def test_common_schema_file(self, tmp_path):
+        """Test that the common schema holds the shared components only."""
+        for zone_name, components in (
+            ("public", {"User": USER, "Token": {}}),
+            ("admin", {"User": USER}),
+        ):
+            (tmp_path / f"{zone_name}.yaml").write_text(
+                yaml.safe_dump(zone_schema(**components))
+            )
+        schemas = {name: tmp_path / f"{name}.yaml" for name in ("public", "admin")}
+        schema_file = tmp_path / "common.yaml"
+
+        assert write_common_schema(schemas, schema_file) == ["User"]
+        common = yaml.safe_load(schema_file.read_text())
+        assert common["paths"] == {}
+        assert common["components"]["schemas"] == {"User": USER}
+
+        # Nothing shared any more
+        (tmp_path / "admin.yaml").write_text(yaml.safe_dump(zone_schema()))
+        assert write_common_schema(schemas, schema_file) == []
+        assert not schema_file.exists()
+
+
+class TestDedupeClients:
+    """Test replacing generated models by imports from the common client."""
+
+    def test_typescript(self, tmp_path):
+        """Test that identical declarations are imported and re-exported."""
+        common_dir, zone_dir = tmp_path / "common", tmp_path / "public"
+        common_dir.mkdir()
+        zone_dir.mkdir()
+        (common_dir / "types.gen.ts").write_text(
+            "// This file is auto-generated by @hey-api/openapi-ts\n\n"
+            "export type User = {\n    id: number;\n};\n\n"
+            "export const StatusEnum = {\n    ACTIVE: 'active',\n} as const;\n"
+        )
+        (zone_dir / "types.gen.ts").write_text(
+            "// This file is auto-generated by @hey-api/openapi-ts\n\n"
+            "/**\n * A user\n */\n"
+            'export type User = {\n  id: number\n}\n\n'
+            "export const StatusEnum = {\n    ACTIVE: 'active',\n} as const;\n\n"
+            "export type Order = {\n    buyer: User;\n};\n"
+        )
+
+        shared = dedupe_typescript_client(zone_dir, common_dir)
+
+        assert shared == ["StatusEnum", "User"]
+        assert (zone_dir / "types.gen.ts").read_text() == (
+            "// This file is auto-generated by @hey-api/openapi-ts\n\n"
+            "import type { User } from '../common/types.gen';\n"
+            "import { StatusEnum } from '../common/types.gen';\n"
+            "export type { User } from '../common/types.gen';\n"
+            "export { StatusEnum } from '../common/types.gen';\n\n"
+            "export type Order = {\n    buyer: User;\n};\n"
+        )
+
+    def test_typescript_without_common_models(self, tmp_path):
+        """Test that a client without shared declarations is left alone."""
+        (tmp_path / "common").mkdir()
+        (tmp_path / "common" / "types.gen.ts").write_text("export type User = {};\n")
+        (tmp_path / "public").mkdir()
+        source = "export type User = {\n    id: number;\n};\n"
+        (tmp_path / "public" / "types.gen.ts").write_text(source)
+
+        assert dedupe_typescript_client(tmp_path / "public", tmp_path / "common") == []
+        assert (tmp_path / "public" / "types.gen.ts").read_text() == source
+
+    def test_python(self, tmp_path):
+        """Test that identical model modules become imports from the common package."""
+        model = (
+            "from typing import TypeVar\n\n"
+            "from attrs import define\n\n"
+            'T = TypeVar("T", bound="User")\n\n\n'
+            "@define\n"
+            "class User:\n"
+            "    id: int\n"
+        )
+        common_models = tmp_path / "common" / "django_revolution_common" / "models"
+        zone_models = tmp_path / "public" / "django_revolution_public" / "models"
+        for models_dir in (common_models, zone_models):
+            models_dir.mkdir(parents=True)
+            (models_dir / "__init__.py").write_text("from .user import User\n")
+        (common_models / "user.py").write_text(model)
+        # Formatting differences do not matter
+        (zone_models / "user.py").write_text(model.replace("\n\n\n", "\n\n"))
+        (zone_models / "order.py").write_text("class Order:\n    pass\n")
+
+        shared = dedupe_python_client(
+            tmp_path / "public",
+            "django_revolution_public",
+            tmp_path / "common",
+            "django_revolution_common",
+        )
+
+        assert shared == ["user"]
+        assert (zone_models / "user.py").read_text() == (
+            '"""Shared model, defined in django_revolution_common.models.user."""\n\n'
+            "from django_revolution_common.models.user import User\n\n"
+            '__all__ = (\n    "User",\n)\n'
+        )
+        assert (zone_models / "order.py").read_text() == "class Order:\n    pass\n"
+        assert (zone_models / "__init__.py").read_text() == "from .user import User\n"
+
+
+class TestSharedModelsGeneration:
+    """Test the common package in OpenAPIGenerator."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        return DjangoRevolutionSettings(
+            shared_models=True,
+            incremental=True,
+            zones={
+                "alpha": {"apps": ["tests.alpha"], "version": "v1"},
+                "beta": {"apps": ["tests.beta"], "version": "v1"},
+            },
+            output={"base_directory": str(tmp_path / "openapi")},
+            generators={
+                "typescript": {"output_directory": str(tmp_path / "ts")},
+                "python": {"output_directory": str(tmp_path / "py")},
+            },
+        )
+
+    def run(self, generator, calls):
+        def fake_client(client_generator):
+            def generate(zone_name, schema_path, *args, **kwargs):
+                calls.append((zone_name, client_generator.common_dir))
+                output_path = client_generator.output_dir / zone_name
+                output_path.mkdir(parents=True, exist_ok=True)
+                return GenerationResult(
+                    success=True,
+                    zone_name=zone_name,
+                    output_path=output_path,
+                    files_generated=1,
+                )
+
+            return generate
+
+        with patch.object(
+            ZoneManager, "create_dynamic_urlconf_module", return_value=make_urlconf()
+        ), patch.object(
+            generator, "validate_environment", return_value=True
+        ), patch.object(
+            generator.ts_generator,
+            "generate_client",
+            side_effect=fake_client(generator.ts_generator),
+        ), patch.object(
+            generator.python_generator,
+            "generate_client",
+            side_effect=fake_client(generator.python_generator),
+        ):
+            return generator.generate_all(archive=False)
+
+    @pytest.mark.parametrize("pipeline_mode", ["staged", "streaming"])
+    def test_common_clients_come_first(self, config, tmp_path, pipeline_mode):
+        """Test that zone clients are built against the common clients."""
+        config.pipeline_mode = pipeline_mode
+        generator = OpenAPIGenerator(config)
+        calls = []
+
+        summary = self.run(generator, calls)
+
+        # Both zones expose the same Ping serializer
+        assert summary.shared_models == ["Ping"]
+        assert set(summary.typescript_results) == {COMMON_PACKAGE, "alpha", "beta"}
+        assert calls[0][0] == COMMON_PACKAGE
+        zone_calls = [call for call in calls if call[0] != COMMON_PACKAGE]
+        assert sorted(common_dir.parent.name for _, common_dir in zone_calls) == [
+            "py",
+            "py",
+            "ts",
+            "ts",
+        ]
+        assert (tmp_path / "openapi" / "schemas" / "common.yaml").exists()
+        generator.job_scheduler.shutdown()
+
+    def test_unchanged_run_keeps_common_clients(self, config, tmp_path):
+        """Test that an incremental run without changes builds nothing."""
+        generator = OpenAPIGenerator(config)
+        self.run(generator, [])
+        calls = []
+
+        summary = self.run(generator, calls)
+
+        assert calls == []
+        assert summary.unchanged_zones == ["alpha", "beta"]
+        assert (tmp_path / "ts" / COMMON_PACKAGE).exists()
+        generator.job_scheduler.shutdown()
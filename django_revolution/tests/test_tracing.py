@@ -0,0 +1,113 @@
+"""
+Tests for Django Revolution Chrome trace export.
+"""
+
+import json
+import sys
+import pytest
+
+from django_revolution.command_runner import CommandRunner
+from django_revolution.metrics import StageRecorder
+from django_revolution.openapi.job_scheduler import JobScheduler
+from django_revolution.tracing import TraceRecorder, get_tracer
+
+
+@pytest.fixture
+def tracer():
+    tracer = get_tracer()
+    tracer.start()
+    yield tracer
+    tracer.stop()
+
+
+def spans(tracer, category):
+    return [e for e in tracer.get_events() if e.get("cat") == category]
+
+
+class TestTraceRecorder:
+    """Test collecting and writing trace events."""
+
+    def test_disabled_records_nothing(self):
+        """Test that spans are dropped unless recording was started."""
+        tracer = TraceRecorder()
+
+        with tracer.span("schema", "stage"):
+            pass
+        tracer.add_counter("queued", {"python": 1})
+
+        assert [e for e in tracer.get_events() if e["ph"] != "M"] == []
+
+    def test_span_on_thread_track(self):
+        """Test that spans carry timing, args and a named thread track."""
+        tracer = TraceRecorder()
+        tracer.start()
+
+        with tracer.span("schema public", "stage", zone_name="public") as args:
+            args["files"] = 1
+
+        [span] = spans(tracer, "stage")
+        assert span["ph"] == "X"
+        assert span["dur"] >= 0
+        assert span["args"] == {"zone_name": "public", "files": 1}
+
+        names = [e for e in tracer.get_events() if e["name"] == "thread_name"]
+        assert names[0]["tid"] == span["tid"]
+        assert names[0]["args"]["name"] == "MainThread"
+
+    def test_write_chrome_format(self, tmp_path):
+        """Test that the file is a loadable trace-event document."""
+        tracer = TraceRecorder()
+        tracer.start()
+        tracer.add_counter("queued", {"typescript": 2})
+
+        path = tracer.write(tmp_path / "trace.json")
+        document = json.loads(path.read_text())
+
+        assert document["displayTimeUnit"] == "ms"
+        assert {"ph": "C", "name": "queued"}.items() <= document["traceEvents"][-1].items()
+
+
+class TestRunSpans:
+    """Test spans emitted by the generation components."""
+
+    def test_stage_spans(self, tracer):
+        """Test that measured stages appear in the trace."""
+        with StageRecorder().stage("python", "public"):
+            pass
+
+        [span] = spans(tracer, "stage")
+        assert span["name"] == "python public"
+        assert span["args"]["zone_name"] == "public"
+
+    def test_child_process_track(self, tracer):
+        """Test that every child process gets its own track."""
+        result = CommandRunner().run([sys.executable, "-c", "pass"], name="probe")
+
+        [span] = spans(tracer, "process")
+        assert result.success
+        assert span["name"] == "probe"
+        assert span["args"]["returncode"] == 0
+        track_names = {
+            e["tid"]: e["args"]["name"]
+            for e in tracer.get_events()
+            if e["name"] == "thread_name"
+        }
+        assert track_names[span["tid"]].startswith("probe (pid ")
+
+    def test_scheduler_jobs_and_queue_depth(self, tracer):
+        """Test that scheduler jobs and queue depth counters are traced."""
+        scheduler = JobScheduler(max_workers=1)
+
+        futures = [scheduler.submit("python", lambda: None) for _ in range(3)]
+        for future in futures:
+            future.result(timeout=5)
+        scheduler.shutdown()
+
+        assert len(spans(tracer, "job")) == 3
+        queued = [
+            e["args"]["python"]
+            for e in tracer.get_events()
+            if e["ph"] == "C" and e["name"] == "queued"
+        ]
+        assert max(queued) >= 1
+        assert queued[-1] == 0
@@ -0,0 +1,185 @@
+"""
+Tests for Django Revolution watch mode.
+"""
+
+import importlib
+import sys
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+
+from django_revolution.config import DjangoRevolutionSettings
+from django_revolution.openapi.generator import OpenAPIGenerator
+from django_revolution.openapi.schema_cache import SchemaCache
+from django_revolution.openapi.watcher import ZoneWatcher
+
+
+@pytest.fixture
+def app_dir(tmp_path, monkeypatch):
+    """Create an importable app package."""
+    app_dir = tmp_path / "src" / "watch_sample_app"
+    (app_dir / "migrations").mkdir(parents=True)
+    (app_dir / "__init__.py").write_text("")
+    (app_dir / "models.py").write_text("# models\n")
+    (app_dir / "admin.py").write_text("# admin\n")
+    (app_dir / "views.py").write_text("VERSION = 1\n")
+    (app_dir / "serializers.py").write_text("# serializers\n")
+    (app_dir / "migrations" / "__init__.py").write_text("")
+    (app_dir / "migrations" / "0001_initial.py").write_text("# migration\n")
+
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    importlib.invalidate_caches()
+    yield app_dir
+
+    for name in list(sys.modules):
+        if name.startswith("watch_sample_app"):
+            del sys.modules[name]
+
+
+@pytest.fixture
+def generator(tmp_path, app_dir):
+    config = DjangoRevolutionSettings(
+        zones={
+            "sample": {"apps": ["watch_sample_app"], "version": "v1"},
+            "other": {"apps": ["tests"], "version": "v1"},
+        },
+        output={"base_directory": str(tmp_path / "openapi")},
+    )
+    generator = OpenAPIGenerator(config)
+    generator.generate_all = MagicMock(return_value=MagicMock(duration_seconds=0.1))
+    generator.ts_generator.close = MagicMock()
+    yield generator
+    generator.job_scheduler.shutdown()
+
+
+@pytest.fixture
+def watcher(generator):
+    watcher = ZoneWatcher(generator, zones=["sample"], debounce=0.1, poll_interval=0.02)
+    watcher.poll()
+    return watcher
+
+
+class TestChangeDetection:
+    """Test finding changed files and the zones they affect."""
+
+    def test_poll(self, watcher, app_dir):
+        """Test that added, modified and deleted files are reported."""
+        (app_dir / "views.py").write_text("VERSION = 22\n")
+        (app_dir / "filters.py").write_text("# filters\n")
+        (app_dir / "serializers.py").unlink()
+
+        assert watcher.poll() == {
+            app_dir / "views.py",
+            app_dir / "filters.py",
+            app_dir / "serializers.py",
+        }
+        assert watcher.poll() == set()
+
+    def test_admin_and_migrations_not_watched(self, watcher, app_dir):
+        """Test that modules that do not shape schemas are ignored."""
+        (app_dir / "admin.py").write_text("# changed admin\n")
+        (app_dir / "migrations" / "0002_more.py").write_text("# migration\n")
+
+        assert watcher.poll() == set()
+
+    def test_affected_zones(self, generator, app_dir):
+        """Test that only zones containing the changed app are affected."""
+        watcher = ZoneWatcher(generator)
+        watcher.poll()
+
+        assert watcher.affected_zones({app_dir / "views.py"}) == ["sample"]
+
+    def test_debounce(self, watcher, app_dir):
+        """Test that changes in quick succession are collected into one."""
+
+        def edit():
+            for version in range(3):
+                (app_dir / "views.py").write_text(f"VERSION = {version * 100}\n")
+                threading.Event().wait(0.04)
+            (app_dir / "serializers.py").write_text("# changed serializers\n")
+
+        thread = threading.Thread(target=edit)
+        thread.start()
+        changed = watcher.wait_for_changes()
+        thread.join()
+
+        assert changed == {app_dir / "views.py", app_dir / "serializers.py"}
+
+
+class TestRegeneration:
+    """Test regenerating zones after changes."""
+
+    def test_reimports_changed_app(self, watcher, generator, app_dir):
+        """Test that app modules are imported again, models are kept."""
+        import watch_sample_app.models  # noqa: F401
+        import watch_sample_app.views
+
+        assert watch_sample_app.views.VERSION == 1
+        cache = SchemaCache(generator.config, watcher.generator.output_dir / "schemas")
+        cache._index["sample"] = {"fingerprint": "old"}
+        cache.save()
+        (app_dir / "views.py").write_text("VERSION = 22\n")
+
+        watcher.regenerate(watcher.poll())
+
+        assert "watch_sample_app.views" not in sys.modules
+        assert "watch_sample_app.models" in sys.modules
+        assert importlib.import_module("watch_sample_app.views").VERSION == 22
+        generator.generate_all.assert_called_once_with(zones=["sample"], archive=False)
+        assert "sample" not in SchemaCache(generator.config, cache.schemas_dir)._index
+
+    def test_model_change_restarts(self, watcher, generator, app_dir):
+        """Test that model changes restart the process instead of regenerating."""
+        (app_dir / "models.py").write_text("# changed models\n")
+
+        with patch.object(watcher, "restart") as restart:
+            assert watcher.regenerate(watcher.poll()) is None
+
+        restart.assert_called_once()
+        generator.generate_all.assert_not_called()
+
+    def test_callbacks_around_each_run(self, generator, app_dir):
+        """Test that on_start precedes and on_summary follows every run."""
+        events = []
+        watcher = ZoneWatcher(
+            generator,
+            zones=["sample"],
+            on_start=lambda: events.append("start"),
+            on_summary=lambda summary: events.append("summary"),
+        )
+        watcher.poll()
+        (app_dir / "views.py").write_text("VERSION = 23\n")
+
+        watcher.regenerate(watcher.poll())
+
+        assert events == ["start", "summary"]
+
+    def test_run(self, watcher, generator, app_dir):
+        """Test that a run generates once, then once per change."""
+        summaries = []
+        started = threading.Event()
+
+        def on_summary(summary):
+            summaries.append(summary)
+            started.set()
+
+        watcher.on_summary = on_summary
+        thread = threading.Thread(target=watcher.run, kwargs={"max_cycles": 1})
+        thread.start()
+        assert started.wait(5)
+        # The first scan happens right after the initial run
+        threading.Event().wait(0.1)
+        (app_dir / "views.py").write_text("VERSION = 333\n")
+        thread.join(5)
+
+        assert not thread.is_alive()
+        assert len(summaries) == 2
+        assert generator.config.incremental and generator.config.schema_cache
+        assert generator.persistent_workers is False
+        generator.ts_generator.close.assert_called_once()
+
+    def test_stop(self, watcher):
+        """Test that a stopped watcher stops waiting."""
+        watcher.stop()
+
+        assert watcher.wait_for_changes() == set()